@@ -0,0 +1,127 @@
+"""
+Генератор синтетического корпуса для бенчмарков
+
+Резюме и вакансии разного размера, в которых обычный русский и английский
+текст перемешан с терминами навыков на латинице и кириллице в разном
+регистре и написании, а также теги навыков и строки зарплаты в форматах hh.ru.
+"""
+import os
+import random
+from typing import Dict, List
+
+from src.models.constants import TERM_NORMALIZER
+
+# Реальные файлы из репозитория
+FIXTURES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_PDF = os.path.join(FIXTURES_DIR, "ivanov_resume.pdf")
+
+# Размеры документов в словах
+DOCUMENT_SIZES = {"small": 200, "medium": 1_500, "large": 8_000}
+
+RUSSIAN_WORDS = [
+    "разработка", "проектирование", "команда", "ответственность", "сервисов", "приложений", "требования",
+    "обязанности", "компания", "опыт", "работы", "участие", "поддержка", "внедрение", "оптимизация",
+    "высоконагруженных", "систем", "архитектуры", "тестирование", "документации", "бизнес", "заказчиком",
+    "в", "и", "с", "на", "для", "по", "от"
+]
+
+ENGLISH_WORDS = [
+    "development", "experience", "team", "responsible", "application", "services", "project", "design",
+    "implementation", "performance", "delivery", "stakeholders", "with", "and", "of", "the", "for"
+]
+
+# Термины навыков на кириллице и латинице (включая написания из словаря нормализации)
+SKILL_TERMS = sorted(TERM_NORMALIZER)
+CYRILLIC_SKILL_TERMS = [term for term in SKILL_TERMS if any("а" <= char <= "я" or char == "ё" for char in term)]
+
+RESUME_SECTIONS = ["Опыт работы", "Навыки", "Образование", "Experience", "Skills", "О себе"]
+VACANCY_SECTIONS = ["Обязанности", "Требования", "Будет плюсом", "Мы предлагаем", "Responsibilities"]
+
+# Дополнительные теги навыков: написания вне списка популярных навыков и слова, не являющиеся навыками
+EXTRA_TAGS = [
+    "Английский язык", "Java 17", "SpringBoot", "Postgre SQL", "Python3", "ООП", "Многопоточность",
+    "Spring Framework", "Hibernate", "Микросервисная архитектура", "CI", "Code Review", "Опыт",
+    "Знание", "Работа в команде", "BPMN", "UML", "1С", "Clickhouse", "gRPC", "OpenAPI", "Vue 3"
+]
+
+SALARY_SAMPLES = [
+    "от 100 000 до 150 000 ₽ на руки",
+    "350 000 – 430 000 ₽ до вычета налогов",
+    "от 3 000 $ на руки",
+    "до 200 000 руб.",
+    "120\xa0000 ₽ за месяц",
+    "от 80\xa0000 до 95\xa0000 ₽ до вычета налогов",
+    "4 000 – 5 500 EUR",
+    "з/п не указана",
+    "",
+    "от 250 000 ₽"
+]
+
+
+def _skill_term(rng: random.Random):
+    """Термин навыка в случайном регистре; каждый пятый — на кириллице"""
+    pool = CYRILLIC_SKILL_TERMS if CYRILLIC_SKILL_TERMS and rng.random() < 0.2 else SKILL_TERMS
+    term = rng.choice(pool)
+    return rng.choice([term, term.lower(), term.upper(), term.title()])
+
+
+def _paragraph(words: int, skill_share: float, rng: random.Random):
+    tokens = []
+    for _ in range(words):
+        if rng.random() < skill_share:
+            tokens.append(_skill_term(rng))
+        else:
+            tokens.append(rng.choice(RUSSIAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS))
+    # Знаки препинания вокруг терминов: "(Docker)", "Python,", "CI/CD."
+    text = " ".join(tokens)
+    return text[:1].upper() + text[1:] + "."
+
+
+def generate_document(words: int, sections: List[str], rng: random.Random, skill_share: float = 0.08):
+    """
+    Генерирует документ из разделов с заголовками
+
+    :param words: Примерное количество слов
+    :param sections: Заголовки разделов
+    :param skill_share: Доля терминов навыков среди слов
+    """
+    per_section = max(1, words // len(sections))
+    parts = []
+    for section in sections:
+        parts.append(f"{section}:")
+        remaining = per_section
+        while remaining > 0:
+            size = min(remaining, rng.randint(8, 25))
+            parts.append(_paragraph(size, skill_share, rng))
+            remaining -= size
+    return "\n".join(parts)
+
+
+def generate_resume(words: int, rng: random.Random):
+    """Синтетическое резюме из words слов"""
+    return generate_document(words, RESUME_SECTIONS, rng)
+
+
+def generate_vacancy(words: int, rng: random.Random):
+    """Синтетическое описание вакансии из words слов"""
+    return generate_document(words, VACANCY_SECTIONS, rng, skill_share=0.1)
+
+
+def generate_skill_tags(count: int, common_skills: List[str], rng: random.Random):
+    """Теги навыков вакансии: популярные навыки в разном регистре, их варианты написания и не-навыки"""
+    pool = list(common_skills) + EXTRA_TAGS
+    return [rng.choice([skill, skill.lower(), skill.upper()]) for skill in rng.choices(pool, k=count)]
+
+
+def generate_corpus(seed: int = 42, sizes: Dict[str, int] = None):
+    """
+    Генерирует корпус: резюме и вакансии каждого размера
+
+    :return: Словарь {"resume": {размер: текст}, "vacancy": {размер: текст}}
+    """
+    rng = random.Random(seed)
+    sizes = sizes or DOCUMENT_SIZES
+    return {
+        "resume": {name: generate_resume(words, rng) for name, words in sizes.items()},
+        "vacancy": {name: generate_vacancy(words, rng) for name, words in sizes.items()}
+    }
@@ -0,0 +1,184 @@
+"""
+Бенчмарк нечеткого поиска навыков (FuzzySkillMatcher)
+
+Перед замерами проверяются контрольные примеры: обычные фразы не должны
+давать навыков, опечатки в навыках должны распознаваться. При ошибке
+в контрольных примерах код возврата 1.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.fuzzy_skills_benchmark --tokens 1000 10000 100000
+"""
+import argparse
+import random
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from src.models.constants import TERM_NORMALIZER
+from src.services.fuzzy_skills import FuzzySkillMatcher, compact_term, edit_distance
+
+console = Console()
+
+# Обычные слова резюме, которые не должны распознаваться как навыки
+FILLER_WORDS = [
+    "разработка", "проектирование", "команда", "ответственность", "сервисов", "приложений",
+    "требования", "обязанности", "компания", "опыт", "работы", "участие", "поддержка",
+    "development", "experience", "team", "responsible", "application", "services", "project"
+]
+
+
+# Обычные фразы, в которых не должно находиться ни одного навыка
+FALSE_POSITIVE_CASES = [
+    "Hiring manager will reach out",
+    "We pass a string to the function",
+    "Graph of sales by region",
+    "Sprint planning with team members",
+    "Please consult the native speakers",
+    "A linked list of vertical panels",
+    "Rascal in the groove",
+    "Менеджер свяжется с вами после собеседования",
+    "Ответственность, внимательность и желание развиваться",
+]
+
+# Опечатки и слитное написание навыков: {текст: ожидаемый навык}
+TYPO_CASES = {
+    "Kuberentes": "kubernetes",
+    "Pyhton": "python",
+    "Djnago": "django",
+    "Elasticsaerch": "elasticsearch",
+    "Promethues": "prometheus",
+    "SpringBoot": "spring",
+}
+
+
+def check_cases(matcher: FuzzySkillMatcher):
+    """
+    Проверяет контрольные примеры
+
+    :return: True, если все примеры прошли
+    """
+    table = Table(title="Контрольные примеры")
+    table.add_column("Текст")
+    table.add_column("Ожидается")
+    table.add_column("Найдено")
+    table.add_column("Результат")
+
+    passed = True
+    for text in FALSE_POSITIVE_CASES:
+        found = sorted(matcher.find_skills(text))
+        ok = not found
+        passed = passed and ok
+        table.add_row(text, "—", ", ".join(found) or "—", "OK" if ok else "[red]ложное срабатывание[/red]")
+    for text, expected in TYPO_CASES.items():
+        found = sorted(matcher.find_skills(text))
+        ok = expected in found
+        passed = passed and ok
+        table.add_row(text, expected, ", ".join(found) or "—", "OK" if ok else "[red]не найдено[/red]")
+
+    console.print(table)
+    return passed
+
+
+def make_typo(term: str, rng: random.Random):
+    """Вносит в термин случайную опечатку: перестановку, пропуск или слитное написание"""
+    if " " in term:
+        return term.replace(" ", "")
+    if len(term) < 6:
+        return term
+    position = rng.randint(1, len(term) - 3)
+    if rng.random() < 0.5:
+        return term[:position] + term[position + 1] + term[position] + term[position + 2:]
+    return term[:position] + term[position + 1:]
+
+
+def generate_document(tokens: int, rng: random.Random):
+    """Генерирует документ: 90% обычных слов, 10% навыков, половина из них с опечатками"""
+    terms = list(TERM_NORMALIZER.keys())
+    words = []
+    for _ in range(tokens):
+        if rng.random() < 0.1:
+            term = rng.choice(terms)
+            words.append(make_typo(term, rng) if rng.random() < 0.5 else term)
+        else:
+            word = rng.choice(FILLER_WORDS)
+            # Уникальные суффиксы увеличивают количество различных токенов и нагрузку на индекс
+            words.append(word + str(rng.randint(0, tokens)) if rng.random() < 0.3 else word)
+    return " ".join(words)
+
+
+def linear_lookup(token: str, vocabulary, max_distance: int):
+    """Базовый вариант: сравнение токена со всеми терминами словаря"""
+    return [term for term in vocabulary if edit_distance(token, term, max_distance) <= max_distance]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк нечеткого поиска навыков")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Размеры документов в токенах")
+    parser.add_argument("--max-distance", type=int, default=None,
+                        help="Максимальное редакционное расстояние (по умолчанию FUZZY_SKILL_MAX_DISTANCE)")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    cases_passed = check_cases(FuzzySkillMatcher(max_distance=args.max_distance))
+
+    table = Table(title="Нечеткий поиск навыков")
+    table.add_column("Токенов", justify="right")
+    table.add_column("Найдено навыков", justify="right")
+    table.add_column("Холодный кеш, мс", justify="right")
+    table.add_column("Теплый кеш, мс", justify="right")
+    table.add_column("мкс на токен", justify="right")
+
+    for tokens in args.tokens:
+        document = generate_document(tokens, rng)
+        matcher = FuzzySkillMatcher(max_distance=args.max_distance)
+
+        started = time.perf_counter()
+        found = matcher.find_skills(document)
+        cold_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher.find_skills(document)
+        warm_time = time.perf_counter() - started
+
+        table.add_row(f"{tokens:,}", str(len(found)), f"{cold_time * 1000:.1f}", f"{warm_time * 1000:.1f}",
+                      f"{cold_time / tokens * 1_000_000:.2f}")
+
+    console.print(table)
+
+    # Сравнение поиска одного токена по индексу и линейного перебора словаря
+    matcher = FuzzySkillMatcher(max_distance=args.max_distance)
+    max_distance = matcher.max_distance
+    vocabulary = sorted({compact_term(term) for term in TERM_NORMALIZER})
+    queries = [make_typo(term, rng) for term in rng.sample(vocabulary, 200)]
+    queries += [rng.choice(FILLER_WORDS) + str(number) for number in range(200)]
+
+    started = time.perf_counter()
+    for query in queries:
+        matcher._index.search(query, max_distance)
+    index_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for query in queries:
+        linear_lookup(query, vocabulary, max_distance)
+    linear_time = time.perf_counter() - started
+
+    lookup_table = Table(title=f"Поиск одного токена ({len(vocabulary)} терминов словаря)")
+    lookup_table.add_column("Способ")
+    lookup_table.add_column("мкс на запрос", justify="right")
+    lookup_table.add_row("Индекс триграмм", f"{index_time / len(queries) * 1_000_000:.1f}")
+    lookup_table.add_row("Линейный перебор", f"{linear_time / len(queries) * 1_000_000:.1f}")
+    console.print(lookup_table)
+
+    if not cases_passed:
+        console.print("[red]Контрольные примеры не прошли[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
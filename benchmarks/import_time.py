@@ -0,0 +1,114 @@
+"""
+Бенчмарк времени импорта приложения
+
+Каждый замер выполняется в новом процессе интерпретатора: измеряется время
+`import src.main` и по выводу `python -X importtime` определяются модули с
+наибольшим суммарным временем импорта. Переменные окружения LLM по умолчанию
+удаляются, чтобы проверить, что импорт не требует настроек языковой модели.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.import_time --runs 10
+    python -m benchmarks.import_time --module src.api.routes --top 30 --keep-env
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+console = Console()
+
+# Сторонние модули, загрузку которых приложение откладывает до первого использования
+DEFERRED_MODULES = ("fitz", "requests", "bs4", "numpy", "httpx", "psycopg2")
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print("elapsed", elapsed)
+print("loaded", ",".join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+
+def run_once(module: str, env):
+    """
+    Импортирует модуль в новом процессе
+
+    :return: (время импорта в секундах, загруженные отложенные модули, строки вывода -X importtime)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT.format(module=module, deferred=DEFERRED_MODULES)],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Импорт {module} завершился ошибкой:\n{result.stderr[-2000:]}")
+
+    values = dict(line.split(" ", 1) for line in result.stdout.splitlines() if " " in line)
+    loaded = [name for name in values.get("loaded", "").strip().split(",") if name]
+    return float(values["elapsed"]), loaded, result.stderr.splitlines()
+
+
+def parse_importtime(lines):
+    """Разбирает вывод -X importtime: {модуль: (собственное время, суммарное время) в мкс}"""
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта приложения")
+    parser.add_argument("--module", default="src.main", help="Импортируемый модуль")
+    parser.add_argument("--runs", type=int, default=5, help="Количество запусков")
+    parser.add_argument("--top", type=int, default=20, help="Количество модулей в отчете")
+    parser.add_argument("--keep-env", action="store_true",
+                        help="Не удалять переменные окружения LLM_API_URL и LLM_API_KEY")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not args.keep_env:
+        env.pop("LLM_API_URL", None)
+        env.pop("LLM_API_KEY", None)
+        # load_dotenv не перезаписывает заданные переменные: пустые значения скрывают .env
+        env.update(LLM_API_URL="", LLM_API_KEY="")
+
+    timings, loaded, modules = [], [], {}
+    with console.status(f"Импорт {args.module}"):
+        for _ in range(args.runs):
+            elapsed, loaded, lines = run_once(args.module, env)
+            timings.append(elapsed * 1000)
+            # Суммы по запускам для усреднения времени модулей
+            for name, (self_us, cumulative_us) in parse_importtime(lines).items():
+                total_self, total_cumulative = modules.get(name, (0, 0))
+                modules[name] = (total_self + self_us, total_cumulative + cumulative_us)
+
+    summary = Table(title=f"Импорт {escape(args.module)}, запусков: {args.runs}")
+    summary.add_column("Медиана, мс", justify="right")
+    summary.add_column("Мин., мс", justify="right")
+    summary.add_column("Макс., мс", justify="right")
+    summary.add_column("Загружены отложенные модули")
+    summary.add_row(f"{statistics.median(timings):.1f}", f"{min(timings):.1f}", f"{max(timings):.1f}",
+                    ", ".join(loaded) or "нет")
+    console.print(summary)
+
+    table = Table(title="Модули с наибольшим суммарным временем импорта (среднее по запускам)")
+    table.add_column("Модуль", overflow="fold")
+    table.add_column("Суммарно, мс", justify="right")
+    table.add_column("Собственное, мс", justify="right")
+    ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in ranked:
+        table.add_row(escape(name), f"{cumulative_us / args.runs / 1000:.1f}", f"{self_us / args.runs / 1000:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
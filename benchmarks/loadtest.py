@@ -0,0 +1,547 @@
+"""
+Нагрузочные сценарии для сервиса, запущенного через run.py
+
+Сценарии:
+    upload_burst   — всплеск загрузок PDF-резюме (извлечение текста, нормализация LLM, запись в БД)
+    match_storm    — шквал сопоставлений множества резюме с одной вакансией (LLM, затем кеш результатов)
+    list_endpoints — списки на больших таблицах: вакансии, резюме пользователя, результаты по вакансии
+    pdf_download   — выдача сохраненных PDF-файлов
+
+Сервис работает с локальным PostgreSQL (лучше с отдельной схемой, например
+DB_SCHEMA=loadtest) и эмулятором LLM (stubs.llm_emulator). С флагом --spawn
+скрипт сам запускает эмулятор и run.py с LLM_API_URL, указывающим на
+эмулятор. Перед сценариями база наполняется синтетическими данными
+(benchmarks.corpus) напрямую через DBService; идентификаторы зависят только
+от зерна, поэтому повторный запуск с --no-seed использует те же данные.
+
+Для каждого сценария считаются p50/p95/p99 задержки, пропускная
+способность, доля ошибок и потребление CPU/памяти процессом сервиса
+(по /proc, только Linux). Результаты сохраняются в JSON; режим сравнения
+отмечает ухудшения относительно базового запуска.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.loadtest --spawn --output load-baseline.json
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --server-pid 12345 --scenario match_storm
+    python -m benchmarks.loadtest --spawn --no-seed --compare load-baseline.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from benchmarks.corpus import RESUME_PDF, generate_resume, generate_skill_tags, generate_vacancy
+from benchmarks.microbench import _git_commit
+
+console = Console()
+
+# Версия формата файла результатов
+RESULTS_FORMAT = 1
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+EMULATOR_PORT = 8020
+
+# Email синтетических резюме и загрузок сценария upload_burst
+SEED_EMAIL = "loadtest@example.com"
+UPLOAD_EMAIL = "loadtest-upload@example.com"
+
+COMPANIES = ["ООО Ромашка", "Яндекс", "Сбер", "Тинькофф", "Ozon", "VK", "Авито", "Контур"]
+TITLES = ["Python Developer", "Java Developer", "Go Developer", "Frontend Developer", "DevOps Engineer",
+          "QA Automation Engineer", "Data Scientist", "Team Lead"]
+
+
+class Scenario:
+    """Нагрузочный сценарий: функция, выполняющая i-й запрос, и параметры по умолчанию"""
+
+    def __init__(self, name: str, description: str, request: Callable, concurrency: int, duration: float):
+        self.name = name
+        self.description = description
+        self.request = request
+        self.concurrency = concurrency
+        self.duration = duration
+
+
+def seed_ids(seed: int, resumes: int, vacancies: int):
+    """Детерминированные идентификаторы синтетических данных"""
+    rng = random.Random(f"loadtest:{seed}")
+    return {
+        "resumes": [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(resumes)],
+        "vacancies": [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(vacancies)]
+    }
+
+
+def seed_database(ids, seed: int, pdf_content: bytes, batch_size: int = 500):
+    """
+    Наполняет базу синтетическими резюме и вакансиями
+
+    Первая вакансия — общая вакансия сценария match_storm, у нее полноразмерное
+    описание; остальные нужны для списков на больших таблицах.
+    """
+    # Импорт здесь: подключение к базе данных нужно только при наполнении
+    from src.services.db_service import DBService
+    from src.services.matcher import ResumeVacancyMatcher
+    from src.services.vacancy_parser import VacancyParser
+
+    db_service = DBService()
+    matcher = ResumeVacancyMatcher(llm_api_url="http://localhost", llm_api_key="loadtest")
+    common_skills = VacancyParser().common_skills
+    rng = random.Random(seed)
+
+    with console.status(f"Наполнение базы: {len(ids['resumes'])} резюме") as status:
+        for number, resume_id in enumerate(ids["resumes"], start=1):
+            text = generate_resume(600, rng)
+            saved = db_service.save_resume(resume_id, SEED_EMAIL, text, {"filename": f"loadtest-{number}.pdf"},
+                                           pdf_content, matcher.extract_canonical_skills(text))
+            if not saved:
+                raise RuntimeError("Не удалось сохранить резюме: проверьте подключение к базе данных")
+            status.update(f"Наполнение базы: резюме {number}/{len(ids['resumes'])}")
+
+        batch = []
+        for number, vacancy_id in enumerate(ids["vacancies"], start=1):
+            description = generate_vacancy(1500 if number == 1 else 150, rng)
+            tags = generate_skill_tags(rng.randint(3, 12), common_skills, rng)
+            salary_from = rng.randrange(80_000, 400_000, 10_000)
+            batch.append({
+                "id": vacancy_id,
+                "title": rng.choice(TITLES),
+                "company": rng.choice(COMPANIES),
+                "description": description,
+                "url": f"https://hh.ru/vacancy/loadtest-{seed}-{number}",
+                "salary_from": salary_from,
+                "salary_to": salary_from + rng.randrange(0, 150_000, 10_000),
+                "currency": "RUR",
+                "experience": rng.choice(["Нет опыта", "От 1 года до 3 лет", "От 3 до 6 лет"]),
+                "skills": tags,
+                "skills_canonical": matcher.extract_canonical_skills(description, tags)
+            })
+            if len(batch) >= batch_size or number == len(ids["vacancies"]):
+                if not db_service.save_vacancies(batch):
+                    raise RuntimeError("Не удалось сохранить вакансии: проверьте подключение к базе данных")
+                batch = []
+                status.update(f"Наполнение базы: вакансии {number}/{len(ids['vacancies'])}")
+
+
+def build_scenarios(ids, pdf_content: bytes) -> Dict[str, Scenario]:
+    """Создает сценарии; запросы берут идентификаторы синтетических данных по кругу"""
+    resumes, vacancies = ids["resumes"], ids["vacancies"]
+    storm_vacancy = vacancies[0]
+
+    async def upload(client: httpx.AsyncClient, i: int):
+        return await client.post("/api/upload-resume", data={"email": UPLOAD_EMAIL},
+                                 files={"file": (f"loadtest-{i}.pdf", pdf_content, "application/pdf")})
+
+    async def match(client: httpx.AsyncClient, i: int):
+        return await client.post("/api/match-stored",
+                                 json={"resume_id": resumes[i % len(resumes)], "vacancy_id": storm_vacancy})
+
+    async def lists(client: httpx.AsyncClient, i: int):
+        path = ("/api/vacancies", f"/api/resumes/{SEED_EMAIL}", f"/api/vacancy/{storm_vacancy}/matches")[i % 3]
+        return await client.get(path)
+
+    async def pdf(client: httpx.AsyncClient, i: int):
+        return await client.get(f"/api/resume-pdf/{resumes[i % len(resumes)]}")
+
+    return {scenario.name: scenario for scenario in (
+        Scenario("upload_burst", "Всплеск загрузок PDF-резюме", upload, concurrency=16, duration=30),
+        Scenario("match_storm", "Сопоставления с одной вакансией", match, concurrency=32, duration=30),
+        Scenario("list_endpoints", "Списки на больших таблицах", lists, concurrency=8, duration=20),
+        Scenario("pdf_download", "Скачивание PDF резюме", pdf, concurrency=16, duration=20),
+    )}
+
+
+class ResourceSampler(threading.Thread):
+    """
+    Фоновый замер CPU и памяти сервиса по /proc
+
+    Учитываются процесс run.py и его дочерние процессы: при SERVER_WORKERS > 1
+    запросы обрабатывают воркеры, а главный процесс только ждет их. CPU
+    суммируется по приросту каждого процесса с момента его появления в замере,
+    поэтому перезапущенные воркеры не искажают результат. На системах без
+    /proc замер не выполняется, и в отчете ресурсы не указываются.
+    """
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def _stat(self, pid: int):
+        """Поля /proc/<pid>/stat после имени процесса"""
+        with open(f"/proc/{pid}/stat") as file:
+            return file.read().rsplit(")", 1)[1].split()
+
+    def _children(self):
+        """Идентификаторы дочерних процессов run.py"""
+        children = []
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                if int(self._stat(int(entry))[1]) == self.pid:  # ppid
+                    children.append(int(entry))
+            except (OSError, ValueError, IndexError):
+                continue
+        return children
+
+    def _read_process(self, pid: int):
+        fields = self._stat(pid)
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._ticks  # utime + stime
+        threads = int(fields[17])
+        rss_kb = 0
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    rss_kb = int(line.split()[1])
+                    break
+        return cpu_seconds, rss_kb / 1024, threads
+
+    def _read(self):
+        """Замер: (время, {pid: CPU в секундах}, суммарный RSS в МБ, суммарное число потоков)"""
+        cpu, rss_mb, threads = {}, 0.0, 0
+        for pid in [self.pid] + self._children():
+            try:
+                cpu[pid], process_rss, process_threads = self._read_process(pid)
+            except (OSError, ValueError, IndexError):
+                # Воркер завершился между перечислением и чтением
+                if pid == self.pid:
+                    raise
+                continue
+            rss_mb += process_rss
+            threads += process_threads
+        return time.monotonic(), cpu, rss_mb, threads
+
+    def run(self):
+        if not self.pid or not os.path.exists(f"/proc/{self.pid}"):
+            return
+        while not self._stop_event.is_set():
+            try:
+                self.samples.append(self._read())
+            except (OSError, ValueError, IndexError):
+                return
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        if len(self.samples) < 2:
+            return None
+        elapsed = self.samples[-1][0] - self.samples[0][0]
+        # Прирост CPU каждого процесса между первым и последним замером, в которых он был
+        first_cpu, last_cpu = {}, {}
+        for _, cpu, _, _ in self.samples:
+            for pid, seconds in cpu.items():
+                first_cpu.setdefault(pid, seconds)
+                last_cpu[pid] = seconds
+        cpu_seconds = sum(last_cpu[pid] - first_cpu[pid] for pid in last_cpu)
+        return {
+            "cpu_percent": round(cpu_seconds / elapsed * 100, 1) if elapsed else 0.0,
+            "rss_mb_max": round(max(sample[2] for sample in self.samples), 1),
+            "threads_max": max(sample[3] for sample in self.samples),
+            "processes_max": max(len(sample[1]) for sample in self.samples)
+        }
+
+
+def percentile(values: List[float], share: float):
+    """Процентиль по методу ближайшего ранга"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(share * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(base_url: str, scenario: Scenario, concurrency: int, duration: float,
+                       max_requests: Optional[int], timeout: float, server_pid: Optional[int]):
+    """
+    Выполняет сценарий в замкнутом цикле: concurrency клиентов отправляют
+    запросы друг за другом, пока не истечет duration секунд или не будет
+    отправлено max_requests запросов
+
+    :return: Словарь с задержками, пропускной способностью, ошибками и ресурсами
+    """
+    latencies, statuses = [], {}
+    counter = iter(range(max_requests if max_requests else sys.maxsize))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        sampler = ResourceSampler(server_pid)
+        sampler.start()
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def worker():
+            for i in counter:
+                if time.perf_counter() >= deadline:
+                    return
+                request_started = time.perf_counter()
+                try:
+                    response = await scenario.request(client, i)
+                    status = str(response.status_code)
+                except httpx.TimeoutException:
+                    status = "timeout"
+                except httpx.HTTPError:
+                    status = "connection_error"
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        resources = sampler.stop()
+
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "p50": _round(percentile(latencies, 0.50)),
+            "p95": _round(percentile(latencies, 0.95)),
+            "p99": _round(percentile(latencies, 0.99)),
+            "max": _round(max(latencies) if latencies else None),
+            "mean": _round(sum(latencies) / len(latencies) if latencies else None)
+        },
+        "resources": resources
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60):
+    """Ждет, пока запущенный процесс начнет отвечать 200 на url"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Процесс {' '.join(process.args)} завершился с кодом {process.returncode}")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"{url} не ответил за {timeout:.0f} с")
+
+
+def spawn_stack(base_url: str, emulator_args: List[str]):
+    """
+    Запускает эмулятор LLM и run.py
+
+    :return: (процесс эмулятора, процесс сервиса)
+    """
+    url = httpx.URL(base_url)
+    emulator = subprocess.Popen(
+        [sys.executable, "-m", "stubs.llm_emulator", "--port", str(EMULATOR_PORT)] + emulator_args,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    env = dict(os.environ,
+               LLM_API_URL=f"http://127.0.0.1:{EMULATOR_PORT}/v1/chat/completions",
+               LLM_API_KEY=os.getenv("LLM_API_KEY", "loadtest"),
+               SERVER_HOST=url.host, SERVER_PORT=str(url.port or 80))
+    server = subprocess.Popen([sys.executable, "run.py"], env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(f"http://127.0.0.1:{EMULATOR_PORT}/emulator/config", emulator)
+        # /ready отвечает 200 только после прогрева и загрузки индексов навыков воркера
+        wait_until_ready(f"{base_url}/ready", server)
+    except Exception:
+        stop_processes(emulator, server)
+        raise
+    return emulator, server
+
+
+def stop_processes(*processes):
+    for process in processes:
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def print_results(data):
+    table = Table(title=f"Нагрузочные сценарии (commit {data.get('commit') or '—'})")
+    table.add_column("Сценарий")
+    table.add_column("Клиентов", justify="right")
+    table.add_column("Запросов", justify="right")
+    table.add_column("RPS", justify="right")
+    table.add_column("p50, мс", justify="right")
+    table.add_column("p95, мс", justify="right")
+    table.add_column("p99, мс", justify="right")
+    table.add_column("Ошибки", justify="right")
+    table.add_column("CPU, %", justify="right")
+    table.add_column("RSS, МБ", justify="right")
+    for name, result in data["scenarios"].items():
+        latency = result["latency_ms"]
+        resources = result.get("resources") or {}
+        table.add_row(
+            escape(name), str(result["concurrency"]), str(result["requests"]), f"{result['throughput_rps']:.1f}",
+            _format(latency["p50"]), _format(latency["p95"]), _format(latency["p99"]),
+            f"{result['error_rate']:.1%}",
+            _format(resources.get("cpu_percent")), _format(resources.get("rss_mb_max"))
+        )
+    console.print(table)
+    for name, result in data["scenarios"].items():
+        console.print(f"  {escape(name)}: коды ответов {result['statuses']}")
+
+
+def _format(value):
+    return "—" if value is None else f"{value:.1f}"
+
+
+def compare(baseline, current, threshold: float):
+    """
+    Сравнивает сценарии с базовым запуском по p95, пропускной способности и доле ошибок
+
+    :param threshold: Допустимое относительное ухудшение (0.2 — 20%)
+    :return: Список сценариев, ухудшившихся больше порога
+    """
+    table = Table(title=f"Сравнение с базовым запуском (commit {baseline.get('commit') or '—'}, "
+                        f"порог {threshold:.0%})")
+    table.add_column("Сценарий")
+    table.add_column("p95, мс", justify="right")
+    table.add_column("RPS", justify="right")
+    table.add_column("Ошибки", justify="right")
+    table.add_column("Статус")
+
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            table.add_row(escape(name), _format(result["latency_ms"]["p95"]), f"{result['throughput_rps']:.1f}",
+                          f"{result['error_rate']:.1%}", "новый")
+            continue
+        base_p95, p95 = base["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        slower = bool(base_p95 and p95 and p95 > base_p95 * (1 + threshold))
+        fewer = result["throughput_rps"] < base["throughput_rps"] / (1 + threshold)
+        more_errors = result["error_rate"] > base["error_rate"] + 0.01
+        if slower or fewer or more_errors:
+            regressions.append(name)
+        table.add_row(
+            escape(name),
+            f"{_format(base_p95)} → {_format(p95)}",
+            f"{base['throughput_rps']:.1f} → {result['throughput_rps']:.1f}",
+            f"{base['error_rate']:.1%} → {result['error_rate']:.1%}",
+            "[red]ухудшение[/red]" if name in regressions else "без ухудшений"
+        )
+
+    console.print(table)
+    if baseline.get("settings") != current.get("settings"):
+        console.print("[yellow]ВНИМАНИЕ: базовый запуск выполнен с другими параметрами нагрузки[/yellow]")
+    return regressions
+
+
+def load_results(path: str):
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    if data.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"Неподдерживаемый формат файла результатов: {path}")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочные сценарии сервиса")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Адрес сервиса")
+    parser.add_argument("--spawn", action="store_true",
+                        help="Запустить эмулятор LLM и run.py на время прогона")
+    parser.add_argument("--emulator-args", default="--latency lognormal --median 1.0 --sigma 0.4",
+                        help="Параметры эмулятора LLM для --spawn")
+    parser.add_argument("--server-pid", type=int, help="PID процесса сервиса для замера ресурсов")
+    parser.add_argument("--scenario", action="append", help="Запустить только указанные сценарии")
+    parser.add_argument("--concurrency", type=int, help="Количество клиентов (по умолчанию — свое для сценария)")
+    parser.add_argument("--duration", type=float, help="Длительность сценария в секундах")
+    parser.add_argument("--requests", type=int, help="Максимальное количество запросов в сценарии")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Таймаут запроса в секундах")
+    parser.add_argument("--resumes", type=int, default=200, help="Количество синтетических резюме")
+    parser.add_argument("--vacancies", type=int, default=10_000, help="Количество синтетических вакансий")
+    parser.add_argument("--no-seed", action="store_true", help="Не наполнять базу (данные уже созданы с тем же зерном)")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора данных")
+    parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+    parser.add_argument("--compare", metavar="BASELINE", help="Сравнить с сохраненными результатами")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Допустимое относительное ухудшение для режима сравнения")
+    args = parser.parse_args()
+
+    with open(RESUME_PDF, "rb") as file:
+        pdf_content = file.read()
+
+    ids = seed_ids(args.seed, args.resumes, args.vacancies)
+    scenarios = build_scenarios(ids, pdf_content)
+    selected = args.scenario or list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        parser.error(f"Неизвестные сценарии: {', '.join(unknown)}; доступны: {', '.join(scenarios)}")
+
+    if not args.no_seed:
+        seed_database(ids, args.seed, pdf_content)
+
+    emulator = server = None
+    server_pid = args.server_pid
+    if args.spawn:
+        console.print("Запуск эмулятора LLM и сервиса...")
+        emulator, server = spawn_stack(args.base_url, args.emulator_args.split())
+        server_pid = server.pid
+
+    results = {}
+    try:
+        for name in selected:
+            scenario = scenarios[name]
+            concurrency = args.concurrency or scenario.concurrency
+            duration = args.duration or scenario.duration
+            console.rule(f"{escape(name)}: {scenario.description}, {concurrency} клиентов, {duration:.0f} с")
+            results[name] = asyncio.run(run_scenario(args.base_url, scenario, concurrency, duration,
+                                                     args.requests, args.timeout, server_pid))
+    finally:
+        stop_processes(server, emulator)
+
+    current = {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "seed": args.seed, "resumes": args.resumes, "vacancies": args.vacancies,
+            "concurrency": args.concurrency, "duration": args.duration, "requests": args.requests,
+            "emulator": args.emulator_args if args.spawn else None
+        },
+        "scenarios": results
+    }
+    print_results(current)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+        console.print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        regressions = compare(load_results(args.compare), current, args.threshold)
+        if regressions:
+            console.print(f"[red]Ухудшились сценарии: {escape(', '.join(regressions))}[/red]")
+            sys.exit(1)
+        console.print("[green]Ухудшений относительно базового запуска нет[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Набор микробенчмарков горячих участков сопоставления, разбора вакансий и извлечения PDF
+
+Покрывает ResumeVacancyMatcher.extract_skills и preprocess_for_tfidf,
+VacancyParser._normalize_skills и разбор строки зарплаты, PDFExtractor на
+ivanov_resume.pdf. Тексты генерируются benchmarks.corpus с фиксированным
+зерном. Результаты сохраняются в JSON; режим сравнения отмечает замедления
+относительно сохраненного базового запуска.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.microbench --output baseline.json
+    python -m benchmarks.microbench --compare baseline.json --threshold 0.1
+    python -m benchmarks.microbench --compare baseline.json --input results.json
+    python -m benchmarks.microbench --quick --filter parser
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from benchmarks.corpus import DOCUMENT_SIZES, RESUME_PDF, SALARY_SAMPLES, generate_corpus, generate_skill_tags
+from src.services.matcher import ResumeVacancyMatcher
+from src.services.vacancy_parser import VacancyParser
+from src.utils.pdf_extractor import PDFExtractor
+
+console = Console()
+
+# Версия формата файла результатов
+RESULTS_FORMAT = 1
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def build_cases(seed: int, sizes: Dict[str, int]) -> List[Case]:
+    """Создает список бенчмарков (имя, функция без аргументов)"""
+    rng = random.Random(seed)
+    corpus = generate_corpus(seed, sizes)
+    # Адрес LLM не используется: бенчмарки не обращаются к языковой модели
+    matcher = ResumeVacancyMatcher(llm_api_url="http://localhost", llm_api_key="benchmark")
+    parser = VacancyParser()
+
+    cases: List[Case] = []
+    for size, text in corpus["resume"].items():
+        cases.append((f"matcher.extract_skills[resume-{size}]", lambda text=text: matcher.extract_skills(text)))
+    for size, text in corpus["vacancy"].items():
+        cases.append((f"matcher.extract_skills[vacancy-{size}]", lambda text=text: matcher.extract_skills(text)))
+    for size, text in corpus["resume"].items():
+        cases.append((f"matcher.preprocess_for_tfidf[resume-{size}]",
+                      lambda text=text: matcher.preprocess_for_tfidf(text)))
+
+    for count in (10, 50, 200):
+        tags = generate_skill_tags(count, parser.common_skills, rng)
+        cases.append((f"parser._normalize_skills[{count}-tags]", lambda tags=tags: parser._normalize_skills(tags)))
+    for size, text in corpus["vacancy"].items():
+        cases.append((f"parser._extract_skills_from_description[{size}]",
+                      lambda text=text: parser._extract_skills_from_description(text)))
+    cases.append(("parser._parse_salary[samples]",
+                  lambda: [parser._parse_salary(sample) for sample in SALARY_SAMPLES]))
+
+    if os.path.exists(RESUME_PDF):
+        with open(RESUME_PDF, "rb") as file:
+            pdf_bytes = file.read()
+        cases.append(("pdf.extract_text_from_file[ivanov_resume]",
+                      lambda: PDFExtractor.extract_text_from_file(RESUME_PDF)))
+        cases.append(("pdf.extract_text_from_bytes[ivanov_resume]",
+                      lambda: PDFExtractor.extract_text_from_bytes(pdf_bytes)))
+        cases.append(("pdf.get_metadata[ivanov_resume]", lambda: PDFExtractor.get_metadata(pdf_bytes)))
+    else:
+        console.print(f"[yellow]Файл {RESUME_PDF} не найден, бенчмарки PDF пропущены[/yellow]")
+
+    return cases
+
+
+def measure(function: Callable[[], object], min_time: float, repeats: int):
+    """
+    Измеряет время вызова
+
+    Количество вызовов в серии подбирается так, чтобы серия длилась не меньше
+    min_time секунд; результат — время одного вызова в каждой из repeats серий.
+
+    :return: Словарь с минимальным, медианным и средним временем вызова в микросекундах
+    """
+    function()  # прогрев: кеши, ленивые индексы, компиляция регулярных выражений
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        timings.append((time.perf_counter() - started) / loops * 1_000_000)
+
+    return {
+        "min_us": round(min(timings), 3),
+        "median_us": round(statistics.median(timings), 3),
+        "mean_us": round(statistics.fmean(timings), 3),
+        "stdev_us": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        "loops": loops,
+        "repeats": repeats
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(name_filter: Optional[str], min_time: float, repeats: int, seed: int, sizes: Dict[str, int]):
+    """Выполняет бенчмарки и возвращает результаты в формате файла результатов"""
+    results = {}
+    for name, function in build_cases(seed, sizes):
+        if name_filter and name_filter not in name:
+            continue
+        console.print(f"  {escape(name)}...", end="")
+        results[name] = measure(function, min_time, repeats)
+        console.print(f" {results[name]['median_us']:.1f} мкс")
+
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": sizes,
+        "filter": name_filter,
+        "results": results
+    }
+
+
+def print_results(data):
+    table = Table(title=f"Микробенчмарки (commit {data.get('commit') or '—'}, Python {data.get('python')})")
+    table.add_column("Бенчмарк", overflow="fold")
+    table.add_column("Медиана, мкс", justify="right")
+    table.add_column("Мин., мкс", justify="right")
+    table.add_column("Откл., мкс", justify="right")
+    table.add_column("Вызовов × серий", justify="right")
+    for name, result in data["results"].items():
+        table.add_row(escape(name), f"{result['median_us']:.1f}", f"{result['min_us']:.1f}",
+                      f"{result['stdev_us']:.1f}", f"{result['loops']} × {result['repeats']}")
+    console.print(table)
+
+
+def compare(baseline, current, threshold: float):
+    """
+    Сравнивает результаты с базовым запуском по медианному времени
+
+    :param threshold: Допустимое относительное замедление (0.1 — 10%)
+    :return: Список имен бенчмарков, замедлившихся больше порога
+    """
+    table = Table(title=f"Сравнение с базовым запуском (commit {baseline.get('commit') or '—'}, "
+                        f"порог {threshold:.0%})")
+    table.add_column("Бенчмарк", overflow="fold")
+    table.add_column("Было, мкс", justify="right")
+    table.add_column("Стало, мкс", justify="right")
+    table.add_column("Изменение", justify="right")
+    table.add_column("Статус")
+
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            table.add_row(escape(name), "—", f"{result['median_us']:.1f}", "—", "новый")
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else 1.0
+        change = f"{(ratio - 1) * 100:+.1f}%"
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            status = "[red]замедление[/red]"
+        elif ratio < 1 / (1 + threshold):
+            status = "[green]ускорение[/green]"
+        else:
+            status = "без изменений"
+        table.add_row(escape(name), f"{base['median_us']:.1f}", f"{result['median_us']:.1f}", change, status)
+
+    # Бенчмарки, отсеянные фильтром текущего запуска, не считаются отсутствующими
+    name_filter = current.get("filter")
+    for name in baseline["results"]:
+        if name not in current["results"] and (not name_filter or name_filter in name):
+            table.add_row(escape(name), f"{baseline['results'][name]['median_us']:.1f}", "—", "—", "отсутствует")
+
+    console.print(table)
+    if baseline.get("sizes") != current.get("sizes") or baseline.get("seed") != current.get("seed"):
+        console.print("[yellow]ВНИМАНИЕ: корпус базового запуска сгенерирован с другими параметрами[/yellow]")
+    return regressions
+
+
+def load_results(path: str):
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    if data.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"Неподдерживаемый формат файла результатов: {path}")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарки горячих участков сервиса")
+    parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+    parser.add_argument("--compare", metavar="BASELINE", help="Сравнить с сохраненными результатами")
+    parser.add_argument("--input", help="Сравнить сохраненные результаты вместо запуска бенчмарков")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Допустимое относительное замедление для режима сравнения")
+    parser.add_argument("--filter", help="Запускать только бенчмарки, в имени которых есть подстрока")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Минимальная длительность серии в секундах")
+    parser.add_argument("--repeats", type=int, default=5, help="Количество серий")
+    parser.add_argument("--quick", action="store_true", help="Быстрый прогон: короткие серии, без больших документов")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора корпуса")
+    args = parser.parse_args()
+
+    sizes = dict(DOCUMENT_SIZES)
+    min_time, repeats = args.min_time, args.repeats
+    if args.quick:
+        sizes.pop("large")
+        min_time, repeats = 0.05, 3
+
+    if args.input:
+        current = load_results(args.input)
+    else:
+        console.rule("Запуск микробенчмарков")
+        current = run_suite(args.filter, min_time, repeats, args.seed, sizes)
+        print_results(current)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+        console.print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        regressions = compare(load_results(args.compare), current, args.threshold)
+        if regressions:
+            console.print(f"[red]Замедлились бенчмарки: {escape(', '.join(regressions))}[/red]")
+            sys.exit(1)
+        console.print("[green]Замедлений относительно базового запуска нет[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Бенчмарк сериализации больших списков (/api/vacancies, /api/.../matches)
+
+Сравнивает прежний путь (словарь строки → модель Pydantic через .get() →
+jsonable_encoder → json.dumps, как JSONResponse FastAPI) с быстрым путем
+src.utils.fast_json (строки базы данных сразу в байты через orjson или json)
+и измеряет сжатие ответа gzip и brotli.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.serialization_benchmark --rows 10000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from rich.console import Console
+from rich.table import Table
+
+from src.models.schemas import ResumeVacancyMatchResponse, Vacancy
+from src.utils import fast_json
+
+console = Console()
+
+SKILLS = ["Python", "Java", "PostgreSQL", "Docker", "Kubernetes", "React", "FastAPI", "Kafka", "Redis", "Go",
+          "Spring Boot", "TypeScript", "Linux", "Git", "CI/CD", "gRPC"]
+TITLES = ["Python-разработчик", "Java-разработчик", "Frontend-разработчик", "DevOps-инженер", "Data Engineer"]
+COMPANIES = ["Ромашка", "Технологии будущего", "Финтех Лаб", "Логистика Онлайн", "Медиа Групп"]
+FILLER = ("Мы ищем разработчика в команду платформы. Предстоит проектировать сервисы, "
+          "участвовать в код-ревью и улучшать производительность. ")
+
+
+def generate_vacancies(count: int, rng: random.Random):
+    """Строки вакансий в том виде, в каком их возвращает get_vacancies_for_response"""
+    started = datetime(2026, 1, 1)
+    return [{
+        "id": f"{index:08d}-0000-4000-8000-000000000000",
+        "title": rng.choice(TITLES),
+        "company": rng.choice(COMPANIES),
+        "description": FILLER * rng.randint(3, 10),
+        "salary_from": rng.choice([None, 100000, 150000, 200000]),
+        "salary_to": rng.choice([None, 250000, 300000]),
+        "currency": "RUR",
+        "experience": "От 1 года до 3 лет",
+        "skills": rng.sample(SKILLS, rng.randint(3, 8)),
+        "url": f"https://hh.ru/vacancy/{100000 + index}",
+        "created_at": started + timedelta(minutes=index)
+    } for index in range(count)]
+
+
+def generate_matches(count: int, rng: random.Random):
+    """Строки сопоставлений в том виде, в каком их возвращает get_resume_matches_for_response"""
+    return [{
+        "resume_id": "00000000-0000-4000-8000-000000000001",
+        "vacancy_id": f"{index:08d}-0000-4000-8000-000000000000",
+        "matched_skills": rng.sample(SKILLS, 4),
+        "unmatched_skills": rng.sample(SKILLS, 2),
+        "llm_comment": "Кандидат подходит по основному стеку, но нет опыта с Kafka. " * 2,
+        "score": round(rng.random(), 2),
+        "positives": ["Опыт с Python", "Знание PostgreSQL"],
+        "negatives": ["Нет опыта с Kafka"],
+        "verdict": rng.choice(["подходит", "частично подходит", "не подходит"]),
+        "status": "success",
+        "message": "Сопоставление выполнено успешно"
+    } for index in range(count)]
+
+
+def legacy_vacancies(rows):
+    """Прежний путь /api/vacancies: модель Vacancy для каждой строки и jsonable_encoder"""
+    models = [Vacancy(
+        id=row.get("id"),
+        title=row.get("title"),
+        company=row.get("company"),
+        description=row.get("description"),
+        salary_from=row.get("salary_from"),
+        salary_to=row.get("salary_to"),
+        currency=row.get("currency"),
+        experience=row.get("experience"),
+        skills=row.get("skills", []),
+        url=row.get("url"),
+        # Модель ожидает строку: datetime из базы данных приводится заранее
+        created_at=row["created_at"].isoformat()
+    ) for row in [dict(row) for row in rows]]
+    return _legacy_render(models)
+
+
+def legacy_matches(rows):
+    """Прежний путь /api/.../matches: модель ResumeVacancyMatchResponse для каждой строки"""
+    models = [ResumeVacancyMatchResponse(
+        resume_id=row.get("resume_id"),
+        vacancy_id=row.get("vacancy_id"),
+        matched_skills=row.get("matched_skills", []),
+        unmatched_skills=row.get("unmatched_skills", []),
+        llm_comment=row.get("llm_comment", ""),
+        score=row.get("score", 0.5),
+        positives=row.get("positives", []),
+        negatives=row.get("negatives", []),
+        verdict=row.get("verdict", "")
+    ) for row in [dict(row) for row in rows]]
+    return _legacy_render(models)
+
+
+def _legacy_render(models):
+    # Так сериализует ответ JSONResponse FastAPI
+    return json.dumps(jsonable_encoder(models), ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_dumps(rows):
+    """Быстрый путь без orjson (откат, если пакет не установлен)"""
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":"), default=fast_json._default).encode("utf-8")
+
+
+def timed(function, repeats: int):
+    """Возвращает результат и лучшее время вызова в миллисекундах"""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации больших списков")
+    parser.add_argument("--rows", type=int, default=10000, help="Количество строк в ответе")
+    parser.add_argument("--repeats", type=int, default=5, help="Количество повторов (берется лучшее время)")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    datasets = (
+        ("/api/vacancies", generate_vacancies(args.rows, rng), legacy_vacancies),
+        ("/api/.../matches", generate_matches(args.rows, rng), legacy_matches),
+    )
+
+    if fast_json.orjson is None:
+        console.print("[yellow]orjson не установлен: быстрый путь использует json[/yellow]")
+
+    table = Table(title=f"Сериализация ответа из {args.rows} строк")
+    table.add_column("Ответ")
+    table.add_column("Способ")
+    table.add_column("Время, мс", justify="right")
+    table.add_column("Ускорение", justify="right")
+    table.add_column("Размер, КБ", justify="right")
+    table.add_column("Совпадает")
+
+    for name, rows, legacy in datasets:
+        expected, legacy_time = timed(lambda: legacy(rows), args.repeats)
+        expected_data = json.loads(expected)
+        table.add_row(name, "модели Pydantic + jsonable_encoder", f"{legacy_time:.1f}", "1.0x",
+                      f"{len(expected) / 1024:.0f}", "да")
+
+        variants = [("json без моделей", lambda: stdlib_dumps(rows))]
+        if fast_json.orjson is not None:
+            variants.append(("orjson без моделей", lambda: fast_json.dumps(rows)))
+        body = expected
+        for label, function in variants:
+            body, elapsed = timed(function, args.repeats)
+            identical = json.loads(body) == expected_data
+            table.add_row(name, label, f"{elapsed:.1f}", f"{legacy_time / elapsed:.1f}x",
+                          f"{len(body) / 1024:.0f}", "да" if identical else "[red]нет[/red]")
+
+        for encoding in fast_json.available_encodings():
+            compressed, elapsed = timed(lambda: fast_json.compress(body, encoding), args.repeats)
+            table.add_row(name, f"+ сжатие {encoding}", f"{elapsed:.1f}", "",
+                          f"{len(compressed) / 1024:.0f}", "")
+        table.add_section()
+
+    console.print(table)
+    if fast_json.brotli is None:
+        console.print("brotli не установлен (pip install brotli): сжатие только gzip")
+
+
+if __name__ == "__main__":
+    main()
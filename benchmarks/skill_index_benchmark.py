@@ -0,0 +1,84 @@
+"""
+Бенчмарк поиска по инвертированному индексу навыков (SkillIndex)
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.skill_index_benchmark --documents 300000 --queries 200
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from itertools import chain
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.skill_matrix_benchmark import generate_skill_sets
+from src.models.constants import TERM_NORMALIZER
+from src.services.skill_index import SkillIndex
+
+console = Console()
+
+
+def counter_at_least(index: SkillIndex, skills, k: int, limit: int):
+    """Базовый вариант: подсчет совпадений Counter по всем спискам документов под блокировкой"""
+    with index._lock:
+        counts = Counter(chain.from_iterable(index._collect_postings(skills)))
+        ranked = sorted(((doc_number, count) for doc_number, count in counts.items() if count >= k),
+                        key=lambda item: (-item[1], item[0]))
+        return len(ranked), [(index._doc_ids[doc_number], count) for doc_number, count in ranked[:limit]]
+
+
+def measure(function, queries, k: int, limit: int):
+    """Время выполнения всех запросов в секундах"""
+    started = time.perf_counter()
+    for skills in queries:
+        function(skills, k, limit)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска по индексу навыков")
+    parser.add_argument("--documents", type=int, default=300_000, help="Количество документов в индексе")
+    parser.add_argument("--queries", type=int, default=200, help="Количество поисковых запросов")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3], help="Минимальное количество совпавших навыков")
+    parser.add_argument("--limit", type=int, default=100, help="Количество возвращаемых результатов")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = sorted(set(TERM_NORMALIZER.values()))
+
+    console.rule("Построение индекса")
+    index = SkillIndex()
+    started = time.perf_counter()
+    for number, skills in enumerate(generate_skill_sets(args.documents, vocabulary, 5, 30, rng)):
+        index.add(f"resume-{number}", skills)
+    build_time = time.perf_counter() - started
+    queries = generate_skill_sets(args.queries, vocabulary, 3, 15, rng)
+
+    # Результаты обоих вариантов должны совпадать
+    for skills in queries[:10]:
+        for k in args.k:
+            assert index.search_at_least(skills, k, args.limit) == counter_at_least(index, skills, k, args.limit)
+
+    stats = index.stats()
+    table = Table(title=f"{args.documents} документов, {stats['postings']:,} записей, {args.queries} запросов, "
+                        f"top-{args.limit}")
+    table.add_column("k", justify="right")
+    table.add_column("Counter, мс на запрос", justify="right")
+    table.add_column("numpy, мс на запрос", justify="right")
+    table.add_column("Ускорение", justify="right")
+    for k in args.k:
+        baseline = measure(lambda skills, k, limit: counter_at_least(index, skills, k, limit), queries, k, args.limit)
+        optimized = measure(index.search_at_least, queries, k, args.limit)
+        table.add_row(str(k), f"{baseline / args.queries * 1000:.2f}", f"{optimized / args.queries * 1000:.2f}",
+                      f"{baseline / optimized:.1f}×")
+
+    console.print(f"Построение индекса: {build_time:.2f} с")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Бенчмарк векторного сопоставления навыков (SkillMatrix)
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.skill_matrix_benchmark --resumes 100000 --vacancies 1000
+"""
+import argparse
+import random
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from src.models.constants import TERM_NORMALIZER
+from src.services.skill_matrix import SkillMatrix
+
+console = Console()
+
+
+def generate_skill_sets(count: int, vocabulary, min_skills: int, max_skills: int, rng: random.Random):
+    """Генерирует случайные наборы навыков"""
+    return [rng.sample(vocabulary, rng.randint(min_skills, max_skills)) for _ in range(count)]
+
+
+def pairwise_sets(vacancy_sets, resume_sets):
+    """Базовый вариант: попарное сравнение множеств строк, как в ResumeVacancyMatcher.match"""
+    for vacancy_skills in vacancy_sets:
+        vacancy_set = set(vacancy_skills)
+        for resume_skills in resume_sets:
+            overlap = len(vacancy_set & set(resume_skills))
+            _ = overlap / len(vacancy_set)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк векторного сопоставления навыков")
+    parser.add_argument("--resumes", type=int, default=100_000, help="Количество резюме")
+    parser.add_argument("--vacancies", type=int, default=1_000, help="Количество вакансий")
+    parser.add_argument("--baseline-vacancies", type=int, default=5,
+                        help="Количество вакансий для замера попарного сравнения множеств")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = sorted(set(TERM_NORMALIZER.values()))
+
+    console.rule("Генерация данных")
+    resume_sets = generate_skill_sets(args.resumes, vocabulary, 5, 30, rng)
+    vacancy_sets = generate_skill_sets(args.vacancies, vocabulary, 3, 15, rng)
+
+    matrix = SkillMatrix(initial_capacity=args.resumes)
+    started = time.perf_counter()
+    for number, skills in enumerate(resume_sets):
+        matrix.add(f"resume-{number}", skills)
+    build_time = time.perf_counter() - started
+
+    console.rule("Сопоставление")
+    started = time.perf_counter()
+    for vacancy_skills in vacancy_sets:
+        matrix.score(vacancy_skills)
+    score_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for vacancy_skills in vacancy_sets:
+        matrix.top(vacancy_skills, limit=100)
+    top_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix.score_many(vacancy_sets[:100])
+    batch_time = time.perf_counter() - started
+
+    baseline_vacancies = vacancy_sets[:args.baseline_vacancies]
+    started = time.perf_counter()
+    pairwise_sets(baseline_vacancies, resume_sets)
+    baseline_time = time.perf_counter() - started
+
+    pairs = args.resumes * args.vacancies
+    baseline_pairs = args.resumes * len(baseline_vacancies)
+
+    table = Table(title=f"{args.resumes} резюме × {args.vacancies} вакансий, {len(vocabulary)} навыков")
+    table.add_column("Операция")
+    table.add_column("Время, с", justify="right")
+    table.add_column("Пар/с", justify="right")
+    table.add_column("мс на вакансию", justify="right")
+
+    table.add_row("Построение матрицы", f"{build_time:.2f}", "-", "-")
+    table.add_row("score (все метрики)", f"{score_time:.2f}", f"{pairs / score_time:,.0f}",
+                  f"{score_time / args.vacancies * 1000:.2f}")
+    table.add_row("top-100", f"{top_time:.2f}", f"{pairs / top_time:,.0f}",
+                  f"{top_time / args.vacancies * 1000:.2f}")
+    table.add_row("score_many (100 вакансий)", f"{batch_time:.2f}", f"{args.resumes * 100 / batch_time:,.0f}",
+                  f"{batch_time / 100 * 1000:.2f}")
+    table.add_row(f"Попарно, set ({len(baseline_vacancies)} вакансий)", f"{baseline_time:.2f}",
+                  f"{baseline_pairs / baseline_time:,.0f}",
+                  f"{baseline_time / max(len(baseline_vacancies), 1) * 1000:.2f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Бенчмарк разбора HTML страниц вакансий (VacancyParser.parse_html)
+
+Сравнивает полный разбор (html.parser, все дерево) и быстрый режим
+(lxml и только узлы вакансии): время разбора одной страницы, пиковую
+память и совпадение извлеченных данных.
+
+Запуск из корня репозитория на сохраненных страницах hh.ru:
+
+    python -m benchmarks.vacancy_html_benchmark --pages saved_pages/
+
+Без --pages страницы генерируются по образцу разметки hh.ru.
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from src.services.vacancy_parser import VacancyParser, FAST_PARSER_FEATURES
+
+console = Console()
+
+SKILLS = [
+    "Java", "Spring Boot", "PostgreSQL", "Kafka", "Docker", "Kubernetes", "Python", "Django",
+    "Redis", "Git", "Linux", "REST API", "React", "TypeScript", "Go", "gRPC", "ClickHouse"
+]
+
+SALARIES = [
+    "от 200 000 до 300 000 ₽ на руки", "до 450 000 ₽ до вычета налогов", "от 3 000 $ на руки",
+    "150 000 – 220 000 ₽ за месяц, на руки", "з/п не указана"
+]
+
+
+def generate_page(rng: random.Random, related: int = 40):
+    """
+    Генерирует страницу вакансии, похожую на hh.ru по структуре и объему:
+    большой head со скриптами и состоянием приложения, меню, описание
+    вакансии и блок похожих вакансий
+    """
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    state = ",".join(f'"k{i}":"{"x" * rng.randint(20, 80)}"' for i in range(2000))
+    scripts = "".join(
+        f"<script>window.__chunk{i}=function(a,b){{return a+b+{i};}};</script>" for i in range(60)
+    )
+    menu = "".join(
+        f'<li class="supernova-navi-item"><a class="supernova-link" href="/section/{i}">Раздел {i}</a></li>'
+        for i in range(80)
+    )
+    paragraphs = "".join(
+        f"<p>Задача {i}: разработка и поддержка сервисов на {rng.choice(skills)}, "
+        f"участие в проектировании &amp; код-ревью.</p>"
+        for i in range(rng.randint(10, 30))
+    )
+    requirements = "".join(f"<li>Опыт работы с {skill}</li>" for skill in skills)
+    footer = '<a href="/about">О компании</a>' * 50
+    tags = "".join(
+        f'<li class="bloko-tag"><span data-qa="bloko-tag__text">{skill}</span></li>' for skill in skills
+    )
+    cards = "".join(
+        f'<div class="vacancy-serp-item"><h3><a class="serp-item__title" href="/vacancy/{rng.randint(10**7, 10**8)}">'
+        f"Похожая вакансия {i}</a></h3><div class=\"vacancy-serp-item__meta\">"
+        f"<span>Компания {i}</span><span>{rng.choice(SALARIES)}</span></div>"
+        f"<p>{'Описание похожей вакансии. ' * 10}</p></div>"
+        for i in range(related)
+    )
+
+    return (
+        "<!DOCTYPE html><html lang=\"ru\"><head><meta charset=\"utf-8\"><title>Вакансия</title>"
+        f"{scripts}<script>window.__INITIAL_STATE__={{{state}}};</script></head><body>"
+        f"<header><nav><ul>{menu}</ul></nav></header><main><div class=\"vacancy-title\">"
+        f"<h1 class=\"bloko-header-section-1\" data-qa=\"vacancy-title\">Разработчик {skills[0]}</h1>"
+        f"<div data-qa=\"vacancy-salary\"><span>{rng.choice(SALARIES)}</span></div></div>"
+        f"<div class=\"vacancy-company\"><a class=\"bloko-link\" href=\"/employer/{rng.randint(1, 10**6)}\">"
+        f"<span data-qa=\"bloko-header-2\">ООО Компания {rng.randint(1, 1000)}</span></a></div>"
+        f"<p class=\"vacancy-description-list-item\">Требуемый опыт работы: "
+        f"<span data-qa=\"vacancy-experience\">{rng.choice(['1–3 года', '3–6 лет', 'более 6 лет'])}</span></p>"
+        f"<div class=\"g-user-content\" data-qa=\"vacancy-description\">{paragraphs}"
+        f"<p><strong>Требования:</strong></p><ul>{requirements}</ul></div>"
+        f"<div class=\"vacancy-section\"><h2>Ключевые навыки</h2><ul class=\"bloko-tag-list\">{tags}</ul></div>"
+        f"</main><aside class=\"related-vacancies\">{cards}</aside>"
+        f"<footer>{footer}</footer></body></html>"
+    )
+
+
+def measure(parser: VacancyParser, html: str, url: str, repeats: int):
+    """
+    Измеряет время разбора (медиана) и пиковую память одного разбора
+
+    :return: Кортеж (результат, миллисекунды, пиковая память в МБ)
+    """
+    timings = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = parser.parse_html(html, url)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    parser.parse_html(html, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result.pop("id")
+    return result, statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк разбора HTML страниц вакансий")
+    parser.add_argument("--pages", type=Path, help="Каталог с сохраненными страницами *.html")
+    parser.add_argument("--generate", type=int, default=10, help="Количество генерируемых страниц без --pages")
+    parser.add_argument("--repeats", type=int, default=5, help="Количество повторов разбора страницы")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(args.pages.glob("*.html"))]
+    else:
+        rng = random.Random(args.seed)
+        pages = [(f"generated-{i}", generate_page(rng)) for i in range(args.generate)]
+
+    if not pages:
+        console.print("Страницы не найдены")
+        return
+
+    full_parser = VacancyParser(html_parser="full")
+    fast_parser = VacancyParser(html_parser="fast")
+
+    table = Table(title=f"Разбор страниц вакансий (быстрый режим: {FAST_PARSER_FEATURES})")
+    table.add_column("Страница")
+    table.add_column("Размер, КБ", justify="right")
+    table.add_column("Полный, мс", justify="right")
+    table.add_column("Быстрый, мс", justify="right")
+    table.add_column("Ускорение", justify="right")
+    table.add_column("Память полный, МБ", justify="right")
+    table.add_column("Память быстрый, МБ", justify="right")
+    table.add_column("Совпадает")
+
+    totals = {"full": [], "fast": [], "full_memory": [], "fast_memory": []}
+    mismatches = 0
+    for index, (name, html) in enumerate(pages):
+        url = f"https://hh.ru/vacancy/{10_000_000 + index}"
+        full_result, full_ms, full_memory = measure(full_parser, html, url, args.repeats)
+        fast_result, fast_ms, fast_memory = measure(fast_parser, html, url, args.repeats)
+        identical = full_result == fast_result
+        mismatches += not identical
+
+        totals["full"].append(full_ms)
+        totals["fast"].append(fast_ms)
+        totals["full_memory"].append(full_memory)
+        totals["fast_memory"].append(fast_memory)
+
+        table.add_row(
+            name, f"{len(html.encode('utf-8')) / 1024:.0f}", f"{full_ms:.1f}", f"{fast_ms:.1f}",
+            f"{full_ms / fast_ms:.1f}x", f"{full_memory:.1f}", f"{fast_memory:.1f}",
+            "да" if identical else "[red]нет[/red]"
+        )
+
+    table.add_row(
+        "[bold]медиана[/bold]", "",
+        f"{statistics.median(totals['full']):.1f}", f"{statistics.median(totals['fast']):.1f}",
+        f"{statistics.median(totals['full']) / statistics.median(totals['fast']):.1f}x",
+        f"{statistics.median(totals['full_memory']):.1f}", f"{statistics.median(totals['fast_memory']):.1f}",
+        "да" if mismatches == 0 else f"[red]расхождений: {mismatches}[/red]"
+    )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Бенчмарк извлечения и нормализации навыков вакансии (VacancyParser)
+
+Сравнивает прежнюю реализацию (регулярное выражение на каждый навык и
+вложенные циклы по списку популярных навыков) с хеш-таблицами и общим
+сканером на вакансиях с разным количеством тегов навыков, включая 50+,
+и измеряет вычисление сохраняемых навыков вакансии (skills_canonical) через
+ResumeVacancyMatcher.extract_canonical_skills, как при сохранении вакансии.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.vacancy_skills_benchmark --tags 5 20 50 100
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from rich.console import Console
+from rich.table import Table
+
+from src.services.matcher import ResumeVacancyMatcher
+from src.services.vacancy_parser import VacancyParser
+
+console = Console()
+
+# Теги, которых нет среди популярных навыков, и слова, не являющиеся навыками
+EXTRA_TAGS = [
+    "Английский язык", "Java 17", "SpringBoot", "Postgre SQL", "Python3", "ООП", "Многопоточность",
+    "Spring Framework", "Hibernate", "Микросервисная архитектура", "CI", "Code Review", "Опыт",
+    "Знание", "Работа в команде", "BPMN", "UML", "1С", "Clickhouse", "gRPC", "OpenAPI", "Vue 3"
+]
+
+FILLER = (
+    "Мы ищем разработчика в команду платформы. Предстоит проектировать сервисы, "
+    "участвовать в код-ревью и улучшать производительность. "
+)
+
+
+def legacy_normalize_skills(parser: VacancyParser, skills: List[str]):
+    """Прежняя реализация VacancyParser._normalize_skills"""
+    unique_skills = []
+    lowercase_skills = set()
+
+    for skill in skills:
+        if skill.lower() not in lowercase_skills and skill not in parser.non_skills:
+            is_common_skill = False
+            for common_skill in parser.common_skills:
+                if skill.lower() == common_skill.lower():
+                    unique_skills.append(common_skill)
+                    is_common_skill = True
+                    break
+
+            if not is_common_skill and len(skill) > 2:
+                unique_skills.append(skill)
+
+            lowercase_skills.add(skill.lower())
+
+    final_skills = []
+    processed_lowercase = set()
+
+    for skill in unique_skills:
+        if skill.lower() not in processed_lowercase:
+            found_in_common = False
+            for common_skill in parser.common_skills:
+                if skill.lower() == common_skill.lower():
+                    final_skills.append(common_skill)
+                    found_in_common = True
+                    break
+
+            if not found_in_common:
+                final_skills.append(skill)
+
+            processed_lowercase.add(skill.lower())
+
+    return final_skills
+
+
+def legacy_extract_skills(parser: VacancyParser, description: str):
+    """Прежняя реализация VacancyParser._extract_skills_from_description"""
+    found_skills = []
+    for skill in parser.common_skills:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, description, re.IGNORECASE):
+            if skill not in found_skills:
+                found_skills.append(skill)
+    return legacy_normalize_skills(parser, found_skills)
+
+
+def generate_vacancy(parser: VacancyParser, tags: int, rng: random.Random):
+    """Генерирует теги навыков (в разном регистре) и описание, упоминающее часть навыков"""
+    pool = parser.common_skills + EXTRA_TAGS
+    tag_list = [rng.choice([skill, skill.lower(), skill.upper()]) for skill in rng.choices(pool, k=tags)]
+    mentioned = ", ".join(rng.sample(parser.common_skills, 15))
+    description = FILLER * 20 + f"Требования: {mentioned}. " + FILLER * 20
+    return tag_list, description
+
+
+def timed(function, repeats: int):
+    """Возвращает результат и среднее время вызова в микросекундах"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return result, (time.perf_counter() - started) / repeats * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк извлечения и нормализации навыков вакансии")
+    parser.add_argument("--tags", type=int, nargs="+", default=[5, 20, 50, 100],
+                        help="Количество тегов навыков в вакансии")
+    parser.add_argument("--vacancies", type=int, default=50, help="Количество вакансий на каждый размер")
+    parser.add_argument("--repeats", type=int, default=20, help="Количество повторов для каждой вакансии")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора случайных чисел")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vacancy_parser = VacancyParser()
+    # Запросы к LLM не выполняются: нужен только словарь навыков
+    matcher = ResumeVacancyMatcher(llm_api_url="http://localhost", llm_api_key="benchmark")
+
+    table = Table(title="Навыки вакансии, мкс на вакансию")
+    table.add_column("Тегов", justify="right")
+    table.add_column("Теги: было", justify="right")
+    table.add_column("Теги: стало", justify="right")
+    table.add_column("Описание: было", justify="right")
+    table.add_column("Описание: стало", justify="right")
+    table.add_column("skills_canonical", justify="right")
+    table.add_column("Навыков в словаре", justify="right")
+    table.add_column("Совпадает")
+
+    for tags in args.tags:
+        totals = [0.0] * 5
+        canonical_count = 0
+        identical = True
+
+        for _ in range(args.vacancies):
+            tag_list, description = generate_vacancy(vacancy_parser, tags, rng)
+
+            old_tags, old_tags_time = timed(lambda: legacy_normalize_skills(vacancy_parser, tag_list), args.repeats)
+            new_tags, new_tags_time = timed(lambda: vacancy_parser._normalize_skills(tag_list), args.repeats)
+            old_found, old_found_time = timed(lambda: legacy_extract_skills(vacancy_parser, description), args.repeats)
+            new_found, new_found_time = timed(lambda: vacancy_parser._extract_skills_from_description(description),
+                                              args.repeats)
+            # Навыки, которые сервис сохраняет для вакансии (compute_vacancy_skills)
+            canonical, canonical_time = timed(lambda: matcher.extract_canonical_skills(description, new_tags),
+                                              args.repeats)
+
+            identical = identical and old_tags == new_tags and old_found == new_found
+            canonical_count += len(canonical)
+            for index, value in enumerate((old_tags_time, new_tags_time, old_found_time, new_found_time,
+                                           canonical_time)):
+                totals[index] += value
+
+        averages = [total / args.vacancies for total in totals]
+        table.add_row(
+            str(tags),
+            f"{averages[0]:.1f}", f"{averages[1]:.1f}",
+            f"{averages[2]:.1f}", f"{averages[3]:.1f}",
+            f"{averages[4]:.1f}",
+            f"{canonical_count / args.vacancies:.1f}",
+            "да" if identical else "[red]нет[/red]"
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import signal
+import sys
+
+from rich.console import Console
+
+from src.services.db_service import DBService
+from src.services.matcher import SkillExtractor
+from src.services.vacancy_crawler import VacancyFreshnessCrawler, HH_CRAWLER_REQUESTS_PER_HOUR, \
+    HH_CRAWLER_RECHECK_HOURS, HH_CRAWLER_BATCH_SIZE, HH_CRAWLER_IDLE_INTERVAL
+from src.services.vacancy_refresher import VacancyRefresher
+from src.utils.config import load_env
+from src.utils.logger import configure_logging
+
+# Загружаем переменные окружения
+load_env()
+
+# Инициализация консоли для красивого вывода
+console = Console()
+
+# Цвета статусов проверки
+STATUS_STYLES = {
+    "updated": "yellow",
+    "closed": "red",
+    "created": "green",
+    "unchanged": "dim",
+    "not_modified": "dim",
+    "error": "red"
+}
+
+
+def print_check(check):
+    """Выводит результат проверки одной вакансии"""
+    style = STATUS_STYLES.get(check["status"], "white")
+    line = f"[{style}]{check['status']}[/{style}] {check['url']}"
+    if check["changed_fields"] and check["status"] == "updated":
+        line += f" — изменено: {', '.join(check['changed_fields'])}"
+        if check["invalidated_matches"]:
+            line += f", сброшено сопоставлений: {check['invalidated_matches']}"
+    if check["error"]:
+        line += f": {check['error']}"
+    console.print(line)
+
+
+def print_cycle(stats):
+    """Выводит итог проверки пачки вакансий"""
+    details = ", ".join(f"{key}: {value}" for key, value in sorted(stats.items())
+                        if key not in ("checked", "requests", "elapsed"))
+    console.print(f"Проверено вакансий: {stats['checked']}, запросов: {stats['requests']}, "
+                  f"время: {stats['elapsed']} с" + (f" ({details})" if details else ""))
+
+
+def main():
+    """Периодическая проверка актуальности сохраненных вакансий на hh.ru"""
+    parser = argparse.ArgumentParser(description="Периодическая проверка актуальности вакансий hh.ru")
+    parser.add_argument("--requests-per-hour", type=int, default=HH_CRAWLER_REQUESTS_PER_HOUR,
+                        help="Бюджет запросов к hh.ru в час")
+    parser.add_argument("--recheck-hours", type=float, default=HH_CRAWLER_RECHECK_HOURS,
+                        help="Минимальный интервал между проверками одной вакансии в часах")
+    parser.add_argument("--batch-size", type=int, default=HH_CRAWLER_BATCH_SIZE,
+                        help="Количество вакансий, выбираемых из базы за один раз")
+    parser.add_argument("--idle-interval", type=float, default=HH_CRAWLER_IDLE_INTERVAL,
+                        help="Пауза в секундах, если проверять нечего")
+    parser.add_argument("--once", action="store_true", help="Проверить одну пачку и завершиться")
+    args = parser.parse_args()
+
+    # Сообщения сервисов выводятся в консоль текстом, если формат журнала не задан явно
+    configure_logging(log_format=os.getenv("LOG_FORMAT", "text"))
+
+    db_service = DBService()
+    # Навыки обновленных вакансий вычисляются по словарю без обращения к языковой модели
+    refresher = VacancyRefresher(db_service=db_service,
+                                 skills_extractor=SkillExtractor().extract_canonical_skills)
+    crawler = VacancyFreshnessCrawler(
+        db_service=db_service,
+        refresher=refresher,
+        requests_per_hour=args.requests_per_hour,
+        recheck_after_hours=args.recheck_hours,
+        batch_size=args.batch_size,
+        idle_interval=args.idle_interval
+    )
+
+    # Остановка по Ctrl+C или SIGTERM после текущей вакансии
+    signal.signal(signal.SIGINT, lambda *_: crawler.stop())
+    signal.signal(signal.SIGTERM, lambda *_: crawler.stop())
+
+    console.rule(f"Проверка вакансий: не более {args.requests_per_hour} запросов в час, "
+                 f"повторная проверка через {args.recheck_hours} ч")
+    crawler.run(once=args.once, on_check=print_check, on_cycle=print_cycle)
+    console.print("Проверка остановлена")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -42,7 +42,7 @@ def create_schema():
         exists = cursor.fetchone()
 
         if not exists:
-            cursor.execute(f"CREATE IF NOT EXISTS SCHEMA {DB_SCHEMA}")
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA}")
         else:
             console.print(f"Схема {DB_SCHEMA} уже существует")
 
@@ -122,6 +122,31 @@ def create_tables():
         created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
         UNIQUE(resume_id, vacancy_id)
     );
+    
+    -- Нормализованные навыки и версия словаря, по которой они вычислены
+    ALTER TABLE {DB_SCHEMA}.resumes ADD COLUMN IF NOT EXISTS skills_canonical JSONB;
+    ALTER TABLE {DB_SCHEMA}.resumes ADD COLUMN IF NOT EXISTS skills_vocab_version VARCHAR(40);
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS skills_canonical JSONB;
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS skills_vocab_version VARCHAR(40);
+    
+    -- Отпечаток входных данных сопоставления для поиска устаревших результатов
+    ALTER TABLE {DB_SCHEMA}.resume_vacancy_matches ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(32);
+
+    -- Поиск вакансии по оригинальному ID при повторном импорте
+    CREATE INDEX IF NOT EXISTS vacancies_original_id_idx ON {DB_SCHEMA}.vacancies (original_id);
+    
+    -- Состояние вакансии на hh.ru по данным периодической проверки
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS is_closed BOOLEAN NOT NULL DEFAULT FALSE;
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS closed_at TIMESTAMP;
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS checked_at TIMESTAMP;
+
+    -- Время первого сохранения вакансии: в отличие от created_at, повторное сохранение его не меняет
+    ALTER TABLE {DB_SCHEMA}.vacancies ADD COLUMN IF NOT EXISTS first_seen_at TIMESTAMP;
+    UPDATE {DB_SCHEMA}.vacancies SET first_seen_at = created_at WHERE first_seen_at IS NULL;
+    ALTER TABLE {DB_SCHEMA}.vacancies ALTER COLUMN first_seen_at SET DEFAULT CURRENT_TIMESTAMP;
+    ALTER TABLE {DB_SCHEMA}.vacancies ALTER COLUMN first_seen_at SET NOT NULL;
+    CREATE INDEX IF NOT EXISTS resume_vacancy_matches_vacancy_id_idx
+        ON {DB_SCHEMA}.resume_vacancy_matches (vacancy_id, created_at);
     """
 
     try:
@@ -148,6 +173,18 @@ def check_connection():
         "port": DB_PORT
     }
 
+    try:
+        conn = psycopg2.connect(**conn_params, connect_timeout=5)
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        conn.close()
+        return True
+    except Exception as e:
+        console.print(f"Ошибка подключения к базе данных: {str(e)}")
+        return False
+
 
 def main():
     """Основная функция инициализации базы данных"""
@@ -165,6 +202,8 @@ def main():
             "Ошибка при создании таблиц. Проверьте параметры подключения и права доступа.")
         return False
 
+    return True
+
 
 if __name__ == "__main__":
     # При запуске скрипта напрямую
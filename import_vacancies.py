@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from rich.console import Console
+
+from src.services.db_service import DBService
+from src.services.matcher import SkillExtractor
+from src.services.vacancy_parser import HH_VACANCY_BACKEND
+from src.services.vacancy_importer import VacancyBatchImporter, HH_IMPORT_CONCURRENCY, \
+    HH_IMPORT_PER_HOST_CONCURRENCY, HH_IMPORT_HOST_DELAY, HH_IMPORT_RETRIES, HH_IMPORT_PARSE_WORKERS
+from src.utils.config import load_env
+from src.utils.logger import configure_logging
+
+# Загружаем переменные окружения
+load_env()
+
+# Инициализация консоли для красивого вывода
+console = Console()
+
+
+def read_urls(path: str):
+    """Читает список URL из файла (по одному в строке) или из stdin, если путь равен '-'"""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        lines = (line.strip() for line in stream)
+        return [line for line in lines if line and not line.startswith("#")]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def print_progress(progress):
+    """Выводит результат обработки одного URL"""
+    prefix = f"[{progress['done']}/{progress['total']}]"
+    if progress["status"] == "error":
+        console.print(f"{prefix} [red]ошибка[/red] {progress['url']}: {progress['error']}")
+    else:
+        console.print(f"{prefix} [green]готово[/green] {progress['url']} — {progress['title']} "
+                      f"({progress['source']}, {progress['elapsed']} с, попыток: {progress['attempts']})")
+
+
+def main():
+    """Пакетный импорт вакансий с hh.ru из файла со списком URL"""
+    parser = argparse.ArgumentParser(description="Пакетный импорт вакансий с hh.ru")
+    parser.add_argument("urls_file", help="Файл со списком URL вакансий (по одному в строке), '-' — stdin")
+    parser.add_argument("--concurrency", type=int, default=HH_IMPORT_CONCURRENCY,
+                        help="Максимальное количество одновременных запросов")
+    parser.add_argument("--per-host", type=int, default=HH_IMPORT_PER_HOST_CONCURRENCY,
+                        help="Максимальное количество одновременных запросов к одному хосту")
+    parser.add_argument("--host-delay", type=float, default=HH_IMPORT_HOST_DELAY,
+                        help="Минимальная пауза между запросами к одному хосту в секундах")
+    parser.add_argument("--retries", type=int, default=HH_IMPORT_RETRIES, help="Количество повторных попыток")
+    parser.add_argument("--timeout", type=float, default=None, help="Таймаут запроса в секундах")
+    parser.add_argument("--parse-workers", type=int, default=HH_IMPORT_PARSE_WORKERS,
+                        help="Количество процессов для разбора HTML (0 — разбор в потоках)")
+    parser.add_argument("--backend", choices=["api", "html"], default=HH_VACANCY_BACKEND,
+                        help="Источник данных: JSON API hh.ru с откатом на HTML или только HTML")
+    parser.add_argument("--dry-run", action="store_true", help="Не сохранять вакансии в базу данных")
+    args = parser.parse_args()
+
+    # Сообщения сервисов выводятся в консоль текстом, если формат журнала не задан явно
+    configure_logging(log_format=os.getenv("LOG_FORMAT", "text"))
+
+    urls = read_urls(args.urls_file)
+    if not urls:
+        console.print("Список URL пуст")
+        return False
+
+    importer = VacancyBatchImporter(
+        db_service=None if args.dry_run else DBService(),
+        # Навыки вычисляются по словарю без обращения к языковой модели
+        skills_extractor=SkillExtractor().extract_canonical_skills,
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host,
+        host_delay=args.host_delay,
+        retries=args.retries,
+        timeout=args.timeout,
+        parse_workers=args.parse_workers,
+        backend=args.backend
+    )
+
+    console.rule(f"Импорт {len(urls)} вакансий")
+    try:
+        summary = asyncio.run(importer.import_urls(urls, on_progress=print_progress))
+    finally:
+        importer.close()
+
+    console.rule("Итог")
+    console.print(f"Всего: {summary['total']}, сохранено: {summary['saved']}, ошибок: {summary['failed']}")
+    return summary["failed"] == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
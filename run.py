@@ -1,23 +1,218 @@
+"""
+Запуск сервиса
+
+Перед запуском воркеров выполняется прогрев: миграции базы данных, компиляция
+словарей навыков и проверка доступности базы данных и LLM. Воркеры создаются
+через fork уже прогретого процесса и принимают соединения на общем сокете.
+
+    python run.py
+    python run.py --workers 4 --graceful-timeout 90
+    python run.py --no-fast --no-warmup
+"""
+import argparse
+import importlib.util
 import os
+import signal
 import sys
+import time
+from collections import deque
 
 import uvicorn
-from dotenv import load_dotenv
 from rich.console import Console
+from rich.table import Table
 
-from db_init import create_schema, create_tables, check_connection
-from src.main import app
+from src.utils.config import load_env
+from src.utils.metrics import PROMETHEUS_MULTIPROC_DIR, prepare_multiprocess_dir
 
 # Загрузка переменных окружения из .env файла
-load_dotenv()
+load_env()
 
 # Инициализация консоли для красивого вывода
 console = Console()
 
-if __name__ == "__main__":
-    # Получаем настройки сервера из .env файла 
-    host = os.getenv("SERVER_HOST", "0.0.0.0")
-    port = int(os.getenv("SERVER_PORT", "8000"))
+# Настройки сервера по умолчанию
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+# Сколько секунд uvicorn ждет завершения открытых соединений при остановке
+SERVER_GRACEFUL_TIMEOUT = float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "75"))
+# Сколько аварийных завершений воркеров за SERVER_CRASH_WINDOW секунд останавливают сервис
+SERVER_CRASH_LIMIT = int(os.getenv("SERVER_CRASH_LIMIT", "5"))
+SERVER_CRASH_WINDOW = float(os.getenv("SERVER_CRASH_WINDOW", "60"))
+# Пауза перед перезапуском воркера удваивается с каждым аварийным завершением в окне
+SERVER_RESTART_DELAY = float(os.getenv("SERVER_RESTART_DELAY", "1"))
+SERVER_RESTART_MAX_DELAY = float(os.getenv("SERVER_RESTART_MAX_DELAY", "30"))
+
+
+def fast_path_available():
+    """Установлены ли uvloop и httptools (pip install "uvicorn[standard]")"""
+    return {name: importlib.util.find_spec(name) is not None for name in ("uvloop", "httptools")}
+
+
+def print_warmup(checks):
+    """Выводит результаты прогрева"""
+    table = Table(title="Прогрев")
+    table.add_column("Шаг")
+    table.add_column("Результат")
+    table.add_column("Время, с", justify="right")
+    table.add_column("Подробности", overflow="fold")
+    for name, check in checks.items():
+        status = "[green]OK[/green]" if check["ok"] else "[red]ошибка[/red]"
+        table.add_row(name, status, f"{check['seconds']:.2f}", str(check["detail"]))
+    console.print(table)
+
+
+def run_worker(config: uvicorn.Config, sock):
+    """
+    Запускает сервер в процессе-воркере
+
+    uvicorn после корректной остановки повторно посылает процессу полученный
+    сигнал; обработчик завершает процесс через sys.exit, чтобы выполнились
+    atexit-обработчики (журнал, трассировки, метрики).
+    """
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: sys.exit(0))
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def restart_delay(crashes: int):
+    """Пауза перед перезапуском воркера после crashes аварийных завершений подряд"""
+    return min(SERVER_RESTART_DELAY * 2 ** (crashes - 1), SERVER_RESTART_MAX_DELAY)
+
+
+def run_workers(config: uvicorn.Config, sock, workers: int):
+    """
+    Запускает воркеры через fork и перезапускает завершившиеся аварийно
+
+    SIGTERM и SIGINT пересылаются воркерам; главный процесс ждет их завершения.
+    Перезапуск выполняется с экспоненциально растущей паузой; если за
+    SERVER_CRASH_WINDOW секунд воркеры завершились аварийно SERVER_CRASH_LIMIT
+    раз, остальные воркеры останавливаются, а главный процесс завершается с
+    ошибкой, чтобы внешний супервизор увидел сбой вместо бесконечных перезапусков.
+
+    Returns:
+        Код завершения главного процесса
+    """
+    children = set()
+    stopping = False
+    # Время аварийных завершений в пределах окна
+    crashes = deque()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            run_worker(config, sock)
+            sys.exit(0)
+        children.add(pid)
+        console.print(f"Запущен воркер {pid}")
 
-    # Запуск сервиса
-    uvicorn.run(app, host=host, port=port)
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    for _ in range(workers):
+        spawn()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    exit_code = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if stopping:
+            console.print(f"Воркер {pid} остановлен")
+            continue
+
+        now = time.monotonic()
+        crashes.append(now)
+        while crashes and crashes[0] < now - SERVER_CRASH_WINDOW:
+            crashes.popleft()
+        if len(crashes) >= SERVER_CRASH_LIMIT:
+            console.print(f"[red]Воркер {pid} завершился с кодом {code}; аварийных завершений за "
+                          f"{SERVER_CRASH_WINDOW:g} с: {len(crashes)}, сервис останавливается[/red]")
+            exit_code = 1
+            stop(signal.SIGTERM, None)
+            continue
+
+        delay = restart_delay(len(crashes))
+        console.print(f"[red]Воркер {pid} завершился с кодом {code}, перезапуск через {delay:g} с[/red]")
+        # Пауза прерывается сигналом остановки
+        deadline = now + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(0.1, deadline - time.monotonic()))
+        if not stopping:
+            spawn()
+    return exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Запуск сервиса сопоставления резюме и вакансий")
+    parser.add_argument("--host", default=SERVER_HOST, help="Адрес сервера")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Порт сервера")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="Количество процессов-воркеров")
+    parser.add_argument("--fast", action=argparse.BooleanOptionalAction, default=True,
+                        help="Использовать uvloop и httptools, если они установлены")
+    parser.add_argument("--graceful-timeout", type=float, default=SERVER_GRACEFUL_TIMEOUT,
+                        help="Сколько секунд ждать завершения запросов при остановке")
+    parser.add_argument("--no-warmup", action="store_true", help="Не выполнять прогрев перед запуском")
+    parser.add_argument("--strict", action="store_true",
+                        help="Не запускать сервис, если какой-либо шаг прогрева завершился ошибкой")
+    args = parser.parse_args()
+
+    # Очистка метрик предыдущего запуска
+    prepare_multiprocess_dir()
+
+    # Приложение импортируется после очистки каталога метрик
+    from src.main import app
+    from src.utils import lifecycle
+
+    if args.no_warmup:
+        lifecycle.mark_ready()
+    else:
+        checks = lifecycle.warmup()
+        print_warmup(checks)
+        if args.strict and not all(check["ok"] for check in checks.values()):
+            console.print("[red]Прогрев завершился ошибками, сервис не запущен[/red]")
+            sys.exit(1)
+
+    available = fast_path_available()
+    if args.fast:
+        missing = [name for name, installed in available.items() if not installed]
+        if missing:
+            console.print(f"Не установлены {', '.join(missing)}: используются asyncio и h11 "
+                          "(pip install \"uvicorn\\[standard]\")")
+        loop, http = "auto", "auto"
+    else:
+        loop, http = "asyncio", "h11"
+
+    workers = args.workers
+    if workers > 1 and not hasattr(os, "fork"):
+        console.print("[yellow]fork недоступен на этой платформе, запускается один воркер[/yellow]")
+        workers = 1
+    if workers > 1 and not PROMETHEUS_MULTIPROC_DIR:
+        console.print("[yellow]PROMETHEUS_MULTIPROC_DIR не задан: /metrics покажет значения одного воркера[/yellow]")
+
+    config = uvicorn.Config(app, host=args.host, port=args.port, loop=loop, http=http,
+                            timeout_graceful_shutdown=args.graceful_timeout)
+    # Сокет открывается до fork и принимает соединения во всех воркерах
+    sock = config.bind_socket()
+    console.print(f"Сервис запускается на http://{args.host}:{args.port}, воркеров: {workers}")
+
+    if workers == 1:
+        uvicorn.Server(config).run(sockets=[sock])
+    else:
+        sys.exit(run_workers(config, sock, workers))
+
+
+if __name__ == "__main__":
+    main()
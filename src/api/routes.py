@@ -1,27 +1,224 @@
+import asyncio
+import json
 import re
 import uuid
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from fastapi import APIRouter, HTTPException, File, UploadFile, Form, BackgroundTasks
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, File, UploadFile, Form, BackgroundTasks, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
 from src.models.schemas import MatchRequest, MatchResult, ResumeVacancyMatchRequest, NormalizedResume, \
     ResumeNormalizationResponse, VacancyRequest, Vacancy, VacancyResponse, StoredResumeVacancyMatchRequest, \
-    ResumeVacancyMatchResponse
-from src.services.db_service import DBService
-from src.services.matcher import ResumeVacancyMatcher
-from src.services.normalizer import ResumeNormalizer
-from src.services.vacancy_parser import VacancyParser
+    ResumeVacancyMatchResponse, SkillSearchMatch, SkillSearchResponse, SkillScore, SkillRankingResponse, \
+    RematchStaleResponse, VacancyBatchRequest
+from src.models.constants import SKILL_MATRIX_METRICS, TERM_NORMALIZER, TERM_NORMALIZER_VERSION
+from src.services.container import services
+from src.services.row_cache import invalidation_listener
+from src.services.skill_index import SkillIndex
+from src.services.skill_index_sync import SkillIndexSync
+from src.utils.deadline import REQUEST_TIMEOUT_LLM, detach_from_request, request_policy
+from src.utils.executors import ExecutorOverloaded, executors, run_in_workload, workload
+from src.utils.fast_json import json_response
+from src.utils.http_cache import RESUME_CACHE_CONTROL, RESUME_PDF_CACHE_CONTROL, VACANCY_CACHE_CONTROL, \
+    VACANCY_LIST_CACHE_CONTROL, conditional_response, content_etag, is_not_modified, validator_headers
+from src.utils.lifecycle import finish_loading
 from src.utils.pdf_extractor import PDFExtractor
+from src.utils.logger import get_logger
+from src.utils.metrics import record_cache
+from src.utils.profiler import route_class
 
-# Создание роутера FastAPI
-router = APIRouter()
+if TYPE_CHECKING:
+    from src.services.skill_matrix import SkillMatrix
 
-# Инициализация сервисов
-matcher = ResumeVacancyMatcher()
-db_service = DBService()
-resume_normalizer = ResumeNormalizer()
-vacancy_parser = VacancyParser()
+# Создание роутера FastAPI (с профилированием запросов, если задан PROFILING_ADMIN_TOKEN)
+router = APIRouter(route_class=route_class())
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Сервисы (ResumeVacancyMatcher, DBService, ResumeNormalizer, VacancyParser и др.) и битовые
+# матрицы навыков создаются контейнером services при первом обращении
+
+# Инвертированные индексы навыков для быстрого поиска кандидатов
+resume_skill_index = SkillIndex()
+vacancy_skill_index = SkillIndex()
+
+# Допустимые режимы поиска по навыкам
+SKILL_SEARCH_MODES = ("all", "any", "at_least")
+
+
+def index_resume_skills(resume_id: str, skills):
+    """Добавляет навыки резюме в индекс и матрицу навыков"""
+    resume_skill_index.add(resume_id, skills)
+    services.resume_skill_matrix.add(resume_id, skills)
+
+
+def index_vacancy_skills(vacancy_id: str, skills):
+    """Добавляет навыки вакансии в индекс и матрицу навыков"""
+    vacancy_skill_index.add(vacancy_id, skills)
+    services.vacancy_skill_matrix.add(vacancy_id, skills)
+
+
+def compute_resume_skills(resume_text: str, normalized_data=None):
+    """
+    Вычисляет нормализованные навыки резюме по тексту и данным, полученным от LLM
+
+    Языки и фреймворки нормализованного резюме приводятся к значениям TERM_NORMALIZER.
+    """
+    extra_terms = []
+    if normalized_data:
+        extra_terms = list(normalized_data.get("languages") or []) + list(normalized_data.get("frameworks") or [])
+    return services.matcher.extract_canonical_skills(resume_text, extra_terms)
+
+
+def compute_vacancy_skills(description: str, skills=None):
+    """
+    Вычисляет нормализованные навыки вакансии по описанию и тегам навыков
+    """
+    return services.matcher.extract_canonical_skills(description, skills or [])
+
+
+def get_resume_skills(resume_id: str, resume_record):
+    """
+    Возвращает сохраненные навыки резюме
+
+    Если навыки не сохранены или вычислены по другой версии словаря,
+    вычисляет их заново и сохраняет в базу данных.
+    """
+    if resume_record.get("skills_vocab_version") == TERM_NORMALIZER_VERSION \
+            and resume_record.get("skills_canonical") is not None:
+        return resume_record["skills_canonical"]
+
+    normalized_data = services.db_service.get_normalized_resume(resume_id)
+    skills = compute_resume_skills(resume_record.get("raw_text", ""), normalized_data)
+    services.db_service.save_resume_skills({resume_id: skills})
+    index_resume_skills(resume_id, skills.keys())
+    return skills
+
+
+def get_vacancy_skills(vacancy_data):
+    """
+    Возвращает сохраненные навыки вакансии
+
+    Если навыки не сохранены или вычислены по другой версии словаря,
+    вычисляет их заново и сохраняет в базу данных.
+    """
+    if vacancy_data.get("skills_vocab_version") == TERM_NORMALIZER_VERSION \
+            and vacancy_data.get("skills_canonical") is not None:
+        return vacancy_data["skills_canonical"]
+
+    skills = compute_vacancy_skills(vacancy_data.get("description", ""), vacancy_data.get("skills"))
+    services.db_service.save_vacancy_skills({vacancy_data["id"]: skills})
+    index_vacancy_skills(vacancy_data["id"], skills.keys())
+    return skills
+
+
+def recompute_stale_skills(batch_size: int = 500):
+    """
+    Пересчитывает навыки резюме и вакансий, вычисленные по другой версии TERM_NORMALIZER
+
+    Результаты сохраняются в базу данных пачками и сразу попадают в индексы навыков.
+    """
+    recomputed_resumes = 0
+    batch = {}
+    for resume_id, raw_text, languages, frameworks in services.db_service.iter_stale_resumes(batch_size):
+        skills = compute_resume_skills(raw_text, {"languages": languages, "frameworks": frameworks})
+        batch[resume_id] = skills
+        index_resume_skills(resume_id, skills.keys())
+        if len(batch) >= batch_size:
+            services.db_service.save_resume_skills(batch)
+            recomputed_resumes += len(batch)
+            batch = {}
+    services.db_service.save_resume_skills(batch)
+    recomputed_resumes += len(batch)
+
+    recomputed_vacancies = 0
+    batch = {}
+    for vacancy_id, description, vacancy_skills in services.db_service.iter_stale_vacancies(batch_size):
+        skills = compute_vacancy_skills(description, vacancy_skills)
+        batch[vacancy_id] = skills
+        index_vacancy_skills(vacancy_id, skills.keys())
+        if len(batch) >= batch_size:
+            services.db_service.save_vacancy_skills(batch)
+            recomputed_vacancies += len(batch)
+            batch = {}
+    services.db_service.save_vacancy_skills(batch)
+    recomputed_vacancies += len(batch)
+
+    if recomputed_resumes or recomputed_vacancies:
+        logger.info("Навыки пересчитаны по словарю версии %s: %s резюме, %s вакансий",
+                    TERM_NORMALIZER_VERSION, recomputed_resumes, recomputed_vacancies)
+
+
+# Сообщения ответа для результатов повторной загрузки
+REFRESH_MESSAGES = {
+    "created": "Вакансия успешно загружена и сохранена",
+    "updated": "Вакансия изменилась на hh.ru и обновлена",
+    "unchanged": "Вакансия не изменилась",
+    "not_modified": "Вакансия не изменилась с последней загрузки",
+    "closed": "Вакансия закрыта на hh.ru"
+}
+
+
+# Сколько секунд при старте ждать подключения слушателя уведомлений перед загрузкой индексов навыков
+SKILL_INDEX_LISTENER_WAIT = 5.0
+
+
+def refresh_resume_skill_index(resume_ids=None):
+    """Перечитывает навыки резюме из базы данных в индекс и матрицу (None — все резюме)"""
+    if resume_ids is None:
+        for resume_id, skills, _ in services.db_service.iter_resume_skills():
+            index_resume_skills(resume_id, skills.keys())
+        return
+    for resume_id, skills in (services.db_service.get_resume_skills(resume_ids) or {}).items():
+        index_resume_skills(resume_id, skills.keys())
+
+
+def refresh_vacancy_skill_index(vacancy_ids=None):
+    """Перечитывает навыки вакансий из базы данных в индекс и матрицу (None — все вакансии)"""
+    if vacancy_ids is None:
+        for vacancy_id, skills, _ in services.db_service.iter_vacancy_skills():
+            index_vacancy_skills(vacancy_id, skills.keys())
+        return
+    for vacancy_id, skills in (services.db_service.get_vacancy_skills(vacancy_ids) or {}).items():
+        index_vacancy_skills(vacancy_id, skills.keys())
+
+
+# Обновление индексов навыков воркера по записям других воркеров
+skill_index_sync = SkillIndexSync({
+    "resume": refresh_resume_skill_index,
+    "vacancy": refresh_vacancy_skill_index,
+})
+
+
+def load_skill_indexes():
+    """
+    Заполняет индексы и матрицы навыков данными из базы данных
+
+    Вызывается один раз при старте воркера в фоновом потоке. Сначала воркер
+    подписывается на уведомления об изменениях, чтобы записи других воркеров
+    после загрузки попадали в его индексы, затем загружаются сохраненные навыки
+    и пересчитываются записи, навыки которых вычислены по другой версии словаря
+    TERM_NORMALIZER. Воркер готов к запросам после загрузки навыков.
+    """
+    try:
+        # DBService при создании задает слушателю параметры подключения к базе данных
+        services.db_service
+        skill_index_sync.start()
+        if not invalidation_listener.wait_connected(SKILL_INDEX_LISTENER_WAIT):
+            logger.warning("Слушатель уведомлений не подключен: индексы навыков перечитаются после подключения")
+        skill_index_sync.begin_loading()
+
+        refresh_resume_skill_index()
+        refresh_vacancy_skill_index()
+
+        logger.info("Индексы навыков загружены: %s резюме, %s вакансий",
+                    len(resume_skill_index), len(vacancy_skill_index))
+    finally:
+        skill_index_sync.mark_loaded()
+        finish_loading("skill_indexes")
+
+    recompute_stale_skills()
 
 
 # Валидация email
@@ -32,6 +229,8 @@ def is_valid_email(email: str):
 
 
 @router.post("/match", response_model=MatchResult, tags=["Матчинг"])
+@request_policy(timeout=REQUEST_TIMEOUT_LLM, cancel_on_disconnect=True)
+@workload("llm")
 def match_vacancy_resume(request: MatchRequest):
     """
     Сопоставление резюме с вакансией
@@ -43,7 +242,7 @@ def match_vacancy_resume(request: MatchRequest):
     комментарий от языковой модели, оценку соответствия, плюсы, минусы и вердикт.
     """
     try:
-        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = matcher.match(
+        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = services.matcher.match(
             request.vacancy_text, request.resume_text
         )
 
@@ -56,11 +255,14 @@ def match_vacancy_resume(request: MatchRequest):
             negatives=negatives,
             verdict=verdict
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/upload-resume", response_model=ResumeNormalizationResponse, tags=["Резюме"])
+@request_policy(timeout=REQUEST_TIMEOUT_LLM)
 async def upload_resume(
         file: UploadFile = File(...),
         email: str = Form(...),
@@ -87,7 +289,7 @@ async def upload_resume(
         pdf_content = await file.read()
 
         # Извлечение текста из PDF
-        resume_text = PDFExtractor.extract_text_from_bytes(pdf_content)
+        resume_text = await run_in_workload("cpu", PDFExtractor.extract_text_from_bytes, pdf_content)
 
         if not resume_text or len(resume_text.strip()) < 50:
             raise HTTPException(
@@ -96,7 +298,7 @@ async def upload_resume(
             )
 
         # Извлечение метаданных из PDF
-        metadata, errors = PDFExtractor.get_metadata(pdf_content)
+        metadata, errors = await run_in_workload("cpu", PDFExtractor.get_metadata, pdf_content)
 
         if metadata:
             # Добавляем имя файла в метаданные
@@ -105,8 +307,12 @@ async def upload_resume(
         # Генерируем идентификатор и сохраняем резюме в базу данных
         resume_id = str(uuid.uuid4())
 
+        # Навыки вычисляются один раз при сохранении и далее читаются из базы данных
+        resume_skills = await run_in_workload("cpu", compute_resume_skills, resume_text)
+
         # Сохранение сырого резюме и PDF-файла в базу данных
-        save_success = db_service.save_resume(resume_id, email, resume_text, metadata, pdf_content)
+        save_success = await run_in_workload("db", services.db_service.save_resume, resume_id, email, resume_text,
+                                             metadata, pdf_content, resume_skills)
 
         if not save_success:
             raise HTTPException(
@@ -114,8 +320,11 @@ async def upload_resume(
                 detail="Не удалось сохранить резюме в базу данных. Попробуйте позже."
             )
 
+        # Обновляем индекс навыков
+        index_resume_skills(resume_id, resume_skills.keys())
+
         # Нормализация резюме с помощью DeepSeek
-        normalized_data = resume_normalizer.normalize_resume(resume_text, email)
+        normalized_data = await run_in_workload("llm", services.resume_normalizer.normalize_resume, resume_text, email)
 
         if not normalized_data:
             raise HTTPException(
@@ -124,7 +333,8 @@ async def upload_resume(
             )
 
         # Сохранение нормализованных данных в базу данных
-        normalized_save_success = db_service.save_normalized_resume(resume_id, normalized_data)
+        normalized_save_success = await run_in_workload("db", services.db_service.save_normalized_resume, resume_id,
+                                                        normalized_data)
 
         if not normalized_save_success:
             raise HTTPException(
@@ -132,6 +342,11 @@ async def upload_resume(
                 detail="Резюме сохранено, но не удалось сохранить нормализованные данные. Попробуйте позже."
             )
 
+        # Дополняем навыки языками и фреймворками из нормализованных данных
+        resume_skills = await run_in_workload("cpu", compute_resume_skills, resume_text, normalized_data)
+        await run_in_workload("db", services.db_service.save_resume_skills, {resume_id: resume_skills})
+        index_resume_skills(resume_id, resume_skills.keys())
+
         # Создаем объект нормализованного резюме
         normalized_resume = NormalizedResume(
             name=normalized_data.get("name", ""),
@@ -156,6 +371,8 @@ async def upload_resume(
 
         return response
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -163,7 +380,8 @@ async def upload_resume(
 
 
 @router.post("/match-stored-resume", response_model=MatchResult, tags=["Матчинг"])
-def match_stored_resume(request: ResumeVacancyMatchRequest):
+@request_policy(timeout=REQUEST_TIMEOUT_LLM, cancel_on_disconnect=True)
+async def match_stored_resume(request: ResumeVacancyMatchRequest):
     """
     Сопоставление ранее загруженного резюме с вакансией
     
@@ -173,15 +391,16 @@ def match_stored_resume(request: ResumeVacancyMatchRequest):
     Возвращает результат сопоставления.
     """
     # Получаем резюме из базы данных
-    resume_text, record = db_service.get_resume(request.resume_id)
+    resume_text, record = await run_in_workload("db", services.db_service.get_resume, request.resume_id)
 
     if not resume_text:
         raise HTTPException(status_code=404, detail=f"Резюме с ID {request.resume_id} не найдено")
 
     try:
-        # Выполняем сопоставление
-        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = matcher.match(
-            request.vacancy_text, resume_text
+        # Выполняем сопоставление, используя сохраненные навыки резюме
+        resume_skills = await run_in_workload("db", get_resume_skills, request.resume_id, record)
+        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = await run_in_workload(
+            "llm", services.matcher.match, request.vacancy_text, resume_text, resume_skills=resume_skills
         )
 
         return MatchResult(
@@ -193,11 +412,14 @@ def match_stored_resume(request: ResumeVacancyMatchRequest):
             negatives=negatives,
             verdict=verdict
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/resumes/{email}", tags=["Резюме"])
+@workload("db")
 def get_user_resumes(email: str):
     """
     Получение списка резюме пользователя по email
@@ -210,26 +432,34 @@ def get_user_resumes(email: str):
         raise HTTPException(status_code=400, detail="Некорректный формат email")
 
     # Получаем резюме из базы данных
-    resumes = db_service.get_resumes_by_email(email)
+    resumes = services.db_service.get_resumes_by_email(email)
 
     return {"email": email, "resumes": resumes}
 
 
 @router.get("/normalized-resume/{resume_id}", response_model=NormalizedResume, tags=["Резюме"])
-def get_normalized_resume(resume_id: str):
+@workload("db")
+def get_normalized_resume(resume_id: str, request: Request, response: Response):
     """
     Получение нормализованных данных резюме
 
     - **resume_id**: Идентификатор резюме
 
-    Возвращает нормализованные данные резюме.
+    Возвращает нормализованные данные резюме. Поддерживает If-None-Match и
+    If-Modified-Since: если данные не изменились, возвращается 304 без тела.
     """
     # Получаем нормализованные данные из базы данных
-    normalized_data = db_service.get_normalized_resume(resume_id)
+    normalized_data = services.db_service.get_normalized_resume(resume_id)
 
     if not normalized_data:
         raise HTTPException(status_code=404, detail=f"Нормализованные данные для резюме с ID {resume_id} не найдены")
 
+    etag = content_etag({field: normalized_data.get(field) for field in NormalizedResume.model_fields})
+    not_modified = conditional_response(request, response, etag, normalized_data.get("created_at"),
+                                        RESUME_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     # Создаем объект нормализованного резюме
     normalized_resume = NormalizedResume(
         name=normalized_data.get("name", ""),
@@ -246,26 +476,38 @@ def get_normalized_resume(resume_id: str):
 
 
 @router.get("/resume-pdf/{resume_id}", tags=["Резюме"])
-def get_resume_pdf(resume_id: str):
+@workload("db")
+def get_resume_pdf(resume_id: str, request: Request):
     """
     Получение PDF-файла резюме по идентификатору
 
     - **resume_id**: Идентификатор резюме
 
-    Возвращает файл резюме в формате PDF.
+    Возвращает файл резюме в формате PDF. Поддерживает If-None-Match и
+    If-Modified-Since: если файл не изменился, возвращается 304, и PDF не
+    читается из базы данных.
     """
+    # Метаданные резюме (из кеша строк): валидаторы и имя файла
+    _, record = services.db_service.get_resume(resume_id)
+
+    if not record:
+        raise HTTPException(status_code=404, detail=f"PDF-файл для резюме с ID {resume_id} не найден")
+
+    # PDF меняется только вместе с резюме (save_resume), а при этом обновляется created_at
+    etag = content_etag(resume_id, record.get("created_at"))
+    headers = validator_headers(etag, record.get("created_at"), RESUME_PDF_CACHE_CONTROL)
+    if is_not_modified(request, etag, record.get("created_at")):
+        return Response(status_code=304, headers=headers)
+
     # Получаем PDF-файл из базы данных
-    pdf_content = db_service.get_resume_pdf(resume_id)
+    pdf_content = services.db_service.get_resume_pdf(resume_id)
 
     if not pdf_content:
         raise HTTPException(status_code=404, detail=f"PDF-файл для резюме с ID {resume_id} не найден")
 
-    # Получаем метаданные резюме для определения имени файла
-    _, record = db_service.get_resume(resume_id)
-
     # Определяем имя файла
     filename = "resume.pdf"
-    if record and record.get("metadata") and record["metadata"].get("filename"):
+    if record.get("metadata") and record["metadata"].get("filename"):
         filename = record["metadata"]["filename"]
 
     # Возвращаем PDF-файл
@@ -273,22 +515,29 @@ def get_resume_pdf(resume_id: str):
         content=pdf_content,
         media_type="application/pdf",
         headers={
+            **headers,
             "Content-Disposition": f'attachment; filename="{filename}"'
         }
     )
 
 
 @router.post("/parse-vacancy", response_model=VacancyResponse, tags=["Вакансии"])
+@workload("cpu")
 def parse_vacancy(request: VacancyRequest):
     """
     Парсинг вакансии с hh.ru
     
     - **url**: URL вакансии на hh.ru
+    - **refresh**: Обновить сохраненную вакансию с тем же ID на hh.ru вместо создания новой
+      (по умолчанию true)
     
     Возвращает данные о вакансии.
     """
+    if request.refresh:
+        return refresh_vacancy(request.url)
+
     # Парсим вакансию
-    vacancy_data, error = vacancy_parser.parse_vacancy(request.url)
+    vacancy_data, error = services.vacancy_parser.parse_vacancy(request.url)
 
     if error:
         raise HTTPException(status_code=400, detail=error)
@@ -296,9 +545,12 @@ def parse_vacancy(request: VacancyRequest):
     if not vacancy_data:
         raise HTTPException(status_code=500, detail="Не удалось распарсить вакансию")
 
+    # Навыки вакансии вычисляются один раз при сохранении
+    vacancy_skills = compute_vacancy_skills(vacancy_data.get("description"), vacancy_data.get("skills"))
+
     # Сохраняем вакансию в базу данных
     vacancy_id = vacancy_data.get("id")
-    save_success = db_service.save_vacancy(
+    save_success = services.db_service.save_vacancy(
         vacancy_id=vacancy_id,
         title=vacancy_data.get("title"),
         company=vacancy_data.get("company"),
@@ -309,7 +561,8 @@ def parse_vacancy(request: VacancyRequest):
         salary_to=vacancy_data.get("salary_to"),
         currency=vacancy_data.get("currency"),
         experience=vacancy_data.get("experience"),
-        skills=vacancy_data.get("skills")
+        skills=vacancy_data.get("skills"),
+        skills_canonical=vacancy_skills
     )
 
     if not save_success:
@@ -318,6 +571,9 @@ def parse_vacancy(request: VacancyRequest):
             detail="Не удалось сохранить вакансию в базу данных. Попробуйте позже."
         )
 
+    # Обновляем индекс навыков
+    index_vacancy_skills(vacancy_id, vacancy_skills.keys())
+
     # Создаем объект вакансии
     vacancy = Vacancy(
         id=vacancy_id,
@@ -342,52 +598,145 @@ def parse_vacancy(request: VacancyRequest):
     return response
 
 
+def refresh_vacancy(url: str):
+    """
+    Загружает вакансию в режиме повторной загрузки по original_id
+
+    Returns:
+        VacancyResponse с результатом повторной загрузки
+    """
+    result, error = services.vacancy_refresher.refresh(url)
+
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    vacancy_data = result["vacancy"]
+    vacancy_id = vacancy_data["id"]
+
+    # Индекс навыков обновляется только при записи новых данных
+    if result["status"] in ("created", "updated") and vacancy_data.get("skills_canonical") is not None:
+        index_vacancy_skills(vacancy_id, vacancy_data["skills_canonical"].keys())
+
+    created_at = vacancy_data.get("created_at")
+    vacancy = Vacancy(
+        id=vacancy_id,
+        title=vacancy_data.get("title"),
+        company=vacancy_data.get("company"),
+        description=vacancy_data.get("description"),
+        salary_from=vacancy_data.get("salary_from"),
+        salary_to=vacancy_data.get("salary_to"),
+        currency=vacancy_data.get("currency"),
+        experience=vacancy_data.get("experience"),
+        skills=vacancy_data.get("skills") or [],
+        url=vacancy_data.get("url"),
+        created_at=str(created_at) if created_at else None
+    )
+
+    return VacancyResponse(
+        vacancy_id=vacancy_id,
+        vacancy=vacancy,
+        message=REFRESH_MESSAGES[result["status"]],
+        refresh_status=result["status"],
+        is_closed=result["closed"],
+        changed_fields=result["changed_fields"],
+        invalidated_matches=result["invalidated_matches"]
+    )
+
+
+@router.post("/parse-vacancies", tags=["Вакансии"])
+async def parse_vacancies(request: VacancyBatchRequest):
+    """
+    Пакетный импорт вакансий с hh.ru
+
+    - **urls**: Список URL вакансий на hh.ru
+
+    Вакансии загружаются параллельно и сохраняются в базу данных одним запросом.
+    Ответ передается потоком в формате NDJSON: по одной строке на каждый обработанный
+    URL (событие progress) и итоговая строка со сводкой (событие summary).
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="Список URL пуст")
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_import():
+        try:
+            summary = await services.vacancy_importer.import_urls(
+                request.urls,
+                on_progress=lambda progress: queue.put_nowait({"event": "progress", **progress})
+            )
+
+            # Обновляем индексы навыков сохраненных вакансий
+            for vacancy in summary.pop("vacancies"):
+                index_vacancy_skills(vacancy["id"], (vacancy.get("skills_canonical") or {}).keys())
+
+            await queue.put({"event": "summary", **summary})
+        except Exception as e:
+            await queue.put({"event": "error", "error": f"Ошибка при импорте вакансий: {str(e)}"})
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(run_import())
+
+    async def stream():
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        await task
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.get("/vacancies", response_model=List[Vacancy], tags=["Вакансии"])
-def get_all_vacancies():
+@workload("db")
+def get_all_vacancies(request: Request):
     """
     Получение списка всех вакансий
 
-    Возвращает список всех вакансий.
-    """
-    # Получаем вакансии из базы данных
-    vacancies_data = db_service.get_all_vacancies()
-
-    # Преобразуем в список объектов Vacancy
-    vacancies = []
-    for vacancy_data in vacancies_data:
-        vacancy = Vacancy(
-            id=vacancy_data.get("id"),
-            title=vacancy_data.get("title"),
-            company=vacancy_data.get("company"),
-            description=vacancy_data.get("description"),
-            salary_from=vacancy_data.get("salary_from"),
-            salary_to=vacancy_data.get("salary_to"),
-            currency=vacancy_data.get("currency"),
-            experience=vacancy_data.get("experience"),
-            skills=vacancy_data.get("skills", []),
-            url=vacancy_data.get("url"),
-            created_at=vacancy_data.get("created_at")
-        )
-        vacancies.append(vacancy)
+    Возвращает список всех вакансий. Поддерживает If-None-Match и
+    If-Modified-Since: если список не изменился, возвращается 304, и вакансии
+    не читаются из базы данных. Большой ответ сжимается (gzip или brotli).
+    """
+    # Версия читается до вакансий: если список изменится между запросами, ETag окажется
+    # старше тела, и следующий запрос клиента получит список заново
+    headers = {}
+    state = services.db_service.get_vacancies_version()
+    if state is not None:
+        etag = content_etag(state["count"], state["version"], weak=True)
+        headers = validator_headers(etag, state["last_modified"], VACANCY_LIST_CACHE_CONTROL)
+        if is_not_modified(request, etag, state["last_modified"]):
+            return Response(status_code=304, headers=headers)
+
+    # Строки базы данных уже содержат только поля модели Vacancy и сериализуются сразу в JSON
+    vacancies = services.db_service.get_vacancies_for_response()
 
-    return vacancies
+    return json_response(request, vacancies, headers)
 
 
 @router.get("/vacancy/{vacancy_id}", response_model=Vacancy, tags=["Вакансии"])
-def get_vacancy(vacancy_id: str):
+@workload("db")
+def get_vacancy(vacancy_id: str, request: Request, response: Response):
     """
     Получение вакансии по идентификатору
 
     - **vacancy_id**: Идентификатор вакансии
 
-    Возвращает данные о вакансии.
+    Возвращает данные о вакансии. Поддерживает If-None-Match и If-Modified-Since:
+    если вакансия не изменилась, возвращается 304 без тела.
     """
     # Получаем вакансию из базы данных
-    vacancy_data = db_service.get_vacancy(vacancy_id)
+    vacancy_data = services.db_service.get_vacancy(vacancy_id)
 
     if not vacancy_data:
         raise HTTPException(status_code=404, detail=f"Вакансия с ID {vacancy_id} не найдена")
 
+    etag = content_etag({field: vacancy_data.get(field) for field in Vacancy.model_fields})
+    not_modified = conditional_response(request, response, etag, vacancy_data.get("created_at"), VACANCY_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
     # Создаем объект вакансии
     vacancy = Vacancy(
         id=vacancy_data.get("id"),
@@ -400,14 +749,15 @@ def get_vacancy(vacancy_id: str):
         experience=vacancy_data.get("experience"),
         skills=vacancy_data.get("skills", []),
         url=vacancy_data.get("url"),
-        created_at=vacancy_data.get("created_at")
+        created_at=vacancy_data["created_at"].isoformat() if vacancy_data.get("created_at") else None
     )
 
     return vacancy
 
 
 @router.post("/match-stored", response_model=ResumeVacancyMatchResponse, tags=["Матчинг"])
-def match_stored_resume_with_vacancy(request: StoredResumeVacancyMatchRequest):
+@request_policy(timeout=REQUEST_TIMEOUT_LLM)
+async def match_stored_resume_with_vacancy(request: StoredResumeVacancyMatchRequest):
     """
     Сопоставление сохраненного резюме с сохраненной вакансией
     
@@ -417,21 +767,26 @@ def match_stored_resume_with_vacancy(request: StoredResumeVacancyMatchRequest):
     Возвращает результат сопоставления и сохраняет его в базе данных.
     """
     # Получаем резюме из базы данных
-    resume_text, resume_record = db_service.get_resume(request.resume_id)
+    resume_text, resume_record = await run_in_workload("db", services.db_service.get_resume, request.resume_id)
     if not resume_text:
         raise HTTPException(status_code=404, detail=f"Резюме с ID {request.resume_id} не найдено")
 
     # Получаем вакансию из базы данных
-    vacancy_data = db_service.get_vacancy(request.vacancy_id)
+    vacancy_data = await run_in_workload("db", services.db_service.get_vacancy, request.vacancy_id)
     if not vacancy_data:
         raise HTTPException(status_code=404, detail=f"Вакансия с ID {request.vacancy_id} не найдена")
 
     vacancy_text = vacancy_data.get("description", "")
 
     try:
-        # Проверяем, есть ли уже результаты сопоставления в базе данных
-        existing_match = db_service.get_resume_vacancy_match(request.resume_id, request.vacancy_id)
-        if existing_match:
+        # Отпечаток текущих входных данных: тексты, модель, версия промпта и словаря навыков
+        fingerprint = services.matcher.get_match_fingerprint(vacancy_text, resume_text)
+
+        # Проверяем, есть ли уже актуальные результаты сопоставления в базе данных
+        existing_match = await run_in_workload("db", services.db_service.get_resume_vacancy_match,
+                                               request.resume_id, request.vacancy_id)
+        if existing_match and existing_match.get("fingerprint") == fingerprint:
+            record_cache("match_result", hits=1)
             # Возвращаем существующие результаты
             return ResumeVacancyMatchResponse(
                 resume_id=request.resume_id,
@@ -446,42 +801,13 @@ def match_stored_resume_with_vacancy(request: StoredResumeVacancyMatchRequest):
                 message="Результаты сопоставления получены из базы данных"
             )
 
-        # Выполняем сопоставление
-        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = matcher.match(
-            vacancy_text, resume_text
+        record_cache("match_result", misses=1)
+        matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = await run_in_workload(
+            "llm", run_stored_match, request.resume_id, resume_text, resume_record, vacancy_data, fingerprint
         )
 
-        # Генерируем ID для сопоставления
-        match_id = str(uuid.uuid4())
-
-        # Сохраняем результаты в базе данных
-        try:
-            save_success = db_service.save_resume_vacancy_match(
-                match_id=match_id,
-                resume_id=request.resume_id,
-                vacancy_id=request.vacancy_id,
-                matched_skills=matched_skills,
-                unmatched_skills=unmatched_skills,
-                llm_comment=llm_comment,
-                score=score,
-                positives=positives,
-                negatives=negatives,
-                verdict=verdict
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Ошибка при сохранении результатов: {str(e)}"
-            )
-
-        if not save_success:
-            raise HTTPException(
-                status_code=500,
-                detail="Не удалось сохранить результаты сопоставления в базу данных. Попробуйте позже."
-            )
-
         # Возвращаем результаты
-        return ResumeVacancyMatchResponse(
+        response = ResumeVacancyMatchResponse(
             resume_id=request.resume_id,
             vacancy_id=request.vacancy_id,
             matched_skills=matched_skills,
@@ -492,12 +818,133 @@ def match_stored_resume_with_vacancy(request: StoredResumeVacancyMatchRequest):
             negatives=negatives,
             verdict=verdict
         )
+
+        if existing_match:
+            response.message = "Результаты сопоставления пересчитаны: исходные данные изменились"
+
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при сопоставлении: {str(e)}")
 
 
+def run_stored_match(resume_id: str, resume_text: str, resume_record, vacancy_data, fingerprint: str):
+    """
+    Выполняет сопоставление сохраненных резюме и вакансии и сохраняет результат
+
+    Returns:
+        Кортеж из (совпадающие навыки, несовпадающие навыки, комментарий LLM,
+                   оценка соответствия, плюсы, минусы, вердикт)
+    """
+    # Выполняем сопоставление, используя сохраненные навыки вместо повторного разбора текстов
+    result = services.matcher.match(
+        vacancy_data.get("description", ""),
+        resume_text,
+        vacancy_skills=get_vacancy_skills(vacancy_data),
+        resume_skills=get_resume_skills(resume_id, resume_record)
+    )
+    matched_skills, unmatched_skills, llm_comment, score, positives, negatives, verdict = result
+
+    # Сохраняем результаты в базе данных вместе с отпечатком входных данных
+    try:
+        save_success = services.db_service.save_resume_vacancy_match(
+            match_id=str(uuid.uuid4()),
+            resume_id=resume_id,
+            vacancy_id=vacancy_data["id"],
+            matched_skills=matched_skills,
+            unmatched_skills=unmatched_skills,
+            llm_comment=llm_comment,
+            score=score,
+            positives=positives,
+            negatives=negatives,
+            verdict=verdict,
+            fingerprint=fingerprint
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ошибка при сохранении результатов: {str(e)}"
+        )
+
+    if not save_success:
+        raise HTTPException(
+            status_code=500,
+            detail="Не удалось сохранить результаты сопоставления в базу данных. Попробуйте позже."
+        )
+
+    return result
+
+
+def rematch_pair(resume_id: str, vacancy_id: str):
+    """
+    Пересчитывает сопоставление одной пары резюме и вакансии
+
+    :return: True, если сопоставление пересчитано
+    """
+    resume_text, resume_record = services.db_service.get_resume(resume_id)
+    vacancy_data = services.db_service.get_vacancy(vacancy_id)
+    if not resume_text or not vacancy_data:
+        return False
+
+    fingerprint = services.matcher.get_match_fingerprint(vacancy_data.get("description", ""), resume_text)
+    run_stored_match(resume_id, resume_text, resume_record, vacancy_data, fingerprint)
+    return True
+
+
+@detach_from_request
+async def rematch_stale_matches(pairs):
+    """
+    Пересчитывает устаревшие результаты сопоставления
+
+    Вызывается в фоновой задаче без срока HTTP-запроса, запустившего пересчет.
+    Пары пересчитываются по одной в пуле потоков llm: фоновый пересчет занимает
+    не больше одного потока пула, а при заполненной очереди ждет Retry-After и
+    повторяет попытку, не вытесняя запросы клиентов. Ошибки отдельных пар не
+    прерывают обработку остальных.
+    """
+    rematched = 0
+    for pair in pairs:
+        resume_id, vacancy_id = pair["resume_id"], pair["vacancy_id"]
+        try:
+            while True:
+                try:
+                    rematched += await executors["llm"].run(rematch_pair, resume_id, vacancy_id)
+                    break
+                except ExecutorOverloaded as e:
+                    await asyncio.sleep(e.retry_after)
+        except Exception as e:
+            logger.error("Ошибка при пересчете сопоставления резюме %s и вакансии %s: %s", resume_id, vacancy_id, e)
+
+    logger.info("Пересчитано устаревших сопоставлений: %s из %s", rematched, len(pairs))
+
+
+@router.post("/matches/rematch-stale", response_model=RematchStaleResponse, tags=["Матчинг"])
+@workload("db")
+def rematch_stale(background_tasks: BackgroundTasks, limit: int = Query(100, ge=1, le=10000)):
+    """
+    Пересчет устаревших результатов сопоставления
+
+    - **limit**: Максимальное количество пар, пересчитываемых за один запуск
+
+    Находит сопоставления, у которых изменились тексты резюме или вакансии, модель,
+    версия промпта или версия словаря навыков, и пересчитывает их в фоновом режиме.
+    """
+    from src.services.matcher import PROMPT_VERSION  # модуль загружается контейнером services лениво
+
+    pairs = services.db_service.get_stale_matches(services.matcher.llm_model, PROMPT_VERSION,
+                                                  TERM_NORMALIZER_VERSION, limit)
+    background_tasks.add_task(rematch_stale_matches, pairs)
+
+    return RematchStaleResponse(
+        scheduled=len(pairs),
+        message=f"Запланирован пересчет {len(pairs)} устаревших сопоставлений"
+    )
+
+
 @router.get("/resume/{resume_id}/matches", response_model=List[ResumeVacancyMatchResponse], tags=["Матчинг"])
-def get_resume_matches(resume_id: str):
+@workload("db")
+def get_resume_matches(resume_id: str, request: Request):
     """
     Получение всех сопоставлений для конкретного резюме
 
@@ -506,37 +953,25 @@ def get_resume_matches(resume_id: str):
     Возвращает список всех сопоставлений резюме с вакансиями.
     """
     # Проверяем существование резюме
-    resume_text, resume_record = db_service.get_resume(resume_id)
+    resume_text, resume_record = services.db_service.get_resume(resume_id)
     if not resume_text:
         raise HTTPException(status_code=404, detail=f"Резюме с ID {resume_id} не найдено")
 
     try:
-        # Получаем все сопоставления для резюме
-        matches = db_service.get_resume_matches(resume_id)
-
-        # Преобразуем результаты в формат ответа
-        response_matches = []
-        for match in matches:
-            response_match = ResumeVacancyMatchResponse(
-                resume_id=match.get("resume_id"),
-                vacancy_id=match.get("vacancy_id"),
-                matched_skills=match.get("matched_skills", []),
-                unmatched_skills=match.get("unmatched_skills", []),
-                llm_comment=match.get("llm_comment", ""),
-                score=match.get("score", 0.5),
-                positives=match.get("positives", []),
-                negatives=match.get("negatives", []),
-                verdict=match.get("verdict", "")
-            )
-            response_matches.append(response_match)
+        # Строки базы данных уже содержат только поля модели ResumeVacancyMatchResponse
+        # и сериализуются сразу в JSON, без создания моделей
+        matches = services.db_service.get_resume_matches_for_response(resume_id)
 
-        return response_matches
+        return json_response(request, matches)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при получении сопоставлений: {str(e)}")
 
 
 @router.get("/vacancy/{vacancy_id}/matches", response_model=List[ResumeVacancyMatchResponse], tags=["Матчинг"])
-def get_vacancy_matches(vacancy_id: str):
+@workload("db")
+def get_vacancy_matches(vacancy_id: str, request: Request):
     """
     Получение всех сопоставлений для конкретной вакансии
 
@@ -545,30 +980,204 @@ def get_vacancy_matches(vacancy_id: str):
     Возвращает список всех сопоставлений вакансии с резюме.
     """
     # Проверяем существование вакансии
-    vacancy_data = db_service.get_vacancy(vacancy_id)
+    vacancy_data = services.db_service.get_vacancy(vacancy_id)
     if not vacancy_data:
         raise HTTPException(status_code=404, detail=f"Вакансия с ID {vacancy_id} не найдена")
 
     try:
-        # Получаем все сопоставления для вакансии
-        matches = db_service.get_vacancy_matches(vacancy_id)
-
-        # Преобразуем результаты в формат ответа
-        response_matches = []
-        for match in matches:
-            response_match = ResumeVacancyMatchResponse(
-                resume_id=match.get("resume_id"),
-                vacancy_id=match.get("vacancy_id"),
-                matched_skills=match.get("matched_skills", []),
-                unmatched_skills=match.get("unmatched_skills", []),
-                llm_comment=match.get("llm_comment", ""),
-                score=match.get("score", 0.5),
-                positives=match.get("positives", []),
-                negatives=match.get("negatives", []),
-                verdict=match.get("verdict", "")
-            )
-            response_matches.append(response_match)
+        # Строки базы данных уже содержат только поля модели ResumeVacancyMatchResponse
+        # и сериализуются сразу в JSON, без создания моделей
+        matches = services.db_service.get_vacancy_matches_for_response(vacancy_id)
 
-        return response_matches
+        return json_response(request, matches)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при получении сопоставлений: {str(e)}")
+
+
+def _normalize_query_skills(skills: List[str]):
+    """Приводит навыки из запроса к нормализованным значениям TERM_NORMALIZER"""
+    normalized = []
+    for skill in skills:
+        term = skill.strip().lower()
+        if term:
+            normalized.append(TERM_NORMALIZER.get(term, term))
+    return sorted(set(normalized))
+
+
+def _search_skill_index(index: SkillIndex, skills: List[str], mode: str, k: int, limit: int):
+    """Выполняет поиск по индексу навыков в заданном режиме"""
+    if mode not in SKILL_SEARCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Неизвестный режим поиска: {mode}. Допустимые значения: {', '.join(SKILL_SEARCH_MODES)}"
+        )
+
+    normalized_skills = _normalize_query_skills(skills)
+    if not normalized_skills:
+        raise HTTPException(status_code=400, detail="Не указаны навыки для поиска")
+
+    if mode == "all":
+        doc_ids = index.match_all(normalized_skills)
+        total, found = len(doc_ids), [(doc_id, len(normalized_skills)) for doc_id in doc_ids[:limit]]
+    else:
+        total, found = index.search_at_least(normalized_skills, 1 if mode == "any" else k, limit)
+
+    return SkillSearchResponse(
+        mode=mode,
+        skills=normalized_skills,
+        total=total,
+        matches=[SkillSearchMatch(id=doc_id, matched_count=count) for doc_id, count in found]
+    )
+
+
+@router.get("/skills/resumes", response_model=SkillSearchResponse, tags=["Поиск по навыкам"])
+@workload("cpu")
+def search_resumes_by_skills(
+        skills: List[str] = Query(...),
+        mode: str = "all",
+        k: int = Query(1, ge=1),
+        limit: int = Query(100, ge=1, le=10000)
+):
+    """
+    Поиск резюме по набору навыков
+
+    - **skills**: Навыки (можно указать несколько раз)
+    - **mode**: Режим поиска: all (все навыки), any (любой навык), at_least (не менее k навыков)
+    - **k**: Минимальное количество совпавших навыков для режима at_least
+    - **limit**: Максимальное количество результатов
+
+    Возвращает идентификаторы резюме, отсортированные по количеству совпавших навыков.
+    """
+    return _search_skill_index(resume_skill_index, skills, mode, k, limit)
+
+
+@router.get("/skills/vacancies", response_model=SkillSearchResponse, tags=["Поиск по навыкам"])
+@workload("cpu")
+def search_vacancies_by_skills(
+        skills: List[str] = Query(...),
+        mode: str = "all",
+        k: int = Query(1, ge=1),
+        limit: int = Query(100, ge=1, le=10000)
+):
+    """
+    Поиск вакансий по набору навыков
+
+    - **skills**: Навыки (можно указать несколько раз)
+    - **mode**: Режим поиска: all (все навыки), any (любой навык), at_least (не менее k навыков)
+    - **k**: Минимальное количество совпавших навыков для режима at_least
+    - **limit**: Максимальное количество результатов
+
+    Возвращает идентификаторы вакансий, отсортированные по количеству совпавших навыков.
+    """
+    return _search_skill_index(vacancy_skill_index, skills, mode, k, limit)
+
+
+@router.get("/vacancy/{vacancy_id}/candidates", response_model=SkillSearchResponse, tags=["Поиск по навыкам"])
+@workload("cpu")
+def get_vacancy_candidates(
+        vacancy_id: str,
+        min_skills: int = Query(1, ge=1),
+        limit: int = Query(100, ge=1, le=10000)
+):
+    """
+    Подбор кандидатов для вакансии по индексу навыков
+
+    - **vacancy_id**: Идентификатор вакансии
+    - **min_skills**: Минимальное количество навыков вакансии, которыми должен владеть кандидат
+    - **limit**: Максимальное количество результатов
+
+    Возвращает идентификаторы резюме, отсортированные по количеству совпавших навыков.
+    Если в вакансии не распознано ни одного навыка, список кандидатов пуст.
+    """
+    vacancy_skills = vacancy_skill_index.get_skills(vacancy_id)
+    if not vacancy_skills:
+        vacancy_data = services.db_service.get_vacancy(vacancy_id)
+        if not vacancy_data:
+            raise HTTPException(status_code=404, detail=f"Вакансия с ID {vacancy_id} не найдена")
+
+        vacancy_skills = set(get_vacancy_skills(vacancy_data).keys())
+
+    # В вакансии не распознано ни одного навыка: подходящих кандидатов нет, это не ошибка запроса
+    if not vacancy_skills:
+        return SkillSearchResponse(mode="at_least", skills=[], total=0, matches=[])
+
+    return _search_skill_index(resume_skill_index, sorted(vacancy_skills), "at_least", min_skills, limit)
+
+
+def _rank_by_skill_matrix(matrix: "SkillMatrix", skills, metric: str, limit: int, min_overlap: int):
+    """Ранжирует документы матрицы по набору навыков"""
+    if metric not in SKILL_MATRIX_METRICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Неизвестная метрика: {metric}. Допустимые значения: {', '.join(SKILL_MATRIX_METRICS)}"
+        )
+
+    ranked = matrix.top(skills, metric=metric, limit=limit, min_overlap=min_overlap)
+
+    return SkillRankingResponse(
+        metric=metric,
+        skills=sorted(skills),
+        matches=[SkillScore(**item) for item in ranked]
+    )
+
+
+@router.get("/vacancy/{vacancy_id}/ranking", response_model=SkillRankingResponse, tags=["Поиск по навыкам"])
+@workload("cpu")
+def rank_resumes_for_vacancy(
+        vacancy_id: str,
+        metric: str = "query_coverage",
+        limit: int = Query(100, ge=1, le=10000),
+        min_overlap: int = Query(1, ge=0)
+):
+    """
+    Ранжирование всех резюме по соответствию навыкам вакансии
+
+    - **vacancy_id**: Идентификатор вакансии
+    - **metric**: Метрика ранжирования: overlap, query_coverage (доля навыков вакансии у кандидата),
+      row_coverage, jaccard
+    - **limit**: Максимальное количество результатов
+    - **min_overlap**: Минимальное количество общих навыков
+
+    Возвращает резюме с количеством общих навыков, покрытием и коэффициентом Жаккара.
+    """
+    vacancy_skills = services.vacancy_skill_matrix.get_skills(vacancy_id)
+    if not vacancy_skills:
+        vacancy_data = services.db_service.get_vacancy(vacancy_id)
+        if not vacancy_data:
+            raise HTTPException(status_code=404, detail=f"Вакансия с ID {vacancy_id} не найдена")
+
+        vacancy_skills = set(get_vacancy_skills(vacancy_data).keys())
+
+    return _rank_by_skill_matrix(services.resume_skill_matrix, vacancy_skills, metric, limit, min_overlap)
+
+
+@router.get("/resume/{resume_id}/ranking", response_model=SkillRankingResponse, tags=["Поиск по навыкам"])
+@workload("cpu")
+def rank_vacancies_for_resume(
+        resume_id: str,
+        metric: str = "row_coverage",
+        limit: int = Query(100, ge=1, le=10000),
+        min_overlap: int = Query(1, ge=0)
+):
+    """
+    Ранжирование всех вакансий по соответствию навыкам резюме
+
+    - **resume_id**: Идентификатор резюме
+    - **metric**: Метрика ранжирования: overlap, query_coverage, row_coverage
+      (доля навыков вакансии, которыми владеет кандидат), jaccard
+    - **limit**: Максимальное количество результатов
+    - **min_overlap**: Минимальное количество общих навыков
+
+    Возвращает вакансии с количеством общих навыков, покрытием и коэффициентом Жаккара.
+    """
+    resume_skills = services.resume_skill_matrix.get_skills(resume_id)
+    if not resume_skills:
+        resume_text, resume_record = services.db_service.get_resume(resume_id)
+        if not resume_text:
+            raise HTTPException(status_code=404, detail=f"Резюме с ID {resume_id} не найдено")
+
+        resume_skills = set(get_resume_skills(resume_id, resume_record).keys())
+
+    return _rank_by_skill_matrix(services.vacancy_skill_matrix, resume_skills, metric, limit, min_overlap)
@@ -1,15 +1,23 @@
 import os
+import threading
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
-from src.api.routes import router
+from src.api.routes import router, load_skill_indexes
+from src.utils.config import load_env
+from src.utils.deadline import DeadlineMiddleware
+from src.utils.lifecycle import begin_loading, drain, readiness, warmup, warmup_started
+from src.utils.logger import RequestContextMiddleware, REQUEST_ID_HEADER
+from src.utils.metrics import MetricsMiddleware, metrics_response_body
+from src.utils.profiler import ProfilingMiddleware, request_profiling_enabled, start_periodic_profiler, \
+    stop_periodic_profiler
+from src.utils.tracing import TracingMiddleware, TRACE_ID_HEADER
 
 # Загрузка переменных окружения из .env файла
-load_dotenv()
+load_env()
 
 # Создание экземпляра FastAPI
 app = FastAPI(
@@ -27,8 +35,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_ID_HEADER, REQUEST_ID_HEADER, "ETag", "Last-Modified"],
 )
 
+# Срок обработки запроса (X-Request-Timeout) и отслеживание отключения клиента
+app.add_middleware(DeadlineMiddleware)
+
+# Метрики времени обработки запросов по маршрутам
+app.add_middleware(MetricsMiddleware)
+
+# Трассировка запросов: корневой спан и заголовок X-Trace-Id
+app.add_middleware(TracingMiddleware)
+
+# Профилирование отдельных запросов администратором (только при заданном PROFILING_ADMIN_TOKEN)
+if request_profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# Идентификатор запроса для записей журнала: заголовок X-Request-Id
+app.add_middleware(RequestContextMiddleware)
+
 # Определение пути к статическим файлам
 static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
@@ -64,10 +89,83 @@ def service_info():
             {"path": "/api/upload-resume", "description": "Загрузка и нормализация резюме в формате PDF"},
             {"path": "/api/match-stored-resume", "description": "Сопоставление загруженного резюме с вакансией"},
             {"path": "/api/resumes/{email}", "description": "Получение списка резюме пользователя"},
-            {"path": "/api/normalized-resume/{resume_id}", "description": "Получение нормализованных данных резюме"}
+            {"path": "/api/normalized-resume/{resume_id}", "description": "Получение нормализованных данных резюме"},
+            {"path": "/api/skills/resumes", "description": "Поиск резюме по набору навыков"},
+            {"path": "/api/skills/vacancies", "description": "Поиск вакансий по набору навыков"},
+            {"path": "/api/vacancy/{vacancy_id}/candidates", "description": "Подбор кандидатов для вакансии по навыкам"}
         ]
     }
 
 
+# Метрики в формате Prometheus
+@app.get("/metrics", tags=["Система"], include_in_schema=False)
+def metrics():
+    """
+    Эндпоинт метрик Prometheus
+
+    При запуске нескольких воркеров (PROMETHEUS_MULTIPROC_DIR) значения суммируются по всем процессам.
+    """
+    body, content_type = metrics_response_body()
+    return Response(content=body, media_type=content_type)
+
+
+# Готовность к приему запросов для балансировщика и оркестратора
+@app.get("/ready", tags=["Система"], include_in_schema=False)
+def ready():
+    """
+    Эндпоинт готовности
+
+    Возвращает 200 только после завершения прогрева (миграции, словари навыков,
+    проверка базы данных и LLM) и загрузки индексов навыков этого воркера,
+    и 503 во время прогрева, загрузки индексов и остановки сервиса.
+    """
+    state = readiness()
+    return JSONResponse(content=state, status_code=200 if state["ready"] else 503)
+
+
+# Прогрев при запуске без run.py (например, uvicorn src.main:app)
+@app.on_event("startup")
+def start_warmup():
+    """
+    Запускает прогрев в фоновом потоке, если он не выполнен до запуска воркеров
+
+    Пока прогрев идет, /ready отвечает 503.
+    """
+    if not warmup_started():
+        threading.Thread(target=warmup, name="warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def drain_llm_calls():
+    """Дожидается завершения запросов к LLM перед остановкой процесса"""
+    drain()
+
+
+# Загрузка индексов навыков при старте приложения
+@app.on_event("startup")
+def start_skill_index_loading():
+    """
+    Запускает заполнение индексов навыков в фоновом потоке,
+    чтобы не задерживать старт приложения
+
+    Каждый воркер загружает свои индексы; пока загрузка не завершена, /ready отвечает 503.
+    """
+    begin_loading("skill_indexes")
+    threading.Thread(target=load_skill_indexes, name="skill-index-loader", daemon=True).start()
+
+
+# Периодический профилировщик (только при заданном PROFILING_SAMPLER_INTERVAL)
+@app.on_event("startup")
+def start_profiler():
+    """Запускает периодическую запись отчетов о самых затратных функциях"""
+    start_periodic_profiler()
+
+
+@app.on_event("shutdown")
+def stop_profiler():
+    """Останавливает периодический профилировщик и записывает последний отчет"""
+    stop_periodic_profiler()
+
+
 # Регистрация роутера
 app.include_router(router, prefix="/api")
@@ -0,0 +1,100 @@
+"""
+Общеупотребительные слова английского и русского языков
+
+Нечеткий поиск навыков не применяется к этим словам: обычное слово на
+расстоянии одной опечатки от навыка ("string" — "spring", "member" — "ember",
+"native" — "knative") не должно превращаться в навык. Точное совпадение со
+словарем навыков по-прежнему распознается. Дополнительный словарь можно
+подключить через FUZZY_SKILL_WORDLIST.
+"""
+
+# Слова на расстоянии одной ошибки от терминов TERM_NORMALIZER
+SKILL_NEAR_MISSES = frozenset("""
+string sprint member native linked linker consult trails scalar reacts relays springs docket locker
+stagger telegram vertical clutter rascal groove thrifty mongol sparks sparky swifts embers nomads
+remixes stomps swarms scrums oracles docked rocker rocket socket ranches
+parcels sentries gentry tracks travel mocker masons mesons lambdas kotlins elixirs drones
+""".split())
+
+ENGLISH_WORDS = frozenset("""
+about above across action active actual address advance advice affect after again against agency agent
+agree ahead allow almost alone along already also always amount analysis another answer anyone anything
+appear apply approach area argue around arrive article artist assume attack attend author available avoid
+away background balance based basic beautiful because become before begin behavior behind believe benefit
+better between beyond billion board bring brother budget build business buyer call camera campaign cancer
+candidate capital career carry catch cause center central century certain chair challenge chance change
+character charge check child choice choose church citizen claim class clear client close coach collection
+college color common community company compare complete computer concern condition conference congress
+consider consumer contain continue control could country couple course court cover create crime cultural
+culture current customer daily damage danger debate decade decide decision deep defense degree delivery
+democrat describe design despite detail determine develop developer development difference different
+difficult dinner direction director discover discuss discussion disease doctor dream drive during early
+economic economy education effect effort eight either election else employee energy enjoy enough enter
+entire environment especially establish evening event every everybody everyone everything evidence exactly
+example executive exist expect experience expert explain external factor family father fear federal feeling
+field fight figure final finally financial finish first floor focus follow foreign forget former forward
+founder friend front future garden general generation girl give glass goal good government great green
+ground group grow growth guess hand happen happy hard have head health hear heart heavy help herself high
+himself hire hiring history hold home hope hospital hotel hour house however huge human hundred husband idea
+identify image imagine impact important improve include including increase indeed indicate individual
+industry information inside instead institution interest interesting international interview investment
+involve issue itself join just keep kind kitchen know knowledge land language large last late later laugh
+leader learn least leave left legal less letter level life light likely line list listen little live local
+long look lose loss love machine magazine maintain major majority make manage management manager many
+market marriage material matter maybe mean measure media medical meet meeting memory mention message method
+middle might military million mind minute miss mission model modern moment money month more morning most
+mother mouth move movement movie much music must myself name nation national natural nature near nearly
+necessary need network never news newspaper next nice night none nothing notice number occur offer office
+officer official often once only onto open operation opportunity option order organization other others
+outside over owner page pain paper parent part participant particular partner party pass past patient
+pattern peace people perform performance perhaps period person personal phone physical pick picture piece
+place plan plant play player point police policy political politics poor popular population position
+positive possible power practice prepare present president pressure pretty prevent price private probably
+problem process produce product production professional professor program project property protect prove
+provide public pull purpose push quality question quickly quite race radio raise range rate rather reach
+read ready real reality realize really reason receive recent recently recognize record reduce reflect region
+relate relationship religious remain remember remove report represent republican require research resource
+respond response responsibility rest result return reveal rich right rise risk road rock role room rule safe
+same save scene school science score season seat second section security seek seem sell send senior sense
+series serious serve service seven several shake share shoot short shot should shoulder show side sign
+significant similar simple simply since sing single sister site situation size skill small smile social
+society soldier some somebody someone something sometimes song soon sort sound source south space speak
+special specific speech spend sport spring staff stage stand standard star start state statement station
+stay step still stock stop store story strategy street strong structure student study stuff style subject
+success successful such suddenly suffer suggest summer support sure surface system table take talk task
+teach teacher team technology television tell tend term test than thank that their them themselves then
+theory there these they thing think third this those though thought thousand threat three through
+throughout throw thus time today together tonight total tough toward town trade traditional training travel
+treat treatment tree trial trip trouble true truth turn under understand unit until upon usually value
+various very victim view violence visit voice vote wait walk wall want watch water weapon wear week weight
+well west western what whatever when where whether which while white whole whom whose wide wife will win
+wind window wish with within without woman wonder word work worker world worry would write writer wrong
+yard yeah year young yourself
+""".split())
+
+RUSSIAN_WORDS = frozenset("""
+работа работы работе опыт опытом опыта знание знания знаний умение умения навыки навыков требования
+требование обязанности условия компания компании команда команды командой проект проекта проекты
+проектов разработка разработки разработчик разработчика программист задачи задач решение решения
+система системы систем сервис сервиса сервисов продукт продукта клиент клиентов бизнес процесс процессы
+процессов качество качества поддержка поддержки участие развитие развития обучение обучения зарплата
+график офис офисе удаленно удаленная удаленной полный полная занятость возможность возможности
+ответственность ответственный внимательность коммуникабельность инициативность самостоятельность
+высшее образование образования университет институт факультет специальность специалист специалиста
+ведущий старший младший руководитель руководителя менеджер менеджера директор отдел отдела
+приложение приложения приложений интерфейс интерфейса данные данных база базы документация
+документации тестирование тестирования внедрение внедрения настройка настройки сопровождение
+архитектура архитектуры проектирование проектирования оптимизация оптимизации интеграция интеграции
+анализ анализа отчет отчеты отчетов пользователь пользователей пользователи клиентами партнеров
+хороший хорошее хорошие отличный отличные понимание понимания желание желательно приветствуется
+будет плюсом преимуществом нужно необходимо требуется предлагаем ищем готовы стабильная белая
+оформление официальное трудоустройство премии бонусы компенсация корпоративные мероприятия
+дружный коллектив современный современные технологии технологий инструменты инструментов
+написание написания создание создания улучшение улучшения ревью участвовать проектировать
+разрабатывать поддерживать развивать внедрять оптимизировать писать тестировать анализировать
+лет года годы месяц месяцев неделя день время года город москва россия страна язык языка языком
+русский уровень уровня средний высокий низкий новые новых новый новая старые первый второй
+""".split())
+
+# Все общеупотребительные слова (нижний регистр)
+COMMON_WORDS = SKILL_NEAR_MISSES | ENGLISH_WORDS | RUSSIAN_WORDS
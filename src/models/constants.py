@@ -1,3 +1,12 @@
+import hashlib
+import json
+import os
+
+from src.utils.config import load_env
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
 TERM_NORMALIZER = {
     # Языки программирования
     'python': 'python',
@@ -447,3 +456,44 @@ TERM_NORMALIZER = {
     'continuous delivery': 'cd',
     'continuous deployment': 'cd'
 }
+
+# Ревизия алгоритма извлечения навыков. Увеличивайте при изменении логики поиска
+# навыков в тексте (например, нечеткого сопоставления), чтобы сохраненные навыки пересчитались.
+SKILL_EXTRACTION_REVISION = 3
+
+# Нечеткий поиск навыков (src.services.fuzzy_skills): включение, максимальное редакционное
+# расстояние, минимальная длина токена и файл дополнительных общеупотребительных слов
+FUZZY_SKILL_MATCHING = os.getenv("FUZZY_SKILL_MATCHING", "false").lower() in ("1", "true", "yes")
+FUZZY_SKILL_MAX_DISTANCE = int(os.getenv("FUZZY_SKILL_MAX_DISTANCE", "1"))
+FUZZY_SKILL_MIN_LENGTH = int(os.getenv("FUZZY_SKILL_MIN_LENGTH", "6"))
+FUZZY_SKILL_WORDLIST = os.getenv("FUZZY_SKILL_WORDLIST", "")
+
+
+def _file_digest(path: str):
+    # Содержимое файла, а не только путь: изменение списка слов меняет найденные навыки
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+# Действующие настройки нечеткого поиска (None — отключен): от них зависят извлеченные навыки
+FUZZY_SKILL_CONFIG = {
+    "max_distance": FUZZY_SKILL_MAX_DISTANCE,
+    "min_length": FUZZY_SKILL_MIN_LENGTH,
+    "wordlist": _file_digest(FUZZY_SKILL_WORDLIST) if FUZZY_SKILL_WORDLIST else None
+} if FUZZY_SKILL_MATCHING else None
+
+# Версия словаря нормализации: меняется при любом изменении TERM_NORMALIZER, ревизии алгоритма
+# или настроек нечеткого поиска. Сохраняется вместе с навыками резюме и вакансий и входит в
+# отпечаток сопоставления, чтобы находить устаревшие записи; воркеры с разными настройками
+# записывают навыки под разными версиями.
+TERM_NORMALIZER_VERSION = hashlib.sha1(
+    json.dumps([SKILL_EXTRACTION_REVISION, TERM_NORMALIZER] + ([FUZZY_SKILL_CONFIG] if FUZZY_SKILL_CONFIG else []),
+               sort_keys=True, ensure_ascii=False).encode("utf-8")
+).hexdigest()[:12]
+
+# Метрики, по которым можно ранжировать документы в SkillMatrix
+# (здесь, а не в skill_matrix.py, чтобы проверка параметров запроса не требовала импорта numpy)
+SKILL_MATRIX_METRICS = ("overlap", "query_coverage", "row_coverage", "jaccard")
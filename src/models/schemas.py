@@ -86,6 +86,8 @@ class ResumeNormalizationResponse(BaseModel):
 class VacancyRequest(BaseModel):
     """Запрос на парсинг вакансии с hh.ru"""
     url: str
+    # Обновить уже сохраненную вакансию с тем же original_id вместо создания новой
+    refresh: bool = True
 
 
 class Vacancy(BaseModel):
@@ -109,3 +111,50 @@ class VacancyResponse(BaseModel):
     vacancy: Vacancy
     status: str = "success"
     message: str = "Вакансия успешно загружена и сохранена"
+    # Результат повторной загрузки: created, updated, unchanged, not_modified, closed
+    refresh_status: Optional[str] = None
+    is_closed: bool = False
+    changed_fields: List[str] = []
+    invalidated_matches: int = 0
+
+
+class SkillSearchMatch(BaseModel):
+    """Документ, найденный по навыкам"""
+    id: str
+    matched_count: int
+
+
+class SkillSearchResponse(BaseModel):
+    """Ответ на поиск документов по навыкам"""
+    mode: str
+    skills: List[str]
+    total: int
+    matches: List[SkillSearchMatch]
+
+
+class SkillScore(BaseModel):
+    """Оценка соответствия документа по навыкам"""
+    id: str
+    overlap: int
+    query_coverage: float
+    row_coverage: float
+    jaccard: float
+
+
+class SkillRankingResponse(BaseModel):
+    """Ответ на ранжирование документов по навыкам"""
+    metric: str
+    skills: List[str]
+    matches: List[SkillScore]
+
+
+class RematchStaleResponse(BaseModel):
+    """Ответ на запуск пересчета устаревших сопоставлений"""
+    scheduled: int
+    status: str = "success"
+    message: str = "Пересчет устаревших сопоставлений запланирован"
+
+
+class VacancyBatchRequest(BaseModel):
+    """Запрос на пакетный импорт вакансий с hh.ru"""
+    urls: List[str]
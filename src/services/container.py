@@ -0,0 +1,119 @@
+import threading
+from typing import Callable, Dict, List
+
+from src.utils.logger import get_logger
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+
+class ServiceContainer:
+    """
+    Контейнер сервисов приложения с ленивым созданием
+
+    Каждый сервис создается при первом обращении к одноименному свойству и
+    дальше переиспользуется всеми запросами. Модули сервисов импортируются
+    там же, поэтому импорт приложения не загружает requests, BeautifulSoup,
+    psycopg2, httpx и numpy и не требует переменных окружения LLM: ошибка
+    настройки проявится при первом запросе, которому нужен сервис.
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, object] = {}
+        # Реентерабельная блокировка: фабрики одних сервисов обращаются к другим
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], object]):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = factory()
+                self._instances[name] = instance
+                logger.debug("Создан сервис %s", name)
+            return instance
+
+    def created(self) -> List[str]:
+        """Имена уже созданных сервисов"""
+        return list(self._instances)
+
+    @property
+    def matcher(self):
+        """Сопоставление резюме и вакансий (ResumeVacancyMatcher)"""
+        def create():
+            from src.services.matcher import ResumeVacancyMatcher
+            return ResumeVacancyMatcher()
+
+        return self._get("matcher", create)
+
+    @property
+    def db_service(self):
+        """Работа с базой данных (DBService)"""
+        def create():
+            from src.services.db_service import DBService
+            return DBService()
+
+        return self._get("db_service", create)
+
+    @property
+    def resume_normalizer(self):
+        """Нормализация резюме с помощью LLM (ResumeNormalizer)"""
+        def create():
+            from src.services.normalizer import ResumeNormalizer
+            return ResumeNormalizer()
+
+        return self._get("resume_normalizer", create)
+
+    @property
+    def vacancy_parser(self):
+        """Загрузка и разбор вакансий hh.ru (VacancyParser)"""
+        def create():
+            from src.services.vacancy_parser import VacancyParser
+            return VacancyParser()
+
+        return self._get("vacancy_parser", create)
+
+    @property
+    def vacancy_importer(self):
+        """Пакетный импорт вакансий (пул разбора HTML создается при первом использовании)"""
+        def create():
+            from src.services.vacancy_importer import VacancyBatchImporter
+            return VacancyBatchImporter(db_service=self.db_service, skills_extractor=self._vacancy_skills)
+
+        return self._get("vacancy_importer", create)
+
+    @property
+    def vacancy_refresher(self):
+        """Повторная загрузка вакансий по original_id с условными запросами и дисковым кешем ответов"""
+        def create():
+            from src.services.vacancy_refresher import VacancyRefresher
+            return VacancyRefresher(db_service=self.db_service, parser=self.vacancy_parser,
+                                    skills_extractor=self._vacancy_skills)
+
+        return self._get("vacancy_refresher", create)
+
+    @property
+    def resume_skill_matrix(self):
+        """Битовая матрица навыков резюме для векторного ранжирования"""
+        return self._get("resume_skill_matrix", self._create_skill_matrix)
+
+    @property
+    def vacancy_skill_matrix(self):
+        """Битовая матрица навыков вакансий для векторного ранжирования"""
+        return self._get("vacancy_skill_matrix", self._create_skill_matrix)
+
+    @staticmethod
+    def _create_skill_matrix():
+        from src.services.skill_matrix import SkillMatrix
+        return SkillMatrix()
+
+    def _vacancy_skills(self, description: str, skills=None):
+        """Нормализованные навыки вакансии по описанию и тегам навыков"""
+        return self.matcher.extract_canonical_skills(description, skills or [])
+
+
+# Сервисы приложения
+services = ServiceContainer()
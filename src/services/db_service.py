@@ -2,11 +2,23 @@ import os
 from typing import Optional, Dict, Any, List
 
 import psycopg2
-from dotenv import load_dotenv
-from psycopg2.extras import Json, RealDictCursor
+from psycopg2.extras import Json, RealDictCursor, execute_values, register_default_jsonb
+
+from src.models.constants import TERM_NORMALIZER_VERSION
+from src.models.schemas import ResumeVacancyMatchResponse
+from src.services.row_cache import invalidate_rows, invalidation_listener, notify_payloads, row_caches
+from src.utils.config import load_env
+from src.utils.deadline import enforce_deadline, remaining_seconds
+from src.utils.fast_json import loads as json_loads
+from src.utils.logger import SAMPLED, get_logger
+from src.utils.metrics import instrument_db_methods
+from src.utils.tracing import trace_methods
 
 # Загружаем переменные окружения
-load_dotenv()
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
 
 # Константы для подключения к базе данных
 DB_HOST = os.getenv("DB_HOST", "localhost")
@@ -15,8 +27,43 @@ DB_NAME = os.getenv("DB_NAME", "postgres")
 DB_SCHEMA = os.getenv("DB_SCHEMA", "resume_db")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
+# Часовой пояс сессии: CURRENT_TIMESTAMP записывается в столбцы TIMESTAMP без пояса
+# по времени сессии, а HTTP-заголовки Last-Modified и сравнение с If-Modified-Since
+# считают эти значения временем UTC
+DB_SESSION_OPTIONS = "-c timezone=UTC"
+# Столбцы ответа API со списком сопоставлений (модель ResumeVacancyMatchResponse)
+MATCH_RESPONSE_COLUMNS = """
+    m.resume_id, m.vacancy_id,
+    COALESCE(m.matched_skills, '[]'::jsonb) AS matched_skills,
+    COALESCE(m.unmatched_skills, '[]'::jsonb) AS unmatched_skills,
+    COALESCE(m.llm_comment, '') AS llm_comment,
+    COALESCE(m.score, 0.5) AS score,
+    COALESCE(m.positives, '[]'::jsonb) AS positives,
+    COALESCE(m.negatives, '[]'::jsonb) AS negatives,
+    COALESCE(m.verdict, '') AS verdict,
+    %(status)s AS status,
+    %(message)s AS message
+"""
+# Значения полей status и message сохраненного сопоставления по умолчанию
+MATCH_RESPONSE_DEFAULTS = {
+    "status": ResumeVacancyMatchResponse.model_fields["status"].default,
+    "message": ResumeVacancyMatchResponse.model_fields["message"].default
+}
+
+# Порядок выбора одной из вакансий с одинаковым original_id (после прежних импортов): сначала
+# вакансия, на которую уже ссылаются сопоставления, затем по id. created_at не подходит —
+# повторное сохранение вакансии его обновляет
+VACANCY_BY_ORIGINAL_ID_ORDER = f"""
+    NOT EXISTS (SELECT 1 FROM {DB_SCHEMA}.resume_vacancy_matches m WHERE m.vacancy_id = v.id), v.id
+"""
 
+# Канал LISTEN/NOTIFY для уведомлений об изменении строк в кешах воркеров (свой для каждой схемы)
+ROW_CACHE_CHANNEL = f"{DB_SCHEMA}_row_cache"
 
+
+@trace_methods("db")
+@instrument_db_methods
+@enforce_deadline
 class DBService:
     """Сервис для работы с базой данных PostgreSQL"""
 
@@ -27,28 +74,32 @@ class DBService:
             "database": DB_NAME,
             "user": DB_USER,
             "password": DB_PASSWORD,
-            "port": DB_PORT
+            "port": DB_PORT,
+            "options": DB_SESSION_OPTIONS
         }
 
         # Проверка наличия параметров подключения
         self._check_db_params()
 
+        # Слушатель уведомлений для кешей строк запускается при первом чтении из кеша
+        invalidation_listener.configure(self.conn_params, ROW_CACHE_CHANNEL)
+
     def _check_db_params(self):
         """Проверка параметров подключения к базе данных"""
         if not DB_HOST:
-            print("ВНИМАНИЕ: Не указан DB_HOST, используется значение по умолчанию: localhost")
+            logger.warning("Не указан DB_HOST, используется значение по умолчанию: localhost")
 
         if not DB_NAME:
-            print("ВНИМАНИЕ: Не указан DB_NAME, используется значение по умолчанию: postgres")
+            logger.warning("Не указан DB_NAME, используется значение по умолчанию: postgres")
 
         if not DB_SCHEMA:
-            print("ВНИМАНИЕ: Не указан DB_SCHEMA, используется значение по умолчанию: resume_db")
+            logger.warning("Не указан DB_SCHEMA, используется значение по умолчанию: resume_db")
 
         if not DB_USER:
-            print("ВНИМАНИЕ: Не указан DB_USER, используется значение по умолчанию: postgres")
+            logger.warning("Не указан DB_USER, используется значение по умолчанию: postgres")
 
         if not DB_PASSWORD:
-            print("ВНИМАНИЕ: DB_PASSWORD не указан")
+            logger.warning("DB_PASSWORD не указан")
 
     def _get_connection(self):
         """Получение соединения с базой данных"""
@@ -56,11 +107,45 @@ class DBService:
         # Устанавливаем схему по умолчанию
         cursor = conn.cursor()
         cursor.execute(f"SET search_path TO {DB_SCHEMA}")
+        # Запросы не выполняются дольше оставшегося времени HTTP-запроса
+        remaining = remaining_seconds()
+        if remaining is not None:
+            cursor.execute("SET statement_timeout = %s", (max(1, int(remaining * 1000)),))
         cursor.close()
         return conn
 
+    def _fetch_response_rows(self, query: str, params=None):
+        """
+        Читает строки в виде словарей {столбец: значение} для быстрых JSON-ответов
+
+        Обычный курсор без RealDictCursor: словарь создается один раз из кортежа
+        строки, а JSONB разбирается через orjson (если установлен).
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            register_default_jsonb(cursor, loads=json_loads)
+            cursor.execute(query, params)
+            columns = [column.name for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+            cursor.close()
+            return rows
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _notify_changed(cursor, kind: str, ids: List[str]):
+        """
+        Уведомляет воркеры об изменении строк (вид: resume, normalized_resume, vacancy)
+
+        Вызывается в транзакции записи до commit: уведомление доставляется только
+        после фиксации и только если транзакция зафиксирована.
+        """
+        for payload in notify_payloads(kind, ids):
+            cursor.execute("SELECT pg_notify(%s, %s)", (ROW_CACHE_CHANNEL, payload))
+
     def save_resume(self, resume_id: str, email: str, raw_text: str, metadata: Optional[Dict] = None,
-                    pdf_content: Optional[bytes] = None):
+                    pdf_content: Optional[bytes] = None, skills_canonical: Optional[Dict[str, List[str]]] = None):
         """
         Сохраняет сырое резюме в базу данных
         
@@ -70,33 +155,48 @@ class DBService:
             raw_text: Исходный текст резюме
             metadata: Метаданные резюме
             pdf_content: Содержимое PDF-файла в бинарном формате
+            skills_canonical: Нормализованные навыки резюме {навык: оригинальные формы}
             
         Returns:
             True, если резюме успешно сохранено
         """
         query = f"""
-        INSERT INTO {DB_SCHEMA}.resumes (id, email, raw_text, metadata, pdf_content)
-        VALUES (%s, %s, %s, %s, %s)
+        INSERT INTO {DB_SCHEMA}.resumes (
+            id, email, raw_text, metadata, pdf_content, skills_canonical, skills_vocab_version
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (id) DO UPDATE
         SET email = EXCLUDED.email,
             raw_text = EXCLUDED.raw_text,
             metadata = EXCLUDED.metadata,
             pdf_content = EXCLUDED.pdf_content,
+            skills_canonical = EXCLUDED.skills_canonical,
+            skills_vocab_version = EXCLUDED.skills_vocab_version,
             created_at = CURRENT_TIMESTAMP
         """
 
         try:
-            print(f"Сохранение резюме с ID {resume_id} для {email}")
+            logger.debug("Сохранение резюме с ID %s для %s", resume_id, email)
             conn = self._get_connection()
             cursor = conn.cursor()
-            cursor.execute(query, (resume_id, email, raw_text, Json(metadata or {}), pdf_content))
+            cursor.execute(query, (
+                resume_id,
+                email,
+                raw_text,
+                Json(metadata or {}),
+                pdf_content,
+                Json(skills_canonical) if skills_canonical is not None else None,
+                TERM_NORMALIZER_VERSION if skills_canonical is not None else None
+            ))
+            self._notify_changed(cursor, "resume", [resume_id])
             conn.commit()
             cursor.close()
             conn.close()
-            print(f"Резюме с ID {resume_id} успешно сохранено")
+            invalidate_rows("resume", [resume_id])
+            logger.info("Резюме с ID %s успешно сохранено", resume_id, extra=SAMPLED)
             return True
         except Exception as e:
-            print(f"Ошибка при сохранении резюме: {str(e)}")
+            logger.error("Ошибка при сохранении резюме: %s", e)
             return False
 
     def save_normalized_resume(self, resume_id: str, normalized_data: Dict[str, Any]):
@@ -128,7 +228,7 @@ class DBService:
         """
 
         try:
-            print(f"Сохранение нормализованных данных для резюме с ID {resume_id}")
+            logger.debug("Сохранение нормализованных данных для резюме с ID %s", resume_id)
 
             # Проверяем, существует ли резюме в базе данных
             check_query = f"""
@@ -140,7 +240,7 @@ class DBService:
 
             cursor.execute(check_query, (resume_id,))
             if not cursor.fetchone():
-                print(f"Ошибка: Резюме с ID {resume_id} не найдено в базе данных")
+                logger.error("Ошибка: Резюме с ID %s не найдено в базе данных", resume_id)
                 cursor.close()
                 conn.close()
                 return False
@@ -156,19 +256,24 @@ class DBService:
                 Json(normalized_data.get("education", [])),
                 Json(normalized_data.get("work_experience", []))
             ))
+            self._notify_changed(cursor, "normalized_resume", [resume_id])
             conn.commit()
             cursor.close()
             conn.close()
-            print(f"Нормализованные данные для резюме с ID {resume_id} успешно сохранены")
+            invalidate_rows("normalized_resume", [resume_id])
+            logger.info("Нормализованные данные для резюме с ID %s успешно сохранены", resume_id, extra=SAMPLED)
             return True
         except Exception as e:
-            print(f"Ошибка при сохранении нормализованных данных: {str(e)}")
+            logger.error("Ошибка при сохранении нормализованных данных: %s", e)
             return False
 
     def get_normalized_resume(self, resume_id: str):
         """
-        Получает нормализованные данные резюме
+        Получает нормализованные данные резюме (через кеш строк)
         """
+        return row_caches["normalized_resume"].get(resume_id, lambda: self._fetch_normalized_resume(resume_id))
+
+    def _fetch_normalized_resume(self, resume_id: str):
         query = f"""
         SELECT * FROM {DB_SCHEMA}.normalized_resumes
         WHERE id = %s
@@ -184,15 +289,25 @@ class DBService:
 
             return dict(result) if result else None
         except Exception as e:
-            print(f"Ошибка при получении нормализованных данных: {str(e)}")
+            logger.error("Ошибка при получении нормализованных данных: %s", e)
             return None
 
     def get_resume(self, resume_id: str):
         """
-        Получает резюме по идентификатору из базы данных
+        Получает резюме по идентификатору (через кеш строк)
+
+        Returns:
+            Кортеж (текст резюме, запись) или (None, None), если резюме не найдено
         """
+        record = row_caches["resume"].get(resume_id, lambda: self._fetch_resume(resume_id))
+        if record is None:
+            return None, None
+        return record.get("raw_text", ""), record
+
+    def _fetch_resume(self, resume_id: str):
         query = f"""
-        SELECT id, email, raw_text, metadata, created_at FROM {DB_SCHEMA}.resumes
+        SELECT id, email, raw_text, metadata, skills_canonical, skills_vocab_version, created_at
+        FROM {DB_SCHEMA}.resumes
         WHERE id = %s
         """
 
@@ -204,14 +319,10 @@ class DBService:
             cursor.close()
             conn.close()
 
-            if not result:
-                return None, None
-
-            record = dict(result)
-            return record.get("raw_text", ""), record
+            return dict(result) if result else None
         except Exception as e:
-            print(f"Ошибка при получении резюме: {str(e)}")
-            return None, None
+            logger.error("Ошибка при получении резюме: %s", e)
+            return None
 
     def get_resume_pdf(self, resume_id: str):
         """
@@ -232,7 +343,7 @@ class DBService:
 
             return result[0] if result and result[0] else None
         except Exception as e:
-            print(f"Ошибка при получении PDF-файла резюме: {str(e)}")
+            logger.error("Ошибка при получении PDF-файла резюме: %s", e)
             return None
 
     def get_resumes_by_email(self, email: str):
@@ -261,14 +372,251 @@ class DBService:
 
             return [dict(r) for r in results] if results else []
         except Exception as e:
-            print(f"Ошибка при получении резюме пользователя: {str(e)}")
+            logger.error("Ошибка при получении резюме пользователя: %s", e)
             return []
 
+    def iter_resume_skills(self, batch_size: int = 1000):
+        """
+        Последовательно возвращает сохраненные навыки всех резюме без загрузки таблицы в память
+
+        Args:
+            batch_size: Количество строк, получаемых с сервера за один раз
+
+        Returns:
+            Генератор кортежей (идентификатор резюме, навыки, версия словаря навыков)
+        """
+        query = f"""
+        SELECT id, skills_canonical, skills_vocab_version FROM {DB_SCHEMA}.resumes
+        """
+
+        conn = None
+        try:
+            conn = self._get_connection()
+            # Именованный курсор читает строки порциями на стороне сервера
+            cursor = conn.cursor(name="iter_resume_skills")
+            cursor.itersize = batch_size
+            cursor.execute(query)
+            for resume_id, skills_canonical, skills_vocab_version in cursor:
+                yield resume_id, skills_canonical or {}, skills_vocab_version
+            cursor.close()
+        except Exception as e:
+            logger.error("Ошибка при чтении навыков резюме: %s", e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def iter_vacancy_skills(self, batch_size: int = 1000):
+        """
+        Последовательно возвращает сохраненные навыки всех вакансий
+
+        Args:
+            batch_size: Количество строк, получаемых с сервера за один раз
+
+        Returns:
+            Генератор кортежей (идентификатор вакансии, навыки, версия словаря навыков)
+        """
+        query = f"""
+        SELECT id, skills_canonical, skills_vocab_version FROM {DB_SCHEMA}.vacancies
+        """
+
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(name="iter_vacancy_skills")
+            cursor.itersize = batch_size
+            cursor.execute(query)
+            for vacancy_id, skills_canonical, skills_vocab_version in cursor:
+                yield vacancy_id, skills_canonical or {}, skills_vocab_version
+            cursor.close()
+        except Exception as e:
+            logger.error("Ошибка при чтении навыков вакансий: %s", e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _get_skills(self, table: str, ids: List[str]):
+        """Сохраненные навыки строк таблицы (resumes или vacancies) по идентификаторам"""
+        query = f"""
+        SELECT id, skills_canonical FROM {DB_SCHEMA}.{table}
+        WHERE id = ANY(%s)
+        """
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, (list(ids),))
+        result = {row_id: skills_canonical or {} for row_id, skills_canonical in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+        return result
+
+    def get_resume_skills(self, resume_ids: List[str]):
+        """
+        Получает сохраненные навыки нескольких резюме
+
+        Args:
+            resume_ids: Идентификаторы резюме
+
+        Returns:
+            Словарь {идентификатор резюме: навыки} для найденных резюме или None при ошибке
+        """
+        try:
+            return self._get_skills("resumes", resume_ids)
+        except Exception as e:
+            logger.error("Ошибка при чтении навыков резюме: %s", e)
+            return None
+
+    def get_vacancy_skills(self, vacancy_ids: List[str]):
+        """
+        Получает сохраненные навыки нескольких вакансий
+
+        Args:
+            vacancy_ids: Идентификаторы вакансий
+
+        Returns:
+            Словарь {идентификатор вакансии: навыки} для найденных вакансий или None при ошибке
+        """
+        try:
+            return self._get_skills("vacancies", vacancy_ids)
+        except Exception as e:
+            logger.error("Ошибка при чтении навыков вакансий: %s", e)
+            return None
+
+    def iter_stale_resumes(self, batch_size: int = 500):
+        """
+        Возвращает резюме, навыки которых вычислены по другой версии словаря
+
+        Args:
+            batch_size: Количество строк, получаемых с сервера за один раз
+
+        Returns:
+            Генератор кортежей (идентификатор резюме, текст резюме, языки, фреймворки)
+        """
+        query = f"""
+        SELECT r.id, r.raw_text, n.languages, n.frameworks
+        FROM {DB_SCHEMA}.resumes r
+        LEFT JOIN {DB_SCHEMA}.normalized_resumes n ON n.id = r.id
+        WHERE r.skills_vocab_version IS DISTINCT FROM %s
+        """
+
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(name="iter_stale_resumes")
+            cursor.itersize = batch_size
+            cursor.execute(query, (TERM_NORMALIZER_VERSION,))
+            for resume_id, raw_text, languages, frameworks in cursor:
+                yield resume_id, raw_text or "", languages or [], frameworks or []
+            cursor.close()
+        except Exception as e:
+            logger.error("Ошибка при чтении устаревших навыков резюме: %s", e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def iter_stale_vacancies(self, batch_size: int = 500):
+        """
+        Возвращает вакансии, навыки которых вычислены по другой версии словаря
+
+        Args:
+            batch_size: Количество строк, получаемых с сервера за один раз
+
+        Returns:
+            Генератор кортежей (идентификатор вакансии, описание, список навыков)
+        """
+        query = f"""
+        SELECT id, description, skills FROM {DB_SCHEMA}.vacancies
+        WHERE skills_vocab_version IS DISTINCT FROM %s
+        """
+
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(name="iter_stale_vacancies")
+            cursor.itersize = batch_size
+            cursor.execute(query, (TERM_NORMALIZER_VERSION,))
+            for vacancy_id, description, skills in cursor:
+                yield vacancy_id, description or "", skills or []
+            cursor.close()
+        except Exception as e:
+            logger.error("Ошибка при чтении устаревших навыков вакансий: %s", e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _save_skills(self, table: str, kind: str, skills_by_id: Dict[str, Dict[str, List[str]]]):
+        """
+        Обновляет нормализованные навыки нескольких строк таблицы одним запросом
+
+        Args:
+            table: Таблица (resumes или vacancies)
+            kind: Вид строк для кеша строк (resume или vacancy)
+            skills_by_id: Словарь {идентификатор: {навык: оригинальные формы}}
+        """
+        query = f"""
+        UPDATE {DB_SCHEMA}.{table} AS t
+        SET skills_canonical = v.skills_canonical::jsonb,
+            skills_vocab_version = v.skills_vocab_version
+        FROM (VALUES %s) AS v(id, skills_canonical, skills_vocab_version)
+        WHERE t.id = v.id
+        """
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        execute_values(cursor, query, [
+            (row_id, Json(skills), TERM_NORMALIZER_VERSION) for row_id, skills in skills_by_id.items()
+        ])
+        self._notify_changed(cursor, kind, list(skills_by_id))
+        conn.commit()
+        cursor.close()
+        conn.close()
+        invalidate_rows(kind, list(skills_by_id))
+
+    def save_resume_skills(self, skills_by_id: Dict[str, Dict[str, List[str]]]):
+        """
+        Сохраняет нормализованные навыки резюме
+
+        Args:
+            skills_by_id: Словарь {идентификатор резюме: {навык: оригинальные формы}}
+
+        Returns:
+            True, если навыки успешно сохранены
+        """
+        if not skills_by_id:
+            return True
+
+        try:
+            self._save_skills("resumes", "resume", skills_by_id)
+            return True
+        except Exception as e:
+            logger.error("Ошибка при сохранении навыков резюме: %s", e)
+            return False
+
+    def save_vacancy_skills(self, skills_by_id: Dict[str, Dict[str, List[str]]]):
+        """
+        Сохраняет нормализованные навыки вакансий
+
+        Args:
+            skills_by_id: Словарь {идентификатор вакансии: {навык: оригинальные формы}}
+
+        Returns:
+            True, если навыки успешно сохранены
+        """
+        if not skills_by_id:
+            return True
+
+        try:
+            self._save_skills("vacancies", "vacancy", skills_by_id)
+            return True
+        except Exception as e:
+            logger.error("Ошибка при сохранении навыков вакансий: %s", e)
+            return False
+
     def save_vacancy(self, vacancy_id: str, title: str, company: str, description: str,
                      url: str, original_id: Optional[str] = None,
                      salary_from: Optional[int] = None, salary_to: Optional[int] = None,
                      currency: Optional[str] = None, experience: Optional[str] = None,
-                     skills: Optional[List[str]] = None):
+                     skills: Optional[List[str]] = None,
+                     skills_canonical: Optional[Dict[str, List[str]]] = None):
         """
         Сохраняет вакансию в базу данных
         
@@ -284,6 +632,7 @@ class DBService:
             currency: Валюта зарплаты
             experience: Опыт работы
             skills: Список требуемых навыков
+            skills_canonical: Нормализованные навыки вакансии {навык: оригинальные формы}
             
         Returns:
             True, если вакансия успешно сохранена
@@ -291,9 +640,10 @@ class DBService:
         query = f"""
         INSERT INTO {DB_SCHEMA}.vacancies (
             id, title, company, description, url, original_id, 
-            salary_from, salary_to, currency, experience, skills
+            salary_from, salary_to, currency, experience, skills,
+            skills_canonical, skills_vocab_version
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (id) DO UPDATE
         SET title = EXCLUDED.title,
             company = EXCLUDED.company,
@@ -305,11 +655,13 @@ class DBService:
             currency = EXCLUDED.currency,
             experience = EXCLUDED.experience,
             skills = EXCLUDED.skills,
+            skills_canonical = EXCLUDED.skills_canonical,
+            skills_vocab_version = EXCLUDED.skills_vocab_version,
             created_at = CURRENT_TIMESTAMP
         """
 
         try:
-            print(f"Сохранение вакансии с ID {vacancy_id} - {title}")
+            logger.debug("Сохранение вакансии с ID %s - %s", vacancy_id, title)
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute(query, (
@@ -323,21 +675,149 @@ class DBService:
                 salary_to,
                 currency,
                 experience,
-                Json(skills or [])
+                Json(skills or []),
+                Json(skills_canonical) if skills_canonical is not None else None,
+                TERM_NORMALIZER_VERSION if skills_canonical is not None else None
             ))
+            self._notify_changed(cursor, "vacancy", [vacancy_id])
+            conn.commit()
+            cursor.close()
+            conn.close()
+            invalidate_rows("vacancy", [vacancy_id])
+            logger.info("Вакансия с ID %s успешно сохранена", vacancy_id, extra=SAMPLED)
+            return True
+        except Exception as e:
+            logger.error("Ошибка при сохранении вакансии: %s", e)
+            return False
+
+    @staticmethod
+    def _vacancy_ids_by_original_id(cursor, original_ids: List[str]):
+        """
+        Идентификаторы уже сохраненных вакансий по оригинальным ID на hh.ru
+
+        Для original_id с несколькими строками выбирается та же вакансия,
+        что и в get_vacancy_by_original_id.
+        """
+        if not original_ids:
+            return {}
+        cursor.execute(f"""
+        SELECT DISTINCT ON (v.original_id) v.original_id, v.id FROM {DB_SCHEMA}.vacancies v
+        WHERE v.original_id = ANY(%s)
+        ORDER BY v.original_id, {VACANCY_BY_ORIGINAL_ID_ORDER}
+        """, (list(original_ids),))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def get_vacancy_ids_by_original_ids(self, original_ids: List[str]):
+        """
+        Получает идентификаторы сохраненных вакансий по оригинальным ID на hh.ru
+
+        Returns:
+            Словарь {original_id: id} для найденных вакансий
+        """
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            result = self._vacancy_ids_by_original_id(cursor, original_ids)
+            cursor.close()
+            conn.close()
+            return result
+        except Exception as e:
+            logger.error("Ошибка при получении вакансий по оригинальным ID: %s", e)
+            return {}
+
+    def save_vacancies(self, vacancies: List[Dict[str, Any]]):
+        """
+        Сохраняет несколько вакансий одним запросом
+
+        Вакансия с original_id, который уже есть в базе данных, обновляет
+        существующую строку: ее идентификатор записывается в словарь вакансии
+        вместо нового. Повторы одного original_id в пакете сохраняются один раз.
+
+        Args:
+            vacancies: Список словарей с данными вакансий (ключи совпадают с параметрами save_vacancy)
+
+        Returns:
+            True, если вакансии успешно сохранены
+        """
+        if not vacancies:
+            return True
+
+        query = f"""
+        INSERT INTO {DB_SCHEMA}.vacancies (
+            id, title, company, description, url, original_id, 
+            salary_from, salary_to, currency, experience, skills,
+            skills_canonical, skills_vocab_version
+        )
+        VALUES %s
+        ON CONFLICT (id) DO UPDATE
+        SET title = EXCLUDED.title,
+            company = EXCLUDED.company,
+            description = EXCLUDED.description,
+            url = EXCLUDED.url,
+            original_id = EXCLUDED.original_id,
+            salary_from = EXCLUDED.salary_from,
+            salary_to = EXCLUDED.salary_to,
+            currency = EXCLUDED.currency,
+            experience = EXCLUDED.experience,
+            skills = EXCLUDED.skills,
+            skills_canonical = EXCLUDED.skills_canonical,
+            skills_vocab_version = EXCLUDED.skills_vocab_version,
+            created_at = CURRENT_TIMESTAMP
+        """
+
+        try:
+            logger.debug("Сохранение %s вакансий", len(vacancies))
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            # Существующие строки ищутся в той же транзакции, что и запись
+            original_ids = {vacancy["original_id"] for vacancy in vacancies if vacancy.get("original_id")}
+            existing_ids = self._vacancy_ids_by_original_id(cursor, original_ids)
+
+            # Одна строка на идентификатор: INSERT ... ON CONFLICT не обновляет строку дважды
+            rows_by_id = {}
+            for vacancy in vacancies:
+                original_id = vacancy.get("original_id")
+                if original_id:
+                    vacancy["id"] = existing_ids.setdefault(original_id, vacancy["id"])
+                skills_canonical = vacancy.get("skills_canonical")
+                rows_by_id[vacancy["id"]] = (
+                    vacancy["id"],
+                    vacancy.get("title"),
+                    vacancy.get("company"),
+                    vacancy.get("description"),
+                    vacancy.get("url"),
+                    original_id,
+                    vacancy.get("salary_from"),
+                    vacancy.get("salary_to"),
+                    vacancy.get("currency"),
+                    vacancy.get("experience"),
+                    Json(vacancy.get("skills") or []),
+                    Json(skills_canonical) if skills_canonical is not None else None,
+                    TERM_NORMALIZER_VERSION if skills_canonical is not None else None
+                )
+            rows = list(rows_by_id.values())
+
+            execute_values(cursor, query, rows, page_size=500)
+            vacancy_ids = [row[0] for row in rows]
+            self._notify_changed(cursor, "vacancy", vacancy_ids)
             conn.commit()
             cursor.close()
             conn.close()
-            print(f"Вакансия с ID {vacancy_id} успешно сохранена")
+            invalidate_rows("vacancy", vacancy_ids)
+            logger.info("%s вакансий успешно сохранено", len(rows), extra=SAMPLED)
             return True
         except Exception as e:
-            print(f"Ошибка при сохранении вакансии: {str(e)}")
+            logger.error("Ошибка при сохранении вакансий: %s", e)
             return False
 
     def get_vacancy(self, vacancy_id: str):
         """
-        Получает вакансию по идентификатору
+        Получает вакансию по идентификатору (через кеш строк)
         """
+        return row_caches["vacancy"].get(vacancy_id, lambda: self._fetch_vacancy(vacancy_id))
+
+    def _fetch_vacancy(self, vacancy_id: str):
         query = f"""
         SELECT * FROM {DB_SCHEMA}.vacancies
         WHERE id = %s
@@ -353,9 +833,145 @@ class DBService:
 
             return dict(result) if result else None
         except Exception as e:
-            print(f"Ошибка при получении вакансии: {str(e)}")
+            logger.error("Ошибка при получении вакансии: %s", e)
             return None
 
+    def get_vacancy_by_original_id(self, original_id: str):
+        """
+        Получает вакансию по оригинальному ID на hh.ru
+
+        Если из-за прежних импортов вакансий с одним original_id несколько,
+        выбор не зависит от повторных сохранений: возвращается вакансия, на
+        которую ссылаются сопоставления, а среди равных — с наименьшим id.
+        """
+        query = f"""
+        SELECT v.* FROM {DB_SCHEMA}.vacancies v
+        WHERE v.original_id = %s
+        ORDER BY {VACANCY_BY_ORIGINAL_ID_ORDER}
+        LIMIT 1
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, (original_id,))
+            result = cursor.fetchone()
+            cursor.close()
+            conn.close()
+
+            return dict(result) if result else None
+        except Exception as e:
+            logger.error("Ошибка при получении вакансии по оригинальному ID: %s", e)
+            return None
+
+    def invalidate_vacancy_matches(self, vacancy_id: str):
+        """
+        Помечает результаты сопоставления вакансии как устаревшие
+
+        Отпечаток сбрасывается, поэтому сохраненный результат не будет
+        переиспользован и попадет в выборку get_stale_matches.
+
+        Returns:
+            Количество затронутых сопоставлений или None при ошибке
+        """
+        query = f"""
+        UPDATE {DB_SCHEMA}.resume_vacancy_matches
+        SET fingerprint = NULL
+        WHERE vacancy_id = %s
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query, (vacancy_id,))
+            invalidated = cursor.rowcount
+            conn.commit()
+            cursor.close()
+            conn.close()
+            logger.info("Сброшено сопоставлений вакансии %s: %s", vacancy_id, invalidated)
+            return invalidated
+        except Exception as e:
+            logger.error("Ошибка при сбросе сопоставлений вакансии: %s", e)
+            return None
+
+    def get_vacancies_to_check(self, recheck_after_hours: float, limit: int):
+        """
+        Получает открытые вакансии, которые пора проверить на hh.ru
+
+        Первыми идут вакансии, которые недавно сопоставлялись с резюме или
+        были недавно добавлены; вакансии без проверок — раньше проверенных.
+        Время добавления берется из first_seen_at: created_at обновляется при
+        каждом сохранении, в том числе при самой проверке.
+
+        Args:
+            recheck_after_hours: Минимальный интервал между проверками одной вакансии в часах
+            limit: Максимальное количество вакансий
+
+        Returns:
+            Список словарей с id, url, original_id и checked_at
+        """
+        query = f"""
+        SELECT v.id, v.url, v.original_id, v.checked_at
+        FROM {DB_SCHEMA}.vacancies v
+        LEFT JOIN (
+            SELECT vacancy_id, MAX(created_at) AS last_matched_at
+            FROM {DB_SCHEMA}.resume_vacancy_matches
+            GROUP BY vacancy_id
+        ) m ON m.vacancy_id = v.id
+        WHERE NOT v.is_closed
+          AND v.original_id IS NOT NULL
+          AND (v.checked_at IS NULL OR v.checked_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 hour')
+        ORDER BY GREATEST(m.last_matched_at, v.first_seen_at) DESC,
+                 v.checked_at NULLS FIRST
+        LIMIT %s
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, (recheck_after_hours, limit))
+            results = cursor.fetchall()
+            cursor.close()
+            conn.close()
+
+            return [dict(r) for r in results] if results else []
+        except Exception as e:
+            logger.error("Ошибка при получении вакансий для проверки: %s", e)
+            return []
+
+    def mark_vacancy_checked(self, vacancy_id: str, is_closed: bool = False):
+        """
+        Сохраняет результат проверки вакансии на hh.ru
+
+        Args:
+            vacancy_id: Идентификатор вакансии
+            is_closed: Вакансия закрыта (в архиве или удалена)
+
+        Returns:
+            True, если данные успешно сохранены
+        """
+        query = f"""
+        UPDATE {DB_SCHEMA}.vacancies
+        SET checked_at = CURRENT_TIMESTAMP,
+            is_closed = %s,
+            closed_at = CASE WHEN %s THEN COALESCE(closed_at, CURRENT_TIMESTAMP) END
+        WHERE id = %s
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query, (is_closed, is_closed, vacancy_id))
+            self._notify_changed(cursor, "vacancy", [vacancy_id])
+            conn.commit()
+            cursor.close()
+            conn.close()
+            invalidate_rows("vacancy", [vacancy_id])
+            return True
+        except Exception as e:
+            logger.error("Ошибка при сохранении результата проверки вакансии: %s", e)
+            return False
+
     def get_all_vacancies(self):
         """
         Получает все вакансии из базы данных
@@ -378,13 +994,63 @@ class DBService:
 
             return [dict(r) for r in results] if results else []
         except Exception as e:
-            print(f"Ошибка при получении всех вакансий: {str(e)}")
+            logger.error("Ошибка при получении всех вакансий: %s", e)
+            return []
+
+    def get_vacancies_for_response(self):
+        """
+        Получает все вакансии только с полями ответа API (модель Vacancy)
+
+        Returns:
+            Список словарей, готовых к сериализации в JSON
+        """
+        query = f"""
+        SELECT id, title, company, description, salary_from, salary_to, currency, experience,
+               COALESCE(skills, '[]'::jsonb) AS skills, url, created_at
+        FROM {DB_SCHEMA}.vacancies
+        ORDER BY created_at DESC
+        """
+
+        try:
+            return self._fetch_response_rows(query)
+        except Exception as e:
+            logger.error("Ошибка при получении всех вакансий: %s", e)
             return []
 
+    def get_vacancies_version(self):
+        """
+        Получает версию списка вакансий для валидаторов HTTP-кеша, не читая сами вакансии
+
+        Сумма xmin меняется при любой вставке или изменении строки, в том числе
+        зафиксированной позже транзакции с более ранним created_at.
+
+        Returns:
+            Словарь {"count", "version", "last_modified"} или None при ошибке
+        """
+        query = f"""
+        SELECT count(*) AS count,
+               COALESCE(sum(xmin::text::bigint), 0) AS version,
+               max(created_at) AS last_modified
+        FROM {DB_SCHEMA}.vacancies
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query)
+            result = cursor.fetchone()
+            cursor.close()
+            conn.close()
+
+            return dict(result)
+        except Exception as e:
+            logger.error("Ошибка при получении версии списка вакансий: %s", e)
+            return None
+
     def save_resume_vacancy_match(self, match_id: str, resume_id: str, vacancy_id: str,
                                   matched_skills: List[str], unmatched_skills: List[str],
                                   llm_comment: str, score: float, positives: List[str],
-                                  negatives: List[str], verdict: str):
+                                  negatives: List[str], verdict: str, fingerprint: Optional[str] = None):
         """
         Сохраняет результат сопоставления резюме и вакансии в базу данных
         
@@ -399,6 +1065,7 @@ class DBService:
             positives: Список положительных моментов
             negatives: Список отрицательных моментов
             verdict: Итоговый вердикт
+            fingerprint: Отпечаток входных данных сопоставления
             
         Returns:
             True, если данные успешно сохранены
@@ -407,9 +1074,9 @@ class DBService:
         INSERT INTO {DB_SCHEMA}.resume_vacancy_matches (
             id, resume_id, vacancy_id, matched_skills, 
             unmatched_skills, llm_comment, score, positives, 
-            negatives, verdict
+            negatives, verdict, fingerprint
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (resume_id, vacancy_id) DO UPDATE
         SET matched_skills = EXCLUDED.matched_skills,
             unmatched_skills = EXCLUDED.unmatched_skills,
@@ -418,11 +1085,12 @@ class DBService:
             positives = EXCLUDED.positives,
             negatives = EXCLUDED.negatives,
             verdict = EXCLUDED.verdict,
+            fingerprint = EXCLUDED.fingerprint,
             created_at = CURRENT_TIMESTAMP
         """
 
         try:
-            print(f"Сохранение результата сопоставления резюме {resume_id} и вакансии {vacancy_id}")
+            logger.debug("Сохранение результата сопоставления резюме %s и вакансии %s", resume_id, vacancy_id)
             conn = self._get_connection()
             cursor = conn.cursor()
 
@@ -436,15 +1104,16 @@ class DBService:
                 score,
                 Json(positives),
                 Json(negatives),
-                verdict
+                verdict,
+                fingerprint
             ))
             conn.commit()
             cursor.close()
             conn.close()
-            print(f"Результат сопоставления успешно сохранен с ID {match_id}")
+            logger.info("Результат сопоставления успешно сохранен с ID %s", match_id, extra=SAMPLED)
             return True
         except Exception as e:
-            print(f"Ошибка при сохранении результата сопоставления: {str(e)}")
+            logger.error("Ошибка при сохранении результата сопоставления: %s", e)
             return False
 
     def get_resume_vacancy_match(self, resume_id: str, vacancy_id: str):
@@ -466,9 +1135,51 @@ class DBService:
 
             return dict(result) if result else None
         except Exception as e:
-            print(f"Ошибка при получении результата сопоставления: {str(e)}")
+            logger.error("Ошибка при получении результата сопоставления: %s", e)
             return None
 
+    def get_stale_matches(self, llm_model: str, prompt_version: str, vocab_version: str,
+                          limit: Optional[int] = None):
+        """
+        Получает пары резюме и вакансий, результаты сопоставления которых устарели
+
+        Отпечаток вычисляется на стороне базы данных по той же формуле, что и
+        ResumeVacancyMatcher.get_match_fingerprint, поэтому тексты не передаются в приложение.
+
+        Args:
+            llm_model: Текущая модель LLM
+            prompt_version: Текущая версия промпта
+            vocab_version: Текущая версия словаря навыков
+            limit: Максимальное количество пар
+
+        Returns:
+            Список словарей с resume_id и vacancy_id
+        """
+        query = f"""
+        SELECT m.resume_id, m.vacancy_id
+        FROM {DB_SCHEMA}.resume_vacancy_matches m
+        JOIN {DB_SCHEMA}.resumes r ON m.resume_id = r.id
+        JOIN {DB_SCHEMA}.vacancies v ON m.vacancy_id = v.id
+        WHERE m.fingerprint IS DISTINCT FROM md5(
+            md5(r.raw_text) || ':' || md5(v.description) || ':' || %s || ':' || %s || ':' || %s
+        )
+        ORDER BY m.created_at
+        LIMIT %s
+        """
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, (llm_model, prompt_version, vocab_version, limit))
+            results = cursor.fetchall()
+            cursor.close()
+            conn.close()
+
+            return [dict(r) for r in results] if results else []
+        except Exception as e:
+            logger.error("Ошибка при получении устаревших сопоставлений: %s", e)
+            return []
+
     def get_resume_matches(self, resume_id: str):
         """
         Получает все сопоставления для конкретного резюме
@@ -491,7 +1202,27 @@ class DBService:
 
             return [dict(r) for r in results] if results else []
         except Exception as e:
-            print(f"Ошибка при получении сопоставлений для резюме: {str(e)}")
+            logger.error("Ошибка при получении сопоставлений для резюме: %s", e)
+            return []
+
+    def get_resume_matches_for_response(self, resume_id: str):
+        """
+        Получает сопоставления резюме только с полями ответа API (модель ResumeVacancyMatchResponse)
+
+        Returns:
+            Список словарей, готовых к сериализации в JSON
+        """
+        query = f"""
+        SELECT {MATCH_RESPONSE_COLUMNS}
+        FROM {DB_SCHEMA}.resume_vacancy_matches m
+        WHERE m.resume_id = %(id)s
+        ORDER BY m.created_at DESC
+        """
+
+        try:
+            return self._fetch_response_rows(query, dict(MATCH_RESPONSE_DEFAULTS, id=resume_id))
+        except Exception as e:
+            logger.error("Ошибка при получении сопоставлений для резюме: %s", e)
             return []
 
     def get_vacancy_matches(self, vacancy_id: str):
@@ -516,5 +1247,25 @@ class DBService:
 
             return [dict(r) for r in results] if results else []
         except Exception as e:
-            print(f"Ошибка при получении сопоставлений для вакансии: {str(e)}")
+            logger.error("Ошибка при получении сопоставлений для вакансии: %s", e)
+            return []
+
+    def get_vacancy_matches_for_response(self, vacancy_id: str):
+        """
+        Получает сопоставления вакансии только с полями ответа API (модель ResumeVacancyMatchResponse)
+
+        Returns:
+            Список словарей, готовых к сериализации в JSON
+        """
+        query = f"""
+        SELECT {MATCH_RESPONSE_COLUMNS}
+        FROM {DB_SCHEMA}.resume_vacancy_matches m
+        WHERE m.vacancy_id = %(id)s
+        ORDER BY m.created_at DESC
+        """
+
+        try:
+            return self._fetch_response_rows(query, dict(MATCH_RESPONSE_DEFAULTS, id=vacancy_id))
+        except Exception as e:
+            logger.error("Ошибка при получении сопоставлений для вакансии: %s", e)
             return []
@@ -0,0 +1,303 @@
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.models.common_words import COMMON_WORDS
+from src.models.constants import FUZZY_SKILL_MAX_DISTANCE, FUZZY_SKILL_MIN_LENGTH, FUZZY_SKILL_WORDLIST, \
+    TERM_NORMALIZER
+from src.utils.metrics import record_cache
+
+# Символы, которые не учитываются при сравнении терминов ("Spring Boot" == "SpringBoot" == "spring-boot")
+_COMPACT_PATTERN = re.compile(r'[\s\-_.]+')
+
+# Токены текста: слова из латиницы, кириллицы, цифр и символов "+" и "#" (c++, c#)
+_TOKEN_PATTERN = re.compile(r'[a-zа-яё0-9+#]+(?:[.\-][a-zа-яё0-9+#]+)*')
+
+
+# Номер версии в конце термина: "Java 17", "Python3", "PostgreSQL 14.5", "Vue v3"
+_VERSION_SUFFIX_PATTERN = re.compile(r'[\s\-]*v?\d+(?:\.\d+)*\+?$')
+
+# Сжатая форма термина TERM_NORMALIZER -> нормализованный навык (строится при первом обращении)
+_compact_normalizer: Optional[Dict[str, str]] = None
+
+
+def compact_term(term: str):
+    """
+    Приводит термин к сравниваемому виду: нижний регистр без пробелов, дефисов и точек
+    """
+    return _COMPACT_PATTERN.sub('', term.lower())
+
+
+def canonical_term(term: str):
+    """
+    Находит нормализованный навык для отдельного термина (тега навыка вакансии,
+    языка или фреймворка из резюме) поиском по хеш-таблицам
+
+    Термин сравнивается с TERM_NORMALIZER дословно, в сжатой форме
+    ("Spring-Boot" -> "springboot") и без номера версии ("Java 17" -> "java").
+
+    :param term: Термин в свободной форме
+    :return: Нормализованный навык или None
+    """
+    global _compact_normalizer
+    if _compact_normalizer is None:
+        compact_normalizer = {}
+        for known_term, normalized in TERM_NORMALIZER.items():
+            compact_normalizer.setdefault(compact_term(known_term), normalized)
+        _compact_normalizer = compact_normalizer
+
+    lowered = term.strip().lower()
+    for candidate in (lowered, _VERSION_SUFFIX_PATTERN.sub('', lowered)):
+        if not candidate:
+            continue
+        normalized = TERM_NORMALIZER.get(candidate) or _compact_normalizer.get(compact_term(candidate))
+        if normalized:
+            return normalized
+    return None
+
+
+def load_common_words(path: str = FUZZY_SKILL_WORDLIST) -> FrozenSet[str]:
+    """
+    Общеупотребительные слова, к которым не применяется нечеткий поиск
+
+    :param path: Файл с дополнительными словами (по одному в строке, например /usr/share/dict/words;
+        по умолчанию FUZZY_SKILL_WORDLIST); пустая строка — только COMMON_WORDS
+    """
+    if not path:
+        return COMMON_WORDS
+    with open(path, encoding="utf-8") as file:
+        return COMMON_WORDS | frozenset(line.strip().lower() for line in file if line.strip())
+
+
+def edit_distance(first: str, second: str, max_distance: Optional[int] = None):
+    """
+    Вычисляет редакционное расстояние между строками
+
+    Учитываются вставка, удаление, замена символа и перестановка двух соседних
+    символов ("Kuberentes" -> "Kubernetes" — одна операция).
+
+    :param first: Первая строка
+    :param second: Вторая строка
+    :param max_distance: Если указано, вычисление прекращается, как только
+                         расстояние гарантированно превышает это значение
+    :return: Расстояние (или max_distance + 1 при досрочном прекращении)
+    """
+    if len(first) < len(second):
+        first, second = second, first
+
+    if max_distance is not None and len(first) - len(second) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char)
+            )
+            if (before_previous is not None and j > 1 and first_char == second[j - 2]
+                    and first[i - 2] == second_char):
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+
+    return previous[-1]
+
+
+def _ngrams(word: str, size: int):
+    padded = "$" * (size - 1) + word + "$" * (size - 1)
+    return [padded[i:i + size] for i in range(len(padded) - size + 1)]
+
+
+class NGramIndex:
+    """
+    Индекс n-грамм для поиска строк в пределах заданного редакционного расстояния
+
+    Одна операция редактирования затрагивает не более size + 1 n-грамм, поэтому
+    у строк на расстоянии k не менее (число n-грамм) - k * (size + 1) общих n-грамм.
+    Кандидаты отбираются по спискам n-грамм запроса, и точное расстояние
+    вычисляется только для тех немногих, кто прошел этот фильтр — поиск
+    не зависит линейно от размера словаря.
+    """
+
+    def __init__(self, words=None, size: int = 3):
+        """
+        Инициализация индекса
+
+        :param words: Начальный набор слов
+        :param size: Длина n-граммы
+        """
+        self.size = size
+        self._words: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        for word in words or []:
+            self.add(word)
+
+    def __len__(self):
+        return len(self._words)
+
+    def add(self, word: str):
+        """
+        Добавляет слово в индекс
+        """
+        word_number = len(self._words)
+        self._words.append(word)
+        for gram in set(_ngrams(word, self.size)):
+            self._postings.setdefault(gram, []).append(word_number)
+
+    def search(self, word: str, max_distance: int):
+        """
+        Находит слова на расстоянии не более max_distance
+
+        :param word: Искомое слово
+        :param max_distance: Максимальное редакционное расстояние
+        :return: Список кортежей (расстояние, слово), отсортированный по расстоянию
+        """
+        grams = set(_ngrams(word, self.size))
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for word_number in self._postings.get(gram, ()):
+                counts[word_number] = counts.get(word_number, 0) + 1
+
+        found = []
+        for word_number, shared in counts.items():
+            candidate = self._words[word_number]
+            required = max(len(word), len(candidate)) + self.size - 1 - max_distance * (self.size + 1)
+            if shared < required or abs(len(candidate) - len(word)) > max_distance:
+                continue
+
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+
+        found.sort()
+        return found
+
+
+class FuzzySkillMatcher:
+    """
+    Нечеткое сопоставление токенов текста с навыками из TERM_NORMALIZER
+
+    Используется как дополнение к точному поиску: находит написания вида
+    "Postgre SQL", "Kuberentes" или "SpringBoot". Сначала выполняется поиск
+    по хеш-таблице сжатых форм терминов, затем — по индексу триграмм. Нечетко
+    сравниваются только токены без точного совпадения, не короче min_length и
+    не являющиеся общеупотребительными словами ("string" не становится "spring").
+    Результаты поиска кешируются по токену, поэтому повторяющиеся слова
+    большого документа обрабатываются один раз.
+    """
+
+    def __init__(self, vocabulary: Optional[Dict[str, str]] = None, max_distance: Optional[int] = None,
+                 min_length: Optional[int] = None, cache_size: int = 100_000,
+                 common_words: Optional[Iterable[str]] = None):
+        """
+        Инициализация нечеткого сопоставителя
+
+        :param vocabulary: Словарь {термин: нормализованный навык} (по умолчанию TERM_NORMALIZER)
+        :param max_distance: Максимальное редакционное расстояние для токенов от 8 символов
+                             (FUZZY_SKILL_MAX_DISTANCE, по умолчанию 1)
+        :param min_length: Минимальная длина токена для нечеткого поиска (FUZZY_SKILL_MIN_LENGTH,
+                           по умолчанию 6); короткие токены сравниваются только точно
+        :param cache_size: Максимальное количество закешированных токенов
+        :param common_words: Слова, которые сравниваются только точно (по умолчанию load_common_words())
+        """
+        vocabulary = vocabulary or TERM_NORMALIZER
+        self.max_distance = max_distance if max_distance is not None else FUZZY_SKILL_MAX_DISTANCE
+        self.min_length = min_length if min_length is not None else FUZZY_SKILL_MIN_LENGTH
+        self.cache_size = cache_size
+        self.common_words = frozenset(common_words) if common_words is not None else load_common_words()
+
+        # Сжатая форма термина -> нормализованный навык
+        self._compact_terms: Dict[str, str] = {}
+        for term, normalized in vocabulary.items():
+            self._compact_terms.setdefault(compact_term(term), normalized)
+
+        # В индекс попадают только достаточно длинные термины: короткие дают ложные совпадения
+        self._index = NGramIndex(term for term in self._compact_terms if len(term) >= self.min_length)
+
+        self._cache: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def allowed_distance(self, token: str):
+        """
+        Допустимое расстояние для токена: 0 для коротких токенов и общеупотребительных слов,
+        1 для токенов до 8 символов, иначе max_distance
+        """
+        if len(token) < self.min_length or token in self.common_words:
+            return 0
+        if len(token) < 8:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, token: str):
+        """
+        Находит нормализованный навык для токена
+
+        :param token: Токен или пара соседних токенов в сжатой форме
+        :return: Кортеж (нормализованный навык, термин словаря) или None
+        """
+        cached = self._cache.get(token, False)
+        if cached is not False:
+            return cached
+
+        result = None
+        normalized = self._compact_terms.get(token)
+        if normalized:
+            result = (normalized, token)
+        else:
+            distance = self.allowed_distance(token)
+            if distance > 0:
+                candidates = self._index.search(token, distance)
+                # Неоднозначные совпадения (несколько терминов на одном расстоянии) пропускаем
+                if candidates and (len(candidates) == 1 or candidates[0][0] < candidates[1][0] or
+                                   self._compact_terms[candidates[0][1]] ==
+                                   self._compact_terms[candidates[1][1]]):
+                    term = candidates[0][1]
+                    result = (self._compact_terms[term], term)
+
+        with self._lock:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[token] = result
+
+        return result
+
+    def find_skills(self, text: str):
+        """
+        Находит навыки в тексте с учетом опечаток и слитного/раздельного написания
+
+        :param text: Исходный текст
+        :return: Словарь {нормализованный навык: множество исходных написаний из текста}
+        """
+        tokens: List[str] = _TOKEN_PATTERN.findall(text.lower())
+        found: Dict[str, set] = {}
+
+        previous = None
+        cache_hits = cache_misses = 0
+        for token in tokens:
+            if not token.isdigit():
+                compact = compact_term(token)
+                match = self._cache.get(compact, False)
+                if match is False:
+                    cache_misses += 1
+                    match = self.lookup(compact)
+                else:
+                    cache_hits += 1
+                if match:
+                    found.setdefault(match[0], set()).add(token)
+
+                # Пара соседних токенов: "postgre sql" -> "postgresql"
+                if previous is not None:
+                    match = self._compact_terms.get(compact_term(previous + token))
+                    if match:
+                        found.setdefault(match, set()).add(f"{previous} {token}")
+
+            previous = token if not token.isdigit() else None
+
+        record_cache("fuzzy_skills", cache_hits, cache_misses)
+        return found
@@ -0,0 +1,113 @@
+import html
+import os
+import re
+import uuid
+from typing import Any, Dict, Optional
+
+import requests
+
+from src.utils.config import load_env
+
+# Загружаем переменные окружения
+load_env()
+
+# Адрес публичного API hh.ru (для тестов можно указать локальную заглушку stubs/hh_api_stub.py)
+HH_API_URL = os.getenv("HH_API_URL", "https://api.hh.ru").rstrip("/")
+
+# Соответствие кодов валют API обозначениям, которые извлекаются из HTML страницы
+API_CURRENCIES = {
+    "RUR": "₽",
+    "RUB": "₽",
+    "USD": "$",
+    "EUR": "€",
+}
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_BLOCK_TAG_PATTERN = re.compile(r'</?(?:p|br|li|ul|ol|div|h[1-6])\b[^>]*>', re.IGNORECASE)
+_SPACES_PATTERN = re.compile(r'[ \t\xa0]+')
+_NEWLINES_PATTERN = re.compile(r'\s*\n\s*')
+
+
+def extract_original_id(url: str):
+    """
+    Извлекает идентификатор вакансии hh.ru из URL
+    """
+    match = re.search(r'/vacancy/(\d+)', url or "")
+    return match.group(1) if match else None
+
+
+def html_fragment_to_text(fragment: str):
+    """
+    Преобразует HTML-фрагмент описания из API в обычный текст без построения DOM
+    """
+    text = _BLOCK_TAG_PATTERN.sub('\n', fragment or "")
+    text = html.unescape(_TAG_PATTERN.sub('', text))
+    text = _SPACES_PATTERN.sub(' ', text)
+    return _NEWLINES_PATTERN.sub('\n', text).strip()
+
+
+def map_api_vacancy(data: Dict[str, Any], url: Optional[str] = None):
+    """
+    Преобразует ответ api.hh.ru/vacancies/{id} в словарь вакансии
+
+    Формат результата совпадает с VacancyParser.parse_html, поэтому данные
+    можно сохранять тем же путем, что и вакансии, полученные из HTML.
+
+    :param data: JSON-ответ API
+    :param url: Исходный URL вакансии (по умолчанию alternate_url из ответа)
+    :return: Словарь с данными вакансии
+    """
+    salary = data.get("salary") or {}
+    currency_code = salary.get("currency")
+    experience = (data.get("experience") or {}).get("name")
+
+    return {
+        "id": str(uuid.uuid4()),
+        "title": data.get("name") or "Неизвестная вакансия",
+        "company": (data.get("employer") or {}).get("name") or "Неизвестная компания",
+        "description": html_fragment_to_text(data.get("description")),
+        "salary_from": salary.get("from"),
+        "salary_to": salary.get("to"),
+        "currency": API_CURRENCIES.get(currency_code, currency_code) if currency_code else None,
+        "experience": experience,
+        "skills": [skill.get("name") for skill in data.get("key_skills") or [] if skill.get("name")],
+        "url": url or data.get("alternate_url"),
+        "original_id": str(data.get("id")) if data.get("id") is not None else extract_original_id(url)
+    }
+
+
+class HHApiClient:
+    """Клиент публичного API hh.ru для получения вакансий в формате JSON"""
+
+    def __init__(self, base_url: str = HH_API_URL, timeout: float = 15, user_agent: Optional[str] = None):
+        """
+        Инициализация клиента
+
+        :param base_url: Адрес API (HH_API_URL)
+        :param timeout: Таймаут запроса в секундах
+        :param user_agent: Заголовок User-Agent (API hh.ru требует указывать приложение)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.headers = {
+            "User-Agent": user_agent or os.getenv("HH_API_USER_AGENT", "deepseek-service/1.0"),
+            "Accept": "application/json"
+        }
+
+    def vacancy_url(self, original_id: str):
+        """
+        Возвращает адрес вакансии в API
+        """
+        return f"{self.base_url}/vacancies/{original_id}"
+
+    def get_vacancy(self, original_id: str):
+        """
+        Получает вакансию по идентификатору hh.ru
+
+        :param original_id: Идентификатор вакансии на hh.ru
+        :return: JSON-ответ API
+        :raises requests.RequestException: При ошибке запроса или ответе с кодом ошибки
+        """
+        response = requests.get(self.vacancy_url(original_id), headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
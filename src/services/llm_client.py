@@ -0,0 +1,102 @@
+import json
+import os
+
+import requests
+
+from src.utils.config import load_env
+from src.utils.deadline import check_deadline, current_deadline, deadline_timeout
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Наибольшее время запроса к языковой модели, в секундах (меньше, если у HTTP-запроса срок короче)
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+# Запрашивать ответ модели потоком (stream=True) в маршрутах, прерываемых при отключении клиента.
+# По умолчанию отключено: не все совместимые с OpenAI API поддерживают потоковые ответы
+LLM_STREAMING = os.getenv("LLM_STREAMING", "false").lower() in ("1", "true", "yes")
+
+
+def _post(url: str, headers, data, timeout: float, stream: bool):
+    try:
+        return requests.post(url, headers=headers, json=data, timeout=timeout, stream=stream)
+    except requests.Timeout:
+        # Таймаут из-за срока запроса превращается в ответ 504
+        check_deadline("llm")
+        raise
+
+
+def post_chat_completion(url: str, headers, data):
+    """
+    Отправляет запрос к API языковой модели с учетом срока HTTP-запроса
+
+    Таймаут ограничивается оставшимся временем запроса. Если маршрут прерывает
+    работу при отключении клиента и включен LLM_STREAMING, ответ запрашивается
+    потоком (stream=True): между фрагментами проверяется соединение клиента, и
+    закрытие ответа останавливает генерацию на стороне модели. Без потока
+    соединение клиента проверяется до запроса и после ответа модели.
+
+    :return: Ответ requests; тело читается read_chat_completion
+    """
+    timeout = deadline_timeout(LLM_REQUEST_TIMEOUT, "llm")
+    deadline = current_deadline()
+
+    if LLM_STREAMING and deadline is not None and deadline.cancel_on_disconnect:
+        response = _post(url, headers, dict(data, stream=True, stream_options={"include_usage": True}),
+                         timeout, stream=True)
+        if response.status_code != 400:
+            return response
+        # API не поддерживает stream_options: поток без оценки токенов в ответе
+        response.close()
+        return _post(url, headers, dict(data, stream=True), deadline_timeout(LLM_REQUEST_TIMEOUT, "llm"),
+                     stream=True)
+
+    response = _post(url, headers, data, timeout, stream=False)
+    # Клиент мог отключиться или срок истечь, пока модель отвечала: результат не обрабатывается
+    check_deadline("llm")
+    return response
+
+
+def read_chat_completion(response: requests.Response):
+    """
+    Читает ответ языковой модели
+
+    Потоковый ответ (text/event-stream) собирается в тот же вид, что и обычный:
+    {"choices": [{"message": {"content": ...}}], "usage": ...}.
+
+    :raises RequestCancelled: Клиент отключился во время генерации
+    :raises DeadlineExceeded: Срок запроса истек во время генерации
+    """
+    if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+        return response.json()
+
+    parts = []
+    result = {"usage": None}
+    finish_reason = None
+    try:
+        for line in response.iter_lines():
+            check_deadline("llm")
+            if not line.startswith(b"data:"):
+                continue
+            payload = line[len(b"data:"):].strip()
+            if payload == b"[DONE]":
+                break
+
+            chunk = json.loads(payload)
+            result["id"] = chunk.get("id", result.get("id"))
+            result["model"] = chunk.get("model", result.get("model"))
+            if chunk.get("usage"):
+                result["usage"] = chunk["usage"]
+            for choice in chunk.get("choices") or []:
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    parts.append(content)
+                finish_reason = choice.get("finish_reason") or finish_reason
+    finally:
+        response.close()
+
+    result["choices"] = [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "".join(parts)},
+        "finish_reason": finish_reason
+    }]
+    return result
@@ -1,18 +1,102 @@
+import hashlib
 import json
 import os
 import re
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Optional
 
-import requests
-from dotenv import load_dotenv
-
-from src.models.constants import TERM_NORMALIZER
+from src.models.constants import FUZZY_SKILL_MATCHING, TERM_NORMALIZER, TERM_NORMALIZER_VERSION
+from src.services.fuzzy_skills import FuzzySkillMatcher, canonical_term
+from src.services.llm_client import post_chat_completion, read_chat_completion
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+from src.utils.metrics import record_llm_usage, track_llm_call
+from src.utils.tracing import start_span, traced
 
 # Загрузка переменных окружения из .env файла
-load_dotenv()
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Версия промпта анализа соответствия. Увеличивайте при изменении текста промпта
+# в get_llm_analysis, чтобы сохраненные результаты сопоставления считались устаревшими.
+PROMPT_VERSION = "1"
+
+
+def _md5(text: str):
+    return hashlib.md5((text or "").encode("utf-8")).hexdigest()
 
 
-class ResumeVacancyMatcher:
+class SkillExtractor:
+    """
+    Извлечение нормализованных навыков из текста по словарю TERM_NORMALIZER
+
+    Не обращается к языковой модели и не требует ее настроек, поэтому
+    используется и вне сервиса (импорт и проверка вакансий из командной строки).
+    """
+
+    def __init__(self):
+        # Нечеткий поиск навыков с опечатками и слитным написанием (включается FUZZY_SKILL_MATCHING=true;
+        # по умолчанию отключен, пока не измерена доля ложных срабатываний). Его настройки входят
+        # в TERM_NORMALIZER_VERSION
+        self.fuzzy_matcher = FuzzySkillMatcher() if FUZZY_SKILL_MATCHING else None
+
+    @traced("matcher.extract_skills")
+    def extract_skills(self, text: str):
+        """
+        Извлекает профессиональные навыки из текста и группирует их
+        по нормализованным значениям
+        
+        :param text: Исходный текст (вакансия или резюме)
+        :return: Словарь с нормализованными навыками и их оригинальными формами
+        """
+        # 1. Поиск технических навыков из словаря нормализации
+        normalized_skills = {}
+
+        # Ищем каждый технический термин в тексте
+        for term, normalized in TERM_NORMALIZER.items():
+            # Используем границы слов для точного поиска
+            pattern = r'\b' + re.escape(term) + r'\b'
+            if re.search(pattern, text.lower()):
+                if normalized not in normalized_skills:
+                    normalized_skills[normalized] = set()
+                normalized_skills[normalized].add(term)
+
+        # 2. Нечеткий поиск терминов, не совпавших с TERM_NORMALIZER дословно
+        if self.fuzzy_matcher is not None:
+            for normalized, terms in self.fuzzy_matcher.find_skills(text).items():
+                normalized_skills.setdefault(normalized, set()).update(terms)
+
+        return normalized_skills
+
+    @traced("matcher.extract_canonical_skills")
+    def extract_canonical_skills(self, text: str, extra_terms: Optional[List[str]] = None):
+        """
+        Извлекает нормализованные навыки в виде, пригодном для сохранения в базу данных
+
+        :param text: Исходный текст (вакансия или резюме)
+        :param extra_terms: Дополнительные термины в свободной форме (теги навыков вакансии,
+                            языки и фреймворки нормализованного резюме)
+        :return: Словарь {нормализованный навык: отсортированный список оригинальных форм}
+        """
+        skills_dict = self.extract_skills(text or "")
+
+        terms = [str(term).strip() for term in extra_terms or [] if str(term).strip()]
+        for term in terms:
+            # Сначала ищем термин целиком (в том числе слитно и без версии: "SpringBoot", "Java 17"),
+            # затем — известные термины внутри него
+            normalized = canonical_term(term)
+            if normalized:
+                skills_dict.setdefault(normalized, set()).add(term.lower())
+
+        if terms:
+            for normalized, found_terms in self.extract_skills("\n".join(terms)).items():
+                skills_dict.setdefault(normalized, set()).update(found_terms)
+
+        return {normalized: sorted(found_terms) for normalized, found_terms in skills_dict.items()}
+
+
+class ResumeVacancyMatcher(SkillExtractor):
     """
     Класс для сопоставления резюме и вакансий с использованием 
     анализа текста и языковой модели
@@ -40,27 +124,7 @@ class ResumeVacancyMatcher:
             raise ValueError(
                 "Ключ API языковой модели не указан. Укажите LLM_API_KEY в .env файле или передайте параметр.")
 
-    def extract_skills(self, text: str):
-        """
-        Извлекает профессиональные навыки из текста и группирует их
-        по нормализованным значениям
-        
-        :param text: Исходный текст (вакансия или резюме)
-        :return: Словарь с нормализованными навыками и их оригинальными формами
-        """
-        # 1. Поиск технических навыков из словаря нормализации
-        normalized_skills = {}
-
-        # Ищем каждый технический термин в тексте
-        for term, normalized in TERM_NORMALIZER.items():
-            # Используем границы слов для точного поиска
-            pattern = r'\b' + re.escape(term) + r'\b'
-            if re.search(pattern, text.lower()):
-                if normalized not in normalized_skills:
-                    normalized_skills[normalized] = set()
-                normalized_skills[normalized].add(term)
-
-        return normalized_skills
+        super().__init__()
 
     def preprocess_for_tfidf(self, text: str):
         """
@@ -77,6 +141,21 @@ class ResumeVacancyMatcher:
             processed_text = re.sub(pattern, normalized, processed_text)
         return processed_text
 
+    def get_match_fingerprint(self, vacancy_text: str, resume_text: str):
+        """
+        Вычисляет отпечаток входных данных сопоставления
+
+        Отпечаток зависит от текстов резюме и вакансии, модели, версии промпта
+        и версии словаря навыков. Формула совпадает с вычислением в
+        DBService.get_stale_matches, чтобы устаревшие пары можно было найти в SQL.
+
+        :param vacancy_text: Текст вакансии
+        :param resume_text: Текст резюме
+        :return: Отпечаток (md5 в шестнадцатеричном виде)
+        """
+        parts = [_md5(resume_text), _md5(vacancy_text), self.llm_model, PROMPT_VERSION, TERM_NORMALIZER_VERSION]
+        return _md5(":".join(parts))
+
     def get_llm_analysis(self, vacancy_text: str, resume_text: str,
                          matched_skills: List[str], unmatched_skills: List[str]):
         """
@@ -183,14 +262,15 @@ class ResumeVacancyMatcher:
         }
 
         # Отправка запроса и получение ответа
-        response = requests.post(
-            self.llm_api_url,
-            headers=headers,
-            json=data,
-            timeout=60
-        )
-        response.raise_for_status()
-        result = response.json()
+        with start_span("llm.request", "client", component="matcher", model=self.llm_model) as span, \
+                track_llm_call("matcher") as llm_call:
+            response = post_chat_completion(self.llm_api_url, headers, data)
+            llm_call["status"] = str(response.status_code)
+            if span is not None:
+                span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status()
+            result = read_chat_completion(response)
+        record_llm_usage("matcher", result)
 
         content = result['choices'][0]['message']['content']
 
@@ -219,22 +299,26 @@ class ResumeVacancyMatcher:
 
             return comment, score, positives, negatives, verdict
         except Exception as e:
-            print(f"Ошибка при парсинге JSON из ответа: {str(e)}")
+            logger.error("Ошибка при парсинге JSON из ответа: %s", e)
             # В случае ошибки парсинга возвращаем исходный текст и дефолтные значения
             return content, 0.5, [], [], "Не удалось определить вердикт"
 
-    def match(self, vacancy_text: str, resume_text: str):
+    def match(self, vacancy_text: str, resume_text: str,
+              vacancy_skills: Optional[Dict[str, List[str]]] = None,
+              resume_skills: Optional[Dict[str, List[str]]] = None):
         """
         Выполняет полный процесс сопоставления вакансии и резюме
         
         :param vacancy_text: Текст вакансии
         :param resume_text: Текст резюме
+        :param vacancy_skills: Заранее вычисленные навыки вакансии (см. extract_canonical_skills)
+        :param resume_skills: Заранее вычисленные навыки резюме (см. extract_canonical_skills)
         :return: Кортеж из (совпадающие навыки, несовпадающие навыки, комментарий LLM, 
                             оценка соответствия, плюсы, минусы, вердикт)
         """
-        # 1. Извлечение навыков
-        vacancy_skills_dict = self.extract_skills(vacancy_text)
-        resume_skills_dict = self.extract_skills(resume_text)
+        # 1. Извлечение навыков (если они не были сохранены заранее)
+        vacancy_skills_dict = vacancy_skills if vacancy_skills is not None else self.extract_skills(vacancy_text)
+        resume_skills_dict = resume_skills if resume_skills is not None else self.extract_skills(resume_text)
 
         # Получаем множества нормализованных ключей
         vacancy_norm_keys = set(vacancy_skills_dict.keys())
@@ -2,11 +2,18 @@ import json
 import os
 from typing import Dict, Any, Optional
 
-import requests
-from dotenv import load_dotenv
+from src.services.llm_client import post_chat_completion, read_chat_completion
+from src.utils.config import load_env
+from src.utils.deadline import DeadlineExceeded, RequestCancelled
+from src.utils.logger import get_logger
+from src.utils.metrics import record_llm_usage, track_llm_call
+from src.utils.tracing import start_span
 
 # Загружаем переменные окружения
-load_dotenv()
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
 
 
 class ResumeNormalizer:
@@ -115,14 +122,15 @@ class ResumeNormalizer:
 
         try:
             # Отправка запроса и получение ответа
-            response = requests.post(
-                self.llm_api_url,
-                headers=headers,
-                json=data,
-                timeout=60
-            )
-            response.raise_for_status()
-            result = response.json()
+            with start_span("llm.request", "client", component="normalizer", model=self.llm_model) as span, \
+                    track_llm_call("normalizer") as llm_call:
+                response = post_chat_completion(self.llm_api_url, headers, data)
+                llm_call["status"] = str(response.status_code)
+                if span is not None:
+                    span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+                result = read_chat_completion(response)
+            record_llm_usage("normalizer", result)
 
             # Извлекаем ответ модели
             llm_response = result['choices'][0]['message']['content']
@@ -163,6 +171,8 @@ class ResumeNormalizer:
 
             return normalized_data
 
+        except (DeadlineExceeded, RequestCancelled):
+            raise
         except Exception as e:
-            print(f"Ошибка при нормализации резюме: {str(e)}")
+            logger.error("Ошибка при нормализации резюме: %s", e)
             return None
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from src.utils.config import load_env
+
+# Загружаем переменные окружения
+load_env()
+
+# Каталог для сохраненных ответов hh.ru
+HH_PAGE_CACHE_DIR = os.getenv("HH_PAGE_CACHE_DIR", ".cache/hh_pages")
+
+_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def content_hash(body: str):
+    """
+    Хеш тела ответа для проверки, изменилось ли содержимое
+    """
+    return hashlib.md5(body.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    Дисковый кеш необработанных ответов hh.ru
+
+    Для каждой вакансии (original_id) и источника ("api" или "html") хранятся
+    сжатое gzip тело ответа и небольшой JSON с валидаторами (ETag,
+    Last-Modified) и хешем содержимого. Файлы записываются атомарно через
+    временный файл, поэтому кешем могут одновременно пользоваться несколько процессов.
+    """
+
+    def __init__(self, directory: str = HH_PAGE_CACHE_DIR):
+        """
+        Инициализация кеша
+
+        :param directory: Каталог для файлов кеша
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, original_id: str, source: str, suffix: str):
+        if not _KEY_PATTERN.match(original_id) or not _KEY_PATTERN.match(source):
+            raise ValueError(f"Недопустимый ключ кеша: {source}/{original_id}")
+        return os.path.join(self.directory, source, f"{original_id}{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get_meta(self, original_id: str, source: str):
+        """
+        Возвращает метаданные сохраненного ответа
+
+        :return: Словарь (url, etag, last_modified, content_hash, fetched_at) или None
+        """
+        try:
+            with open(self._path(original_id, source, ".json"), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def get_body(self, original_id: str, source: str):
+        """
+        Возвращает тело сохраненного ответа или None
+        """
+        try:
+            with gzip.open(self._path(original_id, source, ".gz"), "rt", encoding="utf-8") as file:
+                return file.read()
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def put(self, original_id: str, source: str, url: str, body: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Сохраняет ответ в кеш
+
+        :return: Метаданные сохраненного ответа
+        """
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash(body),
+            "fetched_at": time.time()
+        }
+
+        with self._lock:
+            # Сначала тело, затем метаданные: метаданные без тела не должны появляться
+            self._write_atomic(self._path(original_id, source, ".gz"),
+                               gzip.compress(body.encode("utf-8"), compresslevel=6))
+            self._write_atomic(self._path(original_id, source, ".json"),
+                               json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        return meta
+
+    def touch(self, original_id: str, source: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        """
+        Обновляет время проверки и валидаторы без перезаписи тела (ответ 304)
+        """
+        meta = self.get_meta(original_id, source)
+        if meta is None:
+            return None
+
+        meta["fetched_at"] = time.time()
+        meta["etag"] = etag or meta.get("etag")
+        meta["last_modified"] = last_modified or meta.get("last_modified")
+        with self._lock:
+            self._write_atomic(self._path(original_id, source, ".json"),
+                               json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        return meta
@@ -0,0 +1,308 @@
+import copy
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+from src.utils.metrics import CACHE_ENTRIES, record_cache
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Наибольшее количество строк в каждом кеше (резюме, нормализованные резюме, вакансии); 0 — кеш отключен
+ROW_CACHE_SIZE = int(os.getenv("ROW_CACHE_SIZE", "2000"))
+# Время жизни строки в кеше, в секундах: страховка на случай потерянного уведомления
+ROW_CACHE_TTL = float(os.getenv("ROW_CACHE_TTL", "300"))
+# Больше стольких идентификаторов в одной записи — уведомление об очистке всего кеша
+NOTIFY_MAX_IDS = 100
+
+# Пауза между попытками переподключения слушателя, в секундах
+_LISTENER_BACKOFF_MIN = 1.0
+_LISTENER_BACKOFF_MAX = 30.0
+# Как часто слушатель проверяет соединение при отсутствии уведомлений, в секундах
+_LISTENER_POLL_SECONDS = 5.0
+
+
+class RowCache:
+    """
+    Ограниченный кеш строк базы данных в памяти процесса
+
+    Строки вытесняются по давности использования (LRU) и по времени жизни.
+    Кеш заполняется при чтении (read-through) и очищается по уведомлениям
+    об изменениях от других воркеров, поэтому используется только пока
+    слушатель уведомлений подключен. Хранятся и возвращаются копии строк:
+    вызывающий может менять полученный словарь. Отсутствующие строки не
+    кешируются.
+    """
+
+    def __init__(self, name: str, max_size: int = ROW_CACHE_SIZE, ttl: float = ROW_CACHE_TTL):
+        """
+        :param name: Вид строк (метка метрик и префикс уведомлений)
+        :param max_size: Наибольшее количество строк
+        :param ttl: Время жизни строки в секундах
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._rows: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Счетчик инвалидаций: строка, прочитанная до инвалидации, в кеш не попадает
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, key: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """
+        Возвращает строку из кеша или загружает ее через loader
+
+        :param key: Идентификатор строки
+        :param loader: Функция чтения строки из базы данных; None — строка не найдена
+        """
+        if self.max_size <= 0 or not invalidation_listener.ensure_running():
+            return loader()
+
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._rows.move_to_end(key)
+                row = entry[1]
+            else:
+                row = None
+            generation = self._generation
+        if row is not None:
+            record_cache(f"{self.name}_row", hits=1)
+            return copy.deepcopy(row)
+
+        record_cache(f"{self.name}_row", misses=1)
+        row = loader()
+        if row is not None:
+            self._put(key, copy.deepcopy(row), generation)
+        return row
+
+    def _put(self, key: str, row: dict, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._rows[key] = (time.monotonic() + self.ttl, row)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+            size = len(self._rows)
+        CACHE_ENTRIES.labels(self.name).set(size)
+
+    def invalidate(self, keys: Iterable[str]):
+        """Удаляет строки из кеша"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._rows.pop(key, None)
+            size = len(self._rows)
+        CACHE_ENTRIES.labels(self.name).set(size)
+
+    def clear(self):
+        """Очищает кеш"""
+        with self._lock:
+            self._generation += 1
+            self._rows.clear()
+        CACHE_ENTRIES.labels(self.name).set(0)
+
+
+# Кеши строк по видам; вид совпадает с префиксом уведомления "вид:идентификатор"
+row_caches: Dict[str, RowCache] = {
+    "resume": RowCache("resume"),
+    "normalized_resume": RowCache("normalized_resume"),
+    "vacancy": RowCache("vacancy"),
+}
+
+
+def notify_payloads(kind: str, ids: Iterable[str]):
+    """
+    Тексты уведомлений об изменении строк для pg_notify
+
+    Для большого количества строк отправляется одно уведомление "вид:*".
+    """
+    ids = list(ids)
+    if len(ids) > NOTIFY_MAX_IDS:
+        return [f"{kind}:*"]
+    return [f"{kind}:{row_id}" for row_id in ids]
+
+
+def invalidate_rows(kind: str, ids: Iterable[str]):
+    """Удаляет строки из кеша этого процесса (после записи, не дожидаясь уведомления)"""
+    cache = row_caches[kind]
+    ids = list(ids)
+    if len(ids) > NOTIFY_MAX_IDS:
+        cache.clear()
+    else:
+        cache.invalidate(ids)
+
+
+def clear_row_caches():
+    """Очищает кеши строк этого процесса"""
+    for cache in row_caches.values():
+        cache.clear()
+
+
+class InvalidationListener:
+    """
+    Фоновый поток, подписанный на уведомления об изменении строк (LISTEN)
+
+    Методы записи DBService отправляют pg_notify в той же транзакции, и
+    уведомление доставляется всем воркерам только после фиксации. Пока
+    соединение слушателя не установлено, кеши не используются; после
+    переподключения они очищаются, потому что уведомления за время разрыва
+    потеряны. Поток создается в процессе, который первым обратился к кешу,
+    поэтому у воркеров, запущенных через fork, слушатели свои.
+
+    Уведомления получают и другие данные в памяти воркера (индексы навыков):
+    обработчики add_handler вызываются для каждого уведомления, а после каждого
+    подключения — с идентификатором "*" для каждого вида.
+    """
+
+    def __init__(self):
+        self.channel: Optional[str] = None
+        self.conn_params: Optional[dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._handlers: List[Callable[[str, str], None]] = []
+
+    @property
+    def connected(self):
+        return self._connected.is_set()
+
+    def configure(self, conn_params: dict, channel: str):
+        """
+        Задает параметры подключения к базе данных (вызывается при создании DBService)
+
+        :param conn_params: Параметры psycopg2.connect
+        :param channel: Канал LISTEN/NOTIFY
+        """
+        self.conn_params = dict(conn_params)
+        self.channel = channel
+
+    def add_handler(self, handler: Callable[[str, str], None]):
+        """
+        Подписывает обработчик на уведомления об изменении строк
+
+        :param handler: Функция (вид, идентификатор строки или "*"); вызывается в потоке
+            слушателя и не должна блокировать его
+        """
+        self._handlers.append(handler)
+
+    def wait_connected(self, timeout: float):
+        """
+        Запускает слушатель и ждет подключения
+
+        :return: True, если слушатель подключен
+        """
+        if self.conn_params is None:
+            return False
+        self.ensure_running()
+        return self._connected.wait(timeout)
+
+    def ensure_running(self):
+        """
+        Запускает поток слушателя, если он еще не запущен
+
+        :return: True, если слушатель подключен и кешу можно доверять
+        """
+        if self._thread is None and self.conn_params is not None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="row-cache-listener", daemon=True)
+                    self._thread.start()
+        return self._connected.is_set()
+
+    def _run(self):
+        backoff = _LISTENER_BACKOFF_MIN
+        while True:
+            conn = None
+            try:
+                # psycopg2 импортируется здесь, а не при импорте модуля: приложение загружает его
+                # только при первом обращении к базе данных
+                import psycopg2
+
+                conn = psycopg2.connect(**self.conn_params, connect_timeout=5)
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+                cursor.close()
+                # Пока соединения не было, уведомления не доставлялись
+                clear_row_caches()
+                self._connected.set()
+                for kind in row_caches:
+                    self._notify_handlers(kind, "*")
+                backoff = _LISTENER_BACKOFF_MIN
+                logger.info("Кеш строк: подписка на канал %s", self.channel)
+                self._listen(conn)
+            except Exception as e:
+                logger.warning("Кеш строк: соединение слушателя уведомлений потеряно: %s", e)
+            finally:
+                self._connected.clear()
+                clear_row_caches()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, _LISTENER_BACKOFF_MAX)
+
+    def _listen(self, conn):
+        while True:
+            if select.select([conn], [], [], _LISTENER_POLL_SECONDS) == ([], [], []):
+                # Проверка, что соединение живо: poll на закрытом соединении выбрасывает исключение
+                conn.poll()
+                continue
+            conn.poll()
+            while conn.notifies:
+                self._apply(conn.notifies.pop(0).payload)
+
+    def _apply(self, payload: str):
+        kind, _, row_id = payload.partition(":")
+        cache = row_caches.get(kind)
+        if cache is None:
+            return
+        if row_id == "*":
+            cache.clear()
+        else:
+            cache.invalidate([row_id])
+        self._notify_handlers(kind, row_id)
+
+    def _notify_handlers(self, kind: str, row_id: str):
+        for handler in self._handlers:
+            try:
+                handler(kind, row_id)
+            except Exception as e:
+                logger.error("Ошибка обработчика уведомления %s:%s: %s", kind, row_id, e)
+
+    def reset_after_fork(self):
+        # Поток и соединение родителя в дочернем процессе не существуют, обработчики
+        # подписываются в каждом воркере заново
+        self._thread = None
+        self._handlers = []
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+
+
+# Слушатель уведомлений этого процесса
+invalidation_listener = InvalidationListener()
+
+
+def _reinit_after_fork():
+    invalidation_listener.reset_after_fork()
+    for cache in row_caches.values():
+        cache._lock = threading.Lock()
+        cache._rows.clear()
+
+
+os.register_at_fork(after_in_child=_reinit_after_fork)
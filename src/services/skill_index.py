@@ -0,0 +1,211 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class SkillIndex:
+    """
+    Инвертированный индекс «нормализованный навык -> идентификаторы документов»
+
+    Каждому документу (резюме или вакансии) присваивается внутренний
+    порядковый номер, а списки документов по навыку хранятся в компактных
+    отсортированных массивах array('I') (4 байта на документ вместо строки UUID).
+    Новые документы получают возрастающие номера, поэтому обычная вставка
+    сводится к добавлению в конец массива.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого индекса
+        """
+        self._lock = threading.RLock()
+        self._postings: Dict[str, array] = {}
+        self._doc_numbers: Dict[str, int] = {}
+        self._doc_ids: List[str] = []
+        self._doc_skills: Dict[int, Set[str]] = {}
+
+    def __len__(self):
+        return len(self._doc_skills)
+
+    def _get_doc_number(self, doc_id: str):
+        """
+        Возвращает внутренний номер документа, создавая его при необходимости
+        """
+        doc_number = self._doc_numbers.get(doc_id)
+        if doc_number is None:
+            doc_number = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._doc_numbers[doc_id] = doc_number
+        return doc_number
+
+    def add(self, doc_id: str, skills: Iterable[str]):
+        """
+        Добавляет документ в индекс или обновляет его набор навыков
+
+        :param doc_id: Идентификатор документа
+        :param skills: Нормализованные навыки документа (значения TERM_NORMALIZER)
+        """
+        new_skills = set(skills)
+
+        with self._lock:
+            doc_number = self._get_doc_number(doc_id)
+            old_skills = self._doc_skills.get(doc_number, set())
+
+            for skill in old_skills - new_skills:
+                self._remove_posting(skill, doc_number)
+
+            for skill in new_skills - old_skills:
+                self._add_posting(skill, doc_number)
+
+            self._doc_skills[doc_number] = new_skills
+
+    def remove(self, doc_id: str):
+        """
+        Удаляет документ из индекса
+        """
+        with self._lock:
+            doc_number = self._doc_numbers.get(doc_id)
+            if doc_number is None:
+                return
+
+            for skill in self._doc_skills.pop(doc_number, set()):
+                self._remove_posting(skill, doc_number)
+
+    def _add_posting(self, skill: str, doc_number: int):
+        postings = self._postings.get(skill)
+        if postings is None:
+            self._postings[skill] = array('I', [doc_number])
+        elif postings[-1] < doc_number:
+            # Типичный случай: новый документ с самым большим номером
+            postings.append(doc_number)
+        else:
+            postings.insert(bisect_left(postings, doc_number), doc_number)
+
+    def _remove_posting(self, skill: str, doc_number: int):
+        postings = self._postings.get(skill)
+        if postings is None:
+            return
+
+        position = bisect_left(postings, doc_number)
+        if position < len(postings) and postings[position] == doc_number:
+            del postings[position]
+
+        if not postings:
+            del self._postings[skill]
+
+    def get_skills(self, doc_id: str):
+        """
+        Возвращает набор навыков документа из индекса
+        """
+        with self._lock:
+            doc_number = self._doc_numbers.get(doc_id)
+            if doc_number is None:
+                return set()
+            return set(self._doc_skills.get(doc_number, set()))
+
+    def _collect_postings(self, skills: Iterable[str]):
+        return [self._postings.get(skill, array('I')) for skill in set(skills)]
+
+    def _to_ids(self, doc_numbers: Iterable[int]):
+        return [self._doc_ids[doc_number] for doc_number in sorted(doc_numbers)]
+
+    def match_all(self, skills: Iterable[str]):
+        """
+        Возвращает документы, содержащие все перечисленные навыки (AND)
+        """
+        with self._lock:
+            postings = self._collect_postings(skills)
+            if not postings:
+                return []
+
+            # Начинаем с самого короткого списка, чтобы множество быстро сужалось
+            postings.sort(key=len)
+            result = set(postings[0])
+            for other in postings[1:]:
+                if not result:
+                    break
+                result.intersection_update(other)
+
+            return self._to_ids(result)
+
+    def match_any(self, skills: Iterable[str]):
+        """
+        Возвращает документы, содержащие хотя бы один из навыков (OR)
+        """
+        with self._lock:
+            postings = self._collect_postings(skills)
+            return self._to_ids(set().union(*postings))
+
+    def _count_at_least(self, skills: Iterable[str], k: int):
+        """
+        Номера документов, содержащих не менее k навыков, и количества совпадений
+
+        Под блокировкой списки документов только копируются в один массив;
+        подсчет (np.bincount по номерам документов) и сортировка выполняются
+        после ее снятия, не задерживая добавление документов.
+
+        :return: Пара массивов (номера документов, количества совпадений),
+                 отсортированных по убыванию количества, затем по номеру документа
+        """
+        # numpy загружается при первом поиске, чтобы не замедлять запуск сервиса
+        import numpy as np
+
+        with self._lock:
+            postings = [np.frombuffer(postings, dtype=np.uintc)
+                        for postings in self._collect_postings(skills) if postings]
+            merged = np.concatenate(postings) if postings else np.empty(0, dtype=np.uintc)
+            # Пока на array('I') ссылается представление numpy, его размер нельзя менять
+            del postings
+
+        counts = np.bincount(merged)
+        doc_numbers = np.flatnonzero(counts >= max(k, 1))
+        matched = counts[doc_numbers]
+        # Устойчивая сортировка сохраняет возрастающий порядок номеров при равных количествах
+        order = np.argsort(-matched, kind="stable")
+        return doc_numbers[order], matched[order]
+
+    def match_at_least(self, skills: Iterable[str], k: int, limit: Optional[int] = None):
+        """
+        Возвращает документы, содержащие не менее k навыков из списка
+
+        :param skills: Нормализованные навыки
+        :param k: Минимальное количество совпавших навыков
+        :param limit: Максимальное количество результатов
+        :return: Список кортежей (идентификатор, количество совпавших навыков),
+                 отсортированный по убыванию количества совпадений
+        """
+        return self.search_at_least(skills, k, limit)[1]
+
+    def search_at_least(self, skills: Iterable[str], k: int, limit: Optional[int] = None):
+        """
+        Поиск документов, содержащих не менее k навыков, с общим числом найденных
+
+        Идентификаторы создаются только для первых limit документов.
+
+        :return: Пара (количество найденных документов, список кортежей
+                 (идентификатор, количество совпавших навыков) длиной не более limit)
+        """
+        doc_numbers, matched = self._count_at_least(skills, k)
+        total = len(doc_numbers)
+        if limit is not None:
+            doc_numbers, matched = doc_numbers[:limit], matched[:limit]
+
+        # Список идентификаторов только пополняется, номера документов не переиспользуются
+        doc_ids = self._doc_ids
+        return total, [(doc_ids[doc_number], count)
+                       for doc_number, count in zip(doc_numbers.tolist(), matched.tolist())]
+
+    def stats(self):
+        """
+        Возвращает статистику индекса
+        """
+        with self._lock:
+            return {
+                "documents": len(self._doc_skills),
+                "skills": len(self._postings),
+                "postings": sum(len(postings) for postings in self._postings.values()),
+                "postings_bytes": sum(
+                    postings.itemsize * len(postings) for postings in self._postings.values()
+                )
+            }
@@ -0,0 +1,85 @@
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from src.services.row_cache import invalidation_listener
+from src.utils.logger import get_logger
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+
+class SkillIndexSync:
+    """
+    Согласование индексов и матриц навыков воркера с базой данных
+
+    Каждый воркер держит индексы навыков в своей памяти, а запись попадает
+    только в индекс воркера, обработавшего запрос. Остальные воркеры узнают
+    об изменении из уведомлений кеша строк (LISTEN/NOTIFY) и перечитывают
+    навыки измененных строк в отдельном потоке; после переподключения
+    слушателя, когда уведомления могли быть потеряны, вид перечитывается
+    целиком. Уведомления копятся до окончания начальной загрузки индексов.
+    """
+
+    def __init__(self, refreshers: Dict[str, Callable[[Optional[List[str]]], None]]):
+        """
+        :param refreshers: Функции обновления индексов по видам строк {вид: функция(идентификаторы)};
+            None вместо списка идентификаторов — перечитать все строки вида
+        """
+        self._refreshers = refreshers
+        # Ожидающие обновления: {вид: идентификаторы или None — все строки}
+        self._pending: Dict[str, Optional[Set[str]]] = {}
+        self._condition = threading.Condition()
+        self._loaded = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self):
+        """Завершена ли начальная загрузка индексов"""
+        return self._loaded.is_set()
+
+    def start(self):
+        """Подписывается на уведомления и запускает поток обновления индексов"""
+        if self._thread is not None:
+            return
+        invalidation_listener.add_handler(self.handle)
+        self._thread = threading.Thread(target=self._run, name="skill-index-sync", daemon=True)
+        self._thread.start()
+
+    def handle(self, kind: str, row_id: str):
+        """Ставит в очередь обновление строки (вызывается в потоке слушателя уведомлений)"""
+        if kind not in self._refreshers:
+            return
+        with self._condition:
+            if row_id == "*":
+                self._pending[kind] = None
+            else:
+                ids = self._pending.setdefault(kind, set())
+                if ids is not None:
+                    ids.add(row_id)
+            self._condition.notify()
+
+    def begin_loading(self):
+        """
+        Отмечает начало начальной загрузки индексов
+
+        Изменения, о которых пришли уведомления до этого момента, загрузка
+        прочитает сама; более поздние уведомления обрабатываются после нее.
+        """
+        with self._condition:
+            self._pending.clear()
+
+    def mark_loaded(self):
+        """Отмечает окончание начальной загрузки индексов"""
+        self._loaded.set()
+
+    def _run(self):
+        self._loaded.wait()
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                pending, self._pending = self._pending, {}
+            for kind, ids in pending.items():
+                try:
+                    self._refreshers[kind](None if ids is None else sorted(ids))
+                except Exception as e:
+                    logger.error("Ошибка при обновлении индекса навыков (%s): %s", kind, e)
@@ -0,0 +1,228 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.models.constants import SKILL_MATRIX_METRICS, TERM_NORMALIZER
+
+# Таблица количества установленных битов для каждого байта
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words: np.ndarray):
+    """
+    Считает количество установленных битов в каждой строке матрицы uint64
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int32)
+
+    # Для NumPy < 2.0 считаем по байтам через таблицу
+    bytes_view = words.view(np.uint8)
+    return _POPCOUNT_TABLE[bytes_view].sum(axis=-1, dtype=np.int32)
+
+
+class SkillMatrix:
+    """
+    Матрица навыков документов в виде упакованных битовых строк
+
+    Каждый нормализованный навык из TERM_NORMALIZER соответствует одному
+    столбцу (биту), каждый документ — строке из слов uint64. Пересечение,
+    покрытие и коэффициент Жаккара для одного запроса считаются сразу
+    по всем строкам матрицы векторными операциями NumPy.
+    """
+
+    def __init__(self, vocabulary: Optional[Iterable[str]] = None, initial_capacity: int = 1024):
+        """
+        Инициализация матрицы
+
+        :param vocabulary: Словарь нормализованных навыков (по умолчанию значения TERM_NORMALIZER)
+        :param initial_capacity: Начальное количество строк
+        """
+        self.vocabulary: List[str] = sorted(set(vocabulary or TERM_NORMALIZER.values()))
+        self.columns: Dict[str, int] = {skill: column for column, skill in enumerate(self.vocabulary)}
+        self.words = (len(self.vocabulary) + 63) // 64
+
+        self._lock = threading.RLock()
+        self._rows = np.zeros((max(initial_capacity, 1), self.words), dtype=np.uint64)
+        self._row_counts = np.zeros(max(initial_capacity, 1), dtype=np.int32)
+        self._size = 0
+        self._doc_rows: Dict[str, int] = {}
+        self._doc_ids: List[str] = []
+
+    def __len__(self):
+        return self._size
+
+    def encode(self, skills: Iterable[str]):
+        """
+        Упаковывает набор навыков в битовую строку
+
+        Навыки, отсутствующие в словаре, игнорируются.
+
+        :param skills: Нормализованные навыки
+        :return: Массив uint64 длиной self.words
+        """
+        columns = [self.columns[skill] for skill in set(skills) if skill in self.columns]
+        bits = np.zeros(self.words * 64, dtype=np.uint8)
+        bits[columns] = 1
+        # Порядок битов little-endian, чтобы столбец i попадал в бит i % 64 слова i // 64
+        return np.packbits(bits, bitorder="little").view(np.uint64)
+
+    def decode(self, row: np.ndarray):
+        """
+        Распаковывает битовую строку обратно в набор навыков
+        """
+        bits = np.unpackbits(row.view(np.uint8), bitorder="little")[:len(self.vocabulary)]
+        return {self.vocabulary[column] for column in np.flatnonzero(bits)}
+
+    def _ensure_capacity(self, size: int):
+        capacity = self._rows.shape[0]
+        if size <= capacity:
+            return
+
+        new_capacity = max(size, capacity * 2)
+        rows = np.zeros((new_capacity, self.words), dtype=np.uint64)
+        rows[:self._size] = self._rows[:self._size]
+        row_counts = np.zeros(new_capacity, dtype=np.int32)
+        row_counts[:self._size] = self._row_counts[:self._size]
+        self._rows = rows
+        self._row_counts = row_counts
+
+    def add(self, doc_id: str, skills: Iterable[str]):
+        """
+        Добавляет документ в матрицу или обновляет его строку
+
+        :param doc_id: Идентификатор документа
+        :param skills: Нормализованные навыки документа
+        """
+        encoded = self.encode(skills)
+
+        with self._lock:
+            row = self._doc_rows.get(doc_id)
+            if row is None:
+                self._ensure_capacity(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._doc_rows[doc_id] = row
+                self._doc_ids.append(doc_id)
+
+            self._rows[row] = encoded
+            self._row_counts[row] = _popcount_rows(encoded)
+
+    def add_many(self, doc_ids: List[str], skill_sets: List[Iterable[str]]):
+        """
+        Добавляет пачку документов в матрицу
+        """
+        for doc_id, skills in zip(doc_ids, skill_sets):
+            self.add(doc_id, skills)
+
+    def get_skills(self, doc_id: str):
+        """
+        Возвращает набор навыков документа
+        """
+        with self._lock:
+            row = self._doc_rows.get(doc_id)
+            if row is None:
+                return set()
+            return self.decode(self._rows[row])
+
+    def score(self, skills: Iterable[str]):
+        """
+        Сравнивает набор навыков со всеми строками матрицы
+
+        :param skills: Нормализованные навыки запроса (вакансии или резюме)
+        :return: Словарь массивов длиной len(self):
+                 overlap — количество общих навыков,
+                 query_coverage — доля навыков запроса, найденных в строке,
+                 row_coverage — доля навыков строки, найденных в запросе,
+                 jaccard — коэффициент Жаккара
+        """
+        query = self.encode(skills)
+
+        with self._lock:
+            rows = self._rows[:self._size]
+            row_counts = self._row_counts[:self._size]
+            overlap = _popcount_rows(rows & query)
+
+        query_count = int(_popcount_rows(query))
+        union = row_counts + query_count - overlap
+
+        # Пустые знаменатели заменяются единицей: числитель в этих случаях тоже равен нулю
+        query_coverage = overlap / max(query_count, 1)
+        row_coverage = overlap / np.maximum(row_counts, 1)
+        jaccard = overlap / np.maximum(union, 1)
+
+        return {
+            "overlap": overlap,
+            "query_coverage": query_coverage,
+            "row_coverage": row_coverage,
+            "jaccard": jaccard
+        }
+
+    def score_many(self, skill_sets: List[Iterable[str]], block_size: int = 512, query_block_size: int = 64):
+        """
+        Считает количество общих навыков для нескольких запросов сразу
+
+        Запросы и строки матрицы обрабатываются блоками, поэтому промежуточный
+        массив занимает не больше query_block_size × block_size × words слов
+        uint64 независимо от количества запросов и документов.
+
+        :param skill_sets: Список наборов навыков запросов
+        :param block_size: Количество строк матрицы в одном блоке
+        :param query_block_size: Количество запросов в одном блоке
+        :return: Матрица int32 размером (количество запросов × len(self))
+        """
+        queries = np.stack([self.encode(skills) for skills in skill_sets]) if skill_sets else \
+            np.zeros((0, self.words), dtype=np.uint64)
+
+        with self._lock:
+            rows = self._rows[:self._size]
+            overlap = np.empty((queries.shape[0], rows.shape[0]), dtype=np.int32)
+            for query_start in range(0, queries.shape[0], query_block_size):
+                query_block = queries[query_start:query_start + query_block_size, None, :]
+                for start in range(0, rows.shape[0], block_size):
+                    block = rows[start:start + block_size]
+                    overlap[query_start:query_start + query_block_size, start:start + block_size] = \
+                        _popcount_rows(query_block & block[None, :, :])
+
+        return overlap
+
+    def top(self, skills: Iterable[str], metric: str = "query_coverage", limit: int = 100,
+            min_overlap: int = 1):
+        """
+        Возвращает лучшие документы по выбранной метрике
+
+        :param skills: Нормализованные навыки запроса
+        :param metric: Метрика ранжирования (см. SKILL_MATRIX_METRICS)
+        :param limit: Максимальное количество результатов
+        :param min_overlap: Минимальное количество общих навыков
+        :return: Список словарей с идентификатором документа и значениями метрик
+        """
+        if metric not in SKILL_MATRIX_METRICS:
+            raise ValueError(f"Неизвестная метрика: {metric}")
+
+        scores = self.score(skills)
+        candidates = np.flatnonzero(scores["overlap"] >= min_overlap)
+        if candidates.size == 0:
+            return []
+
+        values = scores[metric][candidates]
+        if candidates.size > limit:
+            # argpartition выбирает top-N за линейное время, сортируем только их
+            selected = np.argpartition(-values, limit - 1)[:limit]
+        else:
+            selected = np.arange(candidates.size)
+        selected = selected[np.lexsort((-scores["overlap"][candidates[selected]], -values[selected]))]
+
+        with self._lock:
+            doc_ids = [self._doc_ids[row] for row in candidates[selected]]
+
+        return [
+            {
+                "id": doc_id,
+                "overlap": int(scores["overlap"][row]),
+                "query_coverage": float(scores["query_coverage"][row]),
+                "row_coverage": float(scores["row_coverage"][row]),
+                "jaccard": float(scores["jaccard"][row])
+            }
+            for doc_id, row in zip(doc_ids, candidates[selected])
+        ]
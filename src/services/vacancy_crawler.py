@@ -0,0 +1,148 @@
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.services.vacancy_refresher import VacancyRefresher
+from src.utils.config import load_env
+
+# Загружаем переменные окружения
+load_env()
+
+# Настройки периодической проверки вакансий по умолчанию
+HH_CRAWLER_REQUESTS_PER_HOUR = int(os.getenv("HH_CRAWLER_REQUESTS_PER_HOUR", "600"))
+HH_CRAWLER_RECHECK_HOURS = float(os.getenv("HH_CRAWLER_RECHECK_HOURS", "24"))
+HH_CRAWLER_BATCH_SIZE = int(os.getenv("HH_CRAWLER_BATCH_SIZE", "100"))
+HH_CRAWLER_IDLE_INTERVAL = float(os.getenv("HH_CRAWLER_IDLE_INTERVAL", "300"))
+
+
+class VacancyFreshnessCrawler:
+    """
+    Периодическая проверка сохраненных вакансий на hh.ru
+
+    Вакансии выбираются пачками в порядке приоритета (недавно сопоставленные
+    и недавно добавленные — первыми) и обновляются через VacancyRefresher,
+    то есть через обычный путь сохранения save_vacancy. Все запросы к hh.ru
+    укладываются в бюджет запросов в час и равномерно распределяются
+    во времени со случайным разбросом, чтобы не создавать всплесков нагрузки.
+
+    Бюджет действует в пределах одного процесса проверки: несколько
+    запущенных процессов расходуют каждый свой бюджет, а повторные загрузки
+    через /api/parse-vacancy в него не входят.
+    """
+
+    def __init__(self, db_service, refresher: VacancyRefresher,
+                 requests_per_hour: int = HH_CRAWLER_REQUESTS_PER_HOUR,
+                 recheck_after_hours: float = HH_CRAWLER_RECHECK_HOURS,
+                 batch_size: int = HH_CRAWLER_BATCH_SIZE,
+                 idle_interval: float = HH_CRAWLER_IDLE_INTERVAL):
+        """
+        Инициализация планировщика
+
+        :param db_service: Сервис базы данных
+        :param refresher: Сервис повторной загрузки вакансий
+        :param requests_per_hour: Бюджет HTTP-запросов к hh.ru в час
+        :param recheck_after_hours: Минимальный интервал между проверками одной вакансии в часах
+        :param batch_size: Количество вакансий, выбираемых из базы за один раз
+        :param idle_interval: Пауза в секундах, если проверять нечего
+        """
+        if requests_per_hour <= 0:
+            raise ValueError("Бюджет запросов в час должен быть положительным")
+
+        self.db_service = db_service
+        self.refresher = refresher
+        self.request_interval = 3600.0 / requests_per_hour
+        self.recheck_after_hours = recheck_after_hours
+        self.batch_size = batch_size
+        self.idle_interval = idle_interval
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        """Останавливает проверку после текущей вакансии"""
+        self.stop_event.set()
+
+    def _pace(self, requests_made: int):
+        """
+        Выдерживает паузу, соответствующую потраченной части бюджета
+
+        :return: False, если за время паузы поступила команда остановки
+        """
+        if requests_made <= 0:
+            return not self.stop_event.is_set()
+        delay = requests_made * self.request_interval * random.uniform(0.8, 1.2)
+        return not self.stop_event.wait(delay)
+
+    def check_vacancy(self, vacancy: Dict[str, Any]):
+        """
+        Проверяет одну вакансию
+
+        :return: Словарь с результатом проверки (status, changed_fields, requests, error)
+        """
+        requests_before = self.refresher.requests_made
+        try:
+            result, error = self.refresher.refresh(vacancy["url"])
+        except Exception as e:
+            result, error = None, str(e)
+
+        if error:
+            # Ошибочную вакансию откладываем до следующего интервала проверки, чтобы не блокировать очередь
+            self.db_service.mark_vacancy_checked(vacancy["id"], False)
+
+        return {
+            "id": vacancy["id"],
+            "url": vacancy["url"],
+            "status": result["status"] if result else "error",
+            "closed": result["closed"] if result else False,
+            "changed_fields": result["changed_fields"] if result else [],
+            "invalidated_matches": result["invalidated_matches"] if result else 0,
+            "requests": self.refresher.requests_made - requests_before,
+            "error": error
+        }
+
+    def run_cycle(self, on_check: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Проверяет одну пачку вакансий
+
+        :param on_check: Функция, вызываемая после проверки каждой вакансии
+        :return: Словарь с количеством вакансий по статусам проверки
+        """
+        stats: Dict[str, int] = {"checked": 0, "requests": 0}
+        vacancies = self.db_service.get_vacancies_to_check(self.recheck_after_hours, self.batch_size)
+
+        for vacancy in vacancies:
+            if self.stop_event.is_set():
+                break
+
+            check = self.check_vacancy(vacancy)
+            stats["checked"] += 1
+            stats["requests"] += check["requests"]
+            stats[check["status"]] = stats.get(check["status"], 0) + 1
+            if on_check is not None:
+                on_check(check)
+
+            if not self._pace(check["requests"]):
+                break
+
+        return stats
+
+    def run(self, once: bool = False, on_check: Optional[Callable[[Dict[str, Any]], Any]] = None,
+            on_cycle: Optional[Callable[[Dict[str, int]], Any]] = None):
+        """
+        Запускает проверку вакансий до остановки
+
+        :param once: Выполнить одну пачку и завершиться
+        :param on_check: Функция, вызываемая после проверки каждой вакансии
+        :param on_cycle: Функция, вызываемая после каждой пачки со статистикой
+        """
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            stats = self.run_cycle(on_check)
+            stats["elapsed"] = round(time.monotonic() - started, 1)
+            if on_cycle is not None:
+                on_cycle(stats)
+
+            if once:
+                break
+            if stats["checked"] == 0:
+                self.stop_event.wait(self.idle_interval)
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.services.hh_api_client import extract_original_id
+from src.services.vacancy_parser import VacancyParser, parse_vacancy_html, HH_VACANCY_BACKEND
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+
+# Загружаем переменные окружения
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Настройки пакетного импорта по умолчанию
+HH_IMPORT_CONCURRENCY = int(os.getenv("HH_IMPORT_CONCURRENCY", "20"))
+HH_IMPORT_PER_HOST_CONCURRENCY = int(os.getenv("HH_IMPORT_PER_HOST_CONCURRENCY", "4"))
+HH_IMPORT_HOST_DELAY = float(os.getenv("HH_IMPORT_HOST_DELAY", "0.2"))
+HH_IMPORT_RETRIES = int(os.getenv("HH_IMPORT_RETRIES", "3"))
+HH_IMPORT_PARSE_WORKERS = int(os.getenv("HH_IMPORT_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# Коды ответа, при которых запрос повторяется
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class _HostThrottle:
+    """
+    Ограничение нагрузки на один хост: не более N одновременных запросов
+    и пауза не меньше delay секунд между началом соседних запросов
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self._lock = asyncio.Lock()
+        self._next_request_at = 0.0
+
+    async def wait_turn(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_request_at > now:
+                await asyncio.sleep(self._next_request_at - now)
+            self._next_request_at = max(now, self._next_request_at) + self.delay
+
+
+def _public_result(result: Dict[str, Any]):
+    """Результат обработки URL без полных данных вакансии"""
+    public = {key: value for key, value in result.items() if key != "vacancy"}
+    if "vacancy" in result:
+        public["vacancy_id"] = result["vacancy"]["id"]
+        public["title"] = result["vacancy"]["title"]
+    return public
+
+
+class VacancyBatchImporter:
+    """
+    Пакетный импорт вакансий с hh.ru
+
+    Страницы загружаются параллельно через общий асинхронный HTTP-клиент
+    с ограничением числа одновременных запросов на каждый хост, таймаутами
+    и повторными попытками. При источнике "api" вакансии берутся из JSON API
+    hh.ru, а страница загружается только при ошибке API. HTML разбирается
+    в пуле процессов, а все вакансии сохраняются одним многострочным
+    запросом в DBService.
+    """
+
+    def __init__(self, db_service=None, skills_extractor: Optional[Callable] = None,
+                 concurrency: int = HH_IMPORT_CONCURRENCY,
+                 per_host_concurrency: int = HH_IMPORT_PER_HOST_CONCURRENCY,
+                 host_delay: float = HH_IMPORT_HOST_DELAY,
+                 retries: int = HH_IMPORT_RETRIES,
+                 timeout: Optional[float] = None,
+                 parse_workers: int = HH_IMPORT_PARSE_WORKERS,
+                 backend: str = HH_VACANCY_BACKEND):
+        """
+        Инициализация импортера
+
+        :param db_service: Сервис базы данных (если не указан, вакансии не сохраняются)
+        :param skills_extractor: Функция (описание, теги навыков) -> нормализованные навыки
+        :param concurrency: Максимальное количество одновременных запросов
+        :param per_host_concurrency: Максимальное количество одновременных запросов к одному хосту
+        :param host_delay: Минимальная пауза между запросами к одному хосту в секундах
+        :param retries: Количество повторных попыток при сетевых ошибках и ответах 429/5xx
+        :param timeout: Таймаут запроса в секундах (по умолчанию HH_REQUEST_TIMEOUT)
+        :param parse_workers: Количество процессов для разбора HTML (0 — разбор в потоках)
+        :param backend: Источник данных: "api" (JSON API с откатом на HTML) или "html"
+        """
+        self.db_service = db_service
+        self.skills_extractor = skills_extractor
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.host_delay = host_delay
+        self.retries = retries
+        self.parser = VacancyParser(backend=backend) if timeout is None else \
+            VacancyParser(timeout=timeout, backend=backend)
+        self.parse_workers = parse_workers
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self):
+        """Ленивое создание пула для разбора HTML"""
+        if self._executor is None:
+            if self.parse_workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vacancy-parse")
+        return self._executor
+
+    def close(self):
+        """Останавливает пул разбора HTML"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _fetch(self, client: httpx.AsyncClient, throttle: _HostThrottle, url: str,
+                     headers: Optional[Dict[str, str]] = None):
+        """
+        Загружает страницу с повторными попытками и экспоненциальной задержкой
+
+        :param headers: Заголовки запроса вместо заголовков клиента по умолчанию
+        :return: Кортеж (тело ответа, количество попыток)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            async with throttle.semaphore:
+                await throttle.wait_turn()
+                try:
+                    response = await client.get(url, headers=headers)
+                except httpx.TransportError:
+                    if attempt > self.retries:
+                        raise
+                    response = None
+
+            if response is not None:
+                if response.status_code not in RETRY_STATUS_CODES or attempt > self.retries:
+                    response.raise_for_status()
+                    return response.text, attempt
+
+            # Учитываем Retry-After, если сервер его прислал
+            delay = 0.5 * 2 ** (attempt - 1) + random.uniform(0, 0.25)
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+    def _get_throttle(self, throttles: Dict[str, _HostThrottle], url: str):
+        """Возвращает ограничитель нагрузки для хоста URL"""
+        host = urlparse(url).netloc
+        return throttles.setdefault(host, _HostThrottle(self.per_host_concurrency, self.host_delay))
+
+    async def _import_from_api(self, client: httpx.AsyncClient, throttles: Dict[str, _HostThrottle],
+                               url: str, original_id: str):
+        """
+        Получает вакансию через JSON API hh.ru
+
+        :return: Кортеж (данные вакансии, количество попыток) или None, если нужно перейти к HTML
+        """
+        api_url = self.parser.api_client.vacancy_url(original_id)
+        try:
+            body, attempts = await self._fetch(client, self._get_throttle(throttles, api_url), api_url,
+                                               headers=self.parser.api_client.headers)
+            # Разбор JSON не требует пула процессов: структура уже готова, остается только отобразить поля
+            return self.parser.parse_api_data(json.loads(body), url), attempts
+        except Exception as e:
+            logger.warning("Ошибка при получении вакансии %s через API hh.ru, используется HTML: %s", original_id, e)
+            return None
+
+    async def _import_one(self, client: httpx.AsyncClient, throttles: Dict[str, _HostThrottle], url: str):
+        """
+        Загружает и разбирает одну вакансию
+
+        :return: Словарь с результатом обработки URL
+        """
+        started = time.perf_counter()
+        error = self.parser.validate_url(url)
+        if error:
+            return {"url": url, "status": "error", "error": error}
+
+        original_id = extract_original_id(url)
+        if self.parser.backend == "api" and original_id:
+            api_result = await self._import_from_api(client, throttles, url, original_id)
+            if api_result is not None:
+                vacancy_data, attempts = api_result
+                return {
+                    "url": url,
+                    "status": "parsed",
+                    "source": "api",
+                    "attempts": attempts,
+                    "elapsed": round(time.perf_counter() - started, 3),
+                    "vacancy": vacancy_data
+                }
+
+        throttle = self._get_throttle(throttles, url)
+
+        try:
+            html, attempts = await self._fetch(client, throttle, url)
+        except httpx.HTTPError as e:
+            return {"url": url, "status": "error", "error": f"Ошибка при запросе к hh.ru: {str(e)}"}
+
+        try:
+            loop = asyncio.get_running_loop()
+            vacancy_data = await loop.run_in_executor(self._get_executor(), parse_vacancy_html, html, url)
+        except Exception as e:
+            return {"url": url, "status": "error", "error": f"Ошибка при парсинге вакансии: {str(e)}"}
+
+        return {
+            "url": url,
+            "status": "parsed",
+            "source": "html",
+            "attempts": attempts,
+            "elapsed": round(time.perf_counter() - started, 3),
+            "vacancy": vacancy_data
+        }
+
+    async def _existing_ids(self, urls: List[str]):
+        """Идентификаторы уже сохраненных вакансий по original_id из URL"""
+        original_ids = [original_id for original_id in map(extract_original_id, urls) if original_id]
+        if self.db_service is None or not original_ids:
+            return {}
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.db_service.get_vacancy_ids_by_original_ids, original_ids)
+
+    def _save(self, vacancies: List[Dict[str, Any]]):
+        """Вычисляет навыки и сохраняет вакансии одним запросом (выполняется в отдельном потоке)"""
+        if self.skills_extractor is not None:
+            for vacancy in vacancies:
+                vacancy["skills_canonical"] = self.skills_extractor(vacancy.get("description"), vacancy.get("skills"))
+
+        if self.db_service is None:
+            return True
+        return self.db_service.save_vacancies(vacancies)
+
+    async def import_urls(self, urls: List[str], on_progress: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Импортирует вакансии по списку URL
+
+        :param urls: Список URL вакансий hh.ru (повторы обрабатываются один раз)
+        :param on_progress: Функция, вызываемая после обработки каждого URL
+        :return: Словарь со сводкой (total, saved, failed), результатами по URL
+                 и списком сохраненных вакансий (vacancies)
+        """
+        unique_urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        total = len(unique_urls)
+        throttles: Dict[str, _HostThrottle] = {}
+        results: List[Dict[str, Any]] = []
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        timeout = httpx.Timeout(self.parser.timeout)
+        global_semaphore = asyncio.Semaphore(self.concurrency)
+        existing_ids = await self._existing_ids(unique_urls)
+
+        async with httpx.AsyncClient(headers=self.parser.headers, limits=limits, timeout=timeout,
+                                     follow_redirects=True) as client:
+            async def run(url: str):
+                async with global_semaphore:
+                    result = await self._import_one(client, throttles, url)
+                if result["status"] == "parsed":
+                    # Повторный импорт обновляет уже сохраненную вакансию, а не создает новую
+                    vacancy = result["vacancy"]
+                    vacancy["id"] = existing_ids.get(vacancy.get("original_id"), vacancy["id"])
+                results.append(result)
+                if on_progress is not None:
+                    on_progress({**_public_result(result), "done": len(results), "total": total})
+
+            await asyncio.gather(*(run(url) for url in unique_urls))
+
+        vacancies = [result["vacancy"] for result in results if result["status"] == "parsed"]
+        saved = await asyncio.get_running_loop().run_in_executor(None, self._save, vacancies) if vacancies else True
+
+        for result in results:
+            if result["status"] == "parsed":
+                result["status"] = "saved" if saved else "error"
+                if not saved:
+                    result["error"] = "Не удалось сохранить вакансию в базу данных"
+
+        return {
+            "total": total,
+            "saved": len(vacancies) if saved else 0,
+            "failed": total - (len(vacancies) if saved else 0),
+            "results": [_public_result(result) for result in results],
+            "vacancies": vacancies if saved else []
+        }
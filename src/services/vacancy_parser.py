@@ -1,22 +1,126 @@
+import os
 import re
 import uuid
-from typing import List
+from typing import Dict, List
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.services.hh_api_client import HHApiClient, extract_original_id, map_api_vacancy
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+
+# Загружаем переменные окружения
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Таймаут запроса к hh.ru в секундах
+HH_REQUEST_TIMEOUT = float(os.getenv("HH_REQUEST_TIMEOUT", "15"))
+
+# Источник данных вакансии: "api" — JSON API hh.ru с откатом на HTML, "html" — только страница вакансии
+HH_VACANCY_BACKEND = os.getenv("HH_VACANCY_BACKEND", "api").lower()
+
+# Режим разбора HTML: "fast" — только нужные узлы страницы, "full" — полное дерево документа
+HH_HTML_PARSER = os.getenv("HH_HTML_PARSER", "fast").lower()
+
+# Парсер на C (lxml) используется в быстром режиме, если он установлен
+try:
+    import lxml  # noqa: F401
+    FAST_PARSER_FEATURES = "lxml"
+except ImportError:
+    FAST_PARSER_FEATURES = "html.parser"
+
+# Атрибуты data-qa узлов, из которых извлекаются данные вакансии
+VACANCY_DATA_QA = frozenset({
+    "bloko-header-2", "vacancy-salary", "vacancy-experience", "vacancy-description", "bloko-tag__text"
+})
+
+# Парсер, используемый в процессах пула (создается один раз на процесс)
+_process_parser = None
+
+
+def parse_vacancy_html(html: str, url: str):
+    """
+    Разбирает HTML страницы вакансии
+
+    Функция уровня модуля, чтобы ее можно было выполнять в пуле процессов.
+
+    :param html: HTML страницы вакансии
+    :param url: URL вакансии
+    :return: Словарь с данными вакансии
+    """
+    global _process_parser
+    if _process_parser is None:
+        _process_parser = VacancyParser()
+    return _process_parser.parse_html(html, url)
+
+
+def _has_class(attrs, class_name: str):
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return class_name in classes
+
+
+def _is_vacancy_node(name: str, attrs):
+    """
+    Проверяет, нужен ли узел для извлечения данных вакансии
+
+    Условия повторяют селекторы parse_html: заголовок, компания, зарплата,
+    опыт, описание и теги навыков.
+    """
+    attrs = attrs or {}
+    if attrs.get("data-qa") in VACANCY_DATA_QA:
+        return True
+    if name == "h1":
+        return _has_class(attrs, "bloko-header-section-1")
+    if name == "a":
+        return _has_class(attrs, "bloko-link")
+    return False
+
+
+class _VacancyNodeStrainer(SoupStrainer):
+    """
+    Фильтр разбора, оставляющий только узлы вакансии с их поддеревьями
+
+    Остальные теги и строки страницы (скрипты, меню, похожие вакансии)
+    не превращаются в объекты BeautifulSoup.
+    """
+
+    # beautifulsoup4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return _is_vacancy_node(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # beautifulsoup4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return _is_vacancy_node(markup_name, dict(markup_attrs or {}))
 
 
 class VacancyParser:
     """Сервис для парсинга вакансий с hh.ru"""
 
-    def __init__(self):
+    def __init__(self, timeout: float = HH_REQUEST_TIMEOUT, backend: str = HH_VACANCY_BACKEND,
+                 html_parser: str = HH_HTML_PARSER):
         """
         Инициализация парсера вакансий
+
+        :param timeout: Таймаут запроса к hh.ru в секундах
+        :param backend: Источник данных: "api" (JSON API с откатом на HTML) или "html"
+        :param html_parser: Режим разбора HTML: "fast" (lxml и только нужные узлы) или "full"
         """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
         }
+        self.timeout = timeout
+        self.backend = backend
+        self.api_client = HHApiClient(timeout=timeout)
+        self.html_parser = html_parser
 
         # Список популярных технологий и навыков для поиска в описании
         self.common_skills = [
@@ -43,6 +147,30 @@ class VacancyParser:
             "Компания", "Офис", "Сотрудник", "Коллега", "Руководитель", "Менеджер"
         ]
 
+        # Навык в нижнем регистре -> форма из списка популярных навыков
+        self._common_skills_lower: Dict[str, str] = {}
+        for skill in self.common_skills:
+            self._common_skills_lower.setdefault(skill.lower(), skill)
+        self._common_skill_order = {skill: position for position, skill in enumerate(self._common_skills_lower.values())}
+        self._non_skills_set = frozenset(self.non_skills)
+        # Ключи сканера приводятся через casefold: re.IGNORECASE сопоставляет и такие символы, как "ſ" и "s"
+        self._scanner_skills = {skill.casefold(): skill for skill in self._common_skills_lower.values()}
+
+        # Один сканер для всех популярных навыков. Совпадение ищется в каждой позиции
+        # через опережающую проверку, поэтому пересекающиеся навыки находятся так же,
+        # как при отдельном поиске каждого навыка ("Spring" и "Spring Boot")
+        alternatives = sorted(self._common_skills_lower.values(), key=len, reverse=True)
+        self._skills_scanner = re.compile(
+            r'\b(?=(' + '|'.join(re.escape(skill) for skill in alternatives) + r')\b)', re.IGNORECASE
+        )
+        # Более короткие навыки, которые находятся внутри найденного длинного ("Docker" в "Docker Compose")
+        self._nested_skills: Dict[str, List[str]] = {}
+        for skill in self._common_skills_lower.values():
+            nested = [other for other in self._common_skills_lower.values() if other != skill and
+                      re.search(r'\b' + re.escape(other) + r'\b', skill, re.IGNORECASE)]
+            if nested:
+                self._nested_skills[skill] = nested
+
     def _clean_salary_str(self, salary_str: str):
         """
         Очищает строку с зарплатой от пробелов и других символов, конвертирует в число
@@ -51,6 +179,63 @@ class VacancyParser:
         cleaned_str = ''.join(c for c in salary_str if c.isdigit())
         return int(cleaned_str) if cleaned_str else 0
 
+    def _parse_salary(self, salary_text: str):
+        """
+        Разбирает строку зарплаты со страницы вакансии
+
+        :param salary_text: Текст зарплаты ("от 100 000 до 150 000 ₽ на руки")
+        :return: Кортеж (зарплата от, зарплата до, валюта)
+        """
+        salary_from = None
+        salary_to = None
+        currency = None
+
+        if salary_text and salary_text != "з/п не указана":
+            # Сначала ищем полный текст зарплаты и пытаемся определить валюту
+            currency_match = re.search(r'(₽|\$|€|руб\.|USD|EUR)', salary_text)
+            if currency_match:
+                currency = currency_match.group(1)
+
+            # Удаляем фразы "до вычета налогов", "на руки", "за месяц" и т.д. перед парсингом
+            cleaned_salary_text = re.sub(r'\s+(до вычета налогов|на руки|за месяц).*$', '', salary_text)
+
+            # Проверяем на диапазон с дефисом (например, "350 000 - 430 000 ₽")
+            range_match = re.search(r'(\d+[\s\xa0]*\d*)\s*[-–—]\s*(\d+[\s\xa0]*\d*)', cleaned_salary_text)
+            if range_match:
+                salary_from = self._clean_salary_str(range_match.group(1))
+                salary_to = self._clean_salary_str(range_match.group(2))
+            else:
+                # Парсинг диапазона зарплаты с использованием "от до" (например, "от 100 000 до 150 000 руб.")
+                salary_match = re.search(r'от\s+(\d+[\s\xa0]*\d*)\s+до\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
+                if salary_match:
+                    salary_from = self._clean_salary_str(salary_match.group(1))
+                    salary_to = self._clean_salary_str(salary_match.group(2))
+                else:
+                    # Парсинг "от" зарплаты (например, "от 100 000 руб.")
+                    salary_match = re.search(r'от\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
+                    if salary_match:
+                        salary_from = self._clean_salary_str(salary_match.group(1))
+                    else:
+                        # Парсинг "до" зарплаты (например, "до 150 000 руб.")
+                        salary_match = re.search(r'до\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
+                        if salary_match:
+                            salary_to = self._clean_salary_str(salary_match.group(1))
+                        else:
+                            # Парсинг фиксированной зарплаты (например, "100 000 руб.")
+                            salary_match = re.search(r'(\d+[\s\xa0]*\d*)', cleaned_salary_text)
+                            if salary_match:
+                                salary_from = self._clean_salary_str(salary_match.group(1))
+                                salary_to = salary_from
+
+            # Если валюта не найдена ранее, ищем в тексте
+            if not currency:
+                for curr in ["₽", "$", "€", "руб.", "USD", "EUR"]:
+                    if curr in cleaned_salary_text:
+                        currency = curr
+                        break
+
+        return salary_from, salary_to, currency
+
     def _extract_currency(self, currency_text: str):
         """
         Извлекает валюту из строки, которая может содержать дополнительный текст
@@ -70,188 +255,175 @@ class VacancyParser:
         """
         Извлекает навыки из описания вакансии
         """
-        # Найденные навыки
-        found_skills = []
+        found = set()
+        for match in self._skills_scanner.finditer(description):
+            skill = self._scanner_skills[match.group(1).casefold()]
+            found.add(skill)
+            found.update(self._nested_skills.get(skill, ()))
 
-        # Ищем каждый навык в описании
-        for skill in self.common_skills:
-            # Добавляем границы слов, чтобы избежать частичных совпадений
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, description, re.IGNORECASE):
-                # Для совпадения без учета регистра используем оригинальную форму навыка из списка
-                if skill not in found_skills:
-                    found_skills.append(skill)
+        # Порядок навыков — как в списке популярных навыков
+        found_skills = sorted(found, key=self._common_skill_order.__getitem__)
 
         # Удаляем возможные дубликаты с разным регистром
-        found_skills = self._normalize_skills(found_skills)
-
-        return found_skills
+        return self._normalize_skills(found_skills)
 
     def _normalize_skills(self, skills: List[str]):
         """
         Нормализует список навыков, удаляя дубликаты и неподходящие слова
-        """
-        # Удаляем дубликаты (с учетом регистра)
-        unique_skills = []
-        lowercase_skills = set()
-
-        for skill in skills:
-            if skill.lower() not in lowercase_skills and skill not in self.non_skills:
-                # Проверяем, является ли навык "настоящим" навыком из списка популярных
-                is_common_skill = False
-                for common_skill in self.common_skills:
-                    if skill.lower() == common_skill.lower():
-                        unique_skills.append(common_skill)  # Используем форму из списка популярных
-                        is_common_skill = True
-                        break
-
-                # Если это не популярный навык, но и не из списка неподходящих слов, добавляем
-                if not is_common_skill and len(skill) > 2:  # Проверяем чтобы длина была > 2 символов
-                    unique_skills.append(skill)
-
-                # Добавляем навык в множество обработанных (в нижнем регистре)
-                lowercase_skills.add(skill.lower())
 
-        # Удаляем варианты одного и того же навыка
-        # Например, если есть "PostgreSQL" и "Postgresql", оставляем только "PostgreSQL"
+        Варианты одного навыка с разным регистром ("PostgreSQL" и "Postgresql")
+        сводятся к форме из списка популярных навыков.
+        """
         final_skills = []
         processed_lowercase = set()
 
-        for skill in unique_skills:
-            if skill.lower() not in processed_lowercase:
-                # Проверка, есть ли навык в списке популярных с разным регистром
-                found_in_common = False
-                for common_skill in self.common_skills:
-                    if skill.lower() == common_skill.lower():
-                        final_skills.append(common_skill)
-                        found_in_common = True
-                        break
+        for skill in skills:
+            skill_lower = skill.lower()
+            if skill_lower in processed_lowercase or skill in self._non_skills_set:
+                continue
 
-                if not found_in_common:
-                    final_skills.append(skill)
+            common_skill = self._common_skills_lower.get(skill_lower)
+            if common_skill is not None:
+                final_skills.append(common_skill)
+            elif len(skill) > 2:  # Проверяем чтобы длина была > 2 символов
+                final_skills.append(skill)
 
-                processed_lowercase.add(skill.lower())
+            processed_lowercase.add(skill_lower)
 
         return final_skills
 
+    @staticmethod
+    def validate_url(url: str):
+        """
+        Проверяет, что URL указывает на hh.ru
+
+        :return: Текст ошибки или None, если URL корректен
+        """
+        parsed_url = urlparse(url)
+        if 'hh.ru' not in parsed_url.netloc:
+            return "URL должен указывать на вакансию с сайта hh.ru"
+        return None
+
     def parse_vacancy(self, url: str):
         """
         Парсит вакансию по URL
+
+        Если включен источник "api" и в URL есть идентификатор вакансии, данные
+        берутся из JSON API hh.ru. При ошибке API вакансия загружается со страницы.
         """
         # Проверка, что URL указывает на hh.ru
-        parsed_url = urlparse(url)
-        if 'hh.ru' not in parsed_url.netloc:
-            return None, "URL должен указывать на вакансию с сайта hh.ru"
+        error = self.validate_url(url)
+        if error:
+            return None, error
+
+        original_id = extract_original_id(url)
+        if self.backend == "api" and original_id:
+            try:
+                return self.parse_api_data(self.api_client.get_vacancy(original_id), url), None
+            except Exception as e:
+                logger.warning("Ошибка при получении вакансии %s через API hh.ru, используется HTML: %s", original_id, e)
 
         try:
             # Получение HTML страницы
-            response = requests.get(url, headers=self.headers)
+            response = requests.get(url, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
 
-            # Парсинг HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Извлечение ID вакансии из URL
-            vacancy_id_match = re.search(r'/vacancy/(\d+)', url)
-            original_id = vacancy_id_match.group(1) if vacancy_id_match else None
+            return self.parse_html(response.text, url), None
 
-            # Парсинг названия вакансии
-            title_elem = soup.select_one('h1.bloko-header-section-1')
-            title = title_elem.text.strip() if title_elem else "Неизвестная вакансия"
+        except requests.RequestException as e:
+            return None, f"Ошибка при запросе к hh.ru: {str(e)}"
+        except Exception as e:
+            return None, f"Ошибка при парсинге вакансии: {str(e)}"
 
-            # Парсинг названия компании
-            company_elem = soup.select_one('span[data-qa="bloko-header-2"], a.bloko-link')
-            company = company_elem.text.strip() if company_elem else "Неизвестная компания"
+    def parse_api_data(self, data: dict, url: str):
+        """
+        Извлекает данные вакансии из ответа JSON API hh.ru
 
-            # Парсинг зарплаты
-            salary_elem = soup.select_one('[data-qa="vacancy-salary"] span, [data-qa="vacancy-salary"]')
-            salary_text = salary_elem.text.strip() if salary_elem else ""
+        Навыки берутся из key_skills, а при их отсутствии — из описания,
+        так же как при разборе HTML страницы.
 
-            salary_from = None
-            salary_to = None
-            currency = None
+        :param data: JSON-ответ api.hh.ru/vacancies/{id}
+        :param url: URL вакансии
+        :return: Словарь с данными вакансии
+        """
+        vacancy_data = map_api_vacancy(data, url)
+        if vacancy_data["skills"]:
+            vacancy_data["skills"] = self._normalize_skills(vacancy_data["skills"])
+        else:
+            vacancy_data["skills"] = self._extract_skills_from_description(vacancy_data["description"])
+        return vacancy_data
+
+    def _make_soup(self, html: str):
+        """
+        Строит дерево документа для извлечения данных вакансии
 
-            if salary_text and salary_text != "з/п не указана":
-                # Сначала ищем полный текст зарплаты и пытаемся определить валюту
-                currency_match = re.search(r'(₽|\$|€|руб\.|USD|EUR)', salary_text)
-                if currency_match:
-                    currency = currency_match.group(1)
+        В быстром режиме создаются только узлы вакансии (см. _is_vacancy_node);
+        селекторы parse_html находят в таком дереве те же элементы, что и в полном.
+        """
+        if self.html_parser == "full":
+            return BeautifulSoup(html, 'html.parser')
+        return BeautifulSoup(html, FAST_PARSER_FEATURES, parse_only=_VacancyNodeStrainer())
 
-                # Удаляем фразы "до вычета налогов", "на руки", "за месяц" и т.д. перед парсингом
-                cleaned_salary_text = re.sub(r'\s+(до вычета налогов|на руки|за месяц).*$', '', salary_text)
+    def parse_html(self, html: str, url: str):
+        """
+        Извлекает данные вакансии из HTML страницы hh.ru
 
-                # Проверяем на диапазон с дефисом (например, "350 000 - 430 000 ₽")
-                range_match = re.search(r'(\d+[\s\xa0]*\d*)\s*[-–—]\s*(\d+[\s\xa0]*\d*)', cleaned_salary_text)
-                if range_match:
-                    salary_from = self._clean_salary_str(range_match.group(1))
-                    salary_to = self._clean_salary_str(range_match.group(2))
-                else:
-                    # Парсинг диапазона зарплаты с использованием "от до" (например, "от 100 000 до 150 000 руб.")
-                    salary_match = re.search(r'от\s+(\d+[\s\xa0]*\d*)\s+до\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
-                    if salary_match:
-                        salary_from = self._clean_salary_str(salary_match.group(1))
-                        salary_to = self._clean_salary_str(salary_match.group(2))
-                    else:
-                        # Парсинг "от" зарплаты (например, "от 100 000 руб.")
-                        salary_match = re.search(r'от\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
-                        if salary_match:
-                            salary_from = self._clean_salary_str(salary_match.group(1))
-                        else:
-                            # Парсинг "до" зарплаты (например, "до 150 000 руб.")
-                            salary_match = re.search(r'до\s+(\d+[\s\xa0]*\d*)', cleaned_salary_text)
-                            if salary_match:
-                                salary_to = self._clean_salary_str(salary_match.group(1))
-                            else:
-                                # Парсинг фиксированной зарплаты (например, "100 000 руб.")
-                                salary_match = re.search(r'(\d+[\s\xa0]*\d*)', cleaned_salary_text)
-                                if salary_match:
-                                    salary_from = self._clean_salary_str(salary_match.group(1))
-                                    salary_to = salary_from
-
-                # Если валюта не найдена ранее, ищем в тексте
-                if not currency:
-                    for curr in ["₽", "$", "€", "руб.", "USD", "EUR"]:
-                        if curr in cleaned_salary_text:
-                            currency = curr
-                            break
-
-            # Парсинг опыта работы
-            experience_elem = soup.select_one('[data-qa="vacancy-experience"]')
-            experience = experience_elem.text.strip() if experience_elem else None
-
-            # Парсинг описания вакансии
-            description_elem = soup.select_one('[data-qa="vacancy-description"]')
-            description = description_elem.text.strip() if description_elem else ""
-
-            # Пытаемся найти навыки в блоке тегов
-            skills_elems = soup.select('[data-qa="bloko-tag__text"]')
-            skills = [skill.text.strip() for skill in skills_elems] if skills_elems else []
-
-            # Если навыки не найдены через селектор тегов, извлекаем их из описания
-            if not skills:
-                skills = self._extract_skills_from_description(description)
-            else:
-                # Если навыки найдены через селектор, все равно нормализуем их
-                skills = self._normalize_skills(skills)
-
-            # Формирование результата
-            vacancy_data = {
-                "id": str(uuid.uuid4()),
-                "title": title,
-                "company": company,
-                "description": description,
-                "salary_from": salary_from,
-                "salary_to": salary_to,
-                "currency": currency,
-                "experience": experience,
-                "skills": skills,
-                "url": url,
-                "original_id": original_id
-            }
-
-            return vacancy_data, None
+        :param html: HTML страницы вакансии
+        :param url: URL вакансии
+        :return: Словарь с данными вакансии
+        """
+        # Парсинг HTML
+        soup = self._make_soup(html)
+
+        # Извлечение ID вакансии из URL
+        original_id = extract_original_id(url)
+
+        # Парсинг названия вакансии
+        title_elem = soup.select_one('h1.bloko-header-section-1')
+        title = title_elem.text.strip() if title_elem else "Неизвестная вакансия"
+
+        # Парсинг названия компании
+        company_elem = soup.select_one('span[data-qa="bloko-header-2"], a.bloko-link')
+        company = company_elem.text.strip() if company_elem else "Неизвестная компания"
+
+        # Парсинг зарплаты
+        salary_elem = soup.select_one('[data-qa="vacancy-salary"] span, [data-qa="vacancy-salary"]')
+        salary_text = salary_elem.text.strip() if salary_elem else ""
+
+        salary_from, salary_to, currency = self._parse_salary(salary_text)
+
+        # Парсинг опыта работы
+        experience_elem = soup.select_one('[data-qa="vacancy-experience"]')
+        experience = experience_elem.text.strip() if experience_elem else None
+
+        # Парсинг описания вакансии
+        description_elem = soup.select_one('[data-qa="vacancy-description"]')
+        description = description_elem.text.strip() if description_elem else ""
+
+        # Пытаемся найти навыки в блоке тегов
+        skills_elems = soup.select('[data-qa="bloko-tag__text"]')
+        skills = [skill.text.strip() for skill in skills_elems] if skills_elems else []
+
+        # Если навыки не найдены через селектор тегов, извлекаем их из описания
+        if not skills:
+            skills = self._extract_skills_from_description(description)
+        else:
+            # Если навыки найдены через селектор, все равно нормализуем их
+            skills = self._normalize_skills(skills)
+
+        # Формирование результата
+        vacancy_data = {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "company": company,
+            "description": description,
+            "salary_from": salary_from,
+            "salary_to": salary_to,
+            "currency": currency,
+            "experience": experience,
+            "skills": skills,
+            "url": url,
+            "original_id": original_id
+        }
 
-        except requests.RequestException as e:
-            return None, f"Ошибка при запросе к hh.ru: {str(e)}"
-        except Exception as e:
-            return None, f"Ошибка при парсинге вакансии: {str(e)}"
+        return vacancy_data
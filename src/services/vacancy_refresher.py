@@ -0,0 +1,253 @@
+import json
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from src.services.hh_api_client import extract_original_id
+from src.services.page_cache import PageCache, content_hash
+from src.services.vacancy_parser import VacancyParser
+from src.utils.logger import get_logger
+from src.utils.metrics import record_cache
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Поля вакансии, изменение которых требует обновить запись в базе данных
+CONTENT_FIELDS = ("title", "company", "description", "salary_from", "salary_to", "currency",
+                  "experience", "skills")
+
+# Поля, от которых зависит результат сопоставления с резюме
+MATCH_FIELDS = ("description", "skills")
+
+# Коды ответа, означающие, что вакансия удалена с hh.ru
+GONE_STATUS_CODES = {404, 410}
+
+SAVE_ERROR = "Не удалось сохранить вакансию в базу данных. Попробуйте позже."
+
+
+class VacancyGoneError(Exception):
+    """Источник ответил, что вакансии больше нет"""
+
+
+def _comparable(value):
+    """
+    Значение поля для сравнения: строки без учета пробельных символов
+
+    API и страница hh.ru по-разному разделяют блоки описания (перевод строки в
+    html_fragment_to_text, пробелы или ничего в тексте страницы), поэтому смена
+    источника без изменения содержимого не считается изменением.
+    """
+    if isinstance(value, str):
+        return "".join(value.split())
+    return value
+
+
+def _changed_fields(existing: Dict[str, Any], vacancy_data: Dict[str, Any]):
+    """Возвращает список полей, значения которых отличаются от сохраненных"""
+    changed = []
+    for field in CONTENT_FIELDS:
+        old, new = existing.get(field), vacancy_data.get(field)
+        if field == "skills":
+            old, new = sorted(map(_comparable, old or [])), sorted(map(_comparable, new or []))
+        else:
+            old, new = _comparable(old), _comparable(new)
+        if old != new:
+            changed.append(field)
+    return changed
+
+
+def _result(status: str, source: Optional[str], vacancy: Dict[str, Any], closed: bool,
+            changed_fields=None, invalidated_matches: int = 0):
+    return {
+        "status": status,
+        "source": source,
+        "vacancy": vacancy,
+        "closed": closed,
+        "changed_fields": changed_fields or [],
+        "invalidated_matches": invalidated_matches
+    }
+
+
+class VacancyRefresher:
+    """
+    Повторная загрузка вакансий с hh.ru по original_id
+
+    Запрос отправляется с заголовками If-None-Match / If-Modified-Since из
+    дискового кеша ответов. При ответе 304 или неизменном теле разбор
+    пропускается. Новые данные записываются в уже существующую строку
+    вакансии, а сохраненные сопоставления сбрасываются только при изменении
+    описания или навыков. Время проверки и признак закрытия вакансии
+    (в архиве или удалена с hh.ru) сохраняются после каждой загрузки.
+    """
+
+    def __init__(self, db_service, parser: Optional[VacancyParser] = None, page_cache: Optional[PageCache] = None,
+                 skills_extractor: Optional[Callable] = None):
+        """
+        Инициализация сервиса
+
+        :param db_service: Сервис базы данных
+        :param parser: Парсер вакансий (источник данных и таймауты берутся из него)
+        :param page_cache: Дисковый кеш ответов
+        :param skills_extractor: Функция (описание, теги навыков) -> нормализованные навыки
+        """
+        self.db_service = db_service
+        self.parser = parser or VacancyParser()
+        self.page_cache = page_cache or PageCache()
+        self.skills_extractor = skills_extractor
+        # Количество HTTP-запросов к hh.ru (для соблюдения бюджета запросов)
+        self.requests_made = 0
+
+    def _sources(self, url: str, original_id: str):
+        """Источники в порядке обращения: (имя, URL запроса, заголовки)"""
+        sources = []
+        if self.parser.backend == "api":
+            sources.append(("api", self.parser.api_client.vacancy_url(original_id), self.parser.api_client.headers))
+        sources.append(("html", url, self.parser.headers))
+        return sources
+
+    def _fetch(self, original_id: str, source: str, request_url: str, headers: Dict[str, str]):
+        """
+        Условный запрос ответа источника
+
+        :return: Кортеж (тело ответа, изменилось ли тело по сравнению с кешем)
+        :raises VacancyGoneError: Если источник ответил 404 или 410
+        """
+        meta = self.page_cache.get_meta(original_id, source)
+        cached_body = self.page_cache.get_body(original_id, source) if meta else None
+
+        request_headers = dict(headers)
+        if cached_body is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        self.requests_made += 1
+        response = requests.get(request_url, headers=request_headers, timeout=self.parser.timeout)
+
+        if response.status_code == 304 and cached_body is not None:
+            record_cache("page_cache", hits=1)
+            self.page_cache.touch(original_id, source, response.headers.get("ETag"),
+                                  response.headers.get("Last-Modified"))
+            return cached_body, False
+
+        if response.status_code in GONE_STATUS_CODES:
+            raise VacancyGoneError(f"{source}: HTTP {response.status_code}")
+
+        response.raise_for_status()
+        record_cache("page_cache", misses=1)
+        body = response.text
+        changed = cached_body is None or content_hash(body) != meta.get("content_hash")
+        self.page_cache.put(original_id, source, request_url, body,
+                            response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return body, changed
+
+    def _parse(self, source: str, body: str, url: str):
+        """
+        Разбирает ответ источника
+
+        :return: Кортеж (данные вакансии, вакансия в архиве)
+        """
+        if source == "api":
+            data = json.loads(body)
+            return self.parser.parse_api_data(data, url), bool(data.get("archived"))
+        return self.parser.parse_html(body, url), False
+
+    def refresh(self, url: str):
+        """
+        Загружает вакансию и сохраняет ее в существующую строку или как новую
+
+        :param url: URL вакансии на hh.ru
+        :return: Кортеж (результат, ошибка). Результат — словарь с ключами
+                 status ("created", "updated", "unchanged", "not_modified", "closed"),
+                 vacancy (данные вакансии), source, closed, changed_fields и invalidated_matches
+        """
+        error = self.parser.validate_url(url)
+        if error:
+            return None, error
+
+        original_id = extract_original_id(url)
+        if not original_id:
+            # Без идентификатора повторную загрузку отследить нельзя, сохраняем как новую вакансию
+            vacancy_data, error = self.parser.parse_vacancy(url)
+            if error:
+                return None, error
+            return self._save_new(vacancy_data, None, False)
+
+        existing = self.db_service.get_vacancy_by_original_id(original_id)
+
+        last_error = None
+        gone = False
+        for source, request_url, headers in self._sources(url, original_id):
+            try:
+                body, body_changed = self._fetch(original_id, source, request_url, headers)
+                if existing and not body_changed:
+                    return self._checked(_result("not_modified", source, existing,
+                                                 bool(existing.get("is_closed")))), None
+
+                vacancy_data, closed = self._parse(source, body, url)
+                break
+            except VacancyGoneError as e:
+                gone = True
+                last_error = f"Вакансия не найдена на hh.ru ({str(e)})"
+            except requests.RequestException as e:
+                gone = False
+                last_error = f"Ошибка при запросе к hh.ru: {str(e)}"
+            except Exception as e:
+                gone = False
+                last_error = f"Ошибка при парсинге вакансии: {str(e)}"
+            logger.warning("Не удалось обновить вакансию %s из источника %s: %s", original_id, source, last_error)
+        else:
+            # Вакансия удалена, если ее не нашел последний источник (страница на hh.ru)
+            if gone and existing:
+                return self._checked(_result("closed", None, existing, True)), None
+            return None, last_error
+
+        if not existing:
+            return self._save_new(vacancy_data, source, closed)
+
+        changed_fields = _changed_fields(existing, vacancy_data)
+        if not changed_fields:
+            return self._checked(_result("closed" if closed else "unchanged", source, existing, closed)), None
+
+        # Обновляем существующую строку: идентификатор сохраняется, сопоставления остаются привязанными к ней
+        vacancy_data["id"] = existing["id"]
+        if not self._save(vacancy_data):
+            return None, SAVE_ERROR
+
+        invalidated = 0
+        if any(field in changed_fields for field in MATCH_FIELDS):
+            invalidated = self.db_service.invalidate_vacancy_matches(existing["id"]) or 0
+
+        return self._checked(_result("updated", source, vacancy_data, closed, changed_fields, invalidated)), None
+
+    def _checked(self, result: Dict[str, Any]):
+        """Сохраняет время проверки и признак закрытия вакансии"""
+        self.db_service.mark_vacancy_checked(result["vacancy"]["id"], result["closed"])
+        return result
+
+    def _save_new(self, vacancy_data: Dict[str, Any], source: Optional[str], closed: bool):
+        """Сохраняет вакансию, которой еще нет в базе данных"""
+        if not self._save(vacancy_data):
+            return None, SAVE_ERROR
+        return self._checked(_result("created", source, vacancy_data, closed, list(CONTENT_FIELDS))), None
+
+    def _save(self, vacancy_data: Dict[str, Any]):
+        """Вычисляет навыки и сохраняет вакансию через DBService.save_vacancy"""
+        if self.skills_extractor is not None:
+            vacancy_data["skills_canonical"] = self.skills_extractor(vacancy_data.get("description"),
+                                                                     vacancy_data.get("skills"))
+        return self.db_service.save_vacancy(
+            vacancy_id=vacancy_data["id"],
+            title=vacancy_data.get("title"),
+            company=vacancy_data.get("company"),
+            description=vacancy_data.get("description"),
+            url=vacancy_data.get("url"),
+            original_id=vacancy_data.get("original_id"),
+            salary_from=vacancy_data.get("salary_from"),
+            salary_to=vacancy_data.get("salary_to"),
+            currency=vacancy_data.get("currency"),
+            experience=vacancy_data.get("experience"),
+            skills=vacancy_data.get("skills"),
+            skills_canonical=vacancy_data.get("skills_canonical")
+        )
@@ -0,0 +1,24 @@
+import threading
+
+from dotenv import load_dotenv
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_env():
+    """
+    Загружает переменные окружения из .env файла
+
+    Файл читается один раз за процесс, повторные вызовы ничего не делают.
+    Модули вызывают load_env() перед чтением своих переменных окружения
+    вместо собственного load_dotenv(), поэтому порядок импорта не важен.
+    Уже заданные переменные окружения не перезаписываются.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
@@ -0,0 +1,297 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import HTTPException
+
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Заголовок запроса с допустимым временем обработки в секундах ("X-Request-Timeout: 10")
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+# Время обработки запроса по умолчанию для всех маршрутов, в секундах (0 — без ограничения)
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "0"))
+# Время обработки по умолчанию для маршрутов с запросом к LLM
+REQUEST_TIMEOUT_LLM = float(os.getenv("REQUEST_TIMEOUT_LLM", "90"))
+# Наибольшее время из заголовка запроса
+REQUEST_TIMEOUT_MAX = float(os.getenv("REQUEST_TIMEOUT_MAX", "300"))
+
+
+class DeadlineExceeded(HTTPException):
+    """Время обработки запроса истекло: ответ 504"""
+
+    def __init__(self, stage: str):
+        super().__init__(status_code=504, detail=f"Время обработки запроса истекло ({stage})")
+        self.stage = stage
+
+
+class RequestCancelled(HTTPException):
+    """
+    Клиент закрыл соединение, результат никому не нужен
+
+    Статус 499 (как у nginx) попадает только в журнал и метрики: ответ клиенту уже не отправляется.
+    """
+
+    def __init__(self, stage: str):
+        super().__init__(status_code=499, detail=f"Клиент закрыл соединение ({stage})")
+        self.stage = stage
+
+
+class RequestDeadline:
+    """
+    Срок обработки HTTP-запроса и признак отключения клиента
+
+    Время берется из заголовка X-Request-Timeout, иначе из настройки маршрута
+    (request_policy), иначе из REQUEST_TIMEOUT. Объект общий для всех копий
+    контекста запроса, поэтому потоки пулов видят отключение клиента.
+    """
+
+    def __init__(self, header_timeout: Optional[float] = None):
+        self.started = time.monotonic()
+        self.header_timeout = header_timeout
+        self.route_timeout: Optional[float] = None
+        # Прерывать ли работу при отключении клиента (результат не сохраняется для повторного использования)
+        self.cancel_on_disconnect = False
+        self._disconnected = threading.Event()
+
+    @property
+    def timeout(self) -> Optional[float]:
+        for timeout in (self.header_timeout, self.route_timeout, REQUEST_TIMEOUT):
+            if timeout:
+                return timeout
+        return None
+
+    def remaining(self) -> Optional[float]:
+        """Оставшееся время в секундах или None, если срок не ограничен"""
+        timeout = self.timeout
+        if timeout is None:
+            return None
+        return self.started + timeout - time.monotonic()
+
+    @property
+    def disconnected(self):
+        return self._disconnected.is_set()
+
+    def mark_disconnected(self):
+        self._disconnected.set()
+
+    @property
+    def cancelled(self):
+        """Клиент отключился, и работу по запросу следует прервать"""
+        return self.cancel_on_disconnect and self.disconnected
+
+    def check(self, stage: str):
+        """
+        :raises RequestCancelled: Клиент отключился, а результат не сохраняется
+        :raises DeadlineExceeded: Срок обработки истек
+        """
+        if self.cancelled:
+            raise RequestCancelled(stage)
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(stage)
+
+
+_current: ContextVar[Optional[RequestDeadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[RequestDeadline]:
+    """Срок текущего запроса или None вне обработки запроса (фоновые задачи, скрипты)"""
+    return _current.get()
+
+
+def remaining_seconds() -> Optional[float]:
+    """Оставшееся время текущего запроса в секундах или None, если срок не ограничен"""
+    deadline = _current.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def check_deadline(stage: str):
+    """Прерывает работу, если срок текущего запроса истек или клиент отключился"""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def deadline_timeout(default: float, stage: str) -> float:
+    """
+    Таймаут операции с учетом срока запроса: не больше default и не больше оставшегося времени
+
+    :raises DeadlineExceeded: Срок уже истек
+    """
+    check_deadline(stage)
+    remaining = remaining_seconds()
+    return default if remaining is None else min(default, remaining)
+
+
+def request_policy(timeout: Optional[float] = None, cancel_on_disconnect: bool = False):
+    """
+    Декоратор обработчика маршрута: срок обработки по умолчанию и реакция на отключение клиента
+
+    :param timeout: Время обработки, если клиент не передал X-Request-Timeout
+    :param cancel_on_disconnect: Прерывать запросы к LLM при отключении клиента; не включается
+        для маршрутов, результат которых сохраняется для повторного использования
+    """
+    def apply():
+        deadline = _current.get()
+        if deadline is not None:
+            deadline.route_timeout = timeout
+            deadline.cancel_on_disconnect = cancel_on_disconnect
+
+    def decorator(endpoint):
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_wrapper(*args, **kwargs):
+                apply()
+                return await endpoint(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            apply()
+            return endpoint(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def detach_from_request(func):
+    """
+    Декоратор фоновой работы: функция выполняется без срока HTTP-запроса
+
+    Starlette выполняет BackgroundTasks в контексте запроса, и без этого
+    фоновая задача унаследовала бы срок запроса (X-Request-Timeout,
+    statement_timeout) и признак отключения клиента. Работа, результат
+    которой сохраняется, не должна прерываться вместе с запросом.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _current.set(None)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current.set(None)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
+
+
+def enforce_deadline(cls):
+    """
+    Декоратор класса: проверка срока запроса до и после каждого публичного метода
+
+    Методы DBService перехватывают ошибки и возвращают пустой результат; если запрос
+    прерван по statement_timeout, проверка после вызова превращает пустой
+    результат в DeadlineExceeded вместо ответа «не найдено». Методы-генераторы
+    проверяются только перед запуском.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        setattr(cls, name, _checked_method(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _checked_method(stage, method):
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator_wrapper(*args, **kwargs):
+            check_deadline(stage)
+            yield from method(*args, **kwargs)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        check_deadline(stage)
+        result = method(*args, **kwargs)
+        check_deadline(stage)
+        return result
+
+    return wrapper
+
+
+class DeadlineMiddleware:
+    """
+    ASGI-middleware: срок обработки запроса и отслеживание отключения клиента
+
+    После того как приложение прочитало тело запроса, следующее сообщение
+    сервера — только http.disconnect; его ожидает фоновая задача, и при
+    отключении клиента срок запроса помечается отмененным. Обработчику,
+    который снова вызывает receive (StreamingResponse), возвращается то же
+    сообщение.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _header_timeout(scope) -> Optional[float]:
+        header = REQUEST_TIMEOUT_HEADER.lower().encode()
+        for key, value in scope.get("headers", []):
+            if key == header:
+                try:
+                    timeout = float(value.decode("latin-1"))
+                except ValueError:
+                    return None
+                return min(timeout, REQUEST_TIMEOUT_MAX) if timeout > 0 else None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = RequestDeadline(self._header_timeout(scope))
+        watcher: Optional[asyncio.Task] = None
+
+        async def wait_disconnect():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    deadline.mark_disconnected()
+                    return message
+
+        async def receive_wrapper():
+            nonlocal watcher
+            if watcher is not None:
+                return await asyncio.shield(watcher)
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                deadline.mark_disconnected()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(wait_disconnect())
+            return message
+
+        token = _current.set(deadline)
+        try:
+            await self.app(scope, receive_wrapper, send)
+        finally:
+            _current.reset(token)
+            if watcher is not None:
+                watcher.cancel()
+            if deadline.cancelled:
+                logger.info("Клиент закрыл соединение, обработка запроса %s прервана", scope["path"])
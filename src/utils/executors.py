@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import functools
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from src.utils.config import load_env
+from src.utils.deadline import DeadlineExceeded, check_deadline, remaining_seconds
+from src.utils.logger import get_logger
+from src.utils.metrics import EXECUTOR_QUEUE_WAIT, EXECUTOR_REJECTED, EXECUTOR_TASKS
+from src.utils.profiler import request_profiling_enabled, track_thread
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Пулы потоков по классам нагрузки: число потоков и число задач, ожидающих в очереди.
+# cpu — извлечение текста из PDF, навыки и поиск по индексам; llm — запросы к языковой модели;
+# db — чтение и запись в базу данных
+EXECUTOR_CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", str(min(8, os.cpu_count() or 2))))
+EXECUTOR_CPU_QUEUE = int(os.getenv("EXECUTOR_CPU_QUEUE", "32"))
+EXECUTOR_LLM_WORKERS = int(os.getenv("EXECUTOR_LLM_WORKERS", "16"))
+EXECUTOR_LLM_QUEUE = int(os.getenv("EXECUTOR_LLM_QUEUE", "32"))
+EXECUTOR_DB_WORKERS = int(os.getenv("EXECUTOR_DB_WORKERS", "16"))
+EXECUTOR_DB_QUEUE = int(os.getenv("EXECUTOR_DB_QUEUE", "128"))
+
+# Границы значения заголовка Retry-After, в секундах
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+
+class ExecutorOverloaded(HTTPException):
+    """Очередь пула потоков заполнена: ответ 503 с заголовком Retry-After"""
+
+    def __init__(self, workload: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Сервис перегружен ({workload}), повторите запрос через {retry_after} с",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.workload = workload
+        self.retry_after = retry_after
+
+
+class WorkloadExecutor:
+    """
+    Ограниченный пул потоков для одного класса нагрузки
+
+    Одновременно выполняется не больше max_workers задач, еще queue_size
+    ждут в очереди. Задача сверх этого сразу отклоняется с ExecutorOverloaded,
+    и запросы не копят очередь: медленные запросы к LLM не занимают потоки,
+    нужные для чтения из базы данных. Потоки создаются при первой задаче,
+    поэтому у воркеров, запущенных через fork, пулы свои.
+    """
+
+    def __init__(self, name: str, max_workers: int, queue_size: int):
+        """
+        :param name: Класс нагрузки (метка метрик и префикс имен потоков)
+        :param max_workers: Количество потоков
+        :param queue_size: Количество задач, ожидающих свободного потока
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._admitted = 0
+        self._lock = threading.Lock()
+        # Скользящее среднее длительности задачи для оценки Retry-After
+        self._average_seconds = 1.0
+
+    @property
+    def admitted(self):
+        """Количество принятых задач: выполняющиеся и ожидающие в очереди"""
+        return self._admitted
+
+    def retry_after(self):
+        """Оценка времени, за которое пул выполнит уже принятые задачи, в секундах"""
+        seconds = math.ceil(self._average_seconds * self._admitted / self.max_workers)
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, seconds))
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Ставит задачу в пул с копией контекста вызывающего (идентификатор запроса, трассировка)
+
+        :raises ExecutorOverloaded: Очередь пула заполнена
+        """
+        with self._lock:
+            if self._admitted >= self.max_workers + self.queue_size:
+                EXECUTOR_REJECTED.labels(self.name).inc()
+                raise ExecutorOverloaded(self.name, self.retry_after())
+            self._admitted += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"{self.name}-worker")
+            executor = self._executor
+
+        EXECUTOR_TASKS.labels(self.name, "queued").inc()
+        context = contextvars.copy_context()
+        # Обертка профилировщика нужна только при включенном профилировании запросов
+        if request_profiling_enabled():
+            func = track_thread(func)
+        future = executor.submit(context.run, self._run, time.perf_counter(), func, args, kwargs)
+        future.add_done_callback(self._release_cancelled)
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Выполняет функцию в пуле и ждет результата, не блокируя цикл событий
+
+        Ожидание ограничено сроком HTTP-запроса: задача, не дождавшаяся потока
+        до истечения срока, снимается с очереди.
+
+        :raises DeadlineExceeded: Срок запроса истек
+        """
+        check_deadline(f"очередь {self.name}")
+        future = self.submit(func, *args, **kwargs)
+        timeout = remaining_seconds()
+        if timeout is None:
+            return await asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), max(timeout, 0))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"пул {self.name}")
+
+    def _run(self, submitted: float, func: Callable, args, kwargs):
+        started = time.perf_counter()
+        EXECUTOR_QUEUE_WAIT.labels(self.name).observe(started - submitted)
+        EXECUTOR_TASKS.labels(self.name, "queued").dec()
+        EXECUTOR_TASKS.labels(self.name, "running").inc()
+        try:
+            # Запрос мог истечь или клиент отключиться, пока задача ждала в очереди
+            check_deadline(f"очередь {self.name}")
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            EXECUTOR_TASKS.labels(self.name, "running").dec()
+            with self._lock:
+                self._admitted -= 1
+                self._average_seconds += 0.1 * (elapsed - self._average_seconds)
+
+    def _release_cancelled(self, future: Future):
+        # Задача, снятая с очереди до запуска (истек срок запроса), освобождает место в очереди
+        if future.cancelled():
+            EXECUTOR_TASKS.labels(self.name, "queued").dec()
+            with self._lock:
+                self._admitted -= 1
+
+
+# Пулы потоков приложения по классам нагрузки
+executors: Dict[str, WorkloadExecutor] = {
+    "cpu": WorkloadExecutor("cpu", EXECUTOR_CPU_WORKERS, EXECUTOR_CPU_QUEUE),
+    "llm": WorkloadExecutor("llm", EXECUTOR_LLM_WORKERS, EXECUTOR_LLM_QUEUE),
+    "db": WorkloadExecutor("db", EXECUTOR_DB_WORKERS, EXECUTOR_DB_QUEUE),
+}
+
+
+async def run_in_workload(workload: str, func: Callable, *args, **kwargs):
+    """
+    Выполняет синхронную функцию в пуле потоков класса нагрузки
+
+    :param workload: Класс нагрузки: cpu, llm или db
+    :raises ExecutorOverloaded: Очередь пула заполнена
+    """
+    return await executors[workload].run(func, *args, **kwargs)
+
+
+def workload(name: str):
+    """
+    Декоратор синхронного обработчика маршрута: обработчик выполняется в пуле
+    потоков класса нагрузки name вместо общего пула потоков Starlette
+
+    При заполненной очереди пула запрос сразу получает 503 с заголовком Retry-After.
+
+    :param name: Класс нагрузки: cpu, llm или db
+    """
+    executor = executors[name]
+
+    def decorator(endpoint: Callable):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return await executor.run(endpoint, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
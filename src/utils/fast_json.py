@@ -0,0 +1,125 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from src.utils.config import load_env
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Сжимать ли большие JSON-ответы (gzip, brotli — если установлен пакет brotli)
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() in ("1", "true", "yes")
+# Ответы меньше этого размера в байтах не сжимаются
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "4096"))
+# Уровни сжатия: быстрые, чтобы сжатие не занимало поток дольше, чем передача по сети
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+# Кодировщик JSON на C (orjson), если установлен
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Сжатие brotli (pip install brotli), если установлено
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _default(value):
+    # Типы, которые psycopg2 возвращает для столбцов TIMESTAMP и NUMERIC
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(content) -> bytes:
+    """
+    Сериализует данные в JSON (UTF-8) через orjson, иначе через json
+
+    Даты и время записываются в ISO 8601, как в jsonable_encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data):
+    """Разбирает JSON через orjson, иначе через json (используется для столбцов JSONB)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def available_encodings():
+    """Поддерживаемые кодировки сжатия в порядке предпочтения"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Выбирает кодировку сжатия по заголовку Accept-Encoding
+
+    Из поддерживаемых выбирается кодировка с наибольшим весом q; при равных
+    весах brotli предпочтительнее gzip.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Сжимает тело ответа (encoding: br или gzip)"""
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+def json_response(request: Request, content, headers: Optional[Dict[str, str]] = None,
+                  status_code: int = 200) -> Response:
+    """
+    Быстрый JSON-ответ для больших списков: данные сериализуются сразу в байты
+
+    Маршрут возвращает строки базы данных, уже приведенные к полям модели ответа,
+    без создания моделей Pydantic и jsonable_encoder; схема OpenAPI по-прежнему
+    задается response_model маршрута. Ответ больше RESPONSE_COMPRESSION_MIN_SIZE
+    сжимается, если клиент принимает brotli или gzip.
+
+    :param content: Данные ответа (списки и словари)
+    :param headers: Дополнительные заголовки (например, валидаторы ETag)
+    """
+    body = dumps(content)
+    headers = dict(headers or {})
+    if RESPONSE_COMPRESSION:
+        headers["Vary"] = "Accept-Encoding"
+        if len(body) >= RESPONSE_COMPRESSION_MIN_SIZE:
+            encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+            if encoding is not None:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
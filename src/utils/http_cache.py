@@ -0,0 +1,95 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+# Политики Cache-Control по маршрутам. Списки и отдельные записи клиент проверяет при
+# каждом обращении (no-cache + ETag, ответ 304 без тела); данные резюме не кешируются
+# общими прокси (private). PDF резюме меняется только при повторной загрузке
+RESUME_CACHE_CONTROL = "private, no-cache"
+RESUME_PDF_CACHE_CONTROL = "private, max-age=3600"
+VACANCY_CACHE_CONTROL = "public, max-age=60"
+VACANCY_LIST_CACHE_CONTROL = "public, no-cache"
+
+
+def content_etag(*parts, weak: bool = False) -> str:
+    """
+    ETag по содержимому: хеш JSON-представления частей ответа
+
+    :param weak: Слабый валидатор (W/"..."): совпадение означает равнозначный,
+        но не обязательно побайтно одинаковый ответ
+    """
+    body = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    tag = f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Столбцы TIMESTAMP без часового пояса записываются в сессиях с часовым поясом UTC
+    # (DB_SESSION_OPTIONS в DBService), поэтому значения без пояса — время UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Слабое сравнение (RFC 9110, 13.1.2): префикс W/ не учитывается
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None,
+                      cache_control: Optional[str] = None) -> Dict[str, str]:
+    """Заголовки ETag, Last-Modified и Cache-Control ответа"""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Актуальна ли копия клиента (If-None-Match, иначе If-Modified-Since)
+
+    If-Modified-Since учитывается, только если клиент не передал If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    return (if_modified_since is not None and last_modified is not None
+            and _not_modified_since(if_modified_since, _as_utc(last_modified)))
+
+
+def conditional_response(request: Request, response: Response, etag: str,
+                         last_modified: Optional[datetime] = None,
+                         cache_control: Optional[str] = None) -> Optional[Response]:
+    """
+    Проверяет условные заголовки запроса и задает валидаторы ответа маршрута
+
+    :param response: Ответ маршрута (параметр обработчика), в который записываются валидаторы
+    :return: Ответ 304 без тела, если копия клиента актуальна, иначе None —
+        маршрут формирует обычный ответ
+    """
+    headers = validator_headers(etag, last_modified, cache_control)
+    response.headers.update(headers)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Сколько секунд при остановке ждать завершения запросов к LLM (больше таймаута запроса в 60 секунд)
+SERVER_DRAIN_TIMEOUT = float(os.getenv("SERVER_DRAIN_TIMEOUT", "75"))
+
+# Текст для прогрева словарей навыков: латиница, кириллица и опечатка для нечеткого поиска
+WARMUP_TEXT = "Python, Джава, Spring Boot, PostgreSQL, Kubernets, Docker, React"
+
+
+class InFlightCounter:
+    """Счетчик выполняющихся операций с ожиданием их завершения"""
+
+    def __init__(self):
+        self._count = 0
+        self._condition = threading.Condition()
+
+    @property
+    def count(self):
+        return self._count
+
+    @contextmanager
+    def track(self):
+        with self._condition:
+            self._count += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._count -= 1
+                if self._count == 0:
+                    self._condition.notify_all()
+
+    def wait_idle(self, timeout: float):
+        """
+        Ждет завершения всех операций
+
+        :return: True, если операций не осталось, False по истечении timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._count == 0, timeout)
+
+
+# Выполняющиеся запросы к языковой модели (учитываются в metrics.track_llm_call)
+llm_calls = InFlightCounter()
+
+# Состояние процесса: starting → warming_up → ready → draining; loading — данные, которые воркер
+# загружает в память после запуска (например, индексы навыков)
+_state = {"status": "starting", "checks": {}, "warmup_seconds": None, "loading": set()}
+_state_lock = threading.Lock()
+
+
+def readiness():
+    """Состояние готовности для эндпоинта /ready"""
+    with _state_lock:
+        return {
+            "ready": _state["status"] == "ready" and not _state["loading"],
+            "status": _state["status"],
+            "loading": sorted(_state["loading"]),
+            "warmup_seconds": _state["warmup_seconds"],
+            "checks": dict(_state["checks"]),
+            "llm_calls_in_flight": llm_calls.count
+        }
+
+
+def warmup_started():
+    """Выполнялся ли прогрев в этом процессе (или в родительском до fork)"""
+    return _state["status"] != "starting"
+
+
+def begin_loading(name: str):
+    """Отмечает начало загрузки данных воркера: до ее окончания /ready отвечает 503"""
+    with _state_lock:
+        _state["loading"].add(name)
+
+
+def finish_loading(name: str):
+    """Отмечает окончание загрузки данных воркера"""
+    with _state_lock:
+        _state["loading"].discard(name)
+
+
+def mark_ready():
+    """Отмечает процесс готовым без прогрева (прогрев отключен)"""
+    with _state_lock:
+        _state["status"] = "ready"
+
+
+def drain(timeout: float = SERVER_DRAIN_TIMEOUT):
+    """
+    Переводит процесс в состояние остановки и ждет завершения запросов к LLM
+
+    Вызывается при остановке приложения: запросы, которые uvicorn уже не ждет
+    (в том числе фоновые задачи пересчета сопоставлений), дорабатывают в пуле
+    потоков, и их ответы от языковой модели не теряются.
+    """
+    with _state_lock:
+        _state["status"] = "draining"
+    if llm_calls.count:
+        logger.info("Ожидание завершения запросов к LLM: %s", llm_calls.count)
+    if not llm_calls.wait_idle(timeout):
+        logger.warning("Не дождались завершения запросов к LLM за %.0f с: %s", timeout, llm_calls.count)
+
+
+def _run_migrations():
+    # db_init — скрипт в корне репозитория, сервис запускается из него же
+    from db_init import create_schema, create_tables
+
+    if not create_schema() or not create_tables():
+        raise RuntimeError("не удалось создать схему или таблицы")
+    return "схема и таблицы актуальны"
+
+
+def _check_database():
+    from db_init import check_connection
+
+    if not check_connection():
+        raise RuntimeError("нет подключения к базе данных")
+    return "подключение установлено"
+
+
+def _compile_skill_matchers():
+    from src.services.container import services
+
+    # Создание сервисов компилирует регулярные выражения словаря навыков и индекс нечеткого поиска
+    skills = services.matcher.extract_canonical_skills(WARMUP_TEXT)
+    services.vacancy_parser._normalize_skills(WARMUP_TEXT.split(", "))
+    vocabulary = len(services.resume_skill_matrix.vocabulary) + len(services.vacancy_skill_matrix.vocabulary)
+    return f"навыков в тестовом тексте: {len(skills)}, столбцов матриц навыков: {vocabulary}"
+
+
+def _check_llm():
+    import requests
+
+    from src.services.container import services
+
+    url = services.matcher.llm_api_url
+    # Проверяется только доступность адреса: запрос к модели стоил бы денег
+    response = requests.get(url, timeout=5)
+    if response.status_code >= 500:
+        raise RuntimeError(f"{url} ответил {response.status_code}")
+    return f"{url} доступен (HTTP {response.status_code})"
+
+
+# Шаги прогрева в порядке выполнения: (имя, функция)
+WARMUP_STEPS = (
+    ("migrations", _run_migrations),
+    ("database", _check_database),
+    ("skill_matchers", _compile_skill_matchers),
+    ("llm", _check_llm),
+)
+
+
+def warmup(steps: Optional[Dict[str, Callable]] = None):
+    """
+    Прогревает процесс перед приемом запросов
+
+    Выполняет миграции, компилирует словари навыков и проверяет доступность
+    базы данных и LLM. Ошибка шага не прерывает прогрев, а попадает в
+    результаты проверки; по завершении процесс считается готовым.
+
+    :param steps: Шаги прогрева {имя: функция} (по умолчанию WARMUP_STEPS)
+    :return: Результаты шагов {имя: {"ok", "detail", "seconds"}}
+    """
+    with _state_lock:
+        _state["status"] = "warming_up"
+
+    started = time.perf_counter()
+    checks = {}
+    for name, step in (steps or dict(WARMUP_STEPS)).items():
+        step_started = time.perf_counter()
+        try:
+            checks[name] = {"ok": True, "detail": step()}
+        except Exception as e:
+            checks[name] = {"ok": False, "detail": str(e)}
+            logger.warning("Прогрев: шаг %s завершился ошибкой: %s", name, e)
+        checks[name]["seconds"] = round(time.perf_counter() - step_started, 3)
+
+    with _state_lock:
+        _state.update(status="ready", checks=checks, warmup_seconds=round(time.perf_counter() - started, 3))
+    logger.info("Прогрев завершен за %.2f с", _state["warmup_seconds"])
+    return checks
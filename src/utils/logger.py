@@ -0,0 +1,249 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Optional
+
+from src.utils.config import load_env
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Уровень журнала и формат строк: json (структурированный) или text
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Доля сохраняемых частых сообщений об успехе (отмеченных extra=SAMPLED)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+# Максимальный размер очереди записей; при переполнении записи отбрасываются
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Корневой логгер приложения: логгеры модулей создаются как get_logger(__name__)
+ROOT_LOGGER_NAME = "src"
+
+# Заголовок запроса и ответа с идентификатором запроса
+REQUEST_ID_HEADER = "X-Request-Id"
+
+# Признак частого сообщения об успехе: logger.info("...", extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Поля корреляции, добавляемые к каждой записи: имя -> функция, возвращающая значение
+_context_fields: Dict[str, Callable[[], Optional[str]]] = {"request_id": request_id_var.get}
+
+# Стандартные атрибуты LogRecord: все остальные атрибуты записи выводятся как поля
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_configure_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+# Параметры последней настройки журнала: повторяются в процессе-потомке после fork
+_settings: Dict[str, object] = {}
+
+
+def register_context_field(name: str, getter: Callable[[], Optional[str]]):
+    """
+    Добавляет поле корреляции ко всем записям журнала
+
+    :param name: Имя поля ("trace_id")
+    :param getter: Функция, возвращающая значение для текущего запроса или None
+    """
+    _context_fields[name] = getter
+
+
+class ContextFilter(logging.Filter):
+    """
+    Добавляет к записи поля корреляции и отбрасывает часть частых сообщений
+
+    Выполняется в потоке, создавшем запись (до постановки в очередь), поэтому
+    значения контекстных переменных запроса доступны, а отброшенные записи
+    не стоят ничего, кроме проверки.
+    """
+
+    def __init__(self, sample_rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord):
+        if getattr(record, "sampled", False) and random.random() >= self.sample_rate:
+            return False
+        for name, getter in _context_fields.items():
+            setattr(record, name, getter())
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Обработчик, который не блокирует поток запроса: при заполненной очереди запись отбрасывается"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord):
+        """
+        Подготавливает запись к передаче в другой поток
+
+        Аргументы подставляются в сообщение сразу, а трассировка исключения
+        сохраняется отдельно в exc_text, чтобы форматтер вывел ее отдельным полем.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись журнала в виде одной строки JSON"""
+
+    def format(self, record: logging.LogRecord):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sampled" and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Запись журнала в виде строки для чтения в консоли"""
+
+    def format(self, record: logging.LogRecord):
+        context = " ".join(f"{name}={getattr(record, name)}" for name in _context_fields
+                           if getattr(record, name, None))
+        line = f"{self.formatTime(record)} {record.levelname} {record.name}: {record.getMessage()}"
+        if context:
+            line += f" [{context}]"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+def configure_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, stream=None):
+    """
+    Настраивает журнал приложения
+
+    Записи логгеров src.* ставятся в очередь и выводятся фоновым потоком,
+    поэтому поток запроса не ждет записи в stdout. Повторный вызов
+    перенастраивает журнал.
+
+    :param level: Уровень журнала
+    :param log_format: Формат строк: json или text
+    :param stream: Поток вывода (по умолчанию stdout)
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+        _settings.update(level=level, log_format=log_format, stream=stream)
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(TextFormatter() if log_format == "text" else JsonFormatter())
+
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(ContextFilter())
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.handlers = [handler]
+        root.setLevel(level)
+        root.propagate = False
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+
+
+def get_logger(name: str):
+    """
+    Логгер модуля; при первом вызове настраивает журнал приложения
+
+    :param name: Имя модуля (__name__)
+    """
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(name)
+
+
+def shutdown_logging():
+    """Выводит оставшиеся в очереди записи и останавливает фоновый поток"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+class RequestContextMiddleware:
+    """
+    ASGI-middleware: идентификатор запроса для записей журнала
+
+    Берется из заголовка X-Request-Id (если его передал балансировщик или
+    клиент) или создается, и возвращается в том же заголовке ответа.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER.lower().encode(), request_id.encode("latin-1"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+def _reinit_after_fork():
+    """
+    Пересоздает фоновый поток журнала в процессе-потомке
+
+    После fork поток QueueListener родителя в потомке не работает, а блокировка
+    могла быть скопирована захваченной: журнал настраивается заново с теми же параметрами.
+    """
+    global _configure_lock, _listener
+    _configure_lock = threading.Lock()
+    if _listener is not None:
+        _listener = None
+        configure_logging(**_settings)
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_reinit_after_fork)
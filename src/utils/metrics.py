@@ -0,0 +1,304 @@
+import atexit
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils.config import load_env
+
+# Загрузка переменных окружения из .env файла. Выполняется до импорта prometheus_client:
+# способ хранения значений метрик выбирается при импорте по PROMETHEUS_MULTIPROC_DIR
+load_env()
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, \
+    generate_latest, multiprocess, REGISTRY  # noqa: E402
+
+from src.utils.lifecycle import llm_calls  # noqa: E402
+
+# Каталог для файлов метрик, общих для всех процессов-воркеров. Если переменная задана,
+# prometheus_client хранит значения в отображаемых в память файлах этого каталога,
+# а /metrics суммирует их по всем процессам. Каталог очищается при запуске сервиса (run.py).
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if PROMETHEUS_MULTIPROC_DIR:
+    # Файлы метрик создаются уже при объявлении метрик ниже
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+# Границы гистограмм задержки в секундах
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90)
+DB_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Количество обрабатываемых HTTP-запросов",
+    ["method"], multiprocess_mode="livesum"
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds", "Время запроса к языковой модели",
+    ["component", "status"], buckets=LLM_LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens", "Количество токенов в запросах к языковой модели",
+    ["component", "kind"]
+)
+
+PDF_EXTRACTION_DURATION = Histogram(
+    "pdf_extraction_duration_seconds", "Время извлечения текста из PDF", buckets=LATENCY_BUCKETS
+)
+PDF_PAGES = Histogram(
+    "pdf_pages", "Количество страниц в обработанных PDF", buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Время выполнения метода DBService",
+    ["method", "status"], buckets=DB_LATENCY_BUCKETS
+)
+DB_CONNECTIONS = Counter(
+    "db_connections", "Количество открытых соединений с базой данных", ["method"]
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests", "Обращения к кешам приложения", ["cache", "result"]
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Количество строк в кешах строк базы данных", ["cache"], multiprocess_mode="livesum"
+)
+
+EXECUTOR_TASKS = Gauge(
+    "executor_tasks", "Задачи в пулах потоков по классам нагрузки: в очереди и выполняющиеся",
+    ["workload", "state"], multiprocess_mode="livesum"
+)
+EXECUTOR_QUEUE_WAIT = Histogram(
+    "executor_queue_wait_seconds", "Время ожидания задачи в очереди пула потоков",
+    ["workload"], buckets=LATENCY_BUCKETS
+)
+EXECUTOR_REJECTED = Counter(
+    "executor_rejected", "Задачи, отклоненные из-за переполнения очереди пула потоков (ответ 503)", ["workload"]
+)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    """
+    Учитывает попадания и промахи кеша
+
+    Для горячих участков (поиск по токенам) попадания накапливаются локально
+    и передаются сюда одним вызовом.
+    """
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+
+@contextmanager
+def track_llm_call(component: str):
+    """
+    Измеряет время запроса к языковой модели
+
+    В словарь, возвращаемый контекстным менеджером, записывается статус ответа
+    ("status": HTTP-код); если исключение произошло до ответа, статус — "error".
+    Запрос учитывается в lifecycle.llm_calls: при остановке сервиса его дожидаются.
+
+    :param component: Компонент, выполняющий запрос ("matcher" или "normalizer")
+    """
+    call = {"status": "error"}
+    started = time.perf_counter()
+    try:
+        with llm_calls.track():
+            yield call
+    finally:
+        LLM_REQUEST_DURATION.labels(component, call["status"]).observe(time.perf_counter() - started)
+
+
+def record_llm_usage(component: str, result):
+    """
+    Учитывает токены из поля usage ответа OpenAI-совместимого API
+    """
+    usage = (result or {}).get("usage") or {}
+    for kind in ("prompt_tokens", "completion_tokens"):
+        tokens = usage.get(kind)
+        if tokens:
+            LLM_TOKENS.labels(component, kind.replace("_tokens", "")).inc(tokens)
+
+
+def instrument_db_methods(cls):
+    """
+    Декоратор класса: измеряет время каждого публичного метода DBService
+
+    Методы-генераторы измеряются до исчерпания итератора. Соединения,
+    открытые через _get_connection, учитываются по имени вызвавшего метода.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        setattr(cls, name, _timed_db_method(name, method))
+
+    get_connection = cls._get_connection
+
+    @functools.wraps(get_connection)
+    def counted_get_connection(self, *args, **kwargs):
+        DB_CONNECTIONS.labels(getattr(_db_context, "method", None) or "other").inc()
+        return get_connection(self, *args, **kwargs)
+
+    cls._get_connection = counted_get_connection
+    return cls
+
+
+# Имя выполняемого метода DBService в текущем потоке (для счетчика соединений)
+_db_context = threading.local()
+
+
+def _timed_db_method(name, method):
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            status = "error"
+            previous = getattr(_db_context, "method", None)
+            _db_context.method = name
+            try:
+                iterator = method(self, *args, **kwargs)
+                # Соединение открывается при первом next(), поэтому имя метода восстанавливается после него
+                first = next(iterator, _EXHAUSTED)
+                _db_context.method = previous
+                if first is not _EXHAUSTED:
+                    yield first
+                    yield from iterator
+                status = "ok"
+            finally:
+                _db_context.method = previous
+                DB_QUERY_DURATION.labels(name, status).observe(time.perf_counter() - started)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        previous = getattr(_db_context, "method", None)
+        _db_context.method = name
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            _db_context.method = previous
+        # Методы DBService не пробрасывают исключения, а возвращают False при ошибке
+        status = "error" if result is False else "ok"
+        DB_QUERY_DURATION.labels(name, status).observe(time.perf_counter() - started)
+        return result
+
+    return wrapper
+
+
+_EXHAUSTED = object()
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: время обработки запроса по шаблону маршрута
+
+    В метке route используется шаблон пути ("/api/vacancy/{vacancy_id}"),
+    а не фактический URL, чтобы количество временных рядов не росло
+    с количеством идентификаторов. Время потоковых ответов измеряется
+    до отправки последней части.
+    """
+
+    def __init__(self, app, excluded_paths=("/metrics", "/ready")):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        # Шаблон маршрута известен только после маршрутизации, поэтому счетчик
+        # выполняемых запросов ведется по методу, а метка route выставляется в конце
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method, route_template(scope), str(status["code"])).observe(
+                time.perf_counter() - started
+            )
+
+
+def route_template(scope):
+    """
+    Шаблон пути маршрута, обработавшего запрос
+
+    Новые версии FastAPI сохраняют в scope маршрут подключенного роутера без префикса
+    ("/vacancy/{vacancy_id}" вместо "/api/vacancy/{vacancy_id}"), поэтому префикс
+    восстанавливается по фактическому пути запроса.
+
+    :return: Шаблон пути или "other", если запрос обработан вне маршрутов API (статика, 404)
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not path_format:
+        return "other"
+
+    path = scope["path"]
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None or path_regex.match(path):
+        return path_format
+
+    position = path.find("/", 1)
+    while position != -1:
+        if path_regex.match(path[position:]):
+            return path[:position] + path_format
+        position = path.find("/", position + 1)
+    return path_format
+
+
+def metrics_response_body():
+    """
+    Формирует текст метрик в формате Prometheus
+
+    :return: Кортеж (тело ответа, Content-Type)
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def prepare_multiprocess_dir():
+    """
+    Очищает каталог метрик перед запуском воркеров
+
+    Вызывается один раз в родительском процессе: файлы от предыдущего
+    запуска исказили бы счетчики. Файлы текущего процесса (созданные при
+    импорте модуля) сохраняются.
+    """
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return
+    own_suffix = f"_{os.getpid()}.db"
+    for file_name in os.listdir(PROMETHEUS_MULTIPROC_DIR):
+        if file_name.endswith(".db") and not file_name.endswith(own_suffix):
+            os.remove(os.path.join(PROMETHEUS_MULTIPROC_DIR, file_name))
+
+
+def _mark_process_dead():
+    """Исключает значения livesum-метрик завершившегося процесса"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+atexit.register(_mark_process_dead)
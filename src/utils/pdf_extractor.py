@@ -1,7 +1,21 @@
 import os
 import tempfile
+import time
 
-import fitz  # PyMuPDF
+from src.utils.metrics import PDF_EXTRACTION_DURATION, PDF_PAGES
+from src.utils.tracing import traced
+
+
+def _open_document(pdf_path: str):
+    """
+    Открывает PDF-файл
+
+    PyMuPDF импортируется при первом вызове, а не при импорте модуля:
+    его загрузка занимает заметную часть времени старта приложения.
+    """
+    import fitz  # PyMuPDF
+
+    return fitz.open(pdf_path)
 
 
 class PDFExtractor:
@@ -10,6 +24,7 @@ class PDFExtractor:
     """
 
     @staticmethod
+    @traced("pdf.extract_text_from_bytes")
     def extract_text_from_bytes(pdf_bytes: bytes):
         """
         Извлекает текст из PDF-файла, переданного в виде байтов
@@ -32,6 +47,7 @@ class PDFExtractor:
                 os.unlink(temp_pdf_path)
 
     @staticmethod
+    @traced("pdf.extract_text_from_file")
     def extract_text_from_file(pdf_path: str):
         """
         Извлекает текст из PDF-файла по указанному пути
@@ -40,25 +56,30 @@ class PDFExtractor:
         :return: Извлеченный текст
         """
         text = ""
+        started = time.perf_counter()
 
         try:
             # Открываем PDF-файл
-            doc = fitz.open(pdf_path)
+            doc = _open_document(pdf_path)
 
             # Извлекаем текст из каждой страницы
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
                 text += page.get_text()
 
+            PDF_PAGES.observe(len(doc))
+
             # Закрываем документ
             doc.close()
 
         except Exception as e:
             raise ValueError(f"Ошибка при извлечении текста из PDF: {str(e)}")
 
+        PDF_EXTRACTION_DURATION.observe(time.perf_counter() - started)
         return text
 
     @staticmethod
+    @traced("pdf.get_metadata")
     def get_metadata(pdf_bytes: bytes):
         """
         Извлекает метаданные из PDF-файла
@@ -76,7 +97,7 @@ class PDFExtractor:
 
         try:
             # Открываем PDF-файл
-            doc = fitz.open(temp_pdf_path)
+            doc = _open_document(temp_pdf_path)
 
             # Извлекаем метаданные
             metadata = {
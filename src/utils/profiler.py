@@ -0,0 +1,434 @@
+import asyncio
+import functools
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+
+from src.utils.config import load_env
+from src.utils.logger import get_logger
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Токен администратора для профилирования отдельных запросов; без токена профилирование запросов отключено
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+# Каталог отчетов профилировщика
+PROFILING_DIR = os.getenv("PROFILING_DIR", ".profiles")
+# Интервал опроса стеков при профилировании запроса, в секундах
+PROFILING_REQUEST_INTERVAL = float(os.getenv("PROFILING_REQUEST_INTERVAL", "0.002"))
+# Интервал опроса периодического профилировщика, в секундах (0 — отключен)
+PROFILING_SAMPLER_INTERVAL = float(os.getenv("PROFILING_SAMPLER_INTERVAL", "0"))
+# Период записи отчета о самых затратных функциях, в секундах
+PROFILING_REPORT_INTERVAL = float(os.getenv("PROFILING_REPORT_INTERVAL", "300"))
+# Количество функций в отчете
+PROFILING_TOP_N = int(os.getenv("PROFILING_TOP_N", "30"))
+
+# Заголовки запроса профилирования и ответа с именем отчета
+PROFILE_HEADER = "X-Profile"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+PROFILE_REPORT_HEADER = "X-Profile-Report"
+
+# Максимальная глубина сохраняемого стека
+MAX_STACK_DEPTH = 128
+
+# Функции, в которых поток простаивает (ожидание событий, очереди, блокировки)
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("base_events.py", "_run_once")
+}
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Stack = Tuple[str, ...]
+
+
+def _frame_label(code):
+    """Подпись функции в стеке: имя и файл (относительно корня репозитория для кода приложения)"""
+    filename = code.co_filename
+    if filename.startswith(_REPO_ROOT):
+        filename = os.path.relpath(filename, _REPO_ROOT)
+    else:
+        # Для библиотек — каталог пакета и файл: "re/__init__.py"
+        directory, basename = os.path.split(filename)
+        filename = f"{os.path.basename(directory)}/{basename}" if directory else basename
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})"
+
+
+def _capture_stack(frame) -> Optional[Stack]:
+    """
+    Стек потока от внешней функции к текущей или None, если поток простаивает
+    """
+    leaf = frame.f_code
+    if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_FRAMES:
+        return None
+
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class StackSampler:
+    """
+    Профилировщик по выборкам
+
+    Фоновый поток с заданным интервалом снимает стеки выбранных потоков
+    (sys._current_frames) и считает, сколько раз встретился каждый стек.
+    Профилируемый код не изменяется и не замедляется, кроме времени
+    самого снятия стеков под GIL.
+    """
+
+    def __init__(self, interval: float, thread_filter: Optional[Callable[[int], bool]] = None,
+                 name: str = "stack-sampler"):
+        """
+        :param interval: Интервал между выборками в секундах
+        :param thread_filter: Функция, решающая по идентификатору потока, профилировать ли его
+                              (по умолчанию — все потоки, кроме самого профилировщика)
+        """
+        self.interval = interval
+        self.thread_filter = thread_filter
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.sample(own_id)
+
+    def sample(self, own_id: Optional[int] = None):
+        """Снимает стеки всех выбранных потоков один раз"""
+        frames = sys._current_frames()
+        with self._lock:
+            self.sample_count += 1
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or (self.thread_filter is not None and not self.thread_filter(thread_id)):
+                    continue
+                stack = _capture_stack(frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    def snapshot(self, reset: bool = False):
+        """
+        Возвращает накопленные выборки
+
+        :param reset: Начать накопление заново
+        :return: Кортеж (Counter стеков, количество опросов)
+        """
+        with self._lock:
+            samples, count = Counter(self.samples), self.sample_count
+            if reset:
+                self.samples.clear()
+                self.sample_count = 0
+        return samples, count
+
+
+def folded_stacks(samples: Counter):
+    """
+    Стеки в свернутом формате ("a;b;c 12"), который принимают flamegraph.pl и speedscope
+    """
+    return "\n".join(f"{';'.join(stack)} {count}" for stack, count in samples.most_common()) + "\n"
+
+
+def top_functions(samples: Counter, limit: int = PROFILING_TOP_N):
+    """
+    Самые затратные функции по выборкам
+
+    :return: Список словарей {function, self, total}: self — выборки, в которых функция
+             выполнялась сама, total — выборки, в которых она была в стеке
+    """
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in samples.items():
+        self_counts[stack[-1]] += count
+        for label in set(stack):
+            total_counts[label] += count
+
+    ranked = sorted(total_counts, key=lambda label: (self_counts[label], total_counts[label]), reverse=True)
+    return [{"function": label, "self": self_counts[label], "total": total_counts[label]}
+            for label in ranked[:limit]]
+
+
+def format_report(samples: Counter, sample_count: int, interval: float, limit: int = PROFILING_TOP_N):
+    """Текстовый отчет о самых затратных функциях"""
+    total = sum(samples.values()) or 1
+    lines = [f"Выборок: {sum(samples.values())} за {sample_count} опросов (интервал {interval * 1000:g} мс)",
+             f"{'self %':>7} {'total %':>8}  функция"]
+    for entry in top_functions(samples, limit):
+        lines.append(f"{entry['self'] / total * 100:7.1f} {entry['total'] / total * 100:8.1f}  {entry['function']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_file(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+class _RequestSession:
+    """Профилирование одного запроса: потоки, выполняющие запрос, и их выборки"""
+
+    def __init__(self):
+        self.threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.sampler = StackSampler(PROFILING_REQUEST_INTERVAL, self.threads.__contains__,
+                                    name="request-profiler")
+
+    def enter(self):
+        thread_id = threading.get_ident()
+        with self._lock:
+            self.threads[thread_id] = self.threads.get(thread_id, 0) + 1
+
+    def exit(self):
+        thread_id = threading.get_ident()
+        with self._lock:
+            remaining = self.threads.get(thread_id, 1) - 1
+            if remaining:
+                self.threads[thread_id] = remaining
+            else:
+                self.threads.pop(thread_id, None)
+
+
+_session: ContextVar[Optional[_RequestSession]] = ContextVar("profiling_session", default=None)
+
+
+def request_profiling_enabled():
+    """Включено ли профилирование отдельных запросов (задан PROFILING_ADMIN_TOKEN)"""
+    return bool(PROFILING_ADMIN_TOKEN)
+
+
+def track_thread(endpoint):
+    """
+    Оборачивает обработчик маршрута: поток, выполняющий обработчик профилируемого
+    запроса, добавляется к выборкам
+
+    Синхронные обработчики FastAPI выполняет в пуле потоков с копией контекста
+    запроса, поэтому сессия профилирования доступна и там. Так же оборачиваются
+    задачи пулов классов нагрузки (src.utils.executors).
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            session = _session.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            session.enter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                session.exit()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        session = _session.get()
+        if session is None:
+            return endpoint(*args, **kwargs)
+        session.enter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            session.exit()
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Маршрут, обработчик которого может выполняться под профилировщиком запроса"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, track_thread(endpoint), **kwargs)
+
+
+def route_class():
+    """
+    Класс маршрутов для APIRouter
+
+    Без PROFILING_ADMIN_TOKEN возвращается обычный APIRoute, и обработчики не оборачиваются.
+    """
+    return ProfiledRoute if request_profiling_enabled() else APIRoute
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-middleware: профилирование одного запроса по запросу администратора
+
+    Запрос с заголовком X-Profile: 1 (или параметром ?profile=1) и заголовком
+    X-Admin-Token, совпадающим с PROFILING_ADMIN_TOKEN, выполняется под
+    профилировщиком по выборкам. Свернутые стеки для flame graph и отчет о
+    самых затратных функциях сохраняются в PROFILING_DIR, имя отчета
+    возвращается в заголовке X-Profile-Report. Подключается только при
+    заданном токене.
+    """
+
+    def __init__(self, app, token: str = PROFILING_ADMIN_TOKEN, directory: str = PROFILING_DIR):
+        self.app = app
+        self.token = token.encode()
+        self.directory = directory
+
+    def _requested(self, scope):
+        requested = False
+        token = b""
+        for key, value in scope.get("headers", []):
+            if key == b"x-profile":
+                requested = value not in (b"", b"0", b"false")
+            elif key == b"x-admin-token":
+                token = value
+        if not requested and b"profile=" in scope.get("query_string", b""):
+            flag = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[0]
+            requested = flag not in ("", "0", "false")
+        return requested and bool(self.token) and hmac.compare_digest(token, self.token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = _RequestSession()
+        report_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(session):x}"
+        header = (PROFILE_REPORT_HEADER.lower().encode(), report_name.encode())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [header]
+            await send(message)
+
+        # Поток цикла событий выполняет асинхронную часть запроса, сериализацию и отправку ответа
+        _session_token = _session.set(session)
+        session.enter()
+        started = time.perf_counter()
+        session.sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.sampler.stop()
+            session.exit()
+            _session.reset(_session_token)
+            elapsed = time.perf_counter() - started
+            self._save(report_name, scope, session.sampler, elapsed)
+
+    def _save(self, report_name: str, scope, sampler: StackSampler, elapsed: float):
+        samples, sample_count = sampler.snapshot()
+        base = os.path.join(self.directory, "requests", report_name)
+        summary = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "elapsed": round(elapsed, 4),
+            "interval": sampler.interval,
+            "samples": sum(samples.values()),
+            "top": top_functions(samples)
+        }
+        try:
+            _write_file(base + ".folded", folded_stacks(samples))
+            _write_file(base + ".json", json.dumps(summary, ensure_ascii=False, indent=2))
+            _write_file(base + ".txt", format_report(samples, sample_count, sampler.interval))
+        except OSError as e:
+            logger.error("Ошибка при сохранении профиля запроса: %s", e)
+            return
+        logger.info("Профиль запроса %s %s сохранен: %s (%.3f с, выборок: %s)", scope["method"], scope["path"],
+                    base, elapsed, summary["samples"])
+
+
+class PeriodicProfiler:
+    """
+    Периодический профилировщик
+
+    Постоянно снимает стеки всех потоков с низкой частотой и раз в
+    PROFILING_REPORT_INTERVAL секунд записывает отчет о самых затратных
+    функциях за прошедший период. Запускается только при PROFILING_SAMPLER_INTERVAL > 0.
+    """
+
+    def __init__(self, interval: float = PROFILING_SAMPLER_INTERVAL,
+                 report_interval: float = PROFILING_REPORT_INTERVAL, directory: str = PROFILING_DIR,
+                 limit: int = PROFILING_TOP_N):
+        self.sampler = StackSampler(interval, name="periodic-profiler")
+        self.report_interval = report_interval
+        self.directory = directory
+        self.limit = limit
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="periodic-profiler-report", daemon=True)
+
+    def start(self):
+        self.sampler.start()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self.sampler.stop()
+        self._thread.join()
+        self.write_report()
+
+    def _run(self):
+        while not self._stop_event.wait(self.report_interval):
+            self.write_report()
+
+    def write_report(self):
+        """Записывает отчет за прошедший период и начинает накопление заново"""
+        samples, sample_count = self.sampler.snapshot(reset=True)
+        if not samples:
+            return None
+        path = os.path.join(self.directory, "periodic", f"hot-functions-{time.strftime('%Y%m%d-%H%M%S')}-"
+                                                        f"{os.getpid()}.txt")
+        try:
+            _write_file(path, format_report(samples, sample_count, self.sampler.interval, self.limit))
+        except OSError as e:
+            logger.error("Ошибка при сохранении отчета профилировщика: %s", e)
+            return None
+        hottest = top_functions(samples, 3)
+        logger.info("Отчет профилировщика сохранен: %s; самые затратные функции: %s", path,
+                    ", ".join(entry["function"] for entry in hottest))
+        return path
+
+
+_periodic_profiler: Optional[PeriodicProfiler] = None
+
+
+def start_periodic_profiler():
+    """Запускает периодический профилировщик, если задан PROFILING_SAMPLER_INTERVAL"""
+    global _periodic_profiler
+    if PROFILING_SAMPLER_INTERVAL <= 0 or _periodic_profiler is not None:
+        return None
+    _periodic_profiler = PeriodicProfiler().start()
+    logger.info("Периодический профилировщик запущен: интервал %s с, отчет каждые %s с",
+                PROFILING_SAMPLER_INTERVAL, PROFILING_REPORT_INTERVAL)
+    return _periodic_profiler
+
+
+def stop_periodic_profiler():
+    """Останавливает периодический профилировщик и записывает последний отчет"""
+    global _periodic_profiler
+    if _periodic_profiler is not None:
+        _periodic_profiler.stop()
+        _periodic_profiler = None
@@ -0,0 +1,443 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from src.utils.config import load_env
+from src.utils.logger import get_logger, register_context_field
+
+# Загрузка переменных окружения из .env файла
+load_env()
+
+# Журнал модуля
+logger = get_logger(__name__)
+
+# Экспорт трассировок: none (отключено), jsonl (файл JSON Lines) или otlp (коллектор OTLP/HTTP)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_JSONL_PATH = os.getenv("TRACING_JSONL_PATH", "traces.jsonl")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "resume-vacancy-matcher")
+# Доля сохраняемых трассировок обычных запросов
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "0.1"))
+# Запросы дольше порога (в секундах) и запросы с ошибкой сохраняются всегда
+TRACING_SLOW_THRESHOLD = float(os.getenv("TRACING_SLOW_THRESHOLD", "5"))
+
+# Заголовок ответа с идентификатором трассировки
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Заголовок W3C Trace Context: версия-trace_id-span_id-флаги
+_TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+# Ограничение на количество спанов одной трассировки (пакетные операции)
+MAX_SPANS_PER_TRACE = 1000
+
+
+class Span:
+    """Участок выполнения запроса: маршрут, метод DBService, извлечение PDF, запрос к LLM"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "attributes", "start_ns", "end_ns",
+                 "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], kind: str,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Добавляет атрибут спана"""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        """Отмечает спан как завершившийся ошибкой"""
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration(self):
+        """Длительность спана в секундах"""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def to_dict(self):
+        """Спан в виде словаря для экспорта в JSON Lines"""
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_ns": self.start_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class Trace:
+    """Трассировка одного запроса: накапливает завершенные спаны до решения о сохранении"""
+
+    __slots__ = ("trace_id", "remote_parent_id", "spans", "dropped")
+
+    def __init__(self, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.remote_parent_id = remote_parent_id
+        self.spans: List[Span] = []
+        self.dropped = 0
+
+    def add(self, span: Span):
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+class JsonLinesExporter:
+    """Экспорт спанов в файл JSON Lines: одна строка на спан"""
+
+    def __init__(self, path: str = TRACING_JSONL_PATH):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+class OTLPHttpExporter:
+    """
+    Экспорт спанов в коллектор OpenTelemetry по протоколу OTLP/HTTP в кодировке JSON
+
+    Не требует OpenTelemetry SDK: спаны кодируются в формате ExportTraceServiceRequest
+    и отправляются POST-запросом на {endpoint}/v1/traces.
+    """
+
+    SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(self, endpoint: str = TRACING_OTLP_ENDPOINT, service_name: str = TRACING_SERVICE_NAME,
+                 timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _value(value: Any):
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _attributes(self, attributes: Dict[str, Any]):
+        return [{"key": key, "value": self._value(value)} for key, value in attributes.items()]
+
+    def _span(self, span: Span):
+        encoded = {
+            "traceId": span.trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": self.SPAN_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": self._attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def export(self, spans: List[Span]):
+        # requests импортируется при первой отправке: без экспорта OTLP он не замедляет импорт приложения
+        import requests
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "src.utils.tracing"},
+                    "spans": [self._span(span) for span in spans]
+                }]
+            }]
+        }
+        response = requests.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+
+
+# Доступные экспортеры; собственный экспортер подключается через set_exporter
+EXPORTERS = {
+    "jsonl": JsonLinesExporter,
+    "otlp": OTLPHttpExporter
+}
+
+
+class _ExportWorker:
+    """
+    Фоновый поток экспорта
+
+    Запрос не ждет записи в файл или ответа коллектора: трассировки ставятся
+    в ограниченную очередь, при переполнении новые трассировки отбрасываются.
+    """
+
+    def __init__(self, exporter, max_queue_size: int = 1000):
+        self.exporter = exporter
+        self.queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self.thread.start()
+
+    def submit(self, spans: List[Span]):
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            spans = self.queue.get()
+            if spans is None:
+                break
+            try:
+                self.exporter.export(spans)
+            except Exception as e:
+                logger.error("Ошибка при экспорте трассировки: %s", e)
+
+    def shutdown(self, timeout: float = 5.0):
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+
+_worker: Optional[_ExportWorker] = None
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def set_exporter(exporter):
+    """
+    Подключает экспортер трассировок
+
+    :param exporter: Объект с методом export(spans) или None для отключения трассировки
+    """
+    global _worker
+    if _worker is not None:
+        _worker.shutdown()
+    _worker = _ExportWorker(exporter) if exporter is not None else None
+
+
+def tracing_enabled():
+    """Включен ли экспорт трассировок"""
+    return _worker is not None
+
+
+def current_span():
+    """Текущий спан или None"""
+    return _current_span.get()
+
+
+def current_trace_id():
+    """Идентификатор текущей трассировки или None вне запроса"""
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else None
+
+
+def parse_traceparent(header: Optional[str]):
+    """
+    Разбирает заголовок W3C traceparent
+
+    :return: Кортеж (trace_id, parent_span_id) или (None, None)
+    """
+    match = _TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+    if not match or set(match.group(1)) == {"0"}:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def _finish(span: Span, token):
+    span.end_ns = time.time_ns()
+    _current_span.reset(token)
+    span.trace.add(span)
+
+
+def _should_export(root: Span):
+    return root.error is not None or root.duration >= TRACING_SLOW_THRESHOLD or \
+        random.random() < TRACING_SAMPLE_RATE
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Корневой спан запроса
+
+    Трассировка всегда получает идентификатор (он попадает в заголовок ответа и
+    строки журнала), а решение о сохранении принимается по завершении: медленные
+    запросы и запросы с ошибкой сохраняются всегда, остальные — с долей TRACING_SAMPLE_RATE.
+
+    :param name: Имя спана
+    :param traceparent: Заголовок W3C traceparent входящего запроса
+    :param attributes: Атрибуты спана
+    """
+    trace_id, parent_id = parse_traceparent(traceparent)
+    trace = Trace(trace_id, parent_id)
+    root = Span(trace, name, parent_id, "server", attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.record_error(e)
+        raise
+    finally:
+        _finish(root, token)
+        worker = _worker
+        if worker is not None and _should_export(root):
+            worker.submit(trace.spans)
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", **attributes):
+    """
+    Дочерний спан текущей трассировки
+
+    Вне трассируемого запроса (фоновые потоки, скрипты) или при отключенном
+    экспорте ничего не записывает.
+
+    :param name: Имя спана ("db.get_vacancy", "llm.request")
+    :param kind: Тип спана: internal или client (внешний вызов)
+    """
+    parent = _current_span.get()
+    if parent is None or _worker is None:
+        yield None
+        return
+
+    span = Span(parent.trace, name, parent.span_id, kind, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _finish(span, token)
+
+
+def traced(name: str, kind: str = "internal"):
+    """
+    Декоратор: выполняет функцию внутри спана с указанным именем
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with start_span(name, kind):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(prefix: str):
+    """
+    Декоратор класса: спан на каждый публичный метод ("{prefix}.{имя метода}")
+
+    Методы-генераторы (пакетное чтение при старте) не трассируются.
+    """
+    def decorator(cls):
+        for name, method in list(vars(cls).items()):
+            if name.startswith("_") or not callable(method) or inspect.isgeneratorfunction(method):
+                continue
+            setattr(cls, name, traced(f"{prefix}.{name}", "client")(method))
+        return cls
+
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI-middleware: корневой спан на каждый HTTP-запрос
+
+    Продолжает трассировку из заголовка traceparent, возвращает идентификатор
+    трассировки в заголовке X-Trace-Id и выводит в журнал медленные запросы.
+    """
+
+    def __init__(self, app, excluded_paths=("/metrics", "/ready")):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Импорт здесь, чтобы модуль трассировки не зависел от модуля метрик при импорте
+        from src.utils.metrics import route_template
+
+        traceparent = None
+        for key, value in scope.get("headers", []):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        status = {"code": 500}
+        with start_trace(f"{scope['method']} {scope['path']}", traceparent,
+                         {"http.method": scope["method"], "http.target": scope["path"]}) as root:
+            trace_header = (TRACE_ID_HEADER.lower().encode(), root.trace.trace_id.encode())
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    status["code"] = message["status"]
+                    message["headers"] = list(message.get("headers", [])) + [trace_header]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                root.name = f"{scope['method']} {route}"
+                root.set_attribute("http.route", route)
+                root.set_attribute("http.status_code", status["code"])
+                if status["code"] >= 500 and root.error is None:
+                    root.error = f"HTTP {status['code']}"
+                if root.duration >= TRACING_SLOW_THRESHOLD:
+                    logger.warning("Медленный запрос %s: %.2f с", root.name, root.duration,
+                                   extra={"duration": round(root.duration, 3), "status": status["code"]})
+
+
+def _configure_from_env():
+    factory = EXPORTERS.get(TRACING_EXPORTER)
+    if factory is None:
+        if TRACING_EXPORTER not in ("", "none"):
+            logger.warning("Неизвестный экспортер трассировок %s, трассировка отключена", TRACING_EXPORTER)
+        return
+    set_exporter(factory())
+
+
+# Идентификатор трассировки в каждой записи журнала
+register_context_field("trace_id", current_trace_id)
+
+
+def _reinit_after_fork():
+    """Запускает поток экспорта в процессе-потомке: поток родителя после fork не копируется"""
+    global _worker
+    if _worker is not None:
+        _worker = _ExportWorker(_worker.exporter)
+
+
+_configure_from_env()
+atexit.register(lambda: _worker.shutdown() if _worker is not None else None)
+os.register_at_fork(after_in_child=_reinit_after_fork)
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from email.utils import formatdate
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from rich.console import Console
+
+from src.services.hh_api_client import HHApiClient
+
+# Каталог с записанными ответами api.hh.ru/vacancies/{id}
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "hh_api"
+
+# Инициализация консоли для красивого вывода
+console = Console()
+
+
+def create_app(fixtures_dir: Path = FIXTURES_DIR, delay: float = 0.0):
+    """
+    Создает приложение-заглушку API hh.ru
+
+    Ответы отдаются из файлов {id}.json с заголовками ETag и Last-Modified
+    (по содержимому и времени изменения файла), на условный запрос с
+    совпадающим ETag возвращается 304. Для неизвестных вакансий
+    возвращается 404 в формате API hh.ru.
+
+    :param fixtures_dir: Каталог с записанными ответами
+    :param delay: Искусственная задержка ответа в секундах
+    """
+    app = FastAPI(title="hh.ru API stub")
+
+    @app.get("/vacancies/{vacancy_id}")
+    async def get_vacancy(vacancy_id: str, request: Request):
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        fixture = fixtures_dir / f"{vacancy_id}.json"
+        if not vacancy_id.isdigit() or not fixture.is_file():
+            return JSONResponse(
+                status_code=404,
+                content={"description": "Not Found", "errors": [{"type": "not_found"}]}
+            )
+
+        body = fixture.read_bytes()
+        headers = {
+            "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+            "Last-Modified": formatdate(fixture.stat().st_mtime, usegmt=True)
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+
+        return JSONResponse(content=json.loads(body.decode("utf-8")), headers=headers)
+
+    return app
+
+
+def record_fixtures(vacancy_ids, fixtures_dir: Path = FIXTURES_DIR):
+    """
+    Записывает ответы настоящего API hh.ru в каталог заглушки
+
+    :param vacancy_ids: Идентификаторы вакансий на hh.ru
+    :param fixtures_dir: Каталог для записанных ответов
+    """
+    client = HHApiClient(base_url=os.getenv("HH_API_RECORD_URL", "https://api.hh.ru"))
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+    for vacancy_id in vacancy_ids:
+        try:
+            data = client.get_vacancy(vacancy_id)
+        except Exception as e:
+            console.print(f"[red]ошибка[/red] {vacancy_id}: {str(e)}")
+            continue
+
+        (fixtures_dir / f"{vacancy_id}.json").write_text(
+            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        console.print(f"[green]записано[/green] {vacancy_id} — {data.get('name')}")
+
+
+def main():
+    """Запуск заглушки API hh.ru или запись новых ответов"""
+    parser = argparse.ArgumentParser(description="Локальная заглушка API hh.ru с записанными ответами")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес сервера")
+    parser.add_argument("--port", type=int, default=8010, help="Порт сервера")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Каталог с записанными ответами")
+    parser.add_argument("--delay", type=float, default=0.0, help="Задержка ответа в секундах")
+    parser.add_argument("--record", nargs="+", metavar="ID",
+                        help="Записать ответы настоящего API для указанных вакансий и выйти")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures)
+        return
+
+    fixtures = sorted(path.stem for path in args.fixtures.glob("*.json"))
+    console.print(f"Заглушка API hh.ru: http://{args.host}:{args.port}, вакансий: {len(fixtures)}")
+    console.print(f"Для использования укажите HH_API_URL=http://{args.host}:{args.port}")
+    uvicorn.run(create_app(args.fixtures, args.delay), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
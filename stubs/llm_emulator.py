@@ -0,0 +1,440 @@
+"""
+Локальный эмулятор OpenAI-совместимого API chat/completions
+
+Заменяет DeepSeek при нагрузочном тестировании: LLM_API_URL указывает на
+эмулятор, а ответы на промпты нормализатора резюме и сопоставления
+формируются детерминированно по тексту промпта и проходят разбор сервисов.
+Задержка (фиксированная, логнормальная, с редкими выбросами), доля ошибок
+(429/500/таймауты), поле usage и потоковая выдача (stream) настраиваются
+при запуске, через PUT /emulator/config и для отдельного вызова через
+заголовки X-Emulator-*.
+
+Запуск из корня репозитория:
+
+    python -m stubs.llm_emulator --port 8020 --latency lognormal --median 1.5 --sigma 0.5
+    LLM_API_URL=http://127.0.0.1:8020/v1/chat/completions python run.py
+"""
+import argparse
+import ast
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from rich.console import Console
+
+# Инициализация консоли для красивого вывода
+console = Console()
+
+LATENCY_MODES = ("fixed", "lognormal")
+
+# Признаки промптов сервисов (src/services/normalizer.py и src/services/matcher.py)
+NORMALIZER_MARKER = "Вот резюме для анализа:"
+MATCHER_MARKER = "Совпавшие технические навыки:"
+
+LANGUAGES = ["Python", "Java", "JavaScript", "TypeScript", "Go", "Kotlin", "C#", "C++", "PHP", "Ruby", "Scala",
+             "Rust", "Swift", "SQL"]
+FRAMEWORKS = ["Django", "FastAPI", "Flask", "Spring", "Spring Boot", "Hibernate", "React", "Vue", "Angular",
+              "Node.js", "Express", ".NET", "Laravel", "Kafka", "Docker", "Kubernetes", "PostgreSQL", "Redis"]
+COMPANIES = ["ООО Ромашка", "Яндекс", "Сбер", "Тинькофф", "Ozon", "VK", "Лаборатория Касперского"]
+NAMES = ["Иванов Иван", "Петрова Анна", "Сидоров Алексей", "Кузнецова Мария", "Смирнов Дмитрий"]
+
+
+class EmulatorConfig:
+    """Параметры поведения эмулятора"""
+
+    # Поля, которые можно менять через PUT /emulator/config и заголовки X-Emulator-<поле>
+    FIELDS = {
+        "latency": str, "median": float, "sigma": float, "per_token": float,
+        "spike_rate": float, "spike_multiplier": float,
+        "rate_429": float, "rate_500": float, "rate_timeout": float,
+        "timeout_delay": float, "retry_after": int, "stream_chunk_delay": float, "seed": int
+    }
+
+    def __init__(self, latency="fixed", median=0.0, sigma=0.5, per_token=0.0,
+                 spike_rate=0.0, spike_multiplier=10.0,
+                 rate_429=0.0, rate_500=0.0, rate_timeout=0.0,
+                 timeout_delay=75.0, retry_after=1, stream_chunk_delay=0.0, seed=0):
+        """
+        :param latency: Модель задержки: fixed — ровно median секунд, lognormal — логнормальная с медианой median
+        :param median: Базовая задержка ответа в секундах
+        :param sigma: Параметр разброса логнормальной задержки
+        :param per_token: Дополнительная задержка на токен ответа в секундах
+        :param spike_rate: Доля вызовов с выбросом задержки
+        :param spike_multiplier: Во сколько раз увеличивается задержка при выбросе
+        :param rate_429: Доля ответов 429 Too Many Requests
+        :param rate_500: Доля ответов 500 Internal Server Error
+        :param rate_timeout: Доля вызовов, зависающих на timeout_delay секунд
+        :param timeout_delay: Длительность зависания (больше таймаута клиента в 60 секунд)
+        :param retry_after: Значение заголовка Retry-After для ответов 429
+        :param stream_chunk_delay: Пауза между фрагментами потоковой выдачи в секундах
+        :param seed: Зерно генератора задержек и ошибок
+        """
+        self.latency = latency
+        self.median = median
+        self.sigma = sigma
+        self.per_token = per_token
+        self.spike_rate = spike_rate
+        self.spike_multiplier = spike_multiplier
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rate_timeout = rate_timeout
+        self.timeout_delay = timeout_delay
+        self.retry_after = retry_after
+        self.stream_chunk_delay = stream_chunk_delay
+        self.seed = seed
+        self.validate()
+
+    def validate(self):
+        if self.latency not in LATENCY_MODES:
+            raise ValueError(f"Неизвестная модель задержки: {self.latency}")
+        for name in ("median", "sigma", "per_token", "timeout_delay", "stream_chunk_delay"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"Параметр {name} не может быть отрицательным")
+        for name in ("spike_rate", "rate_429", "rate_500", "rate_timeout"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"Параметр {name} должен быть в диапазоне [0, 1]")
+        if self.rate_429 + self.rate_500 + self.rate_timeout > 1:
+            raise ValueError("Суммарная доля ошибок не может превышать 1")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def updated(self, values):
+        """
+        Возвращает копию настроек с измененными полями
+
+        :param values: Словарь {поле: значение}; значения-строки приводятся к типу поля
+        """
+        data = self.to_dict()
+        for name, value in values.items():
+            if name not in self.FIELDS:
+                raise ValueError(f"Неизвестный параметр: {name}")
+            data[name] = self.FIELDS[name](value)
+        return EmulatorConfig(**data)
+
+    def for_request(self, headers):
+        """Настройки для одного вызова с учетом заголовков X-Emulator-<поле> (например X-Emulator-Rate-429)"""
+        overrides = {}
+        for name in self.FIELDS:
+            value = headers.get("x-emulator-" + name.replace("_", "-"))
+            if value is not None:
+                overrides[name] = value
+        return self.updated(overrides) if overrides else self
+
+
+def _rng(*parts):
+    """Генератор случайных чисел, детерминированно зависящий от parts"""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def estimate_tokens(text: str):
+    """Грубая оценка количества токенов: ~4 символа на токен"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def _find_terms(text: str, terms):
+    lowered = text.lower()
+    return [term for term in terms if re.search(r"(?<![\w+#.])" + re.escape(term.lower()) + r"(?![\w+#])", lowered)]
+
+
+def _parse_list(prompt: str, marker: str):
+    """Разбирает список навыков вида "Совпавшие технические навыки: ['Java', 'SQL']" из промпта"""
+    match = re.search(re.escape(marker) + r"\s*(\[.*?\])\s*$", prompt, re.MULTILINE)
+    if not match:
+        return []
+    try:
+        value = ast.literal_eval(match.group(1))
+    except (ValueError, SyntaxError):
+        return []
+    return [str(item) for item in value] if isinstance(value, (list, tuple, set)) else []
+
+
+def normalizer_response(prompt: str):
+    """Ответ на промпт нормализации резюме по схеме ResumeNormalizer"""
+    rng = _rng("normalizer", prompt)
+    resume_text = prompt.split(NORMALIZER_MARKER, 1)[1]
+
+    # Email из резюме, а если его нет — переданный в схеме промпта
+    email_match = re.search(r"[\w.+-]+@[\w-]+\.[\w.-]+", resume_text)
+    schema_email = re.search(r'"email":\s*"([^"]*)"', prompt)
+    email = email_match.group(0) if email_match else (schema_email.group(1) if schema_email else "")
+    phone_match = re.search(r"\+?\d[\d\s()-]{9,}\d", resume_text)
+    name_match = re.search(r"\b([А-ЯЁ][а-яё]+\s+[А-ЯЁ][а-яё]+(?:\s+[А-ЯЁ][а-яё]+)?)\b", resume_text)
+
+    languages = _find_terms(resume_text, LANGUAGES) or rng.sample(LANGUAGES, 2)
+    frameworks = _find_terms(resume_text, FRAMEWORKS) or rng.sample(FRAMEWORKS, 3)
+    work_experience = []
+    for index in range(rng.randint(1, 3)):
+        start_year = 2015 + index * 3 + rng.randint(0, 1)
+        work_experience.append({
+            "start_date": f"{start_year}-{rng.randint(1, 12):02d}",
+            "end_date": f"{start_year + rng.randint(1, 3)}-{rng.randint(1, 12):02d}",
+            "company_name": rng.choice(COMPANIES),
+            "achievements": [f"Достижение {index + 1}.{number}" for number in range(1, rng.randint(2, 4))],
+            "technologies": rng.sample(languages + frameworks, min(5, len(languages + frameworks)))
+        })
+
+    return {
+        "name": name_match.group(1) if name_match else rng.choice(NAMES),
+        "email": email,
+        "phone": phone_match.group(0).strip() if phone_match else "",
+        "vacancy_name": f"{languages[0]} Developer",
+        "languages": languages,
+        "frameworks": frameworks,
+        "education": [{
+            "degree": rng.choice(["бакалавриат", "магистратура"]),
+            "direction": "Информатика и вычислительная техника",
+            "specialty": "Программная инженерия"
+        }],
+        "work_experience": work_experience
+    }
+
+
+def matcher_response(prompt: str):
+    """Ответ на промпт сопоставления резюме и вакансии по формату ResumeVacancyMatcher.get_llm_analysis"""
+    rng = _rng("matcher", prompt)
+    matched = _parse_list(prompt, MATCHER_MARKER)
+    unmatched = _parse_list(prompt, "Не найденные технические навыки:")
+    total = len(matched) + len(unmatched)
+    share = len(matched) / total if total else rng.random()
+    score = round(min(1.0, max(0.0, share * 0.9 + rng.uniform(0.0, 0.1))), 2)
+
+    positives = [f"Есть опыт с {skill}" for skill in matched[:5]]
+    positives += ["Релевантный опыт работы", "Профильное образование", "Опыт командной разработки"]
+    negatives = [f"Нет опыта с {skill}" for skill in unmatched[:5]]
+    negatives += ["Недостаточно подробно описаны достижения", "Нет сведений о сертификатах"]
+
+    if score >= 0.7:
+        verdict = "Рекомендуется пригласить на собеседование"
+    elif score >= 0.4:
+        verdict = "Кандидат подходит частично, требуется дополнительная проверка"
+    else:
+        verdict = "Кандидат не соответствует требованиям вакансии"
+
+    return {
+        "score": score,
+        "positives": positives[:5],
+        "negatives": negatives[:5],
+        "verdict": verdict,
+        "comment": f"Совпало навыков: {len(matched)} из {total}. {verdict}."
+    }
+
+
+def completion_content(prompt: str):
+    """Текст ответа модели: JSON в блоке кода для известных промптов, эхо для остальных"""
+    if NORMALIZER_MARKER in prompt:
+        data = normalizer_response(prompt)
+    elif MATCHER_MARKER in prompt:
+        data = matcher_response(prompt)
+    else:
+        return f"Эмулятор LLM: получено {len(prompt)} символов."
+    return "```json\n" + json.dumps(data, ensure_ascii=False, indent=2) + "\n```"
+
+
+def sample_latency(config: EmulatorConfig, rng: random.Random, completion_tokens: int):
+    """Задержка ответа в секундах по модели из настроек"""
+    if config.latency == "lognormal" and config.median > 0:
+        latency = rng.lognormvariate(math.log(config.median), config.sigma)
+    else:
+        latency = config.median
+    if config.spike_rate and rng.random() < config.spike_rate:
+        latency *= config.spike_multiplier
+    return latency + config.per_token * completion_tokens
+
+
+def sample_outcome(config: EmulatorConfig, rng: random.Random):
+    """Исход вызова: "ok", "429", "500" или "timeout" """
+    value = rng.random()
+    for outcome, rate in (("429", config.rate_429), ("500", config.rate_500), ("timeout", config.rate_timeout)):
+        if value < rate:
+            return outcome
+        value -= rate
+    return "ok"
+
+
+def _error(status_code: int, message: str, error_type: str, headers=None):
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "code": status_code}},
+        headers=headers
+    )
+
+
+def create_app(config: EmulatorConfig = None):
+    """
+    Создает приложение-эмулятор API языковой модели
+
+    Задержки и ошибки выбираются генератором, зависящим от зерна, текста
+    промпта и порядкового номера вызова, поэтому последовательность вызовов
+    воспроизводится между запусками.
+
+    :param config: Начальные настройки эмулятора
+    """
+    app = FastAPI(title="LLM API emulator")
+    state = {"config": config or EmulatorConfig(), "stats": {}}
+    counter = itertools.count(1)
+
+    def count(outcome: str):
+        state["stats"][outcome] = state["stats"].get(outcome, 0) + 1
+
+    @app.get("/emulator/config")
+    async def get_config():
+        return {"config": state["config"].to_dict(), "stats": state["stats"]}
+
+    @app.put("/emulator/config")
+    async def put_config(request: Request):
+        try:
+            state["config"] = state["config"].updated(await request.json())
+        except (ValueError, TypeError) as e:
+            return _error(400, str(e), "invalid_request_error")
+        state["stats"] = {}
+        return {"config": state["config"].to_dict()}
+
+    @app.get("/v1/models")
+    @app.get("/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "emulator", "object": "model", "owned_by": "local"}]}
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        try:
+            call_config = state["config"].for_request(request.headers)
+        except (ValueError, TypeError) as e:
+            return _error(400, str(e), "invalid_request_error")
+        try:
+            body = await request.json()
+            messages = body["messages"]
+            prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return _error(400, "Тело запроса должно содержать messages", "invalid_request_error")
+
+        call_number = next(counter)
+        rng = _rng(call_config.seed, call_number, hashlib.md5(prompt.encode("utf-8")).hexdigest())
+        outcome = sample_outcome(call_config, rng)
+        count(outcome)
+
+        if outcome == "timeout":
+            await asyncio.sleep(call_config.timeout_delay)
+            return _error(504, "Превышено время ожидания ответа модели", "timeout")
+
+        content = completion_content(prompt)
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        latency = sample_latency(call_config, rng, usage["completion_tokens"])
+
+        if outcome == "429":
+            await asyncio.sleep(min(latency, call_config.median))
+            return _error(429, "Rate limit exceeded", "rate_limit_exceeded",
+                          headers={"Retry-After": str(call_config.retry_after)})
+        if outcome == "500":
+            await asyncio.sleep(latency)
+            return _error(500, "Internal server error", "server_error")
+
+        completion_id = f"chatcmpl-{uuid.UUID(int=rng.getrandbits(128)).hex}"
+        created = int(time.time())
+        model = body.get("model") or "emulator"
+        headers = {"X-Emulator-Call": str(call_number), "X-Emulator-Latency": f"{latency:.3f}"}
+
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                _stream(content, usage if include_usage else None, latency, call_config.stream_chunk_delay,
+                        completion_id, created, model),
+                media_type="text/event-stream",
+                headers=headers
+            )
+
+        await asyncio.sleep(latency)
+        return JSONResponse(content={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        }, headers=headers)
+
+    return app
+
+
+async def _stream(content, usage, latency, chunk_delay, completion_id, created, model):
+    """Потоковая выдача в формате server-sent events: первый фрагмент после задержки, затем по паузе"""
+
+    def event(delta, finish_reason=None, extra=None):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        chunk.update(extra or {})
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+    await asyncio.sleep(latency)
+    yield event({"role": "assistant", "content": ""})
+    for start in range(0, len(content), 16):
+        if chunk_delay:
+            await asyncio.sleep(chunk_delay)
+        yield event({"content": content[start:start + 16]})
+    yield event({}, "stop")
+    if usage is not None:
+        # Как в OpenAI API при stream_options.include_usage: отдельный фрагмент без choices
+        chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                 "choices": [], "usage": usage}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def main():
+    """Запуск эмулятора API языковой модели"""
+    parser = argparse.ArgumentParser(description="Локальный эмулятор OpenAI-совместимого API chat/completions")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес сервера")
+    parser.add_argument("--port", type=int, default=8020, help="Порт сервера")
+    parser.add_argument("--latency", choices=LATENCY_MODES, default="fixed", help="Модель задержки")
+    parser.add_argument("--median", type=float, default=0.0, help="Базовая (медианная) задержка в секундах")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Разброс логнормальной задержки")
+    parser.add_argument("--per-token", type=float, default=0.0, help="Задержка на токен ответа в секундах")
+    parser.add_argument("--spike-rate", type=float, default=0.0, help="Доля вызовов с выбросом задержки")
+    parser.add_argument("--spike-multiplier", type=float, default=10.0, help="Множитель задержки при выбросе")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Доля ответов 500")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="Доля зависающих вызовов")
+    parser.add_argument("--timeout-delay", type=float, default=75.0, help="Длительность зависания в секундах")
+    parser.add_argument("--retry-after", type=int, default=1, help="Заголовок Retry-After для ответов 429")
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0,
+                        help="Пауза между фрагментами потоковой выдачи в секундах")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора задержек и ошибок")
+    args = parser.parse_args()
+
+    try:
+        config = EmulatorConfig(**{name: getattr(args, name) for name in EmulatorConfig.FIELDS})
+    except ValueError as e:
+        parser.error(str(e))
+
+    console.print(f"Эмулятор LLM: http://{args.host}:{args.port}/v1/chat/completions")
+    console.print(f"Для использования укажите LLM_API_URL=http://{args.host}:{args.port}/v1/chat/completions")
+    console.print(f"Настройки: {config.to_dict()}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services.container import services
+
+
+@pytest.fixture
+def use_service():
+    """Подменяет сервис контейнера на время теста: use_service("db_service", FakeDB())"""
+    replaced = {}
+
+    def install(name: str, instance):
+        replaced.setdefault(name, services._instances.get(name))
+        services._instances[name] = instance
+        return instance
+
+    yield install
+
+    for name, previous in replaced.items():
+        if previous is None:
+            services._instances.pop(name, None)
+        else:
+            services._instances[name] = previous
+
+
+@pytest.fixture
+def client():
+    """Клиент приложения без запуска lifespan (прогрева и загрузки индексов)"""
+    from src.main import app
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def hh_api_url():
+    """Адрес заглушки API hh.ru (stubs/hh_api_stub.py), запущенной в фоновом потоке"""
+    import socket
+    import threading
+    import time
+
+    import uvicorn
+
+    from stubs.hh_api_stub import create_app
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(create_app(), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Заглушка API hh.ru не запустилась")
+        time.sleep(0.01)
+
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    server.should_exit = True
+    thread.join(timeout=5)
+    sock.close()
+
+
+def api_fixture(original_id: str):
+    """Записанный ответ API hh.ru из каталога заглушки"""
+    import json
+
+    from stubs.hh_api_stub import FIXTURES_DIR
+
+    return json.loads((FIXTURES_DIR / f"{original_id}.json").read_text(encoding="utf-8"))
+
+
+def render_vacancy_page(data):
+    """Страница вакансии в разметке hh.ru по ответу API"""
+    salary = data.get("salary") or {}
+    salary_text = " ".join(part for part in (
+        f"от {salary['from']:,}".replace(",", " ") if salary.get("from") else "",
+        f"до {salary['to']:,}".replace(",", " ") if salary.get("to") else "",
+        "₽ на руки" if salary else "з/п не указана"
+    ) if part)
+    tags = "".join(f'<li class="bloko-tag"><span data-qa="bloko-tag__text">{skill["name"]}</span></li>'
+                   for skill in data.get("key_skills") or [])
+    return (
+        "<!DOCTYPE html><html><head><title>Вакансия</title></head><body><main>"
+        f'<h1 class="bloko-header-section-1" data-qa="vacancy-title">{data["name"]}</h1>'
+        f'<div data-qa="vacancy-salary"><span>{salary_text}</span></div>'
+        f'<a class="bloko-link" href="/employer/1"><span data-qa="bloko-header-2">{data["employer"]["name"]}</span></a>'
+        f'<p>Требуемый опыт работы: <span data-qa="vacancy-experience">{data["experience"]["name"]}</span></p>'
+        f'<div class="g-user-content" data-qa="vacancy-description">{data["description"]}</div>'
+        f'<ul class="bloko-tag-list">{tags}</ul>'
+        "</main></body></html>"
+    )
+
+
+@pytest.fixture
+def hh_pages(monkeypatch):
+    """
+    Страницы вакансий https://hh.ru/vacancy/{id} без обращения к сети
+
+    Возвращает словарь {id: HTML}; для вакансий, которых нет в словаре, ответ 404.
+    Остальные запросы (в том числе к заглушке API) выполняются как обычно.
+    """
+    import requests
+
+    pages = {}
+    original_get = requests.get
+
+    def get(url, *args, **kwargs):
+        prefix = "https://hh.ru/vacancy/"
+        if not url.startswith(prefix):
+            return original_get(url, *args, **kwargs)
+        response = requests.Response()
+        response.url = url
+        response.encoding = "utf-8"
+        page = pages.get(url[len(prefix):])
+        response.status_code = 200 if page is not None else 404
+        response._content = (page or "Not Found").encode("utf-8")
+        return response
+
+    monkeypatch.setattr(requests, "get", get)
+    return pages
@@ -0,0 +1,85 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.utils import executors as executors_module
+from src.utils.deadline import DeadlineExceeded, RequestDeadline, _current
+from src.utils.executors import ExecutorOverloaded, WorkloadExecutor
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_run_uses_pool_threads_and_caller_context():
+    executor = WorkloadExecutor("test", max_workers=2, queue_size=2)
+    request_id.set("req-1")
+
+    thread_name, value = asyncio.run(executor.run(
+        lambda: (threading.current_thread().name, request_id.get())
+    ))
+
+    assert thread_name.startswith("test-worker")
+    assert value == "req-1"
+    assert executor.admitted == 0
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    executor = WorkloadExecutor("test", max_workers=1, queue_size=1)
+    release = threading.Event()
+    futures = [executor.submit(release.wait, 5) for _ in range(2)]
+
+    with pytest.raises(ExecutorOverloaded) as error:
+        executor.submit(release.wait, 5)
+
+    assert error.value.status_code == 503
+    assert 1 <= int(error.value.headers["Retry-After"]) <= 60
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert executor.admitted == 0
+
+
+def test_expired_deadline_is_not_queued():
+    executor = WorkloadExecutor("test", max_workers=1, queue_size=1)
+    token = _current.set(RequestDeadline(header_timeout=0.001))
+    try:
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(executor.run(lambda: None))
+    finally:
+        _current.reset(token)
+    assert executor.admitted == 0
+
+
+@pytest.mark.parametrize("profiling", [False, True])
+def test_profiler_wraps_tasks_only_when_enabled(monkeypatch, profiling):
+    wrapped = []
+
+    def track_thread(func):
+        wrapped.append(func)
+        return func
+
+    monkeypatch.setattr(executors_module, "request_profiling_enabled", lambda: profiling)
+    monkeypatch.setattr(executors_module, "track_thread", track_thread)
+    executor = WorkloadExecutor("test", max_workers=1, queue_size=1)
+
+    assert executor.submit(lambda: 42).result(timeout=5) == 42
+    assert len(wrapped) == (1 if profiling else 0)
+
+
+def test_parse_vacancy_runs_in_cpu_pool(client, use_service):
+    threads = []
+
+    class FakeParser:
+        def parse_vacancy(self, url):
+            threads.append(threading.current_thread().name)
+            return None, "URL должен указывать на вакансию с сайта hh.ru"
+
+    use_service("vacancy_parser", FakeParser())
+
+    response = client.post("/api/parse-vacancy", json={"url": "https://example.com/1", "refresh": False})
+
+    assert response.status_code == 400
+    assert threads and threads[0].startswith("cpu-worker")
@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+from src.services.hh_api_client import HHApiClient
+from src.services.vacancy_parser import VacancyParser
+from tests.conftest import api_fixture, render_vacancy_page
+
+VACANCY_ID = "93353083"
+VACANCY_URL = f"https://hh.ru/vacancy/{VACANCY_ID}"
+
+
+@pytest.fixture
+def parser(hh_api_url):
+    parser = VacancyParser(backend="api")
+    parser.api_client = HHApiClient(base_url=hh_api_url)
+    return parser
+
+
+def test_client_gets_recorded_vacancy(hh_api_url):
+    data = HHApiClient(base_url=hh_api_url).get_vacancy(VACANCY_ID)
+
+    assert data["id"] == VACANCY_ID
+    assert data["name"] == api_fixture(VACANCY_ID)["name"]
+
+
+def test_client_raises_for_unknown_vacancy(hh_api_url):
+    with pytest.raises(requests.HTTPError):
+        HHApiClient(base_url=hh_api_url).get_vacancy("1")
+
+
+def test_stub_answers_conditional_request_with_304(hh_api_url):
+    url = HHApiClient(base_url=hh_api_url).vacancy_url(VACANCY_ID)
+    etag = requests.get(url).headers["ETag"]
+
+    assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_parse_vacancy_from_api(parser, hh_pages):
+    vacancy, error = parser.parse_vacancy(VACANCY_URL)
+
+    assert error is None
+    assert vacancy["title"] == "Senior Java-разработчик (Spring Boot)"
+    assert vacancy["company"] == "Яндекс"
+    assert (vacancy["salary_from"], vacancy["salary_to"], vacancy["currency"]) == (350000, 430000, "₽")
+    assert vacancy["experience"] == "От 3 до 6 лет"
+    assert vacancy["original_id"] == VACANCY_ID
+    assert vacancy["url"] == VACANCY_URL
+    assert "Spring Boot" in vacancy["skills"]
+    assert "<" not in vacancy["description"]
+
+
+def test_parse_vacancy_falls_back_to_html(parser, hh_pages):
+    # Вакансии 1 нет в заглушке API: данные берутся со страницы
+    hh_pages["1"] = render_vacancy_page(api_fixture(VACANCY_ID))
+
+    vacancy, error = parser.parse_vacancy("https://hh.ru/vacancy/1")
+
+    assert error is None
+    assert vacancy["title"] == "Senior Java-разработчик (Spring Boot)"
+    assert vacancy["original_id"] == "1"
+    assert "Spring Boot" in vacancy["skills"]
+
+
+def test_parse_vacancy_reports_missing_page(parser, hh_pages):
+    vacancy, error = parser.parse_vacancy("https://hh.ru/vacancy/1")
+
+    assert vacancy is None
+    assert "404" in error
+
+
+@pytest.mark.parametrize("original_id", ["93353083", "94120517"])
+def test_api_and_html_give_same_vacancy(parser, original_id):
+    data = api_fixture(original_id)
+    url = f"https://hh.ru/vacancy/{original_id}"
+
+    from_api = parser.parse_api_data(data, url)
+    from_html = parser.parse_html(render_vacancy_page(data), url)
+
+    for field in ("title", "company", "salary_from", "salary_to", "currency", "experience", "skills",
+                  "original_id", "url"):
+        assert from_api[field] == from_html[field], field
+    assert from_api["description"].split() == from_html["description"].split()
@@ -0,0 +1,144 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.services import row_cache
+from src.services.row_cache import NOTIFY_MAX_IDS, InvalidationListener, RowCache, invalidate_rows, \
+    notify_payloads
+
+
+@pytest.fixture
+def listening(monkeypatch):
+    """Слушатель уведомлений считается подключенным: кешам можно доверять"""
+    monkeypatch.setattr(row_cache.invalidation_listener, "ensure_running", lambda: True)
+
+
+class Loader:
+    """Функция чтения строки, считающая обращения к базе данных"""
+
+    def __init__(self, row):
+        self.row = row
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return None if self.row is None else dict(self.row)
+
+
+def test_rows_are_cached_as_copies(listening):
+    cache = RowCache("test")
+    loader = Loader({"id": "1", "title": "Java"})
+
+    first = cache.get("1", loader)
+    first["title"] = "изменено"
+    second = cache.get("1", loader)
+
+    assert loader.calls == 1
+    assert second == {"id": "1", "title": "Java"}
+
+
+def test_missing_rows_are_not_cached(listening):
+    cache = RowCache("test")
+    loader = Loader(None)
+
+    assert cache.get("1", loader) is None
+    assert cache.get("1", loader) is None
+    assert loader.calls == 2
+
+
+def test_cache_is_bypassed_without_listener(monkeypatch):
+    monkeypatch.setattr(row_cache.invalidation_listener, "ensure_running", lambda: False)
+    cache = RowCache("test")
+    loader = Loader({"id": "1"})
+
+    cache.get("1", loader)
+    cache.get("1", loader)
+
+    assert loader.calls == 2
+    assert len(cache) == 0
+
+
+def test_expired_and_evicted_rows_are_reloaded(listening):
+    expiring = RowCache("test", ttl=0)
+    loader = Loader({"id": "1"})
+    expiring.get("1", loader)
+    expiring.get("1", loader)
+    assert loader.calls == 2
+
+    bounded = RowCache("test", max_size=2)
+    for key in ("1", "2", "3"):
+        bounded.get(key, Loader({"id": key}))
+    assert len(bounded) == 2
+    loader = Loader({"id": "1"})
+    bounded.get("1", loader)
+    assert loader.calls == 1
+
+
+def test_row_read_before_invalidation_is_not_stored(listening):
+    cache = RowCache("test")
+
+    def stale_loader():
+        # Другой поток записал строку, пока эта копия читалась из базы данных
+        cache.invalidate(["1"])
+        return {"id": "1", "title": "старое"}
+
+    assert cache.get("1", stale_loader) == {"id": "1", "title": "старое"}
+    assert len(cache) == 0
+
+
+def test_notify_payloads_collapse_large_batches():
+    assert notify_payloads("vacancy", ["1", "2"]) == ["vacancy:1", "vacancy:2"]
+    assert notify_payloads("vacancy", map(str, range(NOTIFY_MAX_IDS + 1))) == ["vacancy:*"]
+
+
+def test_invalidate_rows_clears_cache_for_large_batches(listening, monkeypatch):
+    cache = RowCache("vacancy")
+    monkeypatch.setitem(row_cache.row_caches, "vacancy", cache)
+    cache.get("1", Loader({"id": "1"}))
+    cache.get("2", Loader({"id": "2"}))
+
+    invalidate_rows("vacancy", ["1"])
+    assert len(cache) == 1
+
+    invalidate_rows("vacancy", map(str, range(NOTIFY_MAX_IDS + 1)))
+    assert len(cache) == 0
+
+
+def test_listener_applies_notifications_and_calls_handlers(listening, monkeypatch):
+    cache = RowCache("vacancy")
+    monkeypatch.setitem(row_cache.row_caches, "vacancy", cache)
+    for key in ("1", "2"):
+        cache.get(key, Loader({"id": key}))
+    listener = InvalidationListener()
+    received = []
+
+    def failing_handler(kind, row_id):
+        raise RuntimeError("ошибка обработчика")
+
+    listener.add_handler(failing_handler)
+    listener.add_handler(lambda kind, row_id: received.append((kind, row_id)))
+
+    listener._apply("vacancy:1")
+    assert len(cache) == 1
+    listener._apply("unknown:1")
+    listener._apply("vacancy:*")
+    assert len(cache) == 0
+
+    assert received == [("vacancy", "1"), ("vacancy", "*")]
+
+
+def test_unconfigured_listener_does_not_wait():
+    listener = InvalidationListener()
+
+    assert listener.wait_connected(timeout=30) is False
+    assert listener.ensure_running() is False
+
+
+def test_import_does_not_load_psycopg2():
+    code = "import sys, src.services.row_cache; print('psycopg2' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).parent.parent)
+
+    assert result.stdout.strip() == "False"
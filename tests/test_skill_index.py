@@ -0,0 +1,98 @@
+import random
+import threading
+from collections import Counter
+
+from src.services.skill_index import SkillIndex
+
+
+def build_index(documents):
+    index = SkillIndex()
+    for doc_id, skills in documents.items():
+        index.add(doc_id, skills)
+    return index
+
+
+def reference_at_least(documents, skills, k):
+    """Подсчет совпадений перебором документов"""
+    query = set(skills)
+    counts = Counter({doc_id: len(query & set(doc_skills)) for doc_id, doc_skills in documents.items()})
+    return sorted(((doc_id, count) for doc_id, count in counts.items() if count >= max(k, 1)),
+                  key=lambda item: (-item[1], list(documents).index(item[0])))
+
+
+def test_match_all_and_any():
+    index = build_index({"a": ["python", "docker"], "b": ["python"], "c": ["java"]})
+
+    assert index.match_all(["python", "docker"]) == ["a"]
+    assert index.match_all(["python", "kotlin"]) == []
+    assert index.match_any(["python", "java"]) == ["a", "b", "c"]
+
+
+def test_match_at_least_orders_by_count_then_insertion():
+    index = build_index({
+        "a": ["python"],
+        "b": ["python", "docker", "sql"],
+        "c": ["docker", "sql"],
+        "d": ["sql", "python"],
+        "e": ["java"]
+    })
+
+    assert index.match_at_least(["python", "docker", "sql"], 2) == [("b", 3), ("c", 2), ("d", 2)]
+    assert index.match_at_least(["python", "docker", "sql"], 1, limit=2) == [("b", 3), ("c", 2)]
+    assert index.match_at_least(["kotlin"], 1) == []
+    assert index.match_at_least([], 1) == []
+
+
+def test_search_at_least_reports_total_beyond_limit():
+    index = build_index({f"doc-{number}": ["python"] for number in range(10)})
+
+    total, found = index.search_at_least(["python"], 1, limit=3)
+
+    assert total == 10
+    assert found == [("doc-0", 1), ("doc-1", 1), ("doc-2", 1)]
+
+
+def test_match_at_least_reflects_updates_and_removals():
+    index = build_index({"a": ["python", "docker"], "b": ["python"]})
+
+    index.add("a", ["java"])
+    index.remove("b")
+    index.add("c", ["python", "docker"])
+
+    assert index.match_at_least(["python", "docker"], 1) == [("c", 2)]
+    assert index.match_at_least(["java"], 1) == [("a", 1)]
+
+
+def test_match_at_least_matches_reference():
+    rng = random.Random(7)
+    vocabulary = [f"skill-{number}" for number in range(40)]
+    documents = {f"doc-{number}": rng.sample(vocabulary, rng.randint(0, 10)) for number in range(500)}
+    index = build_index(documents)
+
+    for _ in range(20):
+        skills = rng.sample(vocabulary, rng.randint(1, 8))
+        for k in (0, 1, 2, 4):
+            assert index.match_at_least(skills, k) == reference_at_least(documents, skills, k)
+
+
+def test_match_at_least_while_documents_are_added():
+    index = build_index({f"doc-{number}": ["python", "sql"] for number in range(1000)})
+    errors = []
+
+    def writer():
+        try:
+            for number in range(1000, 3000):
+                index.add(f"doc-{number}", ["python"])
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        total, found = index.search_at_least(["python", "sql"], 1, limit=5)
+        assert found[0] == ("doc-0", 2)
+        assert 1000 <= total <= 3000
+    thread.join()
+
+    assert not errors
+    assert index.search_at_least(["python"], 1)[0] == 3000
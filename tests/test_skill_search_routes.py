@@ -0,0 +1,59 @@
+from src.api import routes
+
+
+class FakeVacancyDB:
+    """Сервис базы данных с вакансиями в памяти"""
+
+    def __init__(self, vacancies):
+        self.vacancies = vacancies
+
+    def get_vacancy(self, vacancy_id):
+        return self.vacancies.get(vacancy_id)
+
+    def save_vacancy_skills(self, skills_by_id):
+        return True
+
+
+def make_vacancy(vacancy_id, skills_canonical):
+    return {
+        "id": vacancy_id,
+        "description": "",
+        "skills": [],
+        "skills_canonical": skills_canonical,
+        "skills_vocab_version": routes.TERM_NORMALIZER_VERSION
+    }
+
+
+def test_candidates_for_vacancy_without_skills_is_empty(client, use_service):
+    use_service("db_service", FakeVacancyDB({"v-empty": make_vacancy("v-empty", {})}))
+
+    response = client.get("/api/vacancy/v-empty/candidates")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+    assert response.json()["matches"] == []
+
+
+def test_candidates_for_unknown_vacancy_is_404(client, use_service):
+    use_service("db_service", FakeVacancyDB({}))
+
+    assert client.get("/api/vacancy/missing/candidates").status_code == 404
+
+
+def test_candidates_are_ranked_by_matched_skills(client, use_service, monkeypatch):
+    use_service("db_service", FakeVacancyDB({}))
+    resumes = routes.SkillIndex()
+    resumes.add("r-1", ["python"])
+    resumes.add("r-2", ["python", "docker"])
+    resumes.add("r-3", ["java"])
+    vacancies = routes.SkillIndex()
+    vacancies.add("v-1", ["python", "docker"])
+    monkeypatch.setattr(routes, "resume_skill_index", resumes)
+    monkeypatch.setattr(routes, "vacancy_skill_index", vacancies)
+
+    response = client.get("/api/vacancy/v-1/candidates", params={"limit": 1})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert body["matches"] == [{"id": "r-2", "matched_count": 2}]
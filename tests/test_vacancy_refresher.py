@@ -0,0 +1,131 @@
+import pytest
+
+from src.services.hh_api_client import HHApiClient
+from src.services.page_cache import PageCache
+from src.services.vacancy_parser import VacancyParser
+from src.services.vacancy_refresher import VacancyRefresher, _changed_fields
+from tests.conftest import api_fixture, render_vacancy_page
+
+VACANCY_ID = "93353083"
+VACANCY_URL = f"https://hh.ru/vacancy/{VACANCY_ID}"
+
+
+class FakeVacancyDB:
+    """Сервис базы данных с вакансиями в памяти, индексированными по original_id"""
+
+    def __init__(self):
+        self.vacancies = {}
+        self.invalidated = []
+        self.checked = []
+
+    def get_vacancy_by_original_id(self, original_id):
+        vacancy = self.vacancies.get(original_id)
+        return dict(vacancy) if vacancy else None
+
+    def save_vacancy(self, vacancy_id, original_id, **fields):
+        self.vacancies[original_id] = dict(fields, id=vacancy_id, original_id=original_id)
+        return True
+
+    def invalidate_vacancy_matches(self, vacancy_id):
+        self.invalidated.append(vacancy_id)
+        return 3
+
+    def mark_vacancy_checked(self, vacancy_id, is_closed=False):
+        self.checked.append((vacancy_id, is_closed))
+        return True
+
+
+@pytest.fixture
+def db():
+    return FakeVacancyDB()
+
+
+@pytest.fixture
+def refresher(db, hh_api_url, hh_pages, tmp_path):
+    parser = VacancyParser(backend="api")
+    parser.api_client = HHApiClient(base_url=hh_api_url)
+    return VacancyRefresher(db_service=db, parser=parser, page_cache=PageCache(str(tmp_path)),
+                            skills_extractor=lambda description, skills: {"java": ["java"]})
+
+
+def test_new_vacancy_is_created(refresher, db):
+    result, error = refresher.refresh(VACANCY_URL)
+
+    assert error is None
+    assert result["status"] == "created"
+    assert result["source"] == "api"
+    saved = db.vacancies[VACANCY_ID]
+    assert saved["title"] == "Senior Java-разработчик (Spring Boot)"
+    assert saved["skills_canonical"] == {"java": ["java"]}
+    assert db.checked == [(saved["id"], False)]
+
+
+def test_repeated_refresh_is_not_modified(refresher, db):
+    refresher.refresh(VACANCY_URL)
+
+    result, error = refresher.refresh(VACANCY_URL)
+
+    assert error is None
+    # Заглушка ответила 304 на запрос с ETag из кеша страниц
+    assert result["status"] == "not_modified"
+    assert refresher.requests_made == 2
+    assert not db.invalidated
+
+
+def test_html_copy_with_other_whitespace_is_unchanged(refresher, db, tmp_path):
+    # Вакансия сохранена со страницы: блоки описания разделены иначе, чем в API
+    html_vacancy = refresher.parser.parse_html(render_vacancy_page(api_fixture(VACANCY_ID)), VACANCY_URL)
+    db.save_vacancy(**dict(html_vacancy, vacancy_id="v-1", id=None))
+
+    result, error = refresher.refresh(VACANCY_URL)
+
+    assert error is None
+    assert result["status"] == "unchanged"
+    assert result["vacancy"]["id"] == "v-1"
+    assert not db.invalidated
+
+
+def test_changed_description_invalidates_matches(refresher, db):
+    refresher.refresh(VACANCY_URL)
+    vacancy_id = db.vacancies[VACANCY_ID]["id"]
+    db.vacancies[VACANCY_ID]["description"] = "Прежнее описание"
+    # Сбрасываем кеш страниц, чтобы ответ API был разобран заново
+    refresher.page_cache = PageCache(refresher.page_cache.directory + "-fresh")
+
+    result, error = refresher.refresh(VACANCY_URL)
+
+    assert error is None
+    assert result["status"] == "updated"
+    assert result["changed_fields"] == ["description"]
+    assert result["invalidated_matches"] == 3
+    assert db.invalidated == [vacancy_id]
+    assert db.vacancies[VACANCY_ID]["id"] == vacancy_id
+
+
+def test_vacancy_missing_everywhere_is_closed(refresher, db):
+    db.save_vacancy(vacancy_id="v-1", original_id="1", title="Старая вакансия", description="")
+
+    result, error = refresher.refresh("https://hh.ru/vacancy/1")
+
+    assert error is None
+    assert result["status"] == "closed"
+    assert db.checked == [("v-1", True)]
+
+
+def test_html_fallback_creates_vacancy(refresher, db, hh_pages):
+    hh_pages["1"] = render_vacancy_page(api_fixture(VACANCY_ID))
+
+    result, error = refresher.refresh("https://hh.ru/vacancy/1")
+
+    assert error is None
+    assert (result["status"], result["source"]) == ("created", "html")
+    assert db.vacancies["1"]["company"] == "Яндекс"
+
+
+def test_changed_fields_ignore_whitespace_only():
+    existing = {"title": "Java", "description": "Опыт\nработы", "skills": ["Spring Boot", "Java"]}
+
+    assert _changed_fields(existing, {"title": "Java", "description": "Опыт работы",
+                                      "skills": ["Java", "Spring  Boot"]}) == []
+    assert _changed_fields(existing, {"title": "Python", "description": "Опыт работы",
+                                      "skills": ["Java"]}) == ["title", "skills"]